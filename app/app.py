@@ -20,20 +20,112 @@ from app.services.session_service import (
     initialize_filter_state,
 )
 from app.utils.styling import apply_custom_css
+from app.utils.instrumentation_utils import (
+    start_run,
+    finish_run,
+    timed_section,
+    append_run_to_log,
+    summarize_sections,
+)
 from app.services.search_service import global_search
+from app.services.config_service import load_instrumentation_settings
+from app.services.store_service import (
+    commit_session_changes,
+    get_store_records,
+    resolve_data_conflicts,
+)
 
 
 def main():
     """Orchestrates the Streamlit application flow with improved navigation."""
-    apply_custom_css()
-    initialize_session_state()
-    initialize_filter_state()
+    instrumentation = load_instrumentation_settings()
+    if instrumentation["enabled"]:
+        start_run(st.session_state.get("active_tab", "Dashboard"))
+
+    try:
+        apply_custom_css()
+        with timed_section("Session initialization"):
+            initialize_session_state()
+            initialize_filter_state()
+
+        with st.sidebar:
+            with timed_section("Sidebar"):
+                _display_sidebar()
+
+        st.title("Resource Management App")
+        _display_data_conflicts()
+        with timed_section(st.session_state.get("active_tab", "Dashboard")):
+            _route_to_active_tab()
+    finally:
+        # Also runs when a tab calls st.rerun() right after an edit
+        _commit_data_changes()
+        run = finish_run()
+
+    if run is not None:
+        if instrumentation["log_to_file"]:
+            try:
+                append_run_to_log(run, instrumentation["log_file"])
+            except OSError as e:
+                st.sidebar.error(f"Error writing instrumentation log: {str(e)}")
+        with st.sidebar:
+            _display_instrumentation_panel(run)
+
+
+def _commit_data_changes():
+    """Commit the edits of this run to the shared data and change journal."""
+    try:
+        with timed_section("Commit changes"):
+            commit_session_changes()
+    except Exception as e:
+        st.error(f"Error committing changes: {str(e)}")
 
-    with st.sidebar:
-        _display_sidebar()
 
-    st.title("Resource Management App")
-    _route_to_active_tab()
+def _display_data_conflicts():
+    """Display edits that conflict with changes made in another session."""
+    conflicts = st.session_state.get("data_conflicts", [])
+    if not conflicts:
+        return
+
+    st.warning(
+        f"{len(conflicts)} of your changes conflict with changes made in "
+        "another session and have not been saved."
+    )
+    entity_labels = {
+        "people": "Person",
+        "teams": "Team",
+        "departments": "Department",
+        "projects": "Project",
+    }
+    theirs = get_store_records(
+        [(conflict["entity"], conflict["name"]) for conflict in conflicts]
+    )
+    with st.expander("Review Conflicts", expanded=False):
+        for conflict in conflicts:
+            key = (conflict["entity"], conflict["name"])
+            st.markdown(f"**{entity_labels[key[0]]}: {key[1]}**")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("Your version:")
+                if conflict["op"] == "delete":
+                    st.write("Deleted")
+                else:
+                    st.json(conflict["payload"], expanded=False)
+            with col2:
+                st.write("Their version:")
+                if theirs[key] is None:
+                    st.write("Deleted")
+                else:
+                    st.json(theirs[key], expanded=False)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Keep my version", use_container_width=True):
+                resolve_data_conflicts(keep_mine=True)
+                st.rerun()
+        with col2:
+            if st.button("Use their version", use_container_width=True):
+                resolve_data_conflicts(keep_mine=False)
+                st.rerun()
 
 
 def _display_sidebar():
@@ -92,6 +184,22 @@ def _display_sidebar():
         st.rerun()
 
 
+def _display_instrumentation_panel(run):
+    """Display the timings and counters of the current script run."""
+    with st.expander("⏱️ Performance Instrumentation", expanded=False):
+        st.metric(f"{run['label']} render time", f"{run['total_ms']:.0f} ms")
+
+        st.markdown("**Sections**")
+        st.dataframe(summarize_sections(run), use_container_width=True, hide_index=True)
+
+        st.markdown("**Counters**")
+        if run["counters"]:
+            for name, value in sorted(run["counters"].items()):
+                st.write(f"{name.replace('_', ' ').capitalize()}: {value:,}")
+        else:
+            st.write("No counters recorded.")
+
+
 def _display_search_box():
     """Display search box with results."""
 
@@ -0,0 +1,447 @@
+"""
+Allocation service for the resource management application.
+
+This module provides vectorized allocation calculations over Gantt data.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from app.services.calendar_service import count_working_days
+from app.utils.instrumentation_utils import instrumented
+
+# Decimals kept in the allocation matrix: enough for any entered percentage,
+# few enough to drop the float residue of adding and removing allocations
+ALLOCATION_DECIMALS = 6
+
+
+def to_day_numbers(dates: pd.Series) -> np.ndarray:
+    """
+    Convert datetime values to integer day numbers (days since the epoch).
+
+    Args:
+        dates: Series of datetime values
+
+    Returns:
+        Array of int64 day numbers
+    """
+    normalized = pd.DatetimeIndex(dates).normalize()
+    return normalized.to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def to_day_number(date: Any) -> int:
+    """
+    Convert a single date to an integer day number (days since the epoch).
+
+    Args:
+        date: Date-like value
+
+    Returns:
+        Day number of the date
+    """
+    day = pd.Timestamp(date).normalize().to_datetime64().astype("datetime64[D]")
+    return int(day.astype(np.int64))
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """
+    Parse a column of date values in one call.
+
+    Args:
+        values: Series of date strings or date-like values
+
+    Returns:
+        Series of datetime values
+    """
+    try:
+        return pd.to_datetime(values, format="ISO8601")
+    except (ValueError, TypeError):
+        # Dates in other formats are parsed value by value
+        return pd.to_datetime(values, format="mixed")
+
+
+def _day_range(first_day: int, n_days: int) -> pd.DatetimeIndex:
+    """Create a daily DatetimeIndex starting at a day number."""
+    return pd.date_range(start=pd.Timestamp(first_day, unit="D"), periods=n_days)
+
+
+def calculate_allocation_totals(
+    gantt_data: pd.DataFrame, calendar: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
+    """
+    Calculate allocated and overallocated days per resource with a sweep line.
+
+    Each allocation contributes a +percentage event on its start day and a
+    -percentage event on the day after its end. Sorting the events per resource
+    and taking a running sum gives the allocation level between consecutive
+    events, so the cost depends on the number of allocations, not their length.
+
+    Args:
+        gantt_data: DataFrame containing Gantt chart data
+        calendar: Optional work calendar (see build_work_calendar) covering
+            every resource; when given, only working days are counted
+
+    Returns:
+        DataFrame with Resource, Allocated Days and Overallocated Days columns,
+        one row per resource in order of first appearance
+    """
+    codes, resources = pd.factorize(gantt_data["Resource"], use_na_sentinel=False)
+    allocated_days = np.zeros(len(resources))
+    overallocated_days = np.zeros(len(resources))
+
+    valid = (gantt_data["End"] >= gantt_data["Start"]).to_numpy()
+    if valid.any():
+        valid_rows = gantt_data[valid]
+        valid_codes = codes[valid]
+        starts = to_day_numbers(valid_rows["Start"])
+        ends = to_day_numbers(valid_rows["End"]) + 1
+        percentages = valid_rows["Allocation %"].to_numpy(dtype=np.float64)
+
+        event_codes = np.concatenate([valid_codes, valid_codes])
+        event_days = np.concatenate([starts, ends])
+        deltas = np.concatenate([percentages, -percentages])
+
+        order = np.lexsort((event_days, event_codes))
+        event_codes = event_codes[order]
+        event_days = event_days[order]
+        deltas = deltas[order]
+
+        # Running allocation level, reset at the first event of each resource
+        levels = np.cumsum(deltas)
+        group_starts = np.flatnonzero(np.r_[True, event_codes[1:] != event_codes[:-1]])
+        group_sizes = np.diff(np.r_[group_starts, len(event_codes)])
+        levels -= np.repeat((levels - deltas)[group_starts], group_sizes)
+
+        # Number of days each level holds until the next event of the same resource
+        same_resource_next = np.r_[event_codes[1:] == event_codes[:-1], False]
+        if calendar is None:
+            lengths = np.where(same_resource_next, np.diff(event_days, append=0), 0)
+        else:
+            calendar_rows = calendar["resources"].get_indexer(resources)[event_codes]
+            next_days = np.r_[event_days[1:], 0]
+            lengths = np.where(
+                same_resource_next,
+                count_working_days(calendar, calendar_rows, event_days, next_days),
+                0,
+            )
+
+        allocated_days = (
+            np.bincount(
+                event_codes,
+                weights=np.clip(levels, 0, 100) * lengths,
+                minlength=len(resources),
+            )
+            / 100
+        )
+        overallocated_days = (
+            np.bincount(
+                event_codes,
+                weights=np.maximum(levels - 100, 0) * lengths,
+                minlength=len(resources),
+            )
+            / 100
+        )
+
+    return pd.DataFrame(
+        {
+            "Resource": resources,
+            "Allocated Days": allocated_days,
+            "Overallocated Days": overallocated_days,
+        }
+    )
+
+
+@instrumented()
+def build_allocation_matrix(
+    gantt_data: pd.DataFrame,
+    start_date: Optional[pd.Timestamp] = None,
+    end_date: Optional[pd.Timestamp] = None,
+    key: str = "Resource",
+) -> Dict[str, Any]:
+    """
+    Build a dense row x day matrix of summed allocation percentages.
+
+    Each allocation adds its percentage at its first day and removes it the
+    day after its last day; a cumulative sum along the day axis then yields
+    the daily totals for every row at once. The totals are rounded to
+    ALLOCATION_DECIMALS, so they equal the sums of the daily allocations.
+
+    Args:
+        gantt_data: DataFrame containing Gantt chart data
+        start_date: First day of the matrix (defaults to the earliest start)
+        end_date: Last day of the matrix (defaults to the latest end)
+        key: Column whose values become the matrix rows
+
+    Returns:
+        Dictionary with the float64 "matrix", the row labels as "index"
+        (a pd.Index in order of first appearance) and the column days as
+        "dates" (a pd.DatetimeIndex)
+    """
+    valid = (gantt_data["End"] >= gantt_data["Start"]).to_numpy()
+    valid_rows = gantt_data[valid]
+
+    if start_date is None or end_date is None:
+        if valid_rows.empty:
+            first_day, last_day = 0, -1
+        else:
+            first_day = int(to_day_numbers(valid_rows["Start"]).min())
+            last_day = int(to_day_numbers(valid_rows["End"]).max())
+    if start_date is not None:
+        first_day = to_day_number(start_date)
+    if end_date is not None:
+        last_day = to_day_number(end_date)
+    n_days = max(last_day - first_day + 1, 0)
+
+    codes, labels = pd.factorize(gantt_data[key], use_na_sentinel=False)
+    deltas = np.zeros((len(labels), n_days + 1))
+
+    if n_days > 0 and not valid_rows.empty:
+        starts = np.maximum(to_day_numbers(valid_rows["Start"]), first_day)
+        ends = np.minimum(to_day_numbers(valid_rows["End"]), last_day)
+        in_window = starts <= ends
+        row_codes = codes[valid][in_window]
+        percentages = valid_rows["Allocation %"].to_numpy(dtype=np.float64)
+        percentages = percentages[in_window]
+
+        np.add.at(deltas, (row_codes, starts[in_window] - first_day), percentages)
+        np.add.at(deltas, (row_codes, ends[in_window] - first_day + 1), -percentages)
+
+    matrix = np.round(np.cumsum(deltas[:, :n_days], axis=1), ALLOCATION_DECIMALS)
+    return {
+        "matrix": matrix,
+        "index": pd.Index(labels),
+        "dates": _day_range(first_day, n_days),
+    }
+
+
+def update_allocation_matrix(
+    allocation_matrix: Dict[str, Any],
+    removed_rows: pd.DataFrame,
+    added_rows: pd.DataFrame,
+    key: str = "Resource",
+) -> Dict[str, Any]:
+    """
+    Apply changed allocations to an allocation matrix without rebuilding it.
+
+    The contribution of the removed rows is subtracted and that of the added
+    rows is added, touching only the matrix rows of the affected labels. New
+    labels are appended and the day range grows to cover the added rows;
+    rows left without allocations stay in the matrix as zeros.
+
+    Args:
+        allocation_matrix: Matrix built by build_allocation_matrix
+        removed_rows: Gantt rows no longer part of the data
+        added_rows: Gantt rows new to the data
+        key: Column whose values are the matrix rows
+
+    Returns:
+        Updated allocation matrix dictionary (the input is not modified)
+    """
+    changes = pd.concat(
+        [
+            removed_rows.assign(Sign=-1.0),
+            added_rows.assign(Sign=1.0),
+        ]
+    )
+    changes = changes[(changes["End"] >= changes["Start"]).to_numpy()]
+
+    matrix = allocation_matrix["matrix"]
+    index = allocation_matrix["index"]
+    dates = allocation_matrix["dates"]
+    if changes.empty:
+        return {"matrix": matrix.copy(), "index": index, "dates": dates}
+
+    starts = to_day_numbers(changes["Start"])
+    ends = to_day_numbers(changes["End"])
+
+    # Grow the rows and the day range to cover the added allocations
+    first_day = to_day_number(dates[0]) if len(dates) else int(starts.min())
+    last_day = first_day + len(dates) - 1 if len(dates) else int(ends.max())
+    new_first_day = min(first_day, int(starts.min()))
+    new_last_day = max(last_day, int(ends.max()))
+    new_labels = pd.Index(changes[key].unique()).difference(index, sort=False)
+    n_days = new_last_day - new_first_day + 1
+    if len(new_labels) or n_days != matrix.shape[1]:
+        grown = np.zeros((len(index) + len(new_labels), n_days), dtype=np.float64)
+        offset = first_day - new_first_day
+        grown[: len(index), offset : offset + matrix.shape[1]] = matrix
+        matrix = grown
+        index = index.append(new_labels)
+        dates = _day_range(new_first_day, n_days)
+    else:
+        matrix = matrix.copy()
+
+    # Accumulate the signed deltas of the affected rows only
+    rows = index.get_indexer(changes[key])
+    affected, row_codes = np.unique(rows, return_inverse=True)
+    percentages = changes["Allocation %"].to_numpy(dtype=np.float64) * changes[
+        "Sign"
+    ].to_numpy(dtype=np.float64)
+    deltas = np.zeros((len(affected), n_days + 1))
+    np.add.at(deltas, (row_codes, starts - new_first_day), percentages)
+    np.add.at(deltas, (row_codes, ends - new_first_day + 1), -percentages)
+
+    # Rounding removes float residue left by subtracting and adding back
+    updated = matrix[affected] + np.cumsum(deltas[:, :n_days], axis=1)
+    matrix[affected] = np.round(updated, ALLOCATION_DECIMALS)
+    return {"matrix": matrix, "index": index, "dates": dates}
+
+
+def slice_allocation_matrix(
+    allocation_matrix: Dict[str, Any],
+    labels: Optional[List[Any]] = None,
+    start_date: Optional[pd.Timestamp] = None,
+    end_date: Optional[pd.Timestamp] = None,
+) -> Dict[str, Any]:
+    """
+    Select rows and a day window from an allocation matrix.
+
+    Rows or days outside the original matrix are returned as zero allocation.
+
+    Args:
+        allocation_matrix: Matrix built by build_allocation_matrix
+        labels: Row labels to select (defaults to all rows)
+        start_date: First day of the window (defaults to the matrix start)
+        end_date: Last day of the window (defaults to the matrix end)
+
+    Returns:
+        Allocation matrix dictionary for the selection
+    """
+    matrix = allocation_matrix["matrix"]
+    index = allocation_matrix["index"]
+    dates = allocation_matrix["dates"]
+
+    if labels is not None:
+        rows = index.get_indexer(pd.Index(labels))
+        selected = np.zeros((len(rows), matrix.shape[1]), dtype=np.float64)
+        found = rows >= 0
+        selected[found] = matrix[rows[found]]
+        matrix = selected
+        index = pd.Index(labels)
+
+    if start_date is None and end_date is None:
+        return {"matrix": matrix, "index": index, "dates": dates}
+
+    matrix_first = to_day_number(dates[0]) if len(dates) else 0
+    first_day = to_day_number(start_date) if start_date is not None else matrix_first
+    last_day = (
+        to_day_number(end_date)
+        if end_date is not None
+        else matrix_first + len(dates) - 1
+    )
+    n_days = max(last_day - first_day + 1, 0)
+
+    window = np.zeros((matrix.shape[0], n_days), dtype=np.float64)
+    overlap_start = max(first_day, matrix_first)
+    overlap_end = min(last_day, matrix_first + len(dates) - 1)
+    if overlap_start <= overlap_end:
+        window[:, overlap_start - first_day : overlap_end - first_day + 1] = matrix[
+            :, overlap_start - matrix_first : overlap_end - matrix_first + 1
+        ]
+
+    return {"matrix": window, "index": index, "dates": _day_range(first_day, n_days)}
+
+
+def get_allocation_row(allocation_matrix: Dict[str, Any], label: Any) -> pd.Series:
+    """
+    Get the daily allocation of a single row as a date-indexed Series.
+
+    Args:
+        allocation_matrix: Matrix built by build_allocation_matrix
+        label: Row label (e.g. resource name)
+
+    Returns:
+        Series of daily allocation percentages (zero if the label is unknown)
+    """
+    index = allocation_matrix["index"]
+    dates = allocation_matrix["dates"]
+    if label not in index:
+        return pd.Series(0.0, index=dates)
+    return pd.Series(allocation_matrix["matrix"][index.get_loc(label)], index=dates)
+
+
+def find_allocation_runs(
+    allocation_matrix: Dict[str, Any], mask: np.ndarray
+) -> pd.DataFrame:
+    """
+    Find runs of consecutive days where a mask over the matrix is set.
+
+    Args:
+        allocation_matrix: Matrix built by build_allocation_matrix
+        mask: Boolean array with the same shape as the matrix
+
+    Returns:
+        DataFrame with Label, Start, End, Days and Peak Allocation columns,
+        one row per run ordered by row and start day
+    """
+    matrix = allocation_matrix["matrix"]
+    dates = allocation_matrix["dates"]
+
+    # Run boundaries are where the padded mask flips between False and True
+    padded = np.pad(mask.astype(np.int8), ((0, 0), (1, 1)))
+    changes = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(changes == 1)
+    _, ends = np.nonzero(changes == -1)
+    lengths = ends - starts
+
+    # Masked values are stored run after run, so each run is one contiguous segment
+    peaks = np.zeros(len(rows), dtype=np.float64)
+    if len(rows):
+        offsets = np.r_[0, np.cumsum(lengths)[:-1]]
+        peaks = np.maximum.reduceat(matrix[mask], offsets)
+
+    return pd.DataFrame(
+        {
+            "Label": allocation_matrix["index"][rows],
+            "Start": dates[starts],
+            "End": dates[ends - 1],
+            "Days": lengths,
+            "Peak Allocation": peaks,
+        }
+    )
+
+
+def expand_group_allocations(
+    gantt_data: pd.DataFrame, index: Dict[str, Any], keep_aggregates: bool = False
+) -> pd.DataFrame:
+    """
+    Distribute team and department allocations to the people they apply to.
+
+    Each member receives a copy of the group's allocation row with the same
+    period and percentage, so per-person load includes group work. Groups
+    without known members keep their aggregate row.
+
+    Args:
+        gantt_data: DataFrame containing Gantt chart data
+        index: Entity index (see build_entity_index) of the data behind
+            gantt_data
+        keep_aggregates: Whether to keep the team and department rows as well
+
+    Returns:
+        Gantt data in the original row order with an "Allocated Via" column
+        naming the group a member row was expanded from (None otherwise)
+    """
+    gantt_data = gantt_data.reset_index(drop=True)
+    members = gantt_data["Resource"].map(index["group_members"])
+    is_group = gantt_data["Type"].isin(["Team", "Department"]) & (members.str.len() > 0)
+
+    result = gantt_data.assign(**{"Allocated Via": None})
+    if not is_group.any():
+        return result
+
+    # One row per (allocation, member) from the precomputed membership lists
+    expanded = (
+        result[is_group]
+        .assign(**{"Allocated Via": gantt_data["Resource"][is_group]})
+        .assign(Resource=members[is_group])
+        .explode("Resource")
+    )
+    expanded["Type"] = "Person"
+    expanded["Department"] = expanded["Resource"].map(index["person_department"])
+    expanded["Team"] = expanded["Resource"].map(index["person_team"])
+
+    # Rows keep the index of the allocation they came from, so a stable sort
+    # restores the original order with members right after their group row
+    kept = result if keep_aggregates else result[~is_group]
+    combined = pd.concat([kept, expanded]).sort_index(kind="stable")
+    return combined.reset_index(drop=True)
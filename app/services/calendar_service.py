@@ -0,0 +1,200 @@
+"""
+Work calendar service for the resource management application.
+
+This module provides working-day masks per distinct work pattern, so capacity
+and utilization can be measured in working days and hours instead of
+calendar days.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional, Sequence
+from app.services.config_service import load_work_schedule_settings
+from app.utils.index_utils import get_entity_index
+
+WEEKDAY_NUMBERS = {
+    "MO": 0,
+    "TU": 1,
+    "WE": 2,
+    "TH": 3,
+    "FR": 4,
+    "SA": 5,
+    "SU": 6,
+    "Monday": 0,
+    "Tuesday": 1,
+    "Wednesday": 2,
+    "Thursday": 3,
+    "Friday": 4,
+    "Saturday": 5,
+    "Sunday": 6,
+}
+
+
+def work_days_to_pattern(work_days: Sequence[str]) -> int:
+    """
+    Convert a list of work days into a 7-bit weekday pattern.
+
+    Args:
+        work_days: Day names or codes (e.g. ["MO", "TU"] or ["Monday"])
+
+    Returns:
+        Integer with bit n set when weekday n (Monday = 0) is a working day
+    """
+    pattern = 0
+    for day in work_days or []:
+        if day in WEEKDAY_NUMBERS:
+            pattern |= 1 << WEEKDAY_NUMBERS[day]
+    return pattern
+
+
+def build_pattern_masks(patterns: np.ndarray, dates: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Build a working-day mask for each weekday pattern.
+
+    Args:
+        patterns: Array of distinct 7-bit weekday patterns
+        dates: Days the masks cover
+
+    Returns:
+        Boolean array of shape (len(patterns), len(dates))
+    """
+    weekdays = dates.weekday.to_numpy()
+    return ((patterns[:, None] >> weekdays[None, :]) & 1).astype(bool)
+
+
+def _resource_schedules(
+    resources: Sequence[str], index: Dict[str, Any]
+) -> Dict[str, np.ndarray]:
+    """
+    Look up the weekday pattern and daily hours of each resource.
+
+    People use their own work_days (the default schedule when they have
+    none) and daily_work_hours. Teams and
+    departments follow the default work schedule, with the combined daily
+    hours of their members.
+    """
+    schedule = load_work_schedule_settings()
+    default_pattern = work_days_to_pattern(schedule.get("work_days", []))
+    default_hours = float(schedule.get("work_hours", 8.0))
+
+    people = index["people"]
+
+    def person_hours(name: str) -> float:
+        return float(people[name].get("daily_work_hours", default_hours))
+
+    patterns = np.full(len(resources), default_pattern, dtype=np.int64)
+    hours = np.full(len(resources), default_hours, dtype=np.float64)
+    for i, name in enumerate(resources):
+        resource_type = index["resource_types"].get(name)
+        if resource_type == "Person":
+            person = people[name]
+            # People without work days follow the default schedule
+            if person.get("work_days"):
+                patterns[i] = work_days_to_pattern(person["work_days"])
+            hours[i] = person_hours(name)
+        elif resource_type == "Team":
+            members = [m for m in index["team_members"].get(name, []) if m in people]
+            if members:
+                hours[i] = sum(person_hours(member) for member in members)
+        elif resource_type == "Department":
+            members = index["department_people"].get(name, [])
+            if members:
+                hours[i] = sum(person_hours(member) for member in members)
+    return {"patterns": patterns, "hours": hours}
+
+
+def build_work_calendar(
+    resources: Sequence[str],
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    data: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the work calendar of a set of resources over a date range.
+
+    A mask is computed once per distinct work pattern and shared by every
+    resource with that pattern.
+
+    Args:
+        resources: Resource names
+        start_date: First day of the calendar
+        end_date: Last day of the calendar
+        data: Data dictionary the resources come from (defaults to the
+            session data)
+
+    Returns:
+        Dictionary with "resources", "dates", "first_day" (day number of the
+        first date), "pattern_masks" (one boolean row per distinct pattern),
+        "cumulative_working_days" (per pattern, working days before each day
+        offset, one column longer than the dates), "resource_patterns" (row
+        of each resource in the pattern arrays) and "daily_hours" (per
+        resource)
+    """
+    dates = pd.date_range(
+        start=pd.Timestamp(start_date).normalize(),
+        end=pd.Timestamp(end_date).normalize(),
+    )
+    schedules = _resource_schedules(resources, get_entity_index(data))
+    patterns, resource_patterns = np.unique(schedules["patterns"], return_inverse=True)
+    pattern_masks = build_pattern_masks(patterns, dates)
+    cumulative = np.zeros((len(patterns), len(dates) + 1), dtype=np.int64)
+    np.cumsum(pattern_masks, axis=1, out=cumulative[:, 1:])
+
+    return {
+        "resources": pd.Index(resources),
+        "dates": dates,
+        "first_day": int(np.datetime64(dates[0], "D").astype(np.int64))
+        if len(dates)
+        else 0,
+        "pattern_masks": pattern_masks,
+        "cumulative_working_days": cumulative,
+        "resource_patterns": resource_patterns.reshape(-1),
+        "daily_hours": schedules["hours"],
+    }
+
+
+def get_working_day_mask(
+    calendar: Dict[str, Any], resources: Optional[Sequence[str]] = None
+) -> np.ndarray:
+    """
+    Get the working-day mask of resources from a work calendar.
+
+    Args:
+        calendar: Work calendar from build_work_calendar
+        resources: Resource names (defaults to all resources of the calendar)
+
+    Returns:
+        Boolean array of shape (len(resources), len(calendar["dates"]))
+    """
+    rows = calendar["resource_patterns"]
+    if resources is not None:
+        rows = rows[calendar["resources"].get_indexer(resources)]
+    return calendar["pattern_masks"][rows]
+
+
+def count_working_days(
+    calendar: Dict[str, Any],
+    resource_rows: np.ndarray,
+    first_days: np.ndarray,
+    end_days: np.ndarray,
+) -> np.ndarray:
+    """
+    Count the working days of resources between pairs of day numbers.
+
+    Days outside the calendar are not counted.
+
+    Args:
+        calendar: Work calendar from build_work_calendar
+        resource_rows: Position of each resource in calendar["resources"]
+        first_days: First day number of each range (inclusive)
+        end_days: Day number after each range (exclusive)
+
+    Returns:
+        Array with the number of working days in each range
+    """
+    cumulative = calendar["cumulative_working_days"]
+    n_days = cumulative.shape[1] - 1
+    patterns = calendar["resource_patterns"][resource_rows]
+    first = np.clip(first_days - calendar["first_day"], 0, n_days)
+    end = np.clip(end_days - calendar["first_day"], 0, n_days)
+    return cumulative[patterns, end] - cumulative[patterns, first]
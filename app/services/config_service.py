@@ -5,37 +5,106 @@ This module handles loading, saving, and accessing application configuration.
 """
 
 import os
-import json
-from typing import Dict, List, Any, Tuple
+import copy
+import threading
+from typing import Dict, List, Any, Optional, Tuple
 import streamlit as st
 import plotly.express as px
+from app.utils.file_utils import (
+    atomic_write_json,
+    create_backup,
+    load_json_with_recovery,
+)
+from app.utils.instrumentation_utils import increment_counter
 
 SETTINGS_FILE = "settings.json"
+DEFAULT_BACKUP_SETTINGS = {"enabled": True, "keep": 5, "min_interval_minutes": 10}
+DEFAULT_JOURNAL_SETTINGS = {"enabled": True, "compact_after": 500}
 
+# Process-wide settings cache shared by all sessions, keyed by file signature
+_settings_cache: Dict[str, Any] = {"signature": None, "settings": None}
+_settings_lock = threading.Lock()
 
-def load_settings() -> Dict[str, Any]:
-    """Load settings from the settings file with error handling."""
+
+def _get_settings_signature() -> Optional[Tuple[int, int]]:
+    """Get the modification time and size of the settings file, if it exists."""
     try:
-        if os.path.exists(SETTINGS_FILE):
-            with open(SETTINGS_FILE, "r") as file:
-                return json.load(file)
-        else:
+        stat = os.stat(SETTINGS_FILE)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _get_cached_settings() -> Dict[str, Any]:
+    """
+    Get the shared settings dictionary, re-reading the file only when its
+    modification time or size has changed.
+
+    The returned dictionary is shared and must not be modified.
+    """
+    signature = _get_settings_signature()
+    with _settings_lock:
+        if (
+            signature is not None
+            and _settings_cache["settings"] is not None
+            and _settings_cache["signature"] == signature
+        ):
+            return _settings_cache["settings"]
+
+    try:
+        if signature is None:
             # File doesn't exist, create default settings
             settings = _create_default_settings()
             save_settings(settings)
             return settings
+
+        settings = load_json_with_recovery(SETTINGS_FILE)
+        increment_counter("settings_file_reads")
+        with _settings_lock:
+            _settings_cache["signature"] = signature
+            _settings_cache["settings"] = settings
+        return settings
     except Exception as e:
         st.error(f"Error loading settings: {str(e)}")
         return _create_default_settings()
 
 
+def load_settings() -> Dict[str, Any]:
+    """Load settings from the settings cache (a copy safe to modify)."""
+    return copy.deepcopy(_get_cached_settings())
+
+
+def get_setting(key: str, default: Any = None) -> Any:
+    """
+    Get a single top-level setting from the settings cache.
+
+    Args:
+        key: Name of the setting
+        default: Value to return if the setting is missing
+
+    Returns:
+        A copy of the setting value, safe to modify
+    """
+    return copy.deepcopy(_get_cached_settings().get(key, default))
+
+
 def save_settings(settings: Dict[str, Any]) -> None:
     """Save settings to the settings file with error handling."""
     try:
-        with open(SETTINGS_FILE, "w") as file:
-            json.dump(settings, file, indent=4)
+        backups = {**DEFAULT_BACKUP_SETTINGS, **settings.get("backups", {})}
+        if backups["enabled"]:
+            create_backup(
+                SETTINGS_FILE, backups["keep"], backups["min_interval_minutes"]
+            )
+        atomic_write_json(SETTINGS_FILE, settings)
+        with _settings_lock:
+            _settings_cache["signature"] = _get_settings_signature()
+            _settings_cache["settings"] = copy.deepcopy(settings)
     except Exception as e:
         st.error(f"Error saving settings: {str(e)}")
+        with _settings_lock:
+            _settings_cache["signature"] = None
+            _settings_cache["settings"] = None
 
 
 def _create_default_settings() -> Dict[str, Any]:
@@ -61,14 +130,21 @@ def _create_default_settings() -> Dict[str, Any]:
             "chart_height": 600,
         },
         "date_ranges": {"short": 30, "medium": 90, "long": 180},
+        "storage_backend": "json",
+        "instrumentation": {
+            "enabled": False,
+            "log_to_file": False,
+            "log_file": "instrumentation_log.jsonl",
+        },
+        "backups": dict(DEFAULT_BACKUP_SETTINGS),
+        "journal": dict(DEFAULT_JOURNAL_SETTINGS),
     }
 
 
 def load_currency_settings() -> Tuple[str, Dict[str, Any]]:
     """Load currency settings from the settings file."""
-    settings = load_settings()
-    currency = settings.get("currency", "EUR")
-    currency_format = settings.get(
+    currency = get_setting("currency", "EUR")
+    currency_format = get_setting(
         "currency_format", {"symbol_position": "prefix", "decimal_places": 2}
     )
     return currency, currency_format
@@ -84,8 +160,7 @@ def save_currency_settings(currency: str, currency_format: Dict[str, Any]) -> No
 
 def load_department_colors() -> Dict[str, str]:
     """Load department colors from the settings file."""
-    settings = load_settings()
-    return settings.get("department_colors", {})
+    return get_setting("department_colors", {})
 
 
 def save_department_colors(colors: Dict[str, str]) -> None:
@@ -191,19 +266,28 @@ def get_department_color(department_name: str, default_color: str = "#cccccc") -
     Returns:
         Hex color code for the department
     """
-    department_colors = load_department_colors()
+    department_colors = _get_cached_settings().get("department_colors", {})
     return department_colors.get(department_name, default_color)
 
 
 def load_display_preferences() -> Dict[str, Any]:
     """Load display preferences from the settings file."""
-    settings = load_settings()
-    return settings.get(
+    return get_setting(
         "display_preferences",
         {"page_size": 10, "default_view": "Cards", "chart_height": 600},
     )
 
 
+def get_chart_height() -> int:
+    """Get the chart height in pixels from the display preferences."""
+    return int(load_display_preferences().get("chart_height", 600))
+
+
+def get_page_size() -> int:
+    """Get the number of rows per page from the display preferences."""
+    return int(load_display_preferences().get("page_size", 10))
+
+
 def save_display_preferences(preferences: Dict[str, Any]) -> None:
     """Save display preferences to the settings file."""
     settings = load_settings()
@@ -213,8 +297,7 @@ def save_display_preferences(preferences: Dict[str, Any]) -> None:
 
 def load_utilization_thresholds() -> Dict[str, int]:
     """Load utilization thresholds from the settings file."""
-    settings = load_settings()
-    return settings.get("utilization_thresholds", {"under": 50, "over": 100})
+    return get_setting("utilization_thresholds", {"under": 50, "over": 100})
 
 
 def save_utilization_thresholds(thresholds: Dict[str, int]) -> None:
@@ -226,8 +309,7 @@ def save_utilization_thresholds(thresholds: Dict[str, int]) -> None:
 
 def load_daily_cost_settings() -> float:
     """Load maximum daily cost setting from the settings file."""
-    settings = load_settings()
-    return settings.get("max_daily_cost", 2000.0)
+    return get_setting("max_daily_cost", 2000.0)
 
 
 def save_daily_cost_settings(max_daily_cost: float) -> None:
@@ -239,8 +321,7 @@ def save_daily_cost_settings(max_daily_cost: float) -> None:
 
 def load_work_schedule_settings() -> Dict[str, Any]:
     """Load default work schedule settings from the settings file."""
-    settings = load_settings()
-    return settings.get(
+    return get_setting(
         "work_schedule",
         {
             "work_days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
@@ -258,8 +339,7 @@ def save_work_schedule_settings(work_schedule: Dict[str, Any]) -> None:
 
 def load_date_range_settings() -> Dict[str, int]:
     """Load default date range settings from the settings file."""
-    settings = load_settings()
-    return settings.get("date_ranges", {"short": 30, "medium": 90, "long": 180})
+    return get_setting("date_ranges", {"short": 30, "medium": 90, "long": 180})
 
 
 def save_date_range_settings(date_ranges: Dict[str, int]) -> None:
@@ -269,10 +349,63 @@ def save_date_range_settings(date_ranges: Dict[str, int]) -> None:
     save_settings(settings)
 
 
+def load_storage_backend() -> str:
+    """Load the name of the resource data storage backend from settings."""
+    return get_setting("storage_backend", "json")
+
+
+def save_storage_backend(backend: str) -> None:
+    """Save the name of the resource data storage backend to settings."""
+    settings = load_settings()
+    settings["storage_backend"] = backend
+    save_settings(settings)
+
+
+def load_instrumentation_settings() -> Dict[str, Any]:
+    """Load performance instrumentation settings from the settings file."""
+    instrumentation = {
+        "enabled": False,
+        "log_to_file": False,
+        "log_file": "instrumentation_log.jsonl",
+    }
+    instrumentation.update(get_setting("instrumentation", {}))
+    return instrumentation
+
+
+def save_instrumentation_settings(instrumentation: Dict[str, Any]) -> None:
+    """Save performance instrumentation settings to the settings file."""
+    settings = load_settings()
+    settings["instrumentation"] = instrumentation
+    save_settings(settings)
+
+
+def load_backup_settings() -> Dict[str, Any]:
+    """Load the rolling backup settings of the data and settings files."""
+    return {**DEFAULT_BACKUP_SETTINGS, **get_setting("backups", {})}
+
+
+def save_backup_settings(backups: Dict[str, Any]) -> None:
+    """Save the rolling backup settings to the settings file."""
+    settings = load_settings()
+    settings["backups"] = backups
+    save_settings(settings)
+
+
+def load_journal_settings() -> Dict[str, Any]:
+    """Load the change journal settings from the settings file."""
+    return {**DEFAULT_JOURNAL_SETTINGS, **get_setting("journal", {})}
+
+
+def save_journal_settings(journal: Dict[str, Any]) -> None:
+    """Save the change journal settings to the settings file."""
+    settings = load_settings()
+    settings["journal"] = journal
+    save_settings(settings)
+
+
 def load_heatmap_colorscale() -> List[List[Any]]:
     """Load heatmap colorscale from settings."""
-    settings = load_settings()
-    return settings.get(
+    return get_setting(
         "heatmap_colorscale",
         [
             [0.0, "#f0f2f6"],  # No allocation
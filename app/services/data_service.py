@@ -3,25 +3,64 @@ Data service for handling data loading, saving, and processing.
 """
 
 import json
-import base64
+import hashlib
 import streamlit as st
 import pandas as pd
 import numpy as np
 import os
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterator, Optional, Set, Tuple
 from app.services.config_service import (
-    load_display_preferences,
+    get_page_size,
     ensure_department_colors,
 )
+from app.services.allocation_service import (
+    calculate_allocation_totals,
+    build_allocation_matrix,
+    slice_allocation_matrix,
+    find_allocation_runs,
+    expand_group_allocations,
+    update_allocation_matrix,
+    parse_dates,
+)
+from app.services.calendar_service import build_work_calendar, get_working_day_mask
+from app.services.cost_service import calculate_project_costs
+from app.services.journal_service import clear_journal, load_with_journal_origin
+from app.services.snapshot_service import (
+    build_snapshot_gantt_data,
+    get_snapshot_tables,
+)
+from app.services.storage_service import JSON_DATA_FILE, get_storage_backend
+from app.services.store_service import (
+    ensure_private_data,
+    get_changes_since,
+    get_session_data_origin,
+    replace_session_data,
+    reset_store,
+)
+from app.utils.cache_utils import (
+    bump_data_revision,
+    get_changes_since_revision,
+    get_data_cache_token,
+    make_cache_key,
+    memoize_derived,
+)
+from app.utils.file_utils import load_json_with_recovery
+from app.utils.index_utils import get_entity_index
+from app.utils.instrumentation_utils import instrumented
 from app.utils.resource_utils import delete_resource
 
+# Days of daily capacity rows calculated at a time by iter_capacity_data
+CAPACITY_WINDOW_DAYS = 90
+
+# Flattened allocation tables produced by iter_allocation_export
+ALLOCATION_EXPORTS = ["capacity", "utilization", "conflicts"]
+
 
 def load_demo_data() -> Dict[str, List[Dict[str, Any]]]:
     """Load the demo data from the JSON file."""
     try:
-        with open("resource_data.json", "r") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+        return load_json_with_recovery("resource_data.json")
+    except (FileNotFoundError, ValueError) as e:
         st.error(f"Error loading demo data: {str(e)}")
         # Return minimal empty data structure
         return {
@@ -32,13 +71,20 @@ def load_demo_data() -> Dict[str, List[Dict[str, Any]]]:
         }
 
 
+@instrumented()
 def save_data(
-    data: Dict[str, List[Dict[str, Any]]], filename: str = "resource_data.json"
+    data: Dict[str, List[Dict[str, Any]]], filename: Optional[str] = None
 ) -> bool:
-    """Save data to a JSON file."""
+    """Save data with the configured storage backend."""
     try:
-        with open(filename, "w") as file:
-            json.dump(data, file, indent=4)
+        save = get_storage_backend()["save"]
+        if filename is None:
+            save(data)
+            # The snapshot now holds every change of the journal
+            clear_journal()
+            reset_store(data)
+        else:
+            save(data, filename)
         return True
     except Exception as e:
         st.error(f"Error saving data: {str(e)}")
@@ -54,17 +100,6 @@ def load_json(file) -> Dict[str, Any]:
         return {}
 
 
-def save_json(data: Dict[str, Any], filename: str) -> str:
-    """Save data as a downloadable JSON file."""
-    try:
-        json_str = json.dumps(data, indent=4)
-        b64 = base64.b64encode(json_str.encode()).decode()
-        return f'<a href="data:application/json;base64,{b64}" download="{filename}">Download {filename}</a>'
-    except Exception as e:
-        st.error(f"Error creating download link: {str(e)}")
-        return ""
-
-
 def check_data_integrity():
     """Check and fix data integrity issues."""
 
@@ -79,21 +114,28 @@ def check_data_integrity():
         st.warning(
             f"Found {len(invalid_teams)} teams with fewer than 2 members. These teams will be automatically removed."
         )
+        ensure_private_data()
         for team_name in invalid_teams:
             delete_resource(st.session_state.data["teams"], team_name, "team")
 
     # Check for resources assigned to non-existent departments
     valid_departments = {d["name"] for d in st.session_state.data["departments"]}
 
-    for person in st.session_state.data["people"]:
-        if person.get("department") not in valid_departments:
-            person["department"] = "Unassigned"
-
-    for team in st.session_state.data["teams"]:
-        if team.get("department") not in valid_departments:
-            team["department"] = "Unassigned"
+    reassigned = any(
+        resource.get("department") not in valid_departments
+        for resource_type in ("people", "teams")
+        for resource in st.session_state.data[resource_type]
+    )
+    if reassigned:
+        ensure_private_data()
+        for resource_type in ("people", "teams"):
+            for resource in st.session_state.data[resource_type]:
+                if resource.get("department") not in valid_departments:
+                    resource["department"] = "Unassigned"
+        bump_data_revision()
 
 
+@instrumented()
 def create_gantt_data(
     projects: List[Dict[str, Any]], resources: Dict[str, List[Dict[str, Any]]]
 ) -> pd.DataFrame:
@@ -108,12 +150,14 @@ def create_gantt_data(
         DataFrame containing Gantt chart data
     """
     gantt_data = []
+    # Resource types are looked up once per row, the index is built once
+    index = get_entity_index(resources)
 
     for project in projects:
         # Get project details
         project_name = project["name"]
-        project_start = pd.to_datetime(project["start_date"])
-        project_end = pd.to_datetime(project["end_date"])
+        project_start = project["start_date"]
+        project_end = project["end_date"]
         project_priority = project["priority"]
 
         # Get resource allocation details
@@ -123,7 +167,7 @@ def create_gantt_data(
         if not resource_allocations:
             for resource_name in project.get("assigned_resources", []):
                 resource_type, dept, team = _determine_resource_type(
-                    resource_name, resources
+                    resource_name, index
                 )
 
                 gantt_data.append(
@@ -144,10 +188,10 @@ def create_gantt_data(
             for allocation in resource_allocations:
                 resource_name = allocation["resource"]
                 resource_type, dept, team = _determine_resource_type(
-                    resource_name, resources
+                    resource_name, index
                 )
-                alloc_start = pd.to_datetime(allocation["start_date"])
-                alloc_end = pd.to_datetime(allocation["end_date"])
+                alloc_start = allocation["start_date"]
+                alloc_end = allocation["end_date"]
                 alloc_percentage = allocation["allocation_percentage"]
 
                 gantt_data.append(
@@ -180,55 +224,65 @@ def create_gantt_data(
             ]
         )
 
-    # Create a DataFrame and calculate duration
+    # Create a DataFrame, parse all dates at once and calculate duration
     df = pd.DataFrame(gantt_data)
+    df["Start"] = parse_dates(df["Start"])
+    df["End"] = parse_dates(df["End"])
     df["Duration"] = (df["End"] - df["Start"]).dt.days + 1
 
     return df
 
 
 def _determine_resource_type(
-    resource: str, data: Dict[str, List[Dict[str, Any]]]
+    resource: str, index: Dict[str, Any]
 ) -> Tuple[str, str, Optional[str]]:
     """
     Determine the type, department, and team of a resource.
 
     Args:
         resource: Resource name
-        data: Dictionary containing people, teams, and departments data
+        index: Entity index of the people, teams and departments (see
+            get_entity_index)
 
     Returns:
         Tuple of (resource_type, department, team)
     """
-    # Check if the resource is a person
-    for person in data["people"]:
-        if person["name"] == resource:
-            return (
-                "Person",
-                person.get("department", "Unknown"),
-                person.get("team", None),
-            )
+    resource_type = index["resource_types"].get(resource)
+
+    if resource_type == "Person":
+        person = index["people"][resource]
+        return (
+            "Person",
+            person.get("department", "Unknown"),
+            person.get("team", None),
+        )
 
-    # Check if the resource is a team
-    for team in data["teams"]:
-        if team["name"] == resource:
-            return "Team", team.get("department", "Unknown"), None
+    if resource_type == "Team":
+        return "Team", index["teams"][resource].get("department", "Unknown"), None
 
-    # Check if the resource is a department
-    for department in data["departments"]:
-        if department["name"] == resource:
-            return "Department", department["name"], None
+    if resource_type == "Department":
+        return "Department", resource, None
 
     # Default if resource is not found
     return "Unknown", "Unknown", None
 
 
-def calculate_resource_utilization(gantt_data: pd.DataFrame) -> pd.DataFrame:
+@instrumented()
+def calculate_resource_utilization(
+    gantt_data: pd.DataFrame,
+    start_date: Optional[pd.Timestamp] = None,
+    end_date: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
     """
     Calculate resource utilization from Gantt data.
 
+    Days are working days of each resource's work calendar, so weekends and
+    other days off count neither as capacity nor as allocation.
+
     Args:
         gantt_data: DataFrame containing Gantt chart data
+        start_date: Start of the period (defaults to the earliest start)
+        end_date: End of the period (defaults to the latest end)
 
     Returns:
         DataFrame with resource utilization metrics
@@ -241,137 +295,45 @@ def calculate_resource_utilization(gantt_data: pd.DataFrame) -> pd.DataFrame:
                 "Department",
                 "Total Days",
                 "Allocated Days",
+                "Capacity Hours",
+                "Allocated Hours",
                 "Utilization %",
             ]
         )
 
     # Get the date range for the whole period
-    min_date = gantt_data["Start"].min()
-    max_date = gantt_data["End"].max()
-    total_days = (max_date - min_date).days + 1
-
-    # Create a result dataframe
-    resources = gantt_data["Resource"].unique()
-    result = []
-
-    for resource in resources:
-        resource_rows = gantt_data[gantt_data["Resource"] == resource]
-        resource_type = resource_rows["Type"].iloc[0]
-        department = resource_rows["Department"].iloc[0]
-
-        # Calculate allocation per day
-        daily_allocation = {}
-        for _, row in resource_rows.iterrows():
-            dates = pd.date_range(start=row["Start"], end=row["End"])
-            allocation = row["Allocation %"] / 100
-
-            for date in dates:
-                daily_allocation[date] = daily_allocation.get(date, 0) + allocation
-
-        # Calculate metrics
-        allocated_days = sum(min(alloc, 1) for alloc in daily_allocation.values())
-        over_allocated_days = sum(
-            max(alloc - 1, 0) for alloc in daily_allocation.values()
-        )
-        avg_allocation = allocated_days / total_days * 100
-        overallocation = over_allocated_days / total_days * 100
-
-        result.append(
-            {
-                "Resource": resource,
-                "Type": resource_type,
-                "Department": department,
-                "Total Days": total_days,
-                "Allocated Days": allocated_days,
-                "Utilization %": avg_allocation,
-                "Overallocation %": overallocation,
-            }
-        )
-
-    return pd.DataFrame(result)
-
-
-def calculate_project_cost(
-    project: Dict[str, Any], people: List[Dict[str, Any]], teams: List[Dict[str, Any]]
-) -> float:
-    """
-    Calculate the cost of a project based on assigned resources.
-
-    Args:
-        project: Project dictionary
-        people: List of people dictionaries
-        teams: List of team dictionaries
+    min_date = gantt_data["Start"].min() if start_date is None else start_date
+    max_date = gantt_data["End"].max() if end_date is None else end_date
 
-    Returns:
-        Total cost of the project
-    """
-    # Get project dates
-    start_date = pd.to_datetime(project["start_date"])
-    end_date = pd.to_datetime(project["end_date"])
-    duration_days = (end_date - start_date).days + 1
-
-    # Get resource allocations
-    resource_allocations = project.get("resource_allocations", [])
-
-    # If no specific allocations, use default 100% allocation for all resources
-    if not resource_allocations:
-        assigned_resources = project.get("assigned_resources", [])
-
-        total_cost = 0
-        for resource_name in assigned_resources:
-            # Calculate cost for a person
-            person = next((p for p in people if p["name"] == resource_name), None)
-            if person:
-                total_cost += person.get("daily_cost", 0) * duration_days
-                continue
-
-            # Calculate cost for a team
-            team = next((t for t in teams if t["name"] == resource_name), None)
-            if team:
-                team_cost = sum(
-                    person.get("daily_cost", 0)
-                    for person in people
-                    if person["name"] in team.get("members", [])
-                )
-                total_cost += team_cost * duration_days
-                # Note: We don't handle departments directly in cost calculations
-
-        return total_cost
-
-    # With specific allocations, calculate based on each allocation
-    total_cost = 0
-    for allocation in resource_allocations:
-        resource_name = allocation["resource"]
-        allocation_percentage = allocation["allocation_percentage"] / 100
-        alloc_start = pd.to_datetime(allocation["start_date"])
-        alloc_end = pd.to_datetime(allocation["end_date"])
-        alloc_duration_days = (alloc_end - alloc_start).days + 1
-
-        # Calculate cost for a person
-        person = next((p for p in people if p["name"] == resource_name), None)
-        if person:
-            resource_cost = (
-                person.get("daily_cost", 0)
-                * alloc_duration_days
-                * allocation_percentage
-            )
-            total_cost += resource_cost
-            continue
-
-        # Calculate cost for a team
-        team = next((t for t in teams if t["name"] == resource_name), None)
-        if team:
-            team_daily_cost = sum(
-                person.get("daily_cost", 0)
-                for person in people
-                if person["name"] in team.get("members", [])
-            )
-            resource_cost = (
-                team_daily_cost * alloc_duration_days * allocation_percentage
-            )
-            total_cost += resource_cost
+    # Type and department come from the first row of each resource
+    first_rows = gantt_data.drop_duplicates(subset="Resource")
+    resources = first_rows["Resource"].to_numpy()
+    calendar = build_work_calendar(resources, min_date, max_date)
+    totals = calculate_allocation_totals(gantt_data, calendar)
 
-    return total_cost
+    working_days = calendar["cumulative_working_days"][
+        calendar["resource_patterns"], -1
+    ]
+    daily_hours = calendar["daily_hours"]
+    allocated_days = totals["Allocated Days"].to_numpy()
+    overallocated_days = totals["Overallocated Days"].to_numpy()
+
+    # Resources without working days in the period have no capacity to use
+    divisor = np.where(working_days > 0, working_days, np.inf)
+
+    return pd.DataFrame(
+        {
+            "Resource": resources,
+            "Type": first_rows["Type"].to_numpy(),
+            "Department": first_rows["Department"].to_numpy(),
+            "Total Days": working_days,
+            "Allocated Days": allocated_days,
+            "Capacity Hours": working_days * daily_hours,
+            "Allocated Hours": allocated_days * daily_hours,
+            "Utilization %": allocated_days / divisor * 100,
+            "Overallocation %": overallocated_days / divisor * 100,
+        }
+    )
 
 
 def parse_resources(resources: List[str]) -> Tuple[List[str], List[str], List[str]]:
@@ -397,8 +359,12 @@ def parse_resources(resources: List[str]) -> Tuple[List[str], List[str], List[st
     return people, teams, departments
 
 
+@instrumented()
 def calculate_capacity_data(
-    filtered_data: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp
+    filtered_data: pd.DataFrame,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    allocation_matrix: Optional[Dict[str, Any]] = None,
 ) -> pd.DataFrame:
     """
     Calculate daily capacity data for each resource in the given date range.
@@ -407,104 +373,88 @@ def calculate_capacity_data(
         filtered_data: Filtered DataFrame containing resource assignments
         start_date: Start date to calculate from
         end_date: End date to calculate to
+        allocation_matrix: Optional precomputed allocation matrix for filtered_data
 
     Returns:
-        DataFrame with daily capacity data for each resource
+        DataFrame with daily capacity data for each resource, with Resource,
+        Department, Team and Type columns and the working day flag, capacity
+        hours and allocated hours of each resource per day. The string columns
+        are categorical unless they have missing values, which are None (e.g.
+        the Team of departments and of people without a team)
     """
     if filtered_data.empty or start_date is None or end_date is None:
         return pd.DataFrame()
 
-    # Create list to hold capacity data rows
-    capacity_rows = []
-
-    # Create date range
-    date_range = pd.date_range(start=start_date, end=end_date)
-
-    # Get unique resources
-    resources = filtered_data["Resource"].unique()
-
-    # Create a team lookup dictionary from the source data
-    team_lookup = {}
-    for person in st.session_state.data.get("people", []):
-        if person.get("team"):
-            team_lookup[person["name"]] = person["team"]
-
-    # Create a lookup table for resource attributes
-    resource_attributes = {}
-    for resource in resources:
-        resource_info = filtered_data[filtered_data["Resource"] == resource]
-        if not resource_info.empty:
-            resource_type = (
-                resource_info["Type"].iloc[0]
-                if "Type" in resource_info.columns
-                else None
-            )
-
-            # Determine team value based on resource type and source data
-            if resource_type == "Team":
-                # For Team resources, set Team to their own name
-                team = resource
-            elif resource_type == "Person":
-                # For Person resources, first check the team lookup (source data)
-                team = team_lookup.get(resource)
-
-                # If not found in lookup, fall back to filtered_data
-                if team is None and "Team" in resource_info.columns:
-                    team = resource_info["Team"].iloc[0]
-            else:
-                # For other resource types, use what's in the filtered data
-                team = (
-                    resource_info["Team"].iloc[0]
-                    if "Team" in resource_info.columns
-                    else None
-                )
-
-            department = (
-                resource_info["Department"].iloc[0]
-                if "Department" in resource_info.columns
-                else None
-            )
+    # Attributes of each resource come from its first row
+    first_rows = filtered_data.drop_duplicates(subset="Resource")
+    resources = first_rows["Resource"].to_numpy()
+
+    def first_values(column: str) -> pd.Series:
+        if column not in first_rows.columns:
+            return pd.Series(None, index=first_rows.index, dtype=object)
+        return first_rows[column].astype(object)
+
+    resource_types = first_values("Type")
+    departments = first_values("Department")
+    teams = first_values("Team")
+
+    # People take their team from the source data when it is known, and
+    # team resources are their own team
+    team_lookup = pd.Series(
+        {
+            name: team
+            for name, team in get_entity_index()["person_team"].items()
+            if team
+        },
+        dtype=object,
+    )
+    person_teams = first_rows["Resource"].map(team_lookup)
+    teams = teams.where(
+        ~((resource_types == "Person") & person_teams.notna()), person_teams
+    )
+    teams = teams.where(resource_types != "Team", first_rows["Resource"])
 
-            # Store all attributes for each resource
-            resource_attributes[resource] = {
-                "Department": department,
-                "Team": team,
-                "Type": resource_type,
-            }
+    # Read the requested window from the allocation matrix
+    if allocation_matrix is None:
+        allocation_matrix = build_allocation_matrix(filtered_data)
+    window = slice_allocation_matrix(
+        allocation_matrix, list(resources), start_date, end_date
+    )
+    dates = window["dates"]
+
+    # Rows are ordered by date, then by resource
+    def repeat_per_date(values: np.ndarray) -> Any:
+        missing = pd.isna(values)
+        if missing.any():
+            # Categoricals hold missing values as NaN, keep None instead
+            return np.tile(np.where(missing, None, values), len(dates))
+        per_resource = pd.Categorical(values)
+        return pd.Categorical.from_codes(
+            np.tile(per_resource.codes, len(dates)), dtype=per_resource.dtype
+        )
 
-    # For each resource and date, calculate allocation
-    for date in date_range:
-        for resource in resources:
-            # Filter assignments for this resource on this date
-            assignments = filtered_data[
-                (filtered_data["Resource"] == resource)
-                & (filtered_data["Start"] <= date)
-                & (filtered_data["End"] >= date)
-            ]
+    # Working days and hours come from one mask per distinct work pattern
+    calendar = build_work_calendar(resources, start_date, end_date)
+    working_days = get_working_day_mask(calendar).T.ravel()
+    allocation = window["matrix"].T.ravel()
+    capacity_hours = np.where(
+        working_days, np.tile(calendar["daily_hours"], len(dates)), 0.0
+    )
 
-            # Calculate allocation for this resource on this date
-            if not assignments.empty:
-                # Sum all allocations for this resource on this date
-                allocation = assignments["Allocation %"].sum()
-            else:
-                # No assignments for this resource on this date
-                allocation = 0
-
-            # Add row to capacity data - use the lookup table to ensure we have all attributes
-            attrs = resource_attributes.get(resource, {})
-            capacity_rows.append(
-                {
-                    "Date": date,
-                    "Resource": resource,
-                    "Allocation": allocation,
-                    "Department": attrs.get("Department"),
-                    "Team": attrs.get("Team"),
-                    "Type": attrs.get("Type"),
-                }
-            )
+    capacity_df = pd.DataFrame(
+        {
+            "Date": np.repeat(dates, len(resources)),
+            "Resource": repeat_per_date(resources),
+            "Allocation": allocation,
+            "Department": repeat_per_date(departments.to_numpy()),
+            "Team": repeat_per_date(teams.to_numpy()),
+            "Type": repeat_per_date(resource_types.to_numpy()),
+            "Working Day": working_days,
+            "Capacity Hours": capacity_hours,
+            "Allocated Hours": capacity_hours * allocation / 100,
+        }
+    )
 
-    # Create DataFrame from rows
-    capacity_df = pd.DataFrame(capacity_rows)
     return capacity_df
 
 
@@ -589,6 +539,584 @@ def sort_projects_by_priority_and_date(
     )
 
 
+def _content_signature(value: Any) -> str:
+    """Create a digest of a JSON-like value to detect changes between revisions."""
+    text = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _order_by_projects(gantt_data: pd.DataFrame, names: List[str]) -> pd.DataFrame:
+    """Order Gantt rows by the position of their project in names (stable)."""
+    positions = gantt_data["Project"].map({name: i for i, name in enumerate(names)})
+    order = np.argsort(positions.to_numpy(), kind="stable")
+    return gantt_data.iloc[order].reset_index(drop=True)
+
+
+def _build_allocation_aggregates(
+    data: Dict[str, Any], origin: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Compute the allocation aggregates of the session data from scratch.
+
+    Data loaded from an Arrow snapshot (see get_session_data_origin) is read
+    from the snapshot columns, and the projects changed by the replayed
+    journal are applied on top, unless the journal changed resources.
+    """
+    tables = None
+    if origin is not None and not any(
+        origin["changes"].get(resource_type)
+        for resource_type in ["people", "teams", "departments"]
+    ):
+        tables = get_snapshot_tables(origin["snapshot"])
+    if tables is not None:
+        gantt_data = build_snapshot_gantt_data(tables)
+    else:
+        gantt_data = create_gantt_data(data["projects"], data)
+    aggregates = {
+        "gantt": gantt_data,
+        "matrix": build_allocation_matrix(gantt_data),
+        "utilization": calculate_resource_utilization(gantt_data),
+        "project_costs": calculate_project_costs(
+            data["projects"], data["people"], data["teams"]
+        ).to_dict(),
+    }
+
+    journaled = origin["changes"].get("projects") if tables is not None else None
+    if journaled:
+        names = {project["name"] for project in data["projects"]}
+        aggregates = _apply_project_changes(
+            aggregates,
+            data,
+            [name for name in journaled if name in names],
+            [name for name in journaled if name not in names],
+        )
+    return aggregates
+
+
+def _apply_project_changes(
+    aggregates: Dict[str, Any],
+    data: Dict[str, Any],
+    changed: List[str],
+    removed: List[str],
+) -> Dict[str, Any]:
+    """
+    Update the allocation aggregates for changed and removed projects.
+
+    The rows of the affected projects are replaced in the Gantt data, their
+    old contribution is subtracted from the allocation matrix and the new one
+    added, and utilization is recomputed only for the affected resources.
+    """
+    projects = data["projects"]
+    names = [project["name"] for project in projects]
+    by_name = {project["name"]: project for project in projects}
+    gantt_data = aggregates["gantt"]
+
+    is_affected = gantt_data["Project"].isin(changed + removed)
+    old_rows = gantt_data[is_affected]
+    new_rows = create_gantt_data([by_name[name] for name in changed], data)
+    kept_rows = gantt_data[~is_affected]
+    if kept_rows.empty or new_rows.empty:
+        updated_gantt = new_rows if kept_rows.empty else kept_rows
+    else:
+        updated_gantt = pd.concat([kept_rows, new_rows])
+    updated_gantt = _order_by_projects(updated_gantt, names)
+    if updated_gantt.empty:
+        return _build_allocation_aggregates(data)
+
+    matrix = update_allocation_matrix(aggregates["matrix"], old_rows, new_rows)
+
+    # Utilization is recomputed for the affected resources while the overall
+    # period is unchanged, otherwise every resource's capacity has changed
+    utilization = aggregates["utilization"]
+    start_date = updated_gantt["Start"].min()
+    end_date = updated_gantt["End"].max()
+    if (
+        start_date != gantt_data["Start"].min()
+        or end_date != gantt_data["End"].max()
+        or utilization.empty
+    ):
+        utilization = calculate_resource_utilization(updated_gantt)
+    else:
+        affected = set(old_rows["Resource"]) | set(new_rows["Resource"])
+        affected_rows = updated_gantt[updated_gantt["Resource"].isin(affected)]
+        unaffected = utilization[~utilization["Resource"].isin(affected)]
+        if not affected_rows.empty:
+            unaffected = pd.concat(
+                [
+                    unaffected,
+                    calculate_resource_utilization(affected_rows, start_date, end_date),
+                ]
+            )
+        # Resources appear in order of their first Gantt row
+        utilization = (
+            unaffected.set_index("Resource")
+            .reindex(updated_gantt["Resource"].unique())
+            .reset_index()
+        )
+
+    project_costs = {
+        name: cost
+        for name, cost in aggregates["project_costs"].items()
+        if name not in removed
+    }
+    project_costs.update(
+        calculate_project_costs(
+            [by_name[name] for name in changed], data["people"], data["teams"]
+        ).to_dict()
+    )
+
+    return {
+        "gantt": updated_gantt,
+        "matrix": matrix,
+        "utilization": utilization,
+        "project_costs": project_costs,
+    }
+
+
+# Aggregates state of the shared data (see store_service). Versions of the
+# shared data are updated from each other, whichever session gets there first;
+# the aggregates themselves are never modified in place
+_shared_aggregates: Dict[str, Any] = {"state": None}
+
+
+def _get_changes_since_state(
+    state: Dict[str, Any], token: Tuple[str, int]
+) -> Optional[Dict[str, Set[str]]]:
+    """
+    Get the names of the records changed since the aggregates state.
+
+    Shared versions take them from the store log, session revisions from the
+    names passed to bump_data_revision.
+
+    Returns:
+        Changed names by resource type, or None if they are unknown
+    """
+    kind, previous = state["revision"]
+    if kind != token[0]:
+        return None
+    if kind == "shared":
+        records = get_changes_since(previous)
+        if records is None:
+            return None
+        changes: Dict[str, Set[str]] = {}
+        for record in records:
+            changes.setdefault(record["entity"], set()).add(record["name"])
+        return changes
+    return get_changes_since_revision(previous)
+
+
+def get_allocation_aggregates() -> Optional[Dict[str, Any]]:
+    """
+    Get the Gantt data, allocation matrix, resource utilization and project
+    costs of the session data, updated incrementally between revisions.
+
+    When only projects changed since the last call, just their rows are
+    recomputed and applied as a delta; any change to people, teams or
+    departments rebuilds everything. The changed projects are known from the
+    names passed to bump_data_revision (or the store log for shared data);
+    only changes that were not itemized fall back to comparing content
+    signatures of all records. Sessions viewing the shared data share one set
+    of aggregates.
+
+    Returns:
+        Dictionary with "gantt", "matrix", "utilization" and "project_costs"
+        (project name -> cost), or None if project names are not unique
+    """
+    data = st.session_state.data
+    token = get_data_cache_token()
+    shared = token[0] == "shared"
+    if shared:
+        state = _shared_aggregates["state"]
+    else:
+        state = st.session_state.get("allocation_aggregates")
+        if state is not None and state["data_id"] != id(data):
+            state = None
+    if state is not None and state["revision"] == token:
+        return state["aggregates"]
+
+    names = [project["name"] for project in data["projects"]]
+    if len(set(names)) != len(names):
+        _set_aggregates_state(shared, None)
+        return None
+
+    changes = None if state is None else _get_changes_since_state(state, token)
+    previous = None if state is None else state["project_signatures"]
+    if changes is not None:
+        # Only the changed projects are signed again
+        changed_projects = changes.get("projects", set())
+        by_name = {project["name"]: project for project in data["projects"]}
+        project_signatures = {
+            name: (
+                _content_signature(by_name[name])
+                if name in changed_projects
+                else previous.get(name)
+            )
+            for name in names
+        }
+        if None in project_signatures.values():
+            changes = None
+        elif any(changes.get(key) for key in ["people", "teams", "departments"]):
+            resources_signature = None
+        else:
+            resources_signature = state["resources_signature"]
+    if changes is None:
+        project_signatures = {
+            project["name"]: _content_signature(project) for project in data["projects"]
+        }
+        resources_signature = None
+    if resources_signature is None:
+        resources_signature = _content_signature(
+            [data.get("people", []), data.get("teams", []), data.get("departments", [])]
+        )
+
+    if state is None or state["resources_signature"] != resources_signature:
+        aggregates = _build_allocation_aggregates(data, get_session_data_origin())
+    else:
+        changed = [
+            name
+            for name, signature in project_signatures.items()
+            if previous.get(name) != signature
+        ]
+        removed = [name for name in previous if name not in project_signatures]
+        aggregates = state["aggregates"]
+        if changed or removed:
+            aggregates = _apply_project_changes(aggregates, data, changed, removed)
+        elif list(previous) != list(project_signatures):
+            # Only the project order changed
+            aggregates = dict(
+                aggregates,
+                gantt=_order_by_projects(aggregates["gantt"], list(project_signatures)),
+            )
+
+    _set_aggregates_state(
+        shared,
+        {
+            "data_id": id(data),
+            "revision": token,
+            "project_signatures": project_signatures,
+            "resources_signature": resources_signature,
+            "aggregates": aggregates,
+        },
+    )
+    return aggregates
+
+
+def _set_aggregates_state(shared: bool, state: Optional[Dict[str, Any]]) -> None:
+    """Keep the aggregates state for the shared data or in the session."""
+    if shared:
+        _shared_aggregates["state"] = state
+    else:
+        st.session_state.allocation_aggregates = state
+
+
+def get_cached_gantt_data(sort_by_priority: bool = False) -> pd.DataFrame:
+    """
+    Get the Gantt data of the session, memoized against the data revision.
+
+    Args:
+        sort_by_priority: Whether to order projects by priority and end date
+
+    Returns:
+        DataFrame containing Gantt chart data
+    """
+
+    def compute() -> pd.DataFrame:
+        projects = st.session_state.data["projects"]
+        if sort_by_priority:
+            projects = sort_projects_by_priority_and_date(projects)
+
+        aggregates = get_allocation_aggregates()
+        if aggregates is None:
+            return create_gantt_data(projects, st.session_state.data)
+        if not sort_by_priority:
+            return aggregates["gantt"]
+        return _order_by_projects(
+            aggregates["gantt"], [project["name"] for project in projects]
+        )
+
+    return memoize_derived("gantt", sort_by_priority, compute)
+
+
+def get_cached_expanded_gantt_data(
+    sort_by_priority: bool = False, keep_aggregates: bool = False
+) -> pd.DataFrame:
+    """
+    Get the Gantt data of the session with team and department allocations
+    distributed to their members, memoized against the data revision.
+
+    Args:
+        sort_by_priority: Whether to order projects by priority and end date
+        keep_aggregates: Whether to keep the team and department rows as well
+
+    Returns:
+        Expanded Gantt data (see expand_group_allocations)
+    """
+    return memoize_derived(
+        "expanded_gantt",
+        (sort_by_priority, keep_aggregates),
+        lambda: expand_group_allocations(
+            get_cached_gantt_data(sort_by_priority),
+            get_entity_index(),
+            keep_aggregates,
+        ),
+    )
+
+
+def get_cached_filtered_data(
+    filters: Dict[str, Any], sort_by_priority: bool = False
+) -> pd.DataFrame:
+    """
+    Get the filtered Gantt data of the session, memoized against the data
+    revision and the filters.
+
+    The "group_allocations" filter selects how team and department
+    allocations are shown: "Groups" (default) keeps them as single
+    resources, "Members" distributes them to their members and "Groups and
+    members" does both.
+
+    Args:
+        filters: Dictionary of filter conditions
+        sort_by_priority: Whether to order projects by priority and end date
+
+    Returns:
+        Filtered DataFrame
+    """
+
+    def compute() -> pd.DataFrame:
+        group_allocations = filters.get("group_allocations", "Groups")
+        if group_allocations == "Groups":
+            gantt_data = get_cached_gantt_data(sort_by_priority)
+        else:
+            gantt_data = get_cached_expanded_gantt_data(
+                sort_by_priority, group_allocations == "Groups and members"
+            )
+        return apply_filters(gantt_data, filters)
+
+    return memoize_derived(
+        "filtered", (make_cache_key(filters), sort_by_priority), compute
+    )
+
+
+def get_cached_resource_utilization(
+    filters: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Get the resource utilization of the session, memoized against the data
+    revision and the filters.
+
+    Args:
+        filters: Optional dictionary of filter conditions (defaults to all data)
+
+    Returns:
+        DataFrame with utilization metrics for each resource
+    """
+
+    def compute() -> pd.DataFrame:
+        if filters is None:
+            gantt_data = get_cached_gantt_data()
+        else:
+            gantt_data = get_cached_filtered_data(filters)
+        if gantt_data.empty:
+            return pd.DataFrame()
+
+        aggregates = get_allocation_aggregates()
+        if _selects_all_rows(filters, gantt_data, aggregates):
+            return aggregates["utilization"]
+        return calculate_resource_utilization(gantt_data)
+
+    return memoize_derived("utilization", make_cache_key(filters), compute)
+
+
+def _selects_all_rows(
+    filters: Optional[Dict[str, Any]],
+    filtered_data: pd.DataFrame,
+    aggregates: Optional[Dict[str, Any]],
+) -> bool:
+    """Check whether filtered Gantt data still holds every aggregate row."""
+    return (
+        aggregates is not None
+        and (filters or {}).get("group_allocations", "Groups") == "Groups"
+        and len(filtered_data) == len(aggregates["gantt"])
+    )
+
+
+def get_cached_project_costs() -> Dict[str, float]:
+    """
+    Get the cost of every project of the session, memoized against the data
+    revision and updated only for changed projects.
+
+    Returns:
+        Dictionary mapping project names to their costs
+    """
+
+    def compute() -> Dict[str, float]:
+        aggregates = get_allocation_aggregates()
+        if aggregates is not None:
+            return dict(aggregates["project_costs"])
+        data = st.session_state.data
+        return calculate_project_costs(
+            data["projects"], data["people"], data["teams"]
+        ).to_dict()
+
+    return memoize_derived("project_costs", None, compute)
+
+
+def get_cached_project_cost_series() -> pd.DataFrame:
+    """
+    Get the daily and cumulative cost of every project of the session,
+    memoized against the data revision.
+
+    Returns:
+        DataFrame with Project, Date, Daily Cost and Cumulative Cost columns
+    """
+
+    def compute() -> pd.DataFrame:
+        data = st.session_state.data
+        _, series = calculate_project_costs(
+            data["projects"], data["people"], data["teams"], daily_series=True
+        )
+        return series
+
+    return memoize_derived("project_cost_series", None, compute)
+
+
+def get_cached_allocation_matrix(
+    filters: Dict[str, Any], sort_by_priority: bool = False
+) -> Dict[str, Any]:
+    """
+    Get the allocation matrix of the filtered Gantt data, memoized against the
+    data revision and the filters.
+
+    Args:
+        filters: Dictionary of filter conditions
+        sort_by_priority: Whether to order projects by priority and end date
+
+    Returns:
+        Allocation matrix dictionary (see build_allocation_matrix)
+    """
+
+    def compute() -> Dict[str, Any]:
+        filtered_data = get_cached_filtered_data(filters, sort_by_priority)
+        valid_rows = filtered_data[filtered_data["End"] >= filtered_data["Start"]]
+        aggregates = get_allocation_aggregates()
+        if valid_rows.empty or not _selects_all_rows(
+            filters, filtered_data, aggregates
+        ):
+            return build_allocation_matrix(filtered_data)
+
+        # The incrementally updated matrix may hold extra rows and days
+        return slice_allocation_matrix(
+            aggregates["matrix"],
+            list(filtered_data["Resource"].unique()),
+            valid_rows["Start"].min(),
+            valid_rows["End"].max(),
+        )
+
+    return memoize_derived(
+        "allocation_matrix", (make_cache_key(filters), sort_by_priority), compute
+    )
+
+
+def get_cached_capacity_data(filters: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Get the daily capacity data for the filter date range, memoized against
+    the data revision and the filters.
+
+    Args:
+        filters: Dictionary of filter conditions including "date_range"
+
+    Returns:
+        DataFrame with daily capacity data for each resource
+    """
+
+    def compute() -> pd.DataFrame:
+        start_date, end_date = filters["date_range"][0], filters["date_range"][1]
+        return calculate_capacity_data(
+            get_cached_filtered_data(filters),
+            start_date,
+            end_date,
+            get_cached_allocation_matrix(filters),
+        )
+
+    return memoize_derived("capacity", make_cache_key(filters), compute)
+
+
+def iter_capacity_data(
+    filtered_data: pd.DataFrame,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    allocation_matrix: Optional[Dict[str, Any]] = None,
+    window_days: int = CAPACITY_WINDOW_DAYS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Calculate daily capacity data in consecutive date windows.
+
+    Concatenated, the windows equal calculate_capacity_data over the whole
+    range, but only one window of rows is held at a time.
+
+    Args:
+        filtered_data: Filtered DataFrame containing resource assignments
+        start_date: Start date to calculate from
+        end_date: End date to calculate to
+        allocation_matrix: Optional precomputed allocation matrix for filtered_data
+        window_days: Number of days per window
+
+    Yields:
+        Daily capacity DataFrames (see calculate_capacity_data)
+    """
+    if filtered_data.empty or start_date is None or end_date is None:
+        return
+    if allocation_matrix is None:
+        allocation_matrix = build_allocation_matrix(filtered_data)
+
+    start_date = pd.Timestamp(start_date).normalize()
+    end_date = pd.Timestamp(end_date).normalize()
+    for window_start in pd.date_range(start_date, end_date, freq=f"{window_days}D"):
+        window_end = min(window_start + pd.Timedelta(days=window_days - 1), end_date)
+        yield calculate_capacity_data(
+            filtered_data, window_start, window_end, allocation_matrix
+        )
+
+
+def iter_allocation_export(export_name: str) -> Iterator[pd.DataFrame]:
+    """
+    Produce a flattened allocation table of the session data in chunks.
+
+    Args:
+        export_name: Key of ALLOCATION_EXPORTS: "capacity" for one row per
+            resource and day over the whole allocation period, "utilization"
+            for one row per resource or "conflicts" for one row per merged
+            overallocation interval
+
+    Yields:
+        DataFrames whose concatenation is the requested table
+    """
+    # No filters selects all allocations, as the memoized views do
+    filters: Dict[str, Any] = {}
+    gantt_data = get_cached_filtered_data(filters)
+    if gantt_data.empty:
+        return
+
+    if export_name == "utilization":
+        yield get_cached_resource_utilization()
+        return
+
+    allocation_matrix = get_cached_allocation_matrix(filters)
+    if export_name == "conflicts":
+        yield find_resource_conflicts(
+            gantt_data, allocation_matrix=allocation_matrix, merge_intervals=True
+        )
+        return
+
+    valid_rows = gantt_data[gantt_data["End"] >= gantt_data["Start"]]
+    yield from iter_capacity_data(
+        gantt_data,
+        valid_rows["Start"].min(),
+        valid_rows["End"].max(),
+        allocation_matrix,
+    )
+
+
 def paginate_dataframe(
     df: pd.DataFrame, key_prefix: str, items_per_page: Optional[int] = None
 ) -> pd.DataFrame:
@@ -605,8 +1133,7 @@ def paginate_dataframe(
     """
     if items_per_page is None:
         # Get page size from settings
-        display_prefs = load_display_preferences()
-        items_per_page = display_prefs.get("page_size", 10)
+        items_per_page = get_page_size()
 
     # Initialize page number in session state if not exists
     if f"{key_prefix}_page" not in st.session_state:
@@ -643,6 +1170,7 @@ def paginate_dataframe(
     return df.iloc[start_idx:end_idx].reset_index(drop=True)
 
 
+@instrumented()
 def check_circular_dependencies():
     """
     Check for circular dependencies and other relationship issues in the data.
@@ -719,6 +1247,7 @@ def _build_dependency_graph():
     people = st.session_state.data["people"]
     teams = st.session_state.data["teams"]
     departments = st.session_state.data["departments"]
+    department_names = get_entity_index()["departments"]
 
     # Add person → team edges
     for person in people:
@@ -753,7 +1282,7 @@ def _build_dependency_graph():
         # Only add the edge if the department exists
         if dept_name and dept_name.strip():
             # Make sure the department exists in the departments list
-            if any(d["name"] == dept_name for d in departments):
+            if dept_name in department_names:
                 graph[team_name].append(dept_name)
 
     # Add department → team edges (for teams in departments)
@@ -850,19 +1379,8 @@ def get_resource_type(resource_name: str) -> str:
     Returns:
         Resource type ('person', 'team', 'department', or 'unknown')
     """
-    # Check if it's a person
-    if any(p["name"] == resource_name for p in st.session_state.data["people"]):
-        return "person"
-
-    # Check if it's a team
-    if any(t["name"] == resource_name for t in st.session_state.data["teams"]):
-        return "team"
-
-    # Check if it's a department
-    if any(d["name"] == resource_name for d in st.session_state.data["departments"]):
-        return "department"
-
-    return "unknown"
+    resource_type = get_entity_index()["resource_types"].get(resource_name)
+    return resource_type.lower() if resource_type else "unknown"
 
 
 def _apply_all_filters(
@@ -918,8 +1436,12 @@ def _apply_all_filters(
     return df
 
 
+@instrumented()
 def find_resource_conflicts(
-    gantt_data: pd.DataFrame, threshold: float = 1.0
+    gantt_data: pd.DataFrame,
+    threshold: float = 1.0,
+    allocation_matrix: Optional[Dict[str, Any]] = None,
+    merge_intervals: bool = False,
 ) -> pd.DataFrame:
     """
     Find resource allocation conflicts (overallocations).
@@ -927,69 +1449,149 @@ def find_resource_conflicts(
     Args:
         gantt_data: DataFrame containing Gantt chart data
         threshold: Allocation threshold above which a conflict is detected (default: 1.0)
+        allocation_matrix: Optional precomputed allocation matrix for gantt_data
+        merge_intervals: Return one row per run of consecutive overallocated days
+            (with Start, End, Days and Peak Allocation) instead of one row per day
 
     Returns:
         DataFrame with resource conflicts
     """
+    if merge_intervals:
+        columns = [
+            "Resource",
+            "Type",
+            "Department",
+            "Start",
+            "End",
+            "Days",
+            "Peak Allocation",
+            "Projects",
+        ]
+    else:
+        columns = ["Resource", "Type", "Department", "Date", "Allocation", "Projects"]
+
     if gantt_data.empty:
-        return pd.DataFrame(
-            columns=["Resource", "Type", "Department", "Date", "Allocation", "Projects"]
+        return pd.DataFrame(columns=columns)
+
+    # Daily allocation per resource between the min and max dates
+    if allocation_matrix is None:
+        allocation_matrix = build_allocation_matrix(gantt_data)
+    window = slice_allocation_matrix(
+        allocation_matrix,
+        list(gantt_data["Resource"].unique()),
+        gantt_data["Start"].min(),
+        gantt_data["End"].max(),
+    )
+    overallocated = window["matrix"] > threshold * 100
+
+    if merge_intervals:
+        runs = find_allocation_runs(window, overallocated)
+        conflicts = pd.DataFrame(
+            {
+                "Resource": runs["Label"],
+                "Start": runs["Start"],
+                "End": runs["End"],
+                "Days": runs["Days"],
+                "Peak Allocation": runs["Peak Allocation"],  # As percentage
+            }
+        )
+    else:
+        rows, days = np.nonzero(overallocated)
+        conflicts = pd.DataFrame(
+            {
+                "Resource": window["index"][rows],
+                "Date": window["dates"][days],
+                "Allocation": window["matrix"][rows, days],
+            }
         )
+        conflicts["Start"] = conflicts["Date"]
+        conflicts["End"] = conflicts["Date"]
+
+    if conflicts.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Type and department come from the first row of each resource
+    first_rows = gantt_data.drop_duplicates(subset="Resource").set_index("Resource")
+    conflicts["Type"] = conflicts["Resource"].map(first_rows["Type"])
+    conflicts["Department"] = conflicts["Resource"].map(first_rows["Department"])
+    conflicts["Projects"] = _join_overlapping_projects(
+        gantt_data, conflicts, unique=merge_intervals
+    )
 
-    # Get the min and max dates
-    min_date = gantt_data["Start"].min()
-    max_date = gantt_data["End"].max()
-
-    # Create a date range for all dates
-    dates = pd.date_range(start=min_date, end=max_date)
-    conflicts = []
-
-    # For each resource, check daily allocations
-    for resource in gantt_data["Resource"].unique():
-        resource_data = gantt_data[gantt_data["Resource"] == resource]
-        resource_type = resource_data["Type"].iloc[0]
-        department = resource_data["Department"].iloc[0]
-
-        # For each day, calculate total allocation and collect projects
-        for date in dates:
-            # Find allocations that include this date
-            allocations = resource_data[
-                (resource_data["Start"] <= date) & (resource_data["End"] >= date)
-            ]
-            total_allocation = allocations["Allocation %"].sum() / 100
+    return conflicts[columns]
 
-            # If allocation exceeds threshold, report as conflict
-            if total_allocation > threshold:
-                conflicts.append(
-                    {
-                        "Resource": resource,
-                        "Type": resource_type,
-                        "Department": department,
-                        "Date": date,
-                        "Allocation": total_allocation * 100,  # As percentage
-                        "Projects": ", ".join(allocations["Project"].tolist()),
-                    }
-                )
 
-    return pd.DataFrame(conflicts)
+def _join_overlapping_projects(
+    gantt_data: pd.DataFrame, periods: pd.DataFrame, unique: bool = False
+) -> np.ndarray:
+    """
+    Join the names of the projects allocated to a resource within each period.
 
+    Args:
+        gantt_data: DataFrame containing Gantt chart data
+        periods: DataFrame with Resource, Start and End columns
+        unique: Whether to list each project only once per period
 
-def load_data() -> Dict[str, List[Dict[str, Any]]]:
-    """Load data from the resource data file."""
+    Returns:
+        Array with a comma-separated project list for each period
+    """
+    allocations = pd.DataFrame(
+        {
+            "Resource": gantt_data["Resource"].to_numpy(),
+            "Project": gantt_data["Project"].to_numpy(),
+            "Allocation Start": gantt_data["Start"].dt.normalize().to_numpy(),
+            "Allocation End": gantt_data["End"].dt.normalize().to_numpy(),
+            "Row": np.arange(len(gantt_data)),
+        }
+    )
+    keyed_periods = pd.DataFrame(
+        {
+            "Resource": periods["Resource"].to_numpy(),
+            "Start": periods["Start"].to_numpy(),
+            "End": periods["End"].to_numpy(),
+            "Period": np.arange(len(periods)),
+        }
+    )
+
+    # Pair every period with the allocations of the same resource that overlap it
+    merged = keyed_periods.merge(allocations, on="Resource")
+    merged = merged[
+        (merged["Allocation Start"] <= merged["End"])
+        & (merged["Allocation End"] >= merged["Start"])
+        & (merged["Allocation End"] >= merged["Allocation Start"])
+    ].sort_values(["Period", "Row"])
+    if unique:
+        merged = merged.drop_duplicates(subset=["Period", "Project"])
+
+    projects = merged.groupby("Period")["Project"].agg(", ".join)
+    return projects.reindex(np.arange(len(periods)), fill_value="").to_numpy()
+
+
+@instrumented()
+def load_data_with_origin() -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[Dict]]:
+    """
+    Load data from the configured storage backend and its change journal,
+    together with its origin (see journal_service.load_with_journal_origin).
+    """
     try:
-        if os.path.exists("resource_data.json"):
-            with open("resource_data.json", "r") as file:
-                data = json.load(file)
-            ensure_department_colors(data.get("departments", []))
-            return data
-        else:
-            data = load_demo_data()
+        # The JSON file is migrated into the other backends on first load
+        stored = os.path.exists(get_storage_backend()["file"]) or os.path.exists(
+            JSON_DATA_FILE
+        )
+        data, origin = load_with_journal_origin()
+        if not stored:
+            data, origin = load_demo_data(), None
             save_data(data)
-            ensure_department_colors(data.get("departments", []))
-            return data
+        ensure_department_colors(data.get("departments", []))
+        return data, origin
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
-        return {"people": [], "teams": [], "departments": [], "projects": []}
+        return {"people": [], "teams": [], "departments": [], "projects": []}, None
+
+
+def load_data() -> Dict[str, List[Dict[str, Any]]]:
+    """Load data from the configured storage backend and its change journal."""
+    return load_data_with_origin()[0]
 
 
 def import_data(data: Dict[str, List[Dict[str, Any]]]) -> None:
@@ -1000,7 +1602,8 @@ def import_data(data: Dict[str, List[Dict[str, Any]]]) -> None:
         data: The data to import
     """
     save_data(data)
-    st.session_state.data = data
+    replace_session_data(data)
+    bump_data_revision()
 
     # Ensure all departments have colors assigned
 
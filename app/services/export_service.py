@@ -0,0 +1,336 @@
+"""
+Export service for the resource management application.
+
+This module provides streaming writers for exporting resource data as JSON,
+JSON Lines, CSV and Excel. Records are serialized in batches straight into
+the output file, so no DataFrame or in-memory copy of the whole export is
+built. Exports of several resource types to a one-table-per-file format are
+written as a ZIP archive with one file per resource type. Computed tables,
+such as daily capacity, are written to CSV or Parquet chunk by chunk.
+"""
+
+import csv
+import io
+import json
+import zipfile
+from typing import Dict, List, Any, BinaryIO, Iterable, Iterator
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from app.utils.instrumentation_utils import increment_counter, instrumented
+
+EXPORT_BATCH_SIZE = 1000
+# Number of DataFrame rows written at a time by write_frame_export
+FRAME_EXPORT_CHUNK_SIZE = 100000
+
+# File extension and MIME type of each export format
+EXPORT_FORMATS: Dict[str, Dict[str, str]] = {
+    "json": {"extension": ".json", "mime": "application/json"},
+    "jsonl": {"extension": ".jsonl", "mime": "application/jsonl"},
+    "csv": {"extension": ".csv", "mime": "text/csv"},
+    "excel": {
+        "extension": ".xlsx",
+        "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    },
+    "parquet": {"extension": ".parquet", "mime": "application/vnd.apache.parquet"},
+    "zip": {"extension": ".zip", "mime": "application/zip"},
+}
+
+
+def _batched(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Group items into lists of at most batch_size."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_json_export(
+    data: Dict[str, List[Dict[str, Any]]],
+    resource_types: List[str],
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[str]:
+    """
+    Serialize resource data as a JSON document in batches of records.
+
+    The document has the structure of resource_data.json, with one record
+    per line.
+
+    Args:
+        data: Resource data
+        resource_types: Resource types to export
+        batch_size: Number of records serialized at a time
+
+    Yields:
+        Consecutive parts of the JSON text
+    """
+    yield "{"
+    for i, resource_type in enumerate(resource_types):
+        yield f'{"," if i else ""}\n{json.dumps(resource_type)}: ['
+        separator = "\n"
+        for batch in _batched(data.get(resource_type, []), batch_size):
+            yield separator + ",\n".join(json.dumps(record) for record in batch)
+            separator = ",\n"
+            increment_counter("export_records", len(batch))
+        yield "\n]"
+    yield "\n}\n"
+
+
+def iter_jsonl_export(
+    records: List[Dict[str, Any]], batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Serialize records as JSON Lines in batches.
+
+    Args:
+        records: Records of one resource type
+        batch_size: Number of records serialized at a time
+
+    Yields:
+        Consecutive parts of the JSON Lines text
+    """
+    for batch in _batched(records, batch_size):
+        yield "".join(json.dumps(record) + "\n" for record in batch)
+        increment_counter("export_records", len(batch))
+
+
+def get_export_columns(records: Iterable[Dict[str, Any]]) -> List[str]:
+    """
+    Get the union of the record fields in order of first appearance.
+
+    Args:
+        records: Records of one resource type
+
+    Returns:
+        List of column names
+    """
+    columns: Dict[str, None] = {}
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns[key] = None
+    return list(columns)
+
+
+def format_export_value(value: Any) -> Any:
+    """
+    Convert a record value to a flat cell value.
+
+    Lists of names are joined with ";" (the separator the table import
+    splits on); nested objects are written as JSON.
+
+    Args:
+        value: Record value
+
+    Returns:
+        String, number, boolean or None
+    """
+    if isinstance(value, list):
+        if all(isinstance(item, str) for item in value):
+            return ";".join(value)
+        return json.dumps(value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+
+def iter_csv_export(
+    records: List[Dict[str, Any]], batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Serialize records as CSV in batches.
+
+    Args:
+        records: Records of one resource type
+        batch_size: Number of rows serialized at a time
+
+    Yields:
+        Consecutive parts of the CSV text, starting with the header
+    """
+    columns = get_export_columns(records)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in _batched(records, batch_size):
+        writer.writerows(
+            [format_export_value(record.get(column)) for column in columns]
+            for record in batch
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        increment_counter("export_records", len(batch))
+    yield buffer.getvalue()
+
+
+def write_excel_export(
+    data: Dict[str, List[Dict[str, Any]]],
+    resource_types: List[str],
+    file: BinaryIO,
+) -> None:
+    """
+    Write resource data to an Excel workbook row by row.
+
+    The workbook is created in write-only mode, so rows are streamed to the
+    sheet files instead of being kept as cell objects. Each resource type
+    gets its own sheet.
+
+    Args:
+        data: Resource data
+        resource_types: Resource types to export
+        file: Binary file to write the workbook to
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for resource_type in resource_types:
+        records = data.get(resource_type, [])
+        columns = get_export_columns(records)
+        sheet = workbook.create_sheet(resource_type.capitalize())
+        sheet.append(columns)
+        for record in records:
+            sheet.append(
+                [format_export_value(record.get(column)) for column in columns]
+            )
+        increment_counter("export_records", len(records))
+    workbook.save(file)
+
+
+def _write_text(file: BinaryIO, parts: Iterable[str]) -> None:
+    """Encode text parts into a binary file as they are produced."""
+    for part in parts:
+        file.write(part.encode("utf-8"))
+
+
+def _iter_table(records: List[Dict[str, Any]], file_format: str) -> Iterator[str]:
+    """Serialize one resource type in a table format."""
+    if file_format == "csv":
+        return iter_csv_export(records)
+    return iter_jsonl_export(records)
+
+
+@instrumented()
+def write_export(
+    data: Dict[str, List[Dict[str, Any]]],
+    resource_types: List[str],
+    file_format: str,
+    file: BinaryIO,
+) -> str:
+    """
+    Stream an export of resource data into a binary file.
+
+    Args:
+        data: Resource data
+        resource_types: Resource types to export
+        file_format: Key of EXPORT_FORMATS other than "zip"
+        file: Binary file to write to, e.g. a temporary file
+
+    Returns:
+        Key of EXPORT_FORMATS describing the written file ("zip" when a
+        table format is exported for several resource types)
+    """
+    if file_format == "json":
+        _write_text(file, iter_json_export(data, resource_types))
+        return file_format
+    if file_format == "excel":
+        write_excel_export(data, resource_types, file)
+        return file_format
+
+    if len(resource_types) == 1:
+        _write_text(file, _iter_table(data.get(resource_types[0], []), file_format))
+        return file_format
+
+    extension = EXPORT_FORMATS[file_format]["extension"]
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as archive:
+        for resource_type in resource_types:
+            with archive.open(f"{resource_type}{extension}", "w") as entry:
+                _write_text(
+                    entry, _iter_table(data.get(resource_type, []), file_format)
+                )
+    return "zip"
+
+
+def iter_frame_chunks(
+    frames: Iterable[pd.DataFrame], chunk_size: int = FRAME_EXPORT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Split a sequence of DataFrames into slices of at most chunk_size rows.
+
+    Args:
+        frames: DataFrames with the same columns
+        chunk_size: Maximum number of rows per slice
+
+    Yields:
+        Row slices of the frames (views, not copies)
+    """
+    for frame in frames:
+        for start in range(0, len(frame), chunk_size):
+            yield frame.iloc[start : start + chunk_size]
+
+
+def _to_arrow_table(chunk: pd.DataFrame) -> pa.Table:
+    """Convert a DataFrame chunk to Arrow, storing whole-day timestamps as dates."""
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            try:
+                dates = table.column(i).cast(pa.date32())
+            except pa.ArrowInvalid:
+                # Timestamps with a time of day are kept as they are
+                continue
+            table = table.set_column(i, field.name, dates)
+    return table
+
+
+@instrumented()
+def write_frame_export(
+    frames: Iterable[pd.DataFrame],
+    file_format: str,
+    file: BinaryIO,
+    chunk_size: int = FRAME_EXPORT_CHUNK_SIZE,
+) -> int:
+    """
+    Write a table given as a sequence of DataFrames to CSV or Parquet in chunks.
+
+    Each chunk is converted to Arrow and written before the next one is
+    produced, so frames may be a generator that calculates the table piece
+    by piece. The schema of the first chunk is used for the whole file;
+    Parquet chunks become row groups.
+
+    Args:
+        frames: DataFrames with the same columns
+        file_format: "csv" or "parquet"
+        file: Binary file to write to
+        chunk_size: Maximum number of rows written at a time
+
+    Returns:
+        Number of rows written
+    """
+    rows = 0
+    writer = None
+    try:
+        for chunk in iter_frame_chunks(frames, chunk_size):
+            table = _to_arrow_table(chunk)
+            if writer is None:
+                schema = table.schema
+                if file_format == "csv":
+                    writer = pa_csv.CSVWriter(file, schema)
+                else:
+                    writer = pq.ParquetWriter(file, schema)
+            elif not table.schema.equals(schema):
+                table = table.cast(schema)
+            writer.write_table(table)
+            rows += len(chunk)
+            increment_counter("export_records", len(chunk))
+    finally:
+        if writer is not None:
+            writer.close()
+    if file_format == "parquet" and writer is None:
+        # An empty table is still a valid Parquet file
+        pq.write_table(pa.table({}), file)
+    return rows
@@ -0,0 +1,861 @@
+"""
+Import service for the resource management application.
+
+This module provides streaming imports of resource data. JSON uploads are
+read in two passes over the file: the first collects counts and the few
+fields needed to check relationships, the second validates and merges the
+records in batches. CSV and Excel sheets are read in fixed-size chunks whose
+mapped columns are parsed to typed values and upserted by name. Peak memory
+stays bounded by the batch size rather than by the size of the upload.
+"""
+
+import os
+import re
+from typing import (
+    Dict,
+    List,
+    Any,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+)
+import pandas as pd
+from app.services.storage_service import RESOURCE_TYPES
+from app.services.validation_service import (
+    find_multi_team_members,
+    validate_import_batch,
+)
+from app.utils.index_utils import build_entity_index
+from app.utils.instrumentation_utils import increment_counter, instrumented
+from app.utils.stream_utils import iter_json_arrays
+
+IMPORT_BATCH_SIZE = 1000
+TABLE_CHUNK_SIZE = 10000
+# Number of validation messages kept per resource type
+MAX_IMPORT_MESSAGES = 100
+
+# Fields of each resource type needed to check relationships
+_STUB_FIELDS = {
+    "people": ["name", "team", "department"],
+    "teams": ["name", "department", "members"],
+    "departments": ["name"],
+}
+
+ProgressCallback = Callable[[float, str], None]
+
+
+def _file_size(file: BinaryIO) -> int:
+    """Get the size of a seekable file and rewind it."""
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(0)
+    return size
+
+
+def _is_valid_record(record: Any) -> bool:
+    """Check that an imported record is an object with a name."""
+    return (
+        isinstance(record, dict)
+        and isinstance(record.get("name"), str)
+        and bool(record["name"])
+    )
+
+
+def _progress_reporter(
+    file: BinaryIO, label: str, on_progress: Optional[ProgressCallback]
+) -> Optional[Callable[[int], None]]:
+    """Turn byte counts into progress fractions of the file size."""
+    if on_progress is None:
+        return None
+    size = max(_file_size(file), 1)
+    return lambda bytes_read: on_progress(min(bytes_read / size, 1.0), label)
+
+
+def _add_messages(messages: Dict[str, Any], resource_type: str, new: List[str]) -> None:
+    """Collect validation messages, keeping at most MAX_IMPORT_MESSAGES each."""
+    kept = messages["errors"][resource_type]
+    kept.extend(new[: max(MAX_IMPORT_MESSAGES - len(kept), 0)])
+    messages["error_count"] += len(new)
+
+
+MergeSummary = Dict[str, List[str]]
+
+
+def _with_capacity(person: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the weekly and monthly capacity of a person, as the person form does."""
+    if person.get("work_days") and person.get("daily_work_hours"):
+        capacity_week = len(person["work_days"]) * person["daily_work_hours"]
+        person["capacity_hours_per_week"] = capacity_week
+        person["capacity_hours_per_month"] = capacity_week * 4.33
+    return person
+
+
+# Functions recomputing the derived fields of imported records, by resource type
+_DERIVED_FIELDS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "people": _with_capacity
+}
+
+
+def merge_records(
+    items: List[Dict[str, Any]],
+    records: Iterable[Dict[str, Any]],
+    positions: Dict[str, int],
+    derive: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> MergeSummary:
+    """
+    Upsert records into a resource list by name.
+
+    Records are joined to items through the positions hash map, so merging
+    m records into n items takes O(n + m) instead of a scan per record. A
+    record with a new name is inserted; otherwise its fields are written over
+    the existing record, which counts as updated only if a value changed. A
+    name repeated in records is merged into its first occurrence.
+
+    Args:
+        items: Resource list, modified in place (updated records are replaced
+            with new dictionaries, so shared originals are left untouched)
+        records: Records to merge
+        positions: Name -> position map of items, kept up to date
+        derive: Optional function that recomputes derived fields of a
+            merged record before it is compared
+
+    Returns:
+        Dictionary with the "inserted", "updated" and "unchanged" names
+    """
+    summary: MergeSummary = {"inserted": [], "updated": [], "unchanged": []}
+    for record in records:
+        name = record["name"]
+        position = positions.get(name)
+        if position is None:
+            positions[name] = len(items)
+            items.append(derive(dict(record)) if derive else record)
+            summary["inserted"].append(name)
+            continue
+
+        merged = {**items[position], **record}
+        if derive is not None:
+            merged = derive(merged)
+        if merged == items[position]:
+            summary["unchanged"].append(name)
+        else:
+            items[position] = merged
+            summary["updated"].append(name)
+    return summary
+
+
+@instrumented()
+def merge_resource_data(
+    data: Dict[str, List[Dict[str, Any]]],
+    imported_data: Dict[str, List[Dict[str, Any]]],
+) -> Dict[str, MergeSummary]:
+    """
+    Merge imported resource data into existing data with upsert semantics.
+
+    Args:
+        data: Existing resource data, modified in place
+        imported_data: Imported records by resource type; records without a
+            name are ignored
+
+    Returns:
+        Merge summary (see merge_records) per resource type
+    """
+    result = {}
+    for resource_type in RESOURCE_TYPES:
+        items = data.setdefault(resource_type, [])
+        positions = {record.get("name"): i for i, record in enumerate(items)}
+        result[resource_type] = merge_records(
+            items,
+            (
+                record
+                for record in imported_data.get(resource_type, [])
+                if _is_valid_record(record)
+            ),
+            positions,
+            derive=_DERIVED_FIELDS.get(resource_type),
+        )
+    return result
+
+
+@instrumented()
+def scan_json_import(
+    file: BinaryIO, on_progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Scan a JSON upload without keeping its records.
+
+    Args:
+        file: Uploaded binary file
+        on_progress: Optional function called with the fraction read and a label
+
+    Returns:
+        Dictionary with the record "counts" and number of "skipped" records
+        (not objects with a name) per resource type, the relationship
+        "stubs" of people, teams and departments and "valid" (True if all
+        resource types are present as arrays)
+    """
+    keys: Dict[str, bool] = {}
+    counts = {resource_type: 0 for resource_type in RESOURCE_TYPES}
+    skipped = {resource_type: 0 for resource_type in RESOURCE_TYPES}
+    stubs: Dict[str, List[Dict[str, Any]]] = {key: [] for key in _STUB_FIELDS}
+
+    report = _progress_reporter(file, "Scanning file", on_progress)
+    for key, record in iter_json_arrays(
+        file,
+        on_progress=report,
+        on_key=lambda key, is_array: keys.__setitem__(key, is_array),
+    ):
+        if key not in counts:
+            continue
+        if not _is_valid_record(record):
+            skipped[key] += 1
+            continue
+        counts[key] += 1
+        if key in stubs:
+            stubs[key].append(
+                {field: record[field] for field in _STUB_FIELDS[key] if field in record}
+            )
+    file.seek(0)
+
+    return {
+        "counts": counts,
+        "skipped": skipped,
+        "stubs": stubs,
+        "valid": all(keys.get(resource_type) for resource_type in RESOURCE_TYPES),
+    }
+
+
+@instrumented()
+def stream_json_import(
+    file: BinaryIO,
+    data: Dict[str, List[Dict[str, Any]]],
+    summary: Dict[str, Any],
+    replace: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    Validate and import the records of a JSON upload in batches.
+
+    Records that are not objects with a name are skipped. Relationships are
+    checked against the people, teams and departments of the upload (and of
+    the existing data when merging); records with relationship errors are
+    still imported and the errors reported. Derived fields, such as the
+    capacity hours of people, are recomputed as in the table import.
+
+    Args:
+        file: Uploaded binary file
+        data: Existing resource data; records are merged into its lists in
+            place by name (see merge_records)
+        summary: Result of scan_json_import for the same file
+        replace: Whether to build new data from the upload instead of
+            merging it into data
+        batch_size: Number of records validated and merged at a time
+        on_progress: Optional function called with the fraction read and a label
+
+    Returns:
+        Dictionary with the resulting "data", the "added" and "updated"
+        names and the number of "unchanged" and "skipped" records per
+        resource type, the validation
+        "errors" per resource type (at most MAX_IMPORT_MESSAGES each) and
+        the total "error_count"
+    """
+    target = (
+        {resource_type: [] for resource_type in RESOURCE_TYPES} if replace else data
+    )
+    stubs = summary["stubs"]
+    if replace:
+        checked = stubs
+    else:
+        checked = {key: data.get(key, []) + stubs.get(key, []) for key in _STUB_FIELDS}
+    index = build_entity_index(checked)
+
+    result: Dict[str, Any] = {
+        "data": target,
+        "added": {resource_type: [] for resource_type in RESOURCE_TYPES},
+        "updated": {resource_type: [] for resource_type in RESOURCE_TYPES},
+        "unchanged": {resource_type: 0 for resource_type in RESOURCE_TYPES},
+        "skipped": {resource_type: 0 for resource_type in RESOURCE_TYPES},
+        "errors": {resource_type: [] for resource_type in RESOURCE_TYPES},
+        "error_count": 0,
+    }
+    _add_messages(result, "people", find_multi_team_members(stubs.get("teams", [])))
+    # Existing records are joined to the upload by name
+    positions = {
+        resource_type: (
+            {}
+            if replace
+            else {
+                record.get("name"): i
+                for i, record in enumerate(data.get(resource_type, []))
+            }
+        )
+        for resource_type in RESOURCE_TYPES
+    }
+
+    def flush(resource_type: str, batch: List[Dict[str, Any]]) -> None:
+        _add_messages(
+            result,
+            resource_type,
+            validate_import_batch(resource_type, batch, checked, index),
+        )
+        derive = _DERIVED_FIELDS.get(resource_type)
+        if replace:
+            target[resource_type].extend(
+                [derive(record) for record in batch] if derive else batch
+            )
+            result["added"][resource_type].extend(record["name"] for record in batch)
+        else:
+            merged = merge_records(
+                target.setdefault(resource_type, []),
+                batch,
+                positions[resource_type],
+                derive=derive,
+            )
+            result["added"][resource_type].extend(merged["inserted"])
+            result["updated"][resource_type].extend(merged["updated"])
+            result["unchanged"][resource_type] += len(merged["unchanged"])
+        increment_counter("import_records", len(batch))
+
+    report = _progress_reporter(file, "Importing records", on_progress)
+    batch: List[Dict[str, Any]] = []
+    batch_type = None
+    for key, record in iter_json_arrays(file, on_progress=report):
+        if key not in result["added"]:
+            continue
+        if not _is_valid_record(record):
+            result["skipped"][key] += 1
+            continue
+        if key != batch_type or len(batch) >= batch_size:
+            if batch:
+                flush(batch_type, batch)
+            batch, batch_type = [], key
+        batch.append(record)
+    if batch:
+        flush(batch_type, batch)
+    file.seek(0)
+
+    return result
+
+
+# Fields that can be mapped from table columns per import type, with the type
+# each column is parsed to: "str", "int", "float", "date", "list" (names
+# separated by ";", "," or "|") or "days" (a list of work day codes)
+TABLE_IMPORT_FIELDS: Dict[str, Dict[str, str]] = {
+    "people": {
+        "name": "str",
+        "role": "str",
+        "department": "str",
+        "team": "str",
+        "daily_cost": "float",
+        "work_days": "days",
+        "daily_work_hours": "float",
+        "skills": "list",
+    },
+    "teams": {"name": "str", "department": "str", "members": "list"},
+    "departments": {"name": "str", "teams": "list", "members": "list"},
+    "projects": {
+        "name": "str",
+        "description": "str",
+        "start_date": "date",
+        "end_date": "date",
+        "priority": "int",
+        "allocated_budget": "float",
+        "assigned_resources": "list",
+    },
+    # One row per resource allocation, upserted into its project
+    "allocations": {
+        "project": "str",
+        "resource": "str",
+        "start_date": "date",
+        "end_date": "date",
+        "allocation_percentage": "float",
+    },
+}
+
+TABLE_REQUIRED_FIELDS: Dict[str, List[str]] = {
+    "people": ["name"],
+    "teams": ["name"],
+    "departments": ["name"],
+    "projects": ["name"],
+    "allocations": [
+        "project",
+        "resource",
+        "start_date",
+        "end_date",
+        "allocation_percentage",
+    ],
+}
+
+WORK_DAY_CODES = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+_LIST_SEPARATOR = re.compile(r"\s*[;,|]\s*")
+
+
+def _cell_text(value: Any) -> str:
+    """Convert a spreadsheet cell value to text ("" for empty cells)."""
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def get_excel_sheet_names(file: BinaryIO) -> List[str]:
+    """
+    Get the sheet names of an Excel upload.
+
+    Args:
+        file: Uploaded Excel file
+
+    Returns:
+        List of sheet names
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+        file.seek(0)
+
+
+def read_table_chunks(
+    file: BinaryIO,
+    file_format: str,
+    columns: Optional[List[str]] = None,
+    chunk_size: int = TABLE_CHUNK_SIZE,
+    sheet_name: Optional[str] = None,
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Excel upload in chunks of text columns.
+
+    Cells are read as text ("" when empty) and parsed later, so every chunk
+    has the same columns regardless of its values. The index of each chunk
+    continues the row numbers of the previous one.
+
+    Args:
+        file: Uploaded binary file
+        file_format: "csv" or "excel"
+        columns: Columns to read (defaults to all)
+        chunk_size: Number of rows per chunk
+        sheet_name: Excel sheet to read (defaults to the first)
+        on_progress: Optional function called with the fraction read after
+            each chunk
+
+    Yields:
+        DataFrames of at most chunk_size rows
+    """
+    size = max(_file_size(file), 1)
+    if file_format == "csv":
+        reader = pd.read_csv(
+            file,
+            usecols=columns,
+            dtype=str,
+            keep_default_na=False,
+            chunksize=chunk_size,
+        )
+        with reader:
+            for chunk in reader:
+                yield chunk
+                if on_progress is not None:
+                    on_progress(min(file.tell() / size, 1.0))
+        file.seek(0)
+        return
+
+    # Excel sheets are streamed row by row in read-only mode
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = [_cell_text(value) for value in next(rows, ())]
+        selected = [
+            i for i, name in enumerate(header) if columns is None or name in columns
+        ]
+        names = [header[i] for i in selected]
+        total_rows = max((sheet.max_row or 1) - 1, 1)
+
+        start = 0
+        batch: List[List[str]] = []
+        for row in rows:
+            batch.append([_cell_text(row[i]) if i < len(row) else "" for i in selected])
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(
+                    batch, columns=names, index=pd.RangeIndex(start, start + len(batch))
+                )
+                start += len(batch)
+                batch = []
+                if on_progress is not None:
+                    on_progress(min(start / total_rows, 1.0))
+        if batch:
+            yield pd.DataFrame(
+                batch, columns=names, index=pd.RangeIndex(start, start + len(batch))
+            )
+    finally:
+        workbook.close()
+        file.seek(0)
+
+
+def preview_table(
+    file: BinaryIO, file_format: str, sheet_name: Optional[str] = None, rows: int = 5
+) -> pd.DataFrame:
+    """
+    Read the first rows of a CSV or Excel upload.
+
+    Args:
+        file: Uploaded binary file
+        file_format: "csv" or "excel"
+        sheet_name: Excel sheet to read (defaults to the first)
+        rows: Number of rows to read
+
+    Returns:
+        DataFrame of text columns
+    """
+    chunks = read_table_chunks(
+        file, file_format, chunk_size=rows, sheet_name=sheet_name
+    )
+    try:
+        return next(chunks)
+    except StopIteration:
+        return pd.DataFrame()
+    finally:
+        chunks.close()
+
+
+def _parse_dates_column(text: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Parse ISO dates (other formats value by value) to YYYY-MM-DD strings."""
+    parsed = pd.to_datetime(text, format="ISO8601", errors="coerce")
+    retry = parsed.isna() & (text != "")
+    if retry.any():
+        parsed[retry] = pd.to_datetime(text[retry], format="mixed", errors="coerce")
+    return parsed.dt.strftime("%Y-%m-%d"), parsed.isna()
+
+
+def _split_lists(text: pd.Series) -> pd.Series:
+    """Split separated names into lists (empty cells give empty lists)."""
+    return text.map(lambda value: _LIST_SEPARATOR.split(value) if value else [])
+
+
+def parse_table_chunk(
+    chunk: pd.DataFrame, import_type: str, mapping: Dict[str, str]
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Parse the mapped columns of a chunk to typed records.
+
+    Columns are converted with one vectorized operation per field. Rows with
+    a missing required field, an unparseable value, an end date before the
+    start date or an allocation outside 10-100% are rejected. Empty cells
+    are left out of the records, so upserts keep the existing values.
+
+    Args:
+        chunk: Chunk of text columns (see read_table_chunks)
+        import_type: Key of TABLE_IMPORT_FIELDS
+        mapping: Field name -> column name of the mapped fields
+
+    Returns:
+        Tuple of (records, error messages); messages name the sheet row
+    """
+    fields = TABLE_IMPORT_FIELDS[import_type]
+    rejected = pd.Series(False, index=chunk.index)
+    reasons = pd.Series("", index=chunk.index)
+    values: Dict[str, pd.Series] = {}
+
+    def reject(mask: pd.Series, reason: str) -> None:
+        new = mask & ~rejected
+        reasons[new] = reason
+        rejected[new] = True
+
+    for field, column in mapping.items():
+        kind = fields[field]
+        text = chunk[column].astype(str).str.strip()
+        missing = text == ""
+        if field in TABLE_REQUIRED_FIELDS[import_type]:
+            reject(missing, f"{field} is required")
+
+        if kind in ("int", "float"):
+            numbers = pd.to_numeric(text.where(~missing), errors="coerce")
+            reject(numbers.isna() & ~missing, f"invalid {field}")
+            if kind == "int":
+                numbers = numbers.round().astype("Int64")
+            values[field] = numbers.astype(object).where(numbers.notna(), None)
+        elif kind == "date":
+            dates, invalid = _parse_dates_column(text)
+            reject(invalid & ~missing, f"invalid {field}")
+            values[field] = dates.where(~invalid, None)
+        elif kind in ("list", "days"):
+            lists = _split_lists(text)
+            if kind == "days":
+                # Day names and codes both start with the two-letter code
+                tokens = lists.explode()
+                codes = tokens.str[:2].str.upper()
+                invalid = (
+                    (tokens.notna() & ~codes.isin(WORK_DAY_CODES))
+                    .groupby(level=0)
+                    .any()
+                )
+                reject(
+                    invalid.reindex(chunk.index, fill_value=False), f"invalid {field}"
+                )
+                lists = codes.dropna().groupby(level=0).agg(list).reindex(chunk.index)
+            values[field] = lists.where(~missing, None)
+        else:
+            values[field] = text.where(~missing, None)
+
+    if "start_date" in values and "end_date" in values:
+        starts, ends = values["start_date"], values["end_date"]
+        both = starts.notna() & ends.notna()
+        reject(
+            both & (ends.where(both, "") < starts.where(both, "")),
+            "end_date is before start_date",
+        )
+    if import_type == "allocations" and "allocation_percentage" in values:
+        percentages = pd.to_numeric(values["allocation_percentage"], errors="coerce")
+        reject(
+            percentages.notna() & ((percentages < 10) | (percentages > 100)),
+            "allocation_percentage must be between 10 and 100",
+        )
+
+    # Row numbers count the header row and start at 1
+    errors = [f"Row {row + 2}: {reason}" for row, reason in reasons[rejected].items()]
+    kept = ~rejected.to_numpy()
+    fields_kept = list(values)
+    columns = [values[field][kept].tolist() for field in fields_kept]
+    records = [
+        {field: value for field, value in zip(fields_kept, row) if value is not None}
+        for row in zip(*columns)
+    ]
+    return records, errors
+
+
+def upsert_allocations(
+    projects: List[Dict[str, Any]],
+    allocations: List[Dict[str, Any]],
+    positions: Dict[str, int],
+    keys: Dict[str, Dict[Tuple[Any, Any], int]],
+    replace: bool = False,
+    originals: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[List[str], List[str]]:
+    """
+    Upsert allocation rows into the resource allocations of their projects.
+
+    An allocation is identified by its project, resource and start date;
+    allocated resources are added to the project's assigned resources. A
+    project is copied the first time it is touched, and the lookup of its
+    allocations is kept in keys so later chunks do not rebuild it. Once all
+    rows are upserted, restore_unchanged_projects tells the projects that
+    changed from those that did not.
+
+    Args:
+        projects: Project list, modified in place (changed projects are
+            replaced with copies)
+        allocations: Parsed allocation rows (see parse_table_chunk)
+        positions: Project name -> position map of projects
+        keys: Project name -> {(resource, start_date): position} lookup of
+            the projects touched so far, shared between calls
+        replace: Whether to drop a project's previous allocations the first
+            time it is touched
+        originals: Optional project name -> project map receiving each
+            project as it was before it was first touched
+
+    Returns:
+        Tuple of (project names touched for the first time, project names
+        not found)
+    """
+    touched, missing = [], []
+    for allocation in allocations:
+        name = allocation["project"]
+        position = positions.get(name)
+        if position is None:
+            missing.append(name)
+            continue
+
+        project_keys = keys.get(name)
+        if project_keys is None:
+            if originals is not None:
+                originals[name] = projects[position]
+            project = dict(projects[position])
+            project["resource_allocations"] = (
+                [] if replace else list(project.get("resource_allocations", []))
+            )
+            project["assigned_resources"] = list(project.get("assigned_resources", []))
+            projects[position] = project
+            project_keys = keys[name] = {
+                (existing.get("resource"), existing.get("start_date")): i
+                for i, existing in enumerate(project["resource_allocations"])
+            }
+            touched.append(name)
+
+        project = projects[position]
+        record = {
+            "resource": allocation["resource"],
+            "allocation_percentage": allocation["allocation_percentage"],
+            "start_date": allocation["start_date"],
+            "end_date": allocation["end_date"],
+        }
+        key = (record["resource"], record["start_date"])
+        existing_position = project_keys.get(key)
+        if existing_position is None:
+            project_keys[key] = len(project["resource_allocations"])
+            project["resource_allocations"].append(record)
+        else:
+            project["resource_allocations"][existing_position] = {
+                **project["resource_allocations"][existing_position],
+                **record,
+            }
+        if record["resource"] not in project["assigned_resources"]:
+            project["assigned_resources"].append(record["resource"])
+    return touched, missing
+
+
+def restore_unchanged_projects(
+    projects: List[Dict[str, Any]],
+    positions: Dict[str, int],
+    originals: Dict[str, Dict[str, Any]],
+) -> Tuple[List[str], List[str]]:
+    """
+    Put back the projects whose upserted allocations equal their originals.
+
+    Args:
+        projects: Project list, modified in place
+        positions: Project name -> position map of projects
+        originals: Projects before they were touched (see upsert_allocations)
+
+    Returns:
+        Tuple of (updated project names, unchanged project names)
+    """
+    updated, unchanged = [], []
+    for name, original in originals.items():
+        position = positions[name]
+        if projects[position] == original:
+            projects[position] = original
+            unchanged.append(name)
+        else:
+            updated.append(name)
+    return updated, unchanged
+
+
+@instrumented()
+def stream_table_import(
+    file: BinaryIO,
+    file_format: str,
+    import_type: str,
+    mapping: Dict[str, str],
+    data: Dict[str, List[Dict[str, Any]]],
+    replace: bool = False,
+    chunk_size: int = TABLE_CHUNK_SIZE,
+    sheet_name: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    Import a CSV or Excel upload in chunks, upserting rows by name.
+
+    Each chunk is parsed to typed records, validated against the existing
+    people, teams and departments and upserted into data. Rows that cannot
+    be parsed are skipped; relationship errors are reported but the rows are
+    still imported.
+
+    Args:
+        file: Uploaded binary file
+        file_format: "csv" or "excel"
+        import_type: Key of TABLE_IMPORT_FIELDS
+        mapping: Field name -> column name of the mapped fields
+        data: Resource data, modified in place
+        replace: Whether to replace the existing records of the resource type
+            (for allocations: the allocations of the projects in the upload)
+        chunk_size: Number of rows per chunk
+        sheet_name: Excel sheet to read (defaults to the first)
+        on_progress: Optional function called with the fraction read and a label
+
+    Returns:
+        Dictionary with the "added" and "updated" names and the number of
+        "unchanged" and "skipped" rows per resource type, the "errors" per resource type (at
+        most MAX_IMPORT_MESSAGES each) and the total "error_count"
+    """
+    resource_type = "projects" if import_type == "allocations" else import_type
+    result: Dict[str, Any] = {
+        "added": {key: [] for key in RESOURCE_TYPES},
+        "updated": {key: [] for key in RESOURCE_TYPES},
+        "unchanged": {key: 0 for key in RESOURCE_TYPES},
+        "skipped": {key: 0 for key in RESOURCE_TYPES},
+        "errors": {key: [] for key in RESOURCE_TYPES},
+        "error_count": 0,
+    }
+
+    if replace and import_type != "allocations":
+        data[resource_type] = []
+    items = data.setdefault(resource_type, [])
+    positions = {record.get("name"): i for i, record in enumerate(items)}
+    # Other resource types do not change during the import
+    index = build_entity_index(data)
+    allocation_keys: Dict[str, Dict[Tuple[Any, Any], int]] = {}
+    original_projects: Dict[str, Dict[str, Any]] = {}
+
+    report = None
+    if on_progress is not None:
+        report = lambda fraction: on_progress(fraction, "Importing rows")  # noqa: E731
+    for chunk in read_table_chunks(
+        file,
+        file_format,
+        columns=list(dict.fromkeys(mapping.values())),
+        chunk_size=chunk_size,
+        sheet_name=sheet_name,
+        on_progress=report,
+    ):
+        records, errors = parse_table_chunk(chunk, import_type, mapping)
+        result["skipped"][resource_type] += len(errors)
+        _add_messages(result, resource_type, errors)
+
+        if import_type == "allocations":
+            unknown = sorted(
+                {r["resource"] for r in records} - set(index["resource_types"])
+            )
+            _add_messages(
+                result,
+                resource_type,
+                [f"Resource '{name}' not found" for name in unknown],
+            )
+            _, missing = upsert_allocations(
+                items, records, positions, allocation_keys, replace, original_projects
+            )
+            result["skipped"][resource_type] += len(missing)
+            _add_messages(
+                result,
+                resource_type,
+                [f"Project '{name}' not found" for name in dict.fromkeys(missing)],
+            )
+        else:
+            merged = merge_records(
+                items,
+                records,
+                positions,
+                derive=_DERIVED_FIELDS.get(resource_type),
+            )
+            changed = merged["inserted"] + merged["updated"]
+            result["added"][resource_type].extend(merged["inserted"])
+            result["updated"][resource_type].extend(merged["updated"])
+            result["unchanged"][resource_type] += len(merged["unchanged"])
+            _add_messages(
+                result,
+                resource_type,
+                validate_import_batch(
+                    resource_type,
+                    [items[positions[name]] for name in changed],
+                    data,
+                    index,
+                ),
+            )
+        increment_counter("import_records", len(chunk))
+
+    if import_type == "allocations":
+        # Rows of one project can span chunks, so projects are compared last
+        updated, unchanged = restore_unchanged_projects(
+            items, positions, original_projects
+        )
+        result["updated"][resource_type].extend(updated)
+        result["unchanged"][resource_type] += len(unchanged)
+    return result
@@ -9,6 +9,7 @@ from app.services.validation_service import (
     validate_imported_data,
     suggest_relationship_fixes,
 )
+from app.utils.index_utils import build_entity_index
 
 
 def validate_and_process_import(
@@ -39,17 +40,11 @@ def validate_and_process_import(
     processed_data = {"people": [], "teams": [], "departments": [], "projects": []}
 
     # Process each resource type, applying any automatic corrections
+    teams_by_name = build_entity_index({"teams": import_data.get("teams", [])})["teams"]
     for person in import_data.get("people", []):
         # Handle team-department alignment
         if person.get("team"):
-            team = next(
-                (
-                    t
-                    for t in import_data.get("teams", [])
-                    if t["name"] == person["team"]
-                ),
-                None,
-            )
+            team = teams_by_name.get(person["team"])
             if team and team.get("department"):
                 # Ensure person's department matches team's department
                 person["department"] = team["department"]
@@ -0,0 +1,386 @@
+"""
+Change journal service for the resource management application.
+
+This module provides an append-only JSON Lines journal of record changes.
+Each edit appends a few small records instead of rewriting the data store,
+loading replays the journal on top of the stored snapshot, and a background
+compaction folds the journal into the snapshot and archives it as an audit
+trail.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from app.services.config_service import load_journal_settings
+from app.services.storage_service import RESOURCE_TYPES, get_storage_backend
+from app.utils.file_utils import atomic_write_bytes, get_backup_dir
+
+JOURNAL_FILE = "resource_data.journal.jsonl"
+
+# Serializes appends and truncation of the journal file
+_journal_lock = threading.Lock()
+# Allows one compaction at a time
+_compaction_lock = threading.Lock()
+# Number of lines of each journal file, counted on first use
+_line_counts: Dict[str, int] = {}
+
+
+def fingerprint_record(record: Dict[str, Any]) -> bytes:
+    """
+    Hash a record to detect changes without keeping a serialized copy.
+
+    Args:
+        record: Record dictionary
+
+    Returns:
+        16-byte digest of the canonical JSON of the record
+    """
+    serialized = json.dumps(record, sort_keys=True, default=str)
+    return hashlib.blake2b(serialized.encode("utf-8"), digest_size=16).digest()
+
+
+def fingerprint_data(data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Fingerprint every record of the data by resource type and name.
+
+    Args:
+        data: Resource data dictionary
+
+    Returns:
+        Dictionary mapping resource types to name -> fingerprint maps
+    """
+    return {
+        resource_type: {
+            record.get("name"): fingerprint_record(record)
+            for record in data.get(resource_type, [])
+        }
+        for resource_type in RESOURCE_TYPES
+    }
+
+
+def _session_id() -> Optional[str]:
+    """Get the id of the browser session running the script, if any."""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def build_change_records(
+    data: Dict[str, List[Dict[str, Any]]],
+    changes: Dict[str, Iterable[str]],
+    revision: int,
+) -> List[Dict[str, Any]]:
+    """
+    Build journal records for changed record names.
+
+    A name present in the data becomes an "upsert" carrying the record and
+    its position, a missing name a "delete". Deletes come first and upserts
+    in position order, so replaying them reproduces the order of the data.
+
+    Args:
+        data: Resource data dictionary after the changes
+        changes: Changed names by resource type
+        revision: Data revision of the session after the changes
+
+    Returns:
+        List of journal records
+    """
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    session = _session_id()
+    deletes: List[Dict[str, Any]] = []
+    upserts: List[Dict[str, Any]] = []
+
+    for resource_type in RESOURCE_TYPES:
+        names = changes.get(resource_type)
+        if not names:
+            continue
+        positions = {
+            record.get("name"): i for i, record in enumerate(data[resource_type])
+        }
+        for name in names:
+            change = {
+                "timestamp": timestamp,
+                "session": session,
+                "revision": revision,
+                "entity": resource_type,
+                "name": name,
+            }
+            if name in positions:
+                position = positions[name]
+                change.update(
+                    op="upsert",
+                    position=position,
+                    payload=data[resource_type][position],
+                )
+                upserts.append(change)
+            else:
+                change["op"] = "delete"
+                deletes.append(change)
+
+    upserts.sort(
+        key=lambda change: (RESOURCE_TYPES.index(change["entity"]), change["position"])
+    )
+    return deletes + upserts
+
+
+def append_journal(records: List[Dict[str, Any]], filename: str = JOURNAL_FILE) -> None:
+    """
+    Append records to the journal and flush them to disk.
+
+    Args:
+        records: Journal records
+        filename: Path of the journal file
+    """
+    lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+    with _journal_lock:
+        _truncate_torn_tail(filename)
+        with open(filename, "a", encoding="utf-8") as file:
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+        key = os.path.abspath(filename)
+        if key in _line_counts:
+            _line_counts[key] += len(records)
+
+
+def _truncate_torn_tail(filename: str) -> None:
+    """Cut off a partial last line left by a crash during an append."""
+    if not os.path.exists(filename) or os.path.getsize(filename) == 0:
+        return
+    with open(filename, "rb+") as file:
+        file.seek(-1, os.SEEK_END)
+        if file.read(1) == b"\n":
+            return
+        file.seek(0)
+        content = file.read()
+        file.truncate(content.rfind(b"\n") + 1)
+
+
+def journal_length(filename: str = JOURNAL_FILE) -> int:
+    """
+    Get the number of records in the journal.
+
+    Args:
+        filename: Path of the journal file
+
+    Returns:
+        Number of journal records
+    """
+    key = os.path.abspath(filename)
+    with _journal_lock:
+        if key not in _line_counts:
+            _line_counts[key] = len(_read_journal_lines(filename))
+        return _line_counts[key]
+
+
+def _read_journal_lines(filename: str) -> List[str]:
+    """Read the complete lines of the journal (a torn last line is dropped)."""
+    if not os.path.exists(filename):
+        return []
+    with open(filename, "r", encoding="utf-8") as file:
+        lines = file.readlines()
+    if lines and not lines[-1].endswith("\n"):
+        lines.pop()
+    return lines
+
+
+def read_journal(filename: str = JOURNAL_FILE) -> List[Dict[str, Any]]:
+    """
+    Read the records of the journal.
+
+    Args:
+        filename: Path of the journal file
+
+    Returns:
+        List of journal records, oldest first
+    """
+    return [json.loads(line) for line in _read_journal_lines(filename)]
+
+
+def apply_journal(
+    data: Dict[str, List[Dict[str, Any]]], records: List[Dict[str, Any]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Replay journal records on resource data, in place.
+
+    Replaying is idempotent: upserts replace the record of the same name (or
+    insert it at its position) and deletes of missing names are ignored, so
+    records already folded into the snapshot can be replayed safely.
+
+    Args:
+        data: Resource data dictionary (snapshot)
+        records: Journal records, oldest first
+
+    Returns:
+        The updated data dictionary
+    """
+    positions: Dict[str, Optional[Dict[str, int]]] = {}
+
+    def find(resource_type: str, name: str) -> Optional[int]:
+        # Positions are re-indexed only after inserts and deletes
+        if positions.get(resource_type) is None:
+            positions[resource_type] = {
+                record.get("name"): i for i, record in enumerate(data[resource_type])
+            }
+        return positions[resource_type].get(name)
+
+    for record in records:
+        resource_type = record["entity"]
+        data.setdefault(resource_type, [])
+        position = find(resource_type, record["name"])
+        if record["op"] == "delete":
+            if position is not None:
+                del data[resource_type][position]
+                positions[resource_type] = None
+        elif position is not None:
+            data[resource_type][position] = record["payload"]
+        else:
+            data[resource_type].insert(record["position"], record["payload"])
+            positions[resource_type] = None
+    return data
+
+
+def load_with_journal_origin(
+    filename: str = JOURNAL_FILE,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Load the stored snapshot, replay the journal on it and describe the result.
+
+    The origin ties the data to the snapshot it was loaded from, so data
+    derived from the snapshot columns can be reused for it (see
+    snapshot_service.get_snapshot_tables) and only the journaled records
+    have to be applied on top.
+
+    Args:
+        filename: Path of the journal file
+
+    Returns:
+        Tuple of the resource data dictionary and its origin: a dictionary
+        with the "snapshot" identity, the "journal" position (number of
+        replayed records) and the journaled record names by resource type
+        ("changes"), or None if the backend has no snapshot identity
+    """
+    backend = get_storage_backend()
+    if "load_with_identity" in backend:
+        data, identity = backend["load_with_identity"]()
+    else:
+        data, identity = backend["load"](), None
+    records = read_journal(filename)
+    if records:
+        # Replayed on copies of the lists, so the loaded snapshot stays as stored
+        data = apply_journal(
+            {resource_type: list(items) for resource_type, items in data.items()},
+            records,
+        )
+    if identity is None:
+        return data, None
+
+    changes: Dict[str, Set[str]] = {}
+    for record in records:
+        changes.setdefault(record["entity"], set()).add(record["name"])
+    return data, {"snapshot": identity, "journal": len(records), "changes": changes}
+
+
+def load_with_journal(filename: str = JOURNAL_FILE) -> Dict[str, Any]:
+    """
+    Load the stored snapshot and replay the journal on it.
+
+    Args:
+        filename: Path of the journal file
+
+    Returns:
+        Resource data dictionary
+    """
+    return load_with_journal_origin(filename)[0]
+
+
+def schedule_compaction(filename: str = JOURNAL_FILE) -> bool:
+    """
+    Start a background compaction once the journal is long enough.
+
+    Args:
+        filename: Path of the journal file
+
+    Returns:
+        True if a compaction was started
+    """
+    if journal_length(filename) < load_journal_settings()["compact_after"]:
+        return False
+    threading.Thread(target=compact_journal, args=(filename,), daemon=True).start()
+    return True
+
+
+def clear_journal(filename: str = JOURNAL_FILE) -> None:
+    """
+    Remove the journal after the full data was saved to the snapshot.
+
+    Args:
+        filename: Path of the journal file
+    """
+    with _journal_lock:
+        lines = _read_journal_lines(filename)
+        _archive_journal_lines(lines, filename)
+        if os.path.exists(filename):
+            os.remove(filename)
+        _line_counts[os.path.abspath(filename)] = 0
+
+
+def _archive_journal_lines(lines: List[str], filename: str) -> None:
+    """Append journal lines to the compressed journal archive (audit trail)."""
+    if not lines:
+        return
+    os.makedirs(get_backup_dir(filename), exist_ok=True)
+    archive = os.path.join(
+        get_backup_dir(filename), f"{os.path.basename(filename)}.archive.gz"
+    )
+    # Each append is a gzip member; readers see one continuous stream
+    with open(archive, "ab") as file:
+        file.write(gzip.compress("".join(lines).encode("utf-8")))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def compact_journal(filename: str = JOURNAL_FILE) -> bool:
+    """
+    Fold the journal into the stored snapshot.
+
+    The snapshot is rewritten with the journal replayed on it, then the
+    folded lines move to the archive. Lines appended meanwhile stay in the
+    journal. A crash in between is harmless because replay is idempotent.
+
+    Args:
+        filename: Path of the journal file
+
+    Returns:
+        True if the journal was compacted, False if a compaction was already
+        running or there was nothing to fold
+    """
+    if not _compaction_lock.acquire(blocking=False):
+        return False
+    try:
+        lines = _read_journal_lines(filename)
+        if not lines:
+            return False
+        backend = get_storage_backend()
+        records = [json.loads(line) for line in lines]
+        data = apply_journal(backend["load"](), records)
+        if "save_changes" in backend:
+            changes: Dict[str, Set[str]] = {}
+            for record in records:
+                changes.setdefault(record["entity"], set()).add(record["name"])
+            backend["save_changes"](data, changes)
+        else:
+            backend["save"](data)
+
+        with _journal_lock:
+            remaining = _read_journal_lines(filename)[len(lines) :]
+            _archive_journal_lines(lines, filename)
+            atomic_write_bytes(filename, "".join(remaining).encode("utf-8"))
+            _line_counts[os.path.abspath(filename)] = len(remaining)
+        return True
+    finally:
+        _compaction_lock.release()
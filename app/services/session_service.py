@@ -3,20 +3,21 @@ Session management service to handle Streamlit session state.
 """
 
 import os
-import json
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-from app.services.data_service import load_demo_data, check_data_integrity
+from app.services.data_service import load_data_with_origin, check_data_integrity
+from app.services.store_service import attach_session_data, sync_session_data
+from app.utils.file_utils import atomic_write_json
 
 
 def initialize_session_state():
     """Initialize all session state variables used throughout the application."""
-    # Initialize data if not present
+    # Initialize data if not present, otherwise pick up other sessions' edits
     if "data" not in st.session_state:
         try:
-            st.session_state.data = load_demo_data()
+            attach_session_data(load_data_with_origin)
         except Exception as e:
             st.error(f"Error loading data: {str(e)}")
             st.session_state.data = {
@@ -25,6 +26,8 @@ def initialize_session_state():
                 "departments": [],
                 "projects": [],
             }
+    else:
+        sync_session_data(load_data_with_origin)
 
     # Initialize settings configuration
     settings_file = "settings.json"
@@ -82,8 +85,7 @@ def _create_default_settings_file(settings_file: str):
 
     # Write to file
     try:
-        with open(settings_file, "w") as file:
-            json.dump(default_settings, file, indent=4)
+        atomic_write_json(settings_file, default_settings)
     except Exception as e:
         st.error(f"Error creating settings file: {str(e)}")
 
@@ -0,0 +1,662 @@
+"""
+Columnar snapshot service for the resource management application.
+
+This module provides an Arrow snapshot of the resource data: one Arrow IPC
+file per table (people, teams, departments, projects and the flattened
+allocations) with dictionary-encoded strings and date32 columns, and one
+typed column per record field. Snapshots are memory-mapped on load, so the
+Gantt data can be built from the columns directly instead of from the
+per-record dictionaries.
+"""
+
+import os
+import json
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from app.services.allocation_service import parse_dates
+from app.utils.file_utils import atomic_write_json
+from app.utils.instrumentation_utils import instrumented
+
+SNAPSHOT_DIR = "resource_data_snapshot"
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_FORMAT_VERSION = 2
+# Older formats that can still be read (version 1 kept records as JSON text)
+READABLE_FORMAT_VERSIONS = {1, 2}
+SNAPSHOT_TABLES = ["people", "teams", "departments", "projects", "allocations"]
+
+# Number of loaded snapshots whose tables are kept for the data they produced
+MAX_MAPPED_SNAPSHOTS = 4
+
+GANTT_COLUMNS = [
+    "Project",
+    "Resource",
+    "Type",
+    "Department",
+    "Team",
+    "Start",
+    "End",
+    "Priority",
+    "Allocation %",
+]
+
+# Prefix of the columns holding the record fields
+RECORD_PREFIX = "record."
+
+# Tables of recently loaded snapshots by snapshot identity (directory and
+# generation)
+_mapped_snapshots: "OrderedDict[Tuple[str, int], Dict[str, pa.Table]]" = OrderedDict()
+_snapshot_lock = threading.Lock()
+
+
+def get_manifest_path(directory: str = SNAPSHOT_DIR) -> str:
+    """Get the path of the manifest naming the current snapshot files."""
+    return os.path.join(directory, MANIFEST_FILE)
+
+
+def _date_array(values: List[Any]) -> pa.Array:
+    """Convert date strings to a date32 array (missing values are null)."""
+    parsed = parse_dates(pd.Series(values, dtype=object))
+    return pa.array(
+        parsed.dt.normalize().to_numpy().astype("datetime64[D]"),
+        type=pa.date32(),
+        from_pandas=True,
+    )
+
+
+def _float_array(values: List[Any]) -> pa.Array:
+    """Convert numbers to a float64 array (missing values are null)."""
+    return pa.array(
+        pd.to_numeric(pd.Series(values, dtype=object), errors="coerce"),
+        type=pa.float64(),
+        from_pandas=True,
+    )
+
+
+def _dict_array(values: List[Any]) -> pa.Array:
+    """Convert strings to a dictionary-encoded array."""
+    return pa.array(values, type=pa.string()).dictionary_encode()
+
+
+def _field_kind(values: List[Any]) -> str:
+    """Choose the column type of a record field from its values."""
+    types = {type(value) for value in values if value is not None}
+    if types == {str}:
+        return "string"
+    if types == {bool}:
+        return "bool"
+    if types == {int}:
+        return "int"
+    if types == {float}:
+        return "float"
+    if types == {int, float}:
+        return "number"
+    if types == {list} and all(
+        isinstance(item, str) for value in values if value is not None for item in value
+    ):
+        return "strings"
+    return "json"
+
+
+def _field_arrays(values: List[Any], kind: str) -> Dict[str, pa.Array]:
+    """Convert the values of a record field to arrays by column suffix."""
+    if kind == "number":
+        # Integers and floats share a float column, a flag restores the ints
+        return {
+            "": pa.array(
+                [None if value is None else float(value) for value in values],
+                type=pa.float64(),
+            ),
+            ".int": pa.array(
+                [None if value is None else isinstance(value, int) for value in values],
+                type=pa.bool_(),
+            ),
+        }
+    if kind == "json":
+        return {
+            "": pa.array(
+                [
+                    None if value is None else json.dumps(value, default=str)
+                    for value in values
+                ],
+                type=pa.string(),
+            )
+        }
+    types = {
+        "string": pa.string(),
+        "bool": pa.bool_(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "strings": pa.list_(pa.string()),
+    }
+    return {"": pa.array(values, type=types[kind])}
+
+
+def _record_columns(
+    records: List[Optional[Dict[str, Any]]],
+) -> Tuple[Dict[str, pa.Array], List[List[str]]]:
+    """
+    Convert records to one typed column per field.
+
+    Missing fields are null. Fields set to None are listed per row in the
+    "record_nulls" column, so records are restored exactly.
+
+    Args:
+        records: Records (None for rows without a record)
+
+    Returns:
+        Tuple of the columns by name and the [field, kind] pairs
+    """
+    fields: Dict[str, None] = {}
+    for record in records:
+        if record:
+            fields.update(dict.fromkeys(record))
+
+    columns: Dict[str, pa.Array] = {}
+    kinds = []
+    for field in fields:
+        values = [None if record is None else record.get(field) for record in records]
+        kind = _field_kind(values)
+        try:
+            arrays = _field_arrays(values, kind)
+        except (pa.ArrowInvalid, OverflowError):
+            # e.g. integers beyond 64 bits
+            kind = "json"
+            arrays = _field_arrays(values, kind)
+        for suffix, array in arrays.items():
+            columns[f"{RECORD_PREFIX}{field}{suffix}"] = array
+        kinds.append([field, kind])
+
+    columns["record_nulls"] = pa.array(
+        [
+            [field for field, value in (record or {}).items() if value is None] or None
+            for record in records
+        ],
+        type=pa.list_(pa.string()),
+    )
+    return columns, kinds
+
+
+def _table_with_records(
+    columns: Dict[str, pa.Array], records: List[Optional[Dict[str, Any]]]
+) -> pa.Table:
+    """Build a table of columns and the typed record columns."""
+    record_columns, kinds = _record_columns(records)
+    table = pa.table({**columns, **record_columns})
+    return table.replace_schema_metadata({"record_fields": json.dumps(kinds)})
+
+
+def _table_records(table: pa.Table) -> List[Dict[str, Any]]:
+    """
+    Rebuild the records of a table column by column.
+
+    Args:
+        table: Table with record columns (see _record_columns)
+
+    Returns:
+        List of record dictionaries
+    """
+    if "record" in table.column_names:
+        # Format version 1
+        return [json.loads(record) for record in table.column("record").to_pylist()]
+
+    records: List[Dict[str, Any]] = [{} for _ in range(table.num_rows)]
+    for field, kind in json.loads(table.schema.metadata[b"record_fields"]):
+        values = table.column(f"{RECORD_PREFIX}{field}").to_pylist()
+        if kind == "json":
+            values = [None if value is None else json.loads(value) for value in values]
+        elif kind == "number":
+            integral = table.column(f"{RECORD_PREFIX}{field}.int").to_pylist()
+            values = [
+                int(value) if is_int else value
+                for value, is_int in zip(values, integral)
+            ]
+        for record, value in zip(records, values):
+            if value is not None:
+                record[field] = value
+    for record, nulls in zip(records, table.column("record_nulls").to_pylist()):
+        for field in nulls or ():
+            record[field] = None
+    return records
+
+
+def build_snapshot_tables(
+    data: Dict[str, List[Dict[str, Any]]],
+) -> Dict[str, pa.Table]:
+    """
+    Convert resource data to Arrow tables.
+
+    Every table keeps the record fields in typed columns (see
+    _record_columns), so the data can be restored exactly. The allocations
+    table holds one row per
+    Gantt row: the explicit resource allocations of each project, or one
+    full-time row per assigned resource of projects without allocations.
+
+    Args:
+        data: Resource data dictionary
+
+    Returns:
+        Dictionary mapping table names to Arrow tables
+    """
+    people = data.get("people", [])
+    teams = data.get("teams", [])
+    departments = data.get("departments", [])
+    projects = data.get("projects", [])
+
+    tables = {
+        "people": _table_with_records(
+            {
+                "name": pa.array([p.get("name") for p in people], type=pa.string()),
+                "department": _dict_array([p.get("department") for p in people]),
+                "team": _dict_array([p.get("team") for p in people]),
+                "daily_cost": _float_array([p.get("daily_cost") for p in people]),
+            },
+            people,
+        ),
+        "teams": _table_with_records(
+            {
+                "name": pa.array([t.get("name") for t in teams], type=pa.string()),
+                "department": _dict_array([t.get("department") for t in teams]),
+            },
+            teams,
+        ),
+        "departments": _table_with_records(
+            {"name": pa.array([d.get("name") for d in departments], type=pa.string())},
+            departments,
+        ),
+    }
+
+    project_records = []
+    for project in projects:
+        stored = dict(project)
+        stored.pop("resource_allocations", None)
+        project_records.append(stored)
+    tables["projects"] = _table_with_records(
+        {
+            "name": pa.array([p.get("name") for p in projects], type=pa.string()),
+            "start_date": _date_array([p.get("start_date") for p in projects]),
+            "end_date": _date_array([p.get("end_date") for p in projects]),
+            "priority": pa.array(
+                [p.get("priority") for p in projects], type=pa.int64()
+            ),
+            "has_allocations": pa.array(
+                ["resource_allocations" in p for p in projects], type=pa.bool_()
+            ),
+        },
+        project_records,
+    )
+
+    columns: Dict[str, List[Any]] = {
+        key: []
+        for key in [
+            "project",
+            "position",
+            "resource",
+            "start_date",
+            "end_date",
+            "allocation_percentage",
+            "explicit",
+            "record",
+        ]
+    }
+    for project in projects:
+        allocations = project.get("resource_allocations") or []
+        if allocations:
+            rows = [
+                (
+                    i,
+                    allocation.get("resource"),
+                    allocation.get("start_date"),
+                    allocation.get("end_date"),
+                    allocation.get("allocation_percentage"),
+                    True,
+                    allocation,
+                )
+                for i, allocation in enumerate(allocations)
+            ]
+        else:
+            # Projects without allocations use their assigned resources full time
+            rows = [
+                (
+                    i,
+                    resource,
+                    project.get("start_date"),
+                    project.get("end_date"),
+                    100,
+                    False,
+                    None,
+                )
+                for i, resource in enumerate(project.get("assigned_resources", []))
+            ]
+        for row in rows:
+            columns["project"].append(project.get("name"))
+            for key, value in zip(list(columns)[1:], row):
+                columns[key].append(value)
+
+    tables["allocations"] = _table_with_records(
+        {
+            "project": _dict_array(columns["project"]),
+            "position": pa.array(columns["position"], type=pa.int32()),
+            "resource": _dict_array(columns["resource"]),
+            "start_date": _date_array(columns["start_date"]),
+            "end_date": _date_array(columns["end_date"]),
+            "allocation_percentage": _float_array(columns["allocation_percentage"]),
+            "explicit": pa.array(columns["explicit"], type=pa.bool_()),
+        },
+        columns["record"],
+    )
+    return tables
+
+
+def _read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    """Read the snapshot manifest, or None if there is no snapshot."""
+    try:
+        with open(get_manifest_path(directory), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(
+    data: Dict[str, List[Dict[str, Any]]], directory: str = SNAPSHOT_DIR
+) -> Dict[str, int]:
+    """
+    Write resource data as a new snapshot generation.
+
+    The tables go to a new generation folder first and the manifest is
+    replaced atomically afterwards, so readers always see a complete
+    snapshot. Files of older generations stay valid while they are mapped
+    and are removed once nothing holds them open.
+
+    Args:
+        data: Resource data dictionary
+        directory: Snapshot directory
+
+    Returns:
+        Dictionary with the number of rows per table
+    """
+    tables = build_snapshot_tables(data)
+    manifest = _read_manifest(directory)
+    generation = manifest["generation"] + 1 if manifest else 1
+    generation_dir = os.path.join(directory, f"{generation:06d}")
+    os.makedirs(generation_dir, exist_ok=True)
+
+    for name, table in tables.items():
+        with pa.OSFile(os.path.join(generation_dir, f"{name}.arrow"), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    counts = {name: table.num_rows for name, table in tables.items()}
+    atomic_write_json(
+        get_manifest_path(directory),
+        {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "generation": generation,
+            "counts": counts,
+        },
+    )
+
+    # Memory-mapped files cannot be removed on every platform, those are
+    # retried after the next write
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry != f"{generation:06d}" and entry.isdigit() and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+    return counts
+
+
+def _check_format(manifest: Dict[str, Any]) -> None:
+    """Raise a ValueError if the snapshot format cannot be read."""
+    if manifest.get("format_version") not in READABLE_FORMAT_VERSIONS:
+        raise ValueError(
+            f"Unsupported snapshot format version: {manifest.get('format_version')}"
+        )
+
+
+def _map_tables(identity: Tuple[str, int]) -> Dict[str, pa.Table]:
+    """Memory-map the tables of a snapshot generation, reusing mapped ones."""
+    with _snapshot_lock:
+        tables = _mapped_snapshots.get(identity)
+        if tables is not None:
+            _mapped_snapshots.move_to_end(identity)
+            return tables
+
+    directory, generation = identity
+    generation_dir = os.path.join(directory, f"{generation:06d}")
+    tables = {}
+    for name in SNAPSHOT_TABLES:
+        source = pa.memory_map(os.path.join(generation_dir, f"{name}.arrow"), "r")
+        tables[name] = pa.ipc.open_file(source).read_all()
+
+    with _snapshot_lock:
+        _mapped_snapshots[identity] = tables
+        while len(_mapped_snapshots) > MAX_MAPPED_SNAPSHOTS:
+            _mapped_snapshots.popitem(last=False)
+    return tables
+
+
+def get_snapshot_identity(directory: str = SNAPSHOT_DIR) -> Optional[Tuple[str, int]]:
+    """
+    Get the identity of the current snapshot.
+
+    Args:
+        directory: Snapshot directory
+
+    Returns:
+        Tuple of the absolute directory and the generation, or None if there
+        is no snapshot
+    """
+    manifest = _read_manifest(directory)
+    if manifest is None:
+        return None
+    _check_format(manifest)
+    return (os.path.abspath(directory), manifest["generation"])
+
+
+def read_snapshot_tables(
+    directory: str = SNAPSHOT_DIR,
+) -> Optional[Dict[str, pa.Table]]:
+    """
+    Memory-map the tables of the current snapshot.
+
+    The tables reference the mapped files without copying them.
+
+    Args:
+        directory: Snapshot directory
+
+    Returns:
+        Dictionary mapping table names to Arrow tables, or None if there is
+        no snapshot
+    """
+    identity = get_snapshot_identity(directory)
+    if identity is None:
+        return None
+    return _map_tables(identity)
+
+
+def restore_snapshot_data(
+    tables: Dict[str, pa.Table],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Rebuild the resource data dictionary from snapshot tables.
+
+    Args:
+        tables: Snapshot tables (see build_snapshot_tables)
+
+    Returns:
+        Resource data dictionary
+    """
+    data = {
+        name: _table_records(tables[name])
+        for name in ["people", "teams", "departments"]
+    }
+
+    allocations = tables["allocations"]
+    explicit = allocations.filter(allocations.column("explicit"))
+    by_project: Dict[str, List[Dict[str, Any]]] = {}
+    for project, allocation in zip(
+        explicit.column("project").to_pylist(), _table_records(explicit)
+    ):
+        by_project.setdefault(project, []).append(allocation)
+
+    projects = _table_records(tables["projects"])
+    for name, has_allocations, project in zip(
+        tables["projects"].column("name").to_pylist(),
+        tables["projects"].column("has_allocations").to_pylist(),
+        projects,
+    ):
+        if has_allocations:
+            project["resource_allocations"] = by_project.get(name, [])
+    data["projects"] = projects
+    return data
+
+
+def load_snapshot_with_identity(
+    directory: str = SNAPSHOT_DIR,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[Tuple[str, int]]]:
+    """
+    Load resource data from the snapshot together with the snapshot identity.
+
+    The identity finds the mapped tables again (see get_snapshot_tables), so
+    Gantt data of the snapshot can be built from its columns.
+
+    Args:
+        directory: Snapshot directory
+
+    Returns:
+        Tuple of the resource data dictionary (empty if there is no snapshot)
+        and the snapshot identity (None if there is no snapshot)
+    """
+    identity = get_snapshot_identity(directory)
+    if identity is None:
+        empty = {name: [] for name in ["people", "teams", "departments", "projects"]}
+        return empty, None
+    return restore_snapshot_data(_map_tables(identity)), identity
+
+
+def load_snapshot(directory: str = SNAPSHOT_DIR) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Load resource data from the snapshot.
+
+    Args:
+        directory: Snapshot directory
+
+    Returns:
+        Resource data dictionary (empty if there is no snapshot)
+    """
+    return load_snapshot_with_identity(directory)[0]
+
+
+def get_snapshot_tables(identity: Tuple[str, int]) -> Optional[Dict[str, pa.Table]]:
+    """
+    Get the tables of a snapshot by its identity.
+
+    Args:
+        identity: Snapshot identity (see get_snapshot_identity)
+
+    Returns:
+        Snapshot tables, or None if the generation no longer exists
+    """
+    try:
+        return _map_tables(identity)
+    except OSError:
+        return None
+
+
+def _decode(column: pa.ChunkedArray) -> np.ndarray:
+    """Convert a (dictionary-encoded) string column to an object array."""
+    if pa.types.is_dictionary(column.type):
+        column = column.cast(pa.string())
+    return column.to_numpy(zero_copy_only=False).astype(object)
+
+
+def _to_timestamps(column: pa.ChunkedArray) -> pd.Series:
+    """Convert a date32 column to datetime values."""
+    days = column.cast(pa.int32()).to_numpy(zero_copy_only=False)
+    return pd.Series(pd.to_datetime(days, unit="D"))
+
+
+@instrumented()
+def build_snapshot_gantt_data(tables: Dict[str, pa.Table]) -> pd.DataFrame:
+    """
+    Build Gantt chart data from snapshot tables with column operations.
+
+    The result matches create_gantt_data for the same data: resource types
+    are resolved with people shadowing teams and teams shadowing departments,
+    and the first record of a duplicated name wins.
+
+    Args:
+        tables: Snapshot tables (see build_snapshot_tables)
+
+    Returns:
+        DataFrame containing Gantt chart data
+    """
+    allocations = tables["allocations"]
+    if allocations.num_rows == 0:
+        return pd.DataFrame(columns=GANTT_COLUMNS)
+
+    # Distinct resource names are resolved once, rows take them by code
+    resource_column = allocations.column("resource").combine_chunks()
+    if not pa.types.is_dictionary(resource_column.type):
+        resource_column = resource_column.dictionary_encode()
+    names = pd.Index(resource_column.dictionary.to_pylist())
+    codes = resource_column.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+
+    def first_by_name(table: str, column: Optional[str]) -> pd.Series:
+        frame_names = _decode(tables[table].column("name"))
+        values = frame_names if column is None else _decode(tables[table].column(column))
+        series = pd.Series(values, index=frame_names)
+        return series[~series.index.duplicated()]
+
+    person_departments = first_by_name("people", "department")
+    person_teams = first_by_name("people", "team")
+    team_departments = first_by_name("teams", "department")
+    department_names = first_by_name("departments", None)
+
+    is_person = names.isin(person_departments.index)
+    is_team = ~is_person & names.isin(team_departments.index)
+    is_department = ~is_person & ~is_team & names.isin(department_names.index)
+
+    types = np.select(
+        [is_person, is_team, is_department], ["Person", "Team", "Department"], "Unknown"
+    ).astype(object)
+    departments = np.full(len(names), "Unknown", dtype=object)
+    departments[is_person] = person_departments.reindex(names[is_person]).to_numpy()
+    departments[is_team] = team_departments.reindex(names[is_team]).to_numpy()
+    departments[is_department] = names[is_department].to_numpy()
+    teams = np.full(len(names), None, dtype=object)
+    teams[is_person] = person_teams.reindex(names[is_person]).to_numpy()
+
+    valid = codes >= 0
+
+    def take(values: np.ndarray) -> np.ndarray:
+        taken = np.full(len(codes), None, dtype=object)
+        taken[valid] = values[codes[valid]]
+        return taken
+
+    projects = _decode(allocations.column("project"))
+    priorities = pd.Series(
+        tables["projects"].column("priority").to_pandas().to_numpy(),
+        index=_decode(tables["projects"].column("name")),
+    )
+    priorities = priorities[~priorities.index.duplicated()]
+
+    df = pd.DataFrame(
+        {
+            "Project": projects,
+            "Resource": take(names.to_numpy(dtype=object)),
+            "Type": take(types),
+            "Department": take(departments),
+            "Team": take(teams),
+            "Start": _to_timestamps(allocations.column("start_date")),
+            "End": _to_timestamps(allocations.column("end_date")),
+            "Priority": priorities.reindex(projects).to_numpy(),
+            "Allocation %": allocations.column("allocation_percentage").to_numpy(),
+        }
+    )
+    df["Duration"] = (df["End"] - df["Start"]).dt.days + 1
+    return df
@@ -0,0 +1,620 @@
+"""
+Storage service for the resource management application.
+
+This module provides the pluggable storage layer for resource data, with a
+JSON file backend, a SQLite backend that writes only changed rows and an
+Arrow snapshot backend that is memory-mapped on load.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.services.config_service import load_backup_settings, load_storage_backend
+from app.services.snapshot_service import (
+    SNAPSHOT_DIR,
+    get_manifest_path,
+    load_snapshot,
+    load_snapshot_with_identity,
+    write_snapshot,
+)
+from app.utils.file_utils import (
+    atomic_write_json,
+    create_backup,
+    load_json_with_recovery,
+)
+
+JSON_DATA_FILE = "resource_data.json"
+SQLITE_DATA_FILE = "resource_data.db"
+RESOURCE_TYPES = ["people", "teams", "departments", "projects"]
+SCHEMA_VERSION = 1
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS people (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    department TEXT,
+    team TEXT,
+    daily_cost REAL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    department TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS departments (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    priority INTEGER,
+    has_allocations INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS allocations (
+    project TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    resource TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    allocation_percentage REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (project, position)
+);
+CREATE INDEX IF NOT EXISTS idx_people_department ON people (department);
+CREATE INDEX IF NOT EXISTS idx_people_team ON people (team);
+CREATE INDEX IF NOT EXISTS idx_teams_department ON teams (department);
+CREATE INDEX IF NOT EXISTS idx_projects_dates ON projects (start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_allocations_resource ON allocations (resource);
+CREATE INDEX IF NOT EXISTS idx_allocations_dates ON allocations (start_date, end_date);
+"""
+
+# Serialized rows last read from or written to each database, used to find
+# the rows that changed since then
+_row_cache: Dict[str, Dict[str, Dict[str, str]]] = {}
+_row_cache_lock = threading.Lock()
+
+
+def _empty_data() -> Dict[str, List[Dict[str, Any]]]:
+    """Create an empty resource data dictionary."""
+    return {resource_type: [] for resource_type in RESOURCE_TYPES}
+
+
+def _serialize(record: Dict[str, Any]) -> str:
+    """Serialize a record to a canonical JSON string."""
+    return json.dumps(record, sort_keys=True, default=str)
+
+
+# JSON backend
+
+
+def load_json_storage(filename: str = JSON_DATA_FILE) -> Dict[str, Any]:
+    """
+    Load resource data from a JSON file.
+
+    Args:
+        filename: Path of the JSON file
+
+    Returns:
+        Resource data dictionary (empty if the file does not exist)
+    """
+    if not os.path.exists(filename):
+        return _empty_data()
+    return load_json_with_recovery(filename)
+
+
+def save_json_storage(
+    data: Dict[str, List[Dict[str, Any]]], filename: str = JSON_DATA_FILE
+) -> None:
+    """
+    Save resource data to a JSON file, rewriting the whole file atomically.
+
+    The previous file is kept as a compressed rolling backup first.
+
+    Args:
+        data: Resource data dictionary
+        filename: Path of the JSON file
+    """
+    backups = load_backup_settings()
+    if backups["enabled"]:
+        create_backup(filename, backups["keep"], backups["min_interval_minutes"])
+    atomic_write_json(filename, data)
+
+
+# SQLite backend
+
+
+def _connect(filename: str) -> sqlite3.Connection:
+    """Open a SQLite database and make sure the schema exists."""
+    conn = sqlite3.connect(filename)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SQLITE_SCHEMA)
+    conn.execute(
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+        (str(SCHEMA_VERSION),),
+    )
+    return conn
+
+
+def _entity_columns(resource_type: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the indexed column values of a record besides its name and data."""
+    if resource_type == "people":
+        return {
+            "department": record.get("department"),
+            "team": record.get("team"),
+            "daily_cost": record.get("daily_cost"),
+        }
+    if resource_type == "teams":
+        return {"department": record.get("department")}
+    if resource_type == "projects":
+        return {
+            "start_date": record.get("start_date"),
+            "end_date": record.get("end_date"),
+            "priority": record.get("priority"),
+            "has_allocations": int("resource_allocations" in record),
+        }
+    return {}
+
+
+def _upsert_rows(
+    conn: sqlite3.Connection,
+    resource_type: str,
+    records: List[Tuple[int, Dict[str, Any]]],
+) -> None:
+    """
+    Insert or update rows at the given positions.
+
+    The position is written for existing rows as well, so the stored order
+    follows the list index of each record.
+    """
+    for position, record in records:
+        name = record.get("name")
+        stored = dict(record)
+        allocations = stored.pop("resource_allocations", None)
+        values = {"name": name, "position": position}
+        values.update(_entity_columns(resource_type, record))
+        values["data"] = _serialize(stored)
+
+        columns = ", ".join(values)
+        placeholders = ", ".join("?" for _ in values)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in values if c != "name")
+        conn.execute(
+            f"INSERT INTO {resource_type} ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT(name) DO UPDATE SET {updates}",
+            list(values.values()),
+        )
+
+        if resource_type == "projects":
+            conn.execute("DELETE FROM allocations WHERE project = ?", (name,))
+            conn.executemany(
+                "INSERT INTO allocations (project, position, resource, start_date, "
+                "end_date, allocation_percentage, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        name,
+                        i,
+                        allocation.get("resource"),
+                        allocation.get("start_date"),
+                        allocation.get("end_date"),
+                        allocation.get("allocation_percentage"),
+                        _serialize(allocation),
+                    )
+                    for i, allocation in enumerate(allocations or [])
+                ],
+            )
+
+
+def _move_rows(
+    conn: sqlite3.Connection, resource_type: str, positions: List[Tuple[int, str]]
+) -> None:
+    """Set the position of unchanged rows by name."""
+    conn.executemany(
+        f"UPDATE {resource_type} SET position = ? WHERE name = ?", positions
+    )
+
+
+def _read_positions(conn: sqlite3.Connection, resource_type: str) -> Dict[str, int]:
+    """Read the stored position of every row by name."""
+    return dict(conn.execute(f"SELECT name, position FROM {resource_type}"))
+
+
+def _delete_rows(
+    conn: sqlite3.Connection, resource_type: str, names: List[str]
+) -> None:
+    """Delete rows by name (and the allocations of deleted projects)."""
+    rows = [(name,) for name in names]
+    conn.executemany(f"DELETE FROM {resource_type} WHERE name = ?", rows)
+    if resource_type == "projects":
+        conn.executemany("DELETE FROM allocations WHERE project = ?", rows)
+
+
+def _read_rows(conn: sqlite3.Connection) -> Dict[str, List[Dict[str, Any]]]:
+    """Read all resources from the database in their stored order."""
+    data = _empty_data()
+    for resource_type in ["people", "teams", "departments"]:
+        data[resource_type] = [
+            json.loads(row[0])
+            for row in conn.execute(
+                f"SELECT data FROM {resource_type} ORDER BY position"
+            )
+        ]
+
+    allocations: Dict[str, List[Dict[str, Any]]] = {}
+    for project, row_data in conn.execute(
+        "SELECT project, data FROM allocations ORDER BY project, position"
+    ):
+        allocations.setdefault(project, []).append(json.loads(row_data))
+
+    for name, has_allocations, row_data in conn.execute(
+        "SELECT name, has_allocations, data FROM projects ORDER BY position"
+    ):
+        project = json.loads(row_data)
+        if has_allocations:
+            project["resource_allocations"] = allocations.get(name, [])
+        data["projects"].append(project)
+
+    return data
+
+
+def _snapshot_rows(
+    data: Dict[str, List[Dict[str, Any]]],
+) -> Dict[str, Dict[str, str]]:
+    """Serialize every record of the data by resource type and name."""
+    return {
+        resource_type: {
+            record.get("name"): _serialize(record)
+            for record in data.get(resource_type, [])
+        }
+        for resource_type in RESOURCE_TYPES
+    }
+
+
+def load_sqlite_storage(filename: str = SQLITE_DATA_FILE) -> Dict[str, Any]:
+    """
+    Load resource data from a SQLite database.
+
+    Args:
+        filename: Path of the database file
+
+    Returns:
+        Resource data dictionary
+    """
+    conn = _connect(filename)
+    try:
+        data = _read_rows(conn)
+    finally:
+        conn.close()
+
+    with _row_cache_lock:
+        _row_cache[os.path.abspath(filename)] = _snapshot_rows(data)
+    return data
+
+
+def save_sqlite_storage(
+    data: Dict[str, List[Dict[str, Any]]],
+    filename: str = SQLITE_DATA_FILE,
+    changes: Optional[Dict[str, Iterable[str]]] = None,
+) -> Dict[str, int]:
+    """
+    Save resource data to a SQLite database, writing only rows that changed.
+
+    With changes, only the named records are serialized and written (or
+    deleted if they are no longer in the data). Without them, all rows are
+    compared with the snapshot taken at the last load or save. Either way
+    the database work is proportional to the number of changed records (and
+    the allocations of changed projects). Unchanged rows whose list index
+    differs from their stored position only get their position updated.
+
+    Args:
+        data: Resource data dictionary
+        filename: Path of the database file
+        changes: Names of the records changed since the data was loaded, by
+            resource type (e.g. the records of the change journal)
+
+    Returns:
+        Dictionary with the number of "upserted", "moved" and "deleted" rows
+    """
+    if changes is not None:
+        return _save_sqlite_changes(data, filename, changes)
+
+    key = os.path.abspath(filename)
+    snapshot = _snapshot_rows(data)
+    upserted = 0
+    moved_count = 0
+    deleted = 0
+
+    conn = _connect(filename)
+    try:
+        with _row_cache_lock:
+            previous = _row_cache.get(key)
+        if previous is None:
+            previous = _snapshot_rows(_read_rows(conn))
+
+        with conn:
+            for resource_type in RESOURCE_TYPES:
+                old_rows = previous.get(resource_type, {})
+                new_rows = snapshot[resource_type]
+                positions = _read_positions(conn, resource_type)
+
+                changed = []
+                moved = []
+                for i, record in enumerate(data.get(resource_type, [])):
+                    name = record.get("name")
+                    if old_rows.get(name) != new_rows[name]:
+                        changed.append((i, record))
+                    elif positions.get(name) != i:
+                        moved.append((i, name))
+                removed = [name for name in old_rows if name not in new_rows]
+
+                _delete_rows(conn, resource_type, removed)
+                _upsert_rows(conn, resource_type, changed)
+                _move_rows(conn, resource_type, moved)
+                upserted += len(changed)
+                moved_count += len(moved)
+                deleted += len(removed)
+    finally:
+        conn.close()
+
+    with _row_cache_lock:
+        _row_cache[key] = snapshot
+    return {"upserted": upserted, "moved": moved_count, "deleted": deleted}
+
+
+def _save_sqlite_changes(
+    data: Dict[str, List[Dict[str, Any]]],
+    filename: str,
+    changes: Dict[str, Iterable[str]],
+) -> Dict[str, int]:
+    """Write the named records of the data (see save_sqlite_storage)."""
+    upserted = 0
+    moved_count = 0
+    deleted = 0
+    written: Dict[str, Dict[str, Optional[str]]] = {}
+
+    conn = _connect(filename)
+    try:
+        with conn:
+            for resource_type, names in changes.items():
+                names = set(names)
+                if not names:
+                    continue
+                items = data.get(resource_type, [])
+                indices = {record.get("name"): i for i, record in enumerate(items)}
+                stored = _read_positions(conn, resource_type)
+
+                changed = [
+                    (indices[name], items[indices[name]])
+                    for name in names
+                    if name in indices
+                ]
+                removed = [name for name in names if name not in indices]
+                _delete_rows(conn, resource_type, removed)
+                _upsert_rows(conn, resource_type, changed)
+
+                # Inserts and deletes shift the positions of the other rows
+                moved = []
+                if removed or any(name not in stored for name in indices.keys() & names):
+                    moved = [
+                        (i, name)
+                        for name, i in indices.items()
+                        if name not in names and stored.get(name) != i
+                    ]
+                    _move_rows(conn, resource_type, moved)
+
+                written[resource_type] = {
+                    **{record.get("name"): _serialize(record) for _, record in changed},
+                    **{name: None for name in removed},
+                }
+                upserted += len(changed)
+                moved_count += len(moved)
+                deleted += len(removed)
+    finally:
+        conn.close()
+
+    with _row_cache_lock:
+        cached = _row_cache.get(os.path.abspath(filename))
+        if cached is not None:
+            for resource_type, rows in written.items():
+                for name, row in rows.items():
+                    if row is None:
+                        cached.get(resource_type, {}).pop(name, None)
+                    else:
+                        cached.setdefault(resource_type, {})[name] = row
+    return {"upserted": upserted, "moved": moved_count, "deleted": deleted}
+
+
+def upsert_sqlite_records(
+    resource_type: str,
+    records: List[Dict[str, Any]],
+    positions: List[int],
+    filename: str = SQLITE_DATA_FILE,
+) -> None:
+    """
+    Insert or update individual records in a SQLite database.
+
+    Args:
+        resource_type: One of "people", "teams", "departments" or "projects"
+        records: Records to write
+        positions: Index of each record in its resource list
+        filename: Path of the database file
+    """
+    conn = _connect(filename)
+    try:
+        with conn:
+            _upsert_rows(conn, resource_type, list(zip(positions, records)))
+    finally:
+        conn.close()
+
+    with _row_cache_lock:
+        cached = _row_cache.get(os.path.abspath(filename))
+        if cached is not None:
+            for record in records:
+                cached[resource_type][record.get("name")] = _serialize(record)
+
+
+def delete_sqlite_records(
+    resource_type: str, names: List[str], filename: str = SQLITE_DATA_FILE
+) -> None:
+    """
+    Delete individual records from a SQLite database.
+
+    Args:
+        resource_type: One of "people", "teams", "departments" or "projects"
+        names: Names of the records to delete
+        filename: Path of the database file
+    """
+    conn = _connect(filename)
+    try:
+        with conn:
+            _delete_rows(conn, resource_type, names)
+    finally:
+        conn.close()
+
+    with _row_cache_lock:
+        cached = _row_cache.get(os.path.abspath(filename))
+        if cached is not None:
+            for name in names:
+                cached[resource_type].pop(name, None)
+
+
+def migrate_json_to_sqlite(
+    json_file: str = JSON_DATA_FILE, sqlite_file: str = SQLITE_DATA_FILE
+) -> bool:
+    """
+    Copy resource data from the JSON file into an empty SQLite database.
+
+    The migration runs once: it is skipped if the database already records
+    a migration or contains any resources.
+
+    Args:
+        json_file: Path of the JSON file
+        sqlite_file: Path of the database file
+
+    Returns:
+        True if the data was migrated, False otherwise
+    """
+    if not os.path.exists(json_file):
+        return False
+
+    conn = _connect(sqlite_file)
+    try:
+        migrated = conn.execute(
+            "SELECT value FROM meta WHERE key = 'migrated_from'"
+        ).fetchone()
+        has_rows = any(
+            conn.execute(f"SELECT 1 FROM {resource_type} LIMIT 1").fetchone()
+            for resource_type in RESOURCE_TYPES
+        )
+        if migrated or has_rows:
+            return False
+
+        data = load_json_storage(json_file)
+        with conn:
+            for resource_type in RESOURCE_TYPES:
+                _upsert_rows(
+                    conn,
+                    resource_type,
+                    list(enumerate(data.get(resource_type, []))),
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)",
+                (os.path.abspath(json_file),),
+            )
+    finally:
+        conn.close()
+
+    with _row_cache_lock:
+        _row_cache.pop(os.path.abspath(sqlite_file), None)
+    return True
+
+
+def _load_sqlite_with_migration() -> Dict[str, Any]:
+    """Load the SQLite database, migrating the JSON file into it first if needed."""
+    migrate_json_to_sqlite()
+    return load_sqlite_storage()
+
+
+def migrate_json_to_snapshot(
+    json_file: str = JSON_DATA_FILE, directory: str = SNAPSHOT_DIR
+) -> bool:
+    """
+    Write the JSON file as the first Arrow snapshot if there is none yet.
+
+    Args:
+        json_file: Path of the JSON file
+        directory: Snapshot directory
+
+    Returns:
+        True if the data was migrated, False otherwise
+    """
+    if not os.path.exists(json_file) or os.path.exists(get_manifest_path(directory)):
+        return False
+    write_snapshot(load_json_storage(json_file), directory)
+    return True
+
+
+def _load_snapshot_with_migration() -> Dict[str, Any]:
+    """Load the Arrow snapshot, migrating the JSON file into it first if needed."""
+    migrate_json_to_snapshot()
+    return load_snapshot()
+
+
+def _load_snapshot_identity_with_migration() -> Tuple[Dict[str, Any], Any]:
+    """Load the Arrow snapshot and its identity, migrating the JSON file first."""
+    migrate_json_to_snapshot()
+    return load_snapshot_with_identity()
+
+
+STORAGE_BACKENDS: Dict[str, Dict[str, Any]] = {
+    "json": {
+        "load": load_json_storage,
+        "save": save_json_storage,
+        "file": JSON_DATA_FILE,
+    },
+    "sqlite": {
+        "load": _load_sqlite_with_migration,
+        "save": save_sqlite_storage,
+        # Saves only the records named in the changes
+        "save_changes": lambda data, changes: save_sqlite_storage(
+            data, changes=changes
+        ),
+        "file": SQLITE_DATA_FILE,
+    },
+    "arrow": {
+        "load": _load_snapshot_with_migration,
+        # Also returns the identity of the loaded snapshot
+        "load_with_identity": _load_snapshot_identity_with_migration,
+        "save": write_snapshot,
+        # The manifest is replaced last on every snapshot write
+        "file": get_manifest_path(),
+    },
+}
+
+
+def get_storage_backend(name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the load and save functions of a storage backend.
+
+    Args:
+        name: Backend name (defaults to the "storage_backend" setting)
+
+    Returns:
+        Dictionary with "load" and "save" functions and the data "file"
+    """
+    if name is None:
+        name = load_storage_backend()
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name}")
+    return STORAGE_BACKENDS[name]
@@ -0,0 +1,564 @@
+"""
+Shared data store service for the resource management application.
+
+This module provides a process-wide, versioned copy of the resource data
+shared by all browser sessions. Sessions read the shared data until they
+edit, then work on a private copy. Their changes are committed with a
+compare-and-swap on the records they saw: records changed meanwhile by
+another session are reported as conflicts instead of being overwritten.
+Once all its changes are committed, a session reads the shared data again.
+The copy is reloaded when the data files are changed outside the store.
+"""
+
+import os
+import copy
+import threading
+from typing import Dict, List, Any, Callable, Optional, Set, Tuple
+import streamlit as st
+from app.services.config_service import load_journal_settings
+from app.services.journal_service import (
+    JOURNAL_FILE,
+    append_journal,
+    apply_journal,
+    build_change_records,
+    fingerprint_data,
+    fingerprint_record,
+    schedule_compaction,
+)
+from app.services.storage_service import RESOURCE_TYPES, get_storage_backend
+from app.utils.cache_utils import (
+    bump_data_revision,
+    get_data_revision,
+    pop_pending_changes,
+    set_shared_data_version,
+)
+
+# Number of committed versions whose changes are kept for syncing sessions
+MAX_LOG_VERSIONS = 200
+
+# Loads the data and its origin from storage (see load_with_journal_origin)
+Loader = Callable[[], Tuple[Dict[str, List[Dict[str, Any]]], Optional[Dict[str, Any]]]]
+
+# The shared data and the fingerprints of its records are never modified in
+# place: each commit creates new lists and maps for the resource types it
+# changes, so every version stays a consistent snapshot
+_store: Dict[str, Any] = {
+    "version": 0,
+    "data": None,
+    "fingerprints": None,
+    "log": [],
+    # Signature of the data files the shared data corresponds to
+    "source": None,
+    # Snapshot and journal position the data was loaded from, while it is
+    # unchanged since (see journal_service.load_with_journal_origin)
+    "origin": None,
+}
+_store_lock = threading.RLock()
+
+
+def _source_signature() -> Tuple[Tuple[str, Optional[int], Optional[int]], ...]:
+    """Get the modification time and size of the data files."""
+    data_file = get_storage_backend()["file"]
+    signature = []
+    # SQLite writes go to its write-ahead log first
+    for filename in (data_file, f"{data_file}-wal", JOURNAL_FILE):
+        try:
+            stat = os.stat(filename)
+            signature.append((filename, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((filename, None, None))
+    return tuple(signature)
+
+
+def get_store_snapshot(
+    loader: Loader,
+) -> Dict[str, Any]:
+    """
+    Get the latest version of the shared data.
+
+    The data is loaded on first use and reloaded when the data files were
+    changed outside the store (another process, a manual edit or a journal
+    compaction). A reload with unchanged records keeps the current version.
+    The returned data is shared by all sessions and must not be modified.
+
+    Args:
+        loader: Function loading the data and its origin from storage
+
+    Returns:
+        Dictionary with "version", "data", "fingerprints" and "origin"
+    """
+    with _store_lock:
+        source = _source_signature()
+        if _store["data"] is None or source != _store["source"]:
+            data, origin = loader()
+            fingerprints = fingerprint_data(data)
+            if _store["data"] is None or fingerprints != _store["fingerprints"]:
+                _store.update(
+                    version=_store["version"] + 1,
+                    data=data,
+                    fingerprints=fingerprints,
+                    log=[],
+                    origin=origin,
+                )
+            # Files written while loading trigger one more (cheap) check
+            _store["source"] = source
+        return _latest_snapshot()
+
+
+def reset_store(data: Dict[str, List[Dict[str, Any]]]) -> int:
+    """
+    Replace the shared data entirely, e.g. after an import.
+
+    Sessions cannot sync record by record across a reset and switch to the
+    new data on their next run.
+
+    Args:
+        data: New resource data (copied)
+
+    Returns:
+        New version of the store
+    """
+    data = copy.deepcopy(data)
+    with _store_lock:
+        _store.update(
+            version=_store["version"] + 1,
+            data=data,
+            fingerprints=fingerprint_data(data),
+            log=[],
+            source=_source_signature(),
+            origin=None,
+        )
+        return _store["version"]
+
+
+def _latest_snapshot() -> Dict[str, Any]:
+    """Get the latest version of the shared data without checking the files."""
+    with _store_lock:
+        return {
+            "version": _store["version"],
+            "data": _store["data"],
+            "fingerprints": _store["fingerprints"],
+            "origin": _store["origin"],
+        }
+
+
+def get_changes_since(version: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get the change records committed after a version.
+
+    Args:
+        version: Version a session last synced to
+
+    Returns:
+        Change records, oldest first, or None if they are no longer available
+    """
+    with _store_lock:
+        if version == _store["version"]:
+            return []
+        log = _store["log"]
+        if not log or log[0][0] > version + 1:
+            return None
+        return [change for v, changes in log if v > version for change in changes]
+
+
+def commit_records(
+    records: List[Dict[str, Any]],
+    seen_fingerprints: Dict[str, Dict[str, bytes]],
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Commit change records to the shared data with a compare-and-swap.
+
+    A record is applied only if the shared record still matches the version
+    the session saw. Records whose shared version is already identical are
+    skipped, and the others are returned as conflicts.
+
+    Args:
+        records: Change records (see journal_service.build_change_records)
+        seen_fingerprints: Fingerprints of the records the session saw
+        force: Whether to overwrite conflicting records
+
+    Returns:
+        Dictionary with the new "version", "data", "fingerprints" and "origin"
+        and the "applied" and "conflicts" records
+    """
+    with _store_lock:
+        fingerprints = dict(_store["fingerprints"])
+        data = dict(_store["data"])
+        copied: Set[str] = set()
+        applied: List[Dict[str, Any]] = []
+        conflicts: List[Dict[str, Any]] = []
+
+        for record in records:
+            resource_type, name = record["entity"], record["name"]
+            payload = record.get("payload")
+            mine = fingerprint_record(payload) if payload is not None else None
+            current = fingerprints[resource_type].get(name)
+            if current == mine:
+                continue
+            if not force and current != seen_fingerprints[resource_type].get(name):
+                conflicts.append(record)
+                continue
+
+            if resource_type not in copied:
+                data[resource_type] = list(data[resource_type])
+                fingerprints[resource_type] = dict(fingerprints[resource_type])
+                copied.add(resource_type)
+            if mine is None:
+                fingerprints[resource_type].pop(name, None)
+            else:
+                fingerprints[resource_type][name] = mine
+            applied.append(copy.deepcopy(record))
+
+        if applied:
+            apply_journal(data, applied)
+            version = _store["version"] + 1
+            log = _store["log"] + [(version, applied)]
+            _store.update(
+                version=version,
+                data=data,
+                fingerprints=fingerprints,
+                log=log[-MAX_LOG_VERSIONS:],
+                origin=None,
+            )
+
+        return dict(_latest_snapshot(), applied=applied, conflicts=conflicts)
+
+
+def get_store_records(
+    keys: List[Tuple[str, str]],
+) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+    """
+    Get copies of shared records by resource type and name.
+
+    Args:
+        keys: (resource type, name) pairs
+
+    Returns:
+        Dictionary mapping each pair to a copy of the record (None if the
+        record does not exist)
+    """
+    with _store_lock:
+        records = {
+            resource_type: {
+                record.get("name"): record for record in _store["data"][resource_type]
+            }
+            for resource_type in {resource_type for resource_type, _ in keys}
+        }
+    return {
+        (resource_type, name): copy.deepcopy(records[resource_type].get(name))
+        for resource_type, name in keys
+    }
+
+
+# Session side
+
+
+def _set_session_version(snapshot: Dict[str, Any], shared: bool) -> None:
+    """Record the store version the session data corresponds to."""
+    set_shared_data_version(snapshot["version"] if shared else None)
+    st.session_state.store_state = {
+        "version": snapshot["version"],
+        "fingerprints": snapshot["fingerprints"],
+        # Fingerprints of the records last rendered to the user, checked
+        # when the session commits
+        "seen": st.session_state.get("store_state", {}).get(
+            "seen", snapshot["fingerprints"]
+        ),
+        "shared": shared,
+        "origin": snapshot["origin"] if shared else None,
+    }
+
+
+def _attach_shared_data(snapshot: Dict[str, Any]) -> None:
+    """Point the session at the shared data of a store version."""
+    st.session_state.data = snapshot["data"]
+    _set_session_version(snapshot, shared=True)
+    st.session_state.data_conflicts = []
+    bump_data_revision()
+    # The session holds exactly the shared data, nothing to commit
+    pop_pending_changes()
+
+
+def attach_session_data(
+    loader: Loader,
+) -> None:
+    """
+    Give a new session the shared data.
+
+    Args:
+        loader: Function loading the data and its origin from storage on
+            first use
+    """
+    snapshot = get_store_snapshot(loader)
+    st.session_state.pop("store_state", None)
+    _attach_shared_data(snapshot)
+
+
+def sync_session_data(
+    loader: Loader,
+) -> None:
+    """
+    Bring the session data up to the latest store version.
+
+    Sessions on shared data switch to the latest version. Sessions with a
+    private copy apply the changes committed by others since their version,
+    except on records with unresolved conflicts. If those changes are no
+    longer logged, the copy is rebuilt from the latest version instead.
+
+    Args:
+        loader: Function loading the data and its origin from storage on
+            first use
+    """
+    state = st.session_state.get("store_state")
+    if state is None:
+        attach_session_data(loader)
+        return
+
+    snapshot = get_store_snapshot(loader)
+    if snapshot["version"] == state["version"]:
+        return
+
+    if state["shared"]:
+        _attach_shared_data(snapshot)
+        return
+    changes = get_changes_since(state["version"])
+    if changes is None:
+        _rebase_private_data(snapshot)
+        return
+
+    conflicted = {
+        (record["entity"], record["name"])
+        for record in st.session_state.get("data_conflicts", [])
+    }
+    changes = [
+        copy.deepcopy(record)
+        for record in changes
+        if (record["entity"], record["name"]) not in conflicted
+    ]
+    apply_journal(st.session_state.data, changes)
+    changed_names: Dict[str, List[str]] = {}
+    for record in changes:
+        changed_names.setdefault(record["entity"], []).append(record["name"])
+    bump_data_revision(changed_names)
+    _set_session_version(snapshot, shared=False)
+
+
+def _rebase_private_data(snapshot: Dict[str, Any]) -> None:
+    """
+    Rebuild the private copy of the session on a store version.
+
+    Used when the changes since the session's version are no longer logged.
+    The records with unresolved conflicts keep the session's version and
+    all other records are taken from the snapshot. Conflicts whose record
+    now has the same fingerprint in the snapshot are dropped.
+    """
+    fingerprints = snapshot["fingerprints"]
+    conflicts = [
+        record
+        for record in st.session_state.get("data_conflicts", [])
+        if fingerprints[record["entity"]].get(record["name"])
+        != (
+            fingerprint_record(record["payload"])
+            if record.get("payload") is not None
+            else None
+        )
+    ]
+    if not conflicts:
+        _attach_shared_data(snapshot)
+        return
+
+    data = copy.deepcopy(snapshot["data"])
+    apply_journal(data, copy.deepcopy(conflicts))
+    st.session_state.data = data
+    st.session_state.data_conflicts = conflicts
+    _set_session_version(snapshot, shared=False)
+    bump_data_revision()
+    # The session holds the shared data besides its conflicts
+    pop_pending_changes()
+    st.warning(
+        "The data was reloaded because too many changes were made in other "
+        f"sessions. Your {len(conflicts)} conflicting changes were kept."
+    )
+
+
+def get_session_data_origin() -> Optional[Dict[str, Any]]:
+    """
+    Get the origin of the session data (see load_with_journal_origin).
+
+    Returns:
+        The origin of the shared data the session reads, or None if the
+        session has its own copy or the data was not loaded from a snapshot
+    """
+    state = st.session_state.get("store_state")
+    if state is None or not state["shared"]:
+        return None
+    return state["origin"]
+
+
+def ensure_private_data() -> None:
+    """
+    Give the session its own copy of the data before it edits it.
+
+    Called right before code that modifies st.session_state.data in place,
+    so sessions that only read never copy the data.
+    """
+    state = st.session_state.get("store_state")
+    if state is None or not state["shared"]:
+        return
+    st.session_state.data = copy.deepcopy(st.session_state.data)
+    state["shared"] = False
+    set_shared_data_version(None)
+
+
+def replace_session_data(data: Dict[str, List[Dict[str, Any]]]) -> None:
+    """
+    Replace the session data with new data owned by the session.
+
+    The data is not copied, e.g. the result of an import that replaces all
+    records. Like any edit, it is followed by bump_data_revision.
+
+    Args:
+        data: New resource data
+    """
+    st.session_state.data = data
+    state = st.session_state.get("store_state")
+    if state is not None:
+        state["shared"] = False
+        set_shared_data_version(None)
+
+
+def _find_changes(
+    data: Dict[str, List[Dict[str, Any]]], fingerprints: Dict[str, Any]
+) -> Dict[str, Set[str]]:
+    """Find the names of changed records, itemized or by full comparison."""
+    pending = pop_pending_changes()
+    if pending["unknown"]:
+        current = fingerprint_data(data)
+        return {
+            resource_type: {
+                name
+                for name in set(current[resource_type])
+                | set(fingerprints[resource_type])
+                if current[resource_type].get(name)
+                != fingerprints[resource_type].get(name)
+            }
+            for resource_type in RESOURCE_TYPES
+        }
+
+    changes: Dict[str, Set[str]] = {}
+    for resource_type, names in pending["records"].items():
+        records = {record.get("name"): record for record in data[resource_type]}
+        for name in names:
+            record = records.get(name)
+            fingerprint = fingerprint_record(record) if record is not None else None
+            if fingerprint != fingerprints[resource_type].get(name):
+                changes.setdefault(resource_type, set()).add(name)
+    return changes
+
+
+def _write_journal(records: List[Dict[str, Any]]) -> None:
+    """Append committed records to the change journal if it is enabled."""
+    if not records or not load_journal_settings()["enabled"]:
+        return
+    with _store_lock:
+        source = _source_signature()
+        append_journal(records)
+        # The store already holds these records, but changes made outside
+        # the store before the append must still trigger a reload
+        if source == _store["source"]:
+            _store["source"] = _source_signature()
+    schedule_compaction()
+
+
+def commit_session_changes() -> Dict[str, Any]:
+    """
+    Commit the pending changes of the session to the shared data.
+
+    Applied changes are appended to the change journal. Conflicting changes
+    stay in the session and are listed in st.session_state.data_conflicts
+    until resolved with resolve_data_conflicts. A session without conflicts
+    left is pointed back at the shared data.
+
+    Returns:
+        Dictionary with the "applied" and "conflicts" records
+    """
+    state = st.session_state.get("store_state")
+    if state is None:
+        pop_pending_changes()
+        return {"applied": [], "conflicts": []}
+
+    changes = _find_changes(st.session_state.data, state["fingerprints"])
+    records = build_change_records(st.session_state.data, changes, get_data_revision())
+    if not records:
+        # The user has now seen the version the session is on
+        state["seen"] = state["fingerprints"]
+        if not state["shared"] and not st.session_state.get("data_conflicts"):
+            # A private copy without edits is the shared data
+            _attach_shared_data(_latest_snapshot())
+        return {"applied": [], "conflicts": []}
+
+    result = commit_records(records, state["seen"])
+    _write_journal(result["applied"])
+
+    # Keep earlier conflicts the session has not committed again
+    committed = {(record["entity"], record["name"]) for record in records}
+    st.session_state.data_conflicts = [
+        record
+        for record in st.session_state.get("data_conflicts", [])
+        if (record["entity"], record["name"]) not in committed
+    ] + result["conflicts"]
+
+    if result["version"] != state["version"]:
+        # Changes of other sessions committed in between are picked up by
+        # the next sync, so only the fingerprints of this session's own
+        # records move forward
+        fingerprints = dict(state["fingerprints"])
+        for record in result["applied"]:
+            resource_type, name = record["entity"], record["name"]
+            fingerprints[resource_type] = dict(fingerprints[resource_type])
+            fingerprints[resource_type][name] = result["fingerprints"][
+                resource_type
+            ].get(name)
+        state["fingerprints"] = fingerprints
+    state["seen"] = state["fingerprints"]
+    if not st.session_state.data_conflicts:
+        # Records changed by others in between stay unseen until rendered
+        _attach_shared_data(result)
+    return {"applied": result["applied"], "conflicts": result["conflicts"]}
+
+
+def resolve_data_conflicts(keep_mine: bool) -> None:
+    """
+    Resolve the conflicts of the session.
+
+    The session is pointed back at the latest shared data afterwards.
+
+    Args:
+        keep_mine: Overwrite the shared records with the session's versions
+            if True, replace the session's versions with the shared records
+            otherwise
+    """
+    conflicts = st.session_state.get("data_conflicts", [])
+    if not conflicts:
+        return
+
+    if keep_mine:
+        records = build_change_records(
+            st.session_state.data,
+            _group_names(conflicts),
+            get_data_revision(),
+        )
+        result = commit_records(records, {}, force=True)
+        _write_journal(result["applied"])
+
+    # Either way the session now holds the shared records
+    _attach_shared_data(_latest_snapshot())
+
+
+def _group_names(records: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Group the names of change records by resource type."""
+    names: Dict[str, List[str]] = {}
+    for record in records:
+        names.setdefault(record["entity"], []).append(record["name"])
+    return names
@@ -7,7 +7,11 @@ This module provides validation functions for resource data.
 from typing import Dict, Any, List, Tuple
 import re
 import pandas as pd
-import streamlit as st  # Add this import for session state access
+from app.services.allocation_service import parse_dates
+from app.services.store_service import ensure_private_data
+from app.utils.cache_utils import bump_data_revision
+from app.utils.index_utils import build_entity_index, get_entity_index
+from app.utils.instrumentation_utils import instrumented
 
 
 def validate_person(person_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
@@ -34,12 +38,8 @@ def validate_person(person_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
 
     # Validate team - if team is specified, ensure it belongs to the selected department
     if person_data.get("team"):
-        teams = [
-            t
-            for t in st.session_state.data["teams"]
-            if t["name"] == person_data["team"]
-        ]
-        if teams and teams[0]["department"] != person_data["department"]:
+        team = get_entity_index()["teams"].get(person_data["team"])
+        if team and team["department"] != person_data["department"]:
             errors.append(
                 f"Team '{person_data['team']}' does not belong to department '{person_data['department']}'."
             )
@@ -55,17 +55,21 @@ def validate_person(person_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     return (len(errors) == 0, errors)
 
 
-def validate_person_associations(person, existing_data):
+def validate_person_associations(person, existing_data, index=None):
     """
     Validate person relationships with teams and departments.
 
     Args:
         person: Person data to validate
         existing_data: Current application data
+        index: Optional entity index of existing_data
 
     Returns:
         (bool, str): Tuple of (is_valid, error_message)
     """
+    if index is None:
+        index = get_entity_index(existing_data)
+
     team_name = person.get("team")
     department_name = person.get("department")
 
@@ -75,7 +79,7 @@ def validate_person_associations(person, existing_data):
 
     # Case 2: Person belongs to a team
     if team_name:
-        team = next((t for t in existing_data["teams"] if t["name"] == team_name), None)
+        team = index["teams"].get(team_name)
         if not team:
             return False, f"Team '{team_name}' not found"
 
@@ -95,10 +99,7 @@ def validate_person_associations(person, existing_data):
 
     # Case 3: Person belongs directly to department (Individual Contributor)
     if department_name and not team_name:
-        department = next(
-            (d for d in existing_data["departments"] if d["name"] == department_name),
-            None,
-        )
+        department = index["departments"].get(department_name)
         if not department:
             return False, f"Department '{department_name}' not found"
 
@@ -138,33 +139,33 @@ def validate_team(team_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     return (len(errors) == 0, errors)
 
 
-def validate_team_associations(team, existing_data):
+def validate_team_associations(team, existing_data, index=None):
     """
     Validate team relationships with departments and people.
 
     Args:
         team: Team data to validate
         existing_data: Current application data
+        index: Optional entity index of existing_data
 
     Returns:
         (bool, str): Tuple of (is_valid, error_message)
     """
+    if index is None:
+        index = get_entity_index(existing_data)
+
     department_name = team.get("department")
     members = team.get("members", [])
 
     # Check department exists if specified
     if department_name:
-        department = next(
-            (d for d in existing_data["departments"] if d["name"] == department_name),
-            None,
-        )
+        department = index["departments"].get(department_name)
         if not department:
             return False, f"Department '{department_name}' not found"
 
     # Check each member exists
     for member in members:
-        person = next((p for p in existing_data["people"] if p["name"] == member), None)
-        if not person:
+        if member not in index["people"]:
             return False, f"Person '{member}' not found"
 
     return True, ""
@@ -237,18 +238,23 @@ def validate_project(project_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     return (len(errors) == 0, errors)
 
 
-def validate_project_resource_assignments(project, existing_data):
+def validate_project_resource_assignments(project, existing_data, index=None):
     """
     Validate project resource assignments to prevent duplications.
 
     Args:
         project: Project data to validate
         existing_data: Current application data
+        index: Optional entity index of existing_data
 
     Returns:
         (bool, list): Tuple of (is_valid, conflicts)
     """
+    if index is None:
+        index = get_entity_index(existing_data)
+
     resources = project.get("assigned_resources", [])
+    assigned_resources = set(resources)
     conflicts = []
 
     # Track all people already assigned either directly or via team/department
@@ -257,16 +263,14 @@ def validate_project_resource_assignments(project, existing_data):
     # Check for resource assignment conflicts
     for resource in resources:
         # Check if resource is a person
-        person = next(
-            (p for p in existing_data["people"] if p["name"] == resource), None
-        )
+        person = index["people"].get(resource)
         if person:
             # Direct person assignment
             assigned_people.add(resource)
             continue
 
         # Check if resource is a team
-        team = next((t for t in existing_data["teams"] if t["name"] == resource), None)
+        team = index["teams"].get(resource)
         if team:
             # Check team members against already assigned people
             team_members = team.get("members", [])
@@ -279,44 +283,32 @@ def validate_project_resource_assignments(project, existing_data):
             continue
 
         # Check if resource is a department
-        department = next(
-            (d for d in existing_data["departments"] if d["name"] == resource), None
-        )
+        department = index["departments"].get(resource)
         if department:
             # Check for teams in this department that are already assigned
-            dept_teams = [
-                t["name"]
-                for t in existing_data["teams"]
-                if t.get("department") == resource
-            ]
-            dept_team_conflicts = [t for t in dept_teams if t in resources]
+            dept_teams = index["department_teams"].get(resource, [])
+            dept_team_conflicts = [t for t in dept_teams if t in assigned_resources]
             if dept_team_conflicts:
                 conflicts.append(
                     f"Department '{resource}' is assigned but its teams {dept_team_conflicts} are also assigned"
                 )
 
             # Check for individual people in this department that are already assigned
-            for person in existing_data["people"]:
-                person_dept = person.get("department")
-                if person_dept == resource and person["name"] in assigned_people:
+            for person_name in index["department_people"].get(resource, []):
+                if person_name in assigned_people:
                     conflicts.append(
-                        f"Department '{resource}' is assigned but person '{person['name']}' is already assigned directly"
+                        f"Department '{resource}' is assigned but person '{person_name}' is already assigned directly"
                     )
-                elif person_dept == resource:
-                    assigned_people.add(person["name"])
+                else:
+                    assigned_people.add(person_name)
 
             # Check for people who are in teams belonging to this department
             for team_name in dept_teams:
-                team = next(
-                    (t for t in existing_data["teams"] if t["name"] == team_name), None
-                )
-                if team and team_name in resources:
+                team = index["teams"].get(team_name)
+                if team and team_name in assigned_resources:
+                    team_people = set(index["team_people"].get(team_name, []))
                     for member in team.get("members", []):
-                        if member in assigned_people and member not in [
-                            p["name"]
-                            for p in existing_data["people"]
-                            if p.get("team") == team_name
-                        ]:
+                        if member in assigned_people and member not in team_people:
                             conflicts.append(
                                 f"Person '{member}' is already assigned but also belongs to team '{team_name}' in department '{resource}'"
                             )
@@ -399,28 +391,19 @@ def validate_department(
 
     if members and teams:
         # Check if any direct member is also part of a team in this department
-        team_members = []
+        index = get_entity_index()
+        team_members = set()
         for team_name in teams:
-            team = next(
-                (t for t in st.session_state.data["teams"] if t["name"] == team_name),
-                None,
-            )
+            team = index["teams"].get(team_name)
             if team:
-                team_members.extend(team.get("members", []))
+                team_members.update(team.get("members", []))
 
         for member in members:
             if member in team_members:
                 # Find which teams this member belongs to
                 member_teams = []
                 for team_name in teams:
-                    team = next(
-                        (
-                            t
-                            for t in st.session_state.data["teams"]
-                            if t["name"] == team_name
-                        ),
-                        None,
-                    )
+                    team = index["teams"].get(team_name)
                     if team and member in team.get("members", []):
                         member_teams.append(team_name)
 
@@ -443,22 +426,17 @@ def validate_team_department_change(
     Returns:
         Tuple containing (is_valid, affected_members)
     """
-    team = next(
-        (t for t in st.session_state.data["teams"] if t["name"] == team_name), None
-    )
-    if not team:
+    index = get_entity_index()
+    if team_name not in index["teams"]:
         return True, []
 
     affected_members = []
 
     # Find team members who have a direct department assignment different from the new department
-    for person in st.session_state.data["people"]:
-        if (
-            team_name == person.get("team")
-            and person.get("department")
-            and person["department"] != new_department
-        ):
-            affected_members.append(person["name"])
+    for person_name in index["team_people"].get(team_name, []):
+        person = index["people"][person_name]
+        if person.get("department") and person["department"] != new_department:
+            affected_members.append(person_name)
 
     return True, affected_members
 
@@ -474,16 +452,13 @@ def handle_person_team_assignment(person_name: str, team_name: str) -> Tuple[boo
     Returns:
         Tuple of (success, message)
     """
-    person = next(
-        (p for p in st.session_state.data["people"] if p["name"] == person_name), None
-    )
+    index = get_entity_index()
+    person = index["people"].get(person_name)
     if not person:
         return False, f"Person '{person_name}' not found"
 
     if team_name:
-        team = next(
-            (t for t in st.session_state.data["teams"] if t["name"] == team_name), None
-        )
+        team = index["teams"].get(team_name)
         if not team:
             return False, f"Team '{team_name}' not found"
 
@@ -491,7 +466,10 @@ def handle_person_team_assignment(person_name: str, team_name: str) -> Tuple[boo
         if team.get("department"):
             if person.get("department") != team["department"]:
                 # Update person's department to match team's department
+                ensure_private_data()
+                person = get_entity_index()["people"][person_name]
                 person["department"] = team["department"]
+                bump_data_revision({"people": [person_name]})
                 return (
                     True,
                     f"Person's department updated to '{team['department']}' to match team",
@@ -503,12 +481,171 @@ def handle_person_team_assignment(person_name: str, team_name: str) -> Tuple[boo
     return True, "Assignment handled successfully"
 
 
+def find_allocation_range_errors(projects: List[Dict[str, Any]]) -> List[List[str]]:
+    """
+    Check the dates and percentages of the resource allocations of projects.
+
+    The allocations of all projects are checked together in one vectorized
+    pass, with the rules and messages of validate_project_resources.
+    Allocations of the same resource within a project must not overlap:
+    sorted by start date, each one has to start after the latest end of the
+    earlier ones (allocations with invalid dates are left out).
+
+    Args:
+        projects: List of project dictionaries
+
+    Returns:
+        List with the error messages of each project
+    """
+    owners, resources, starts, ends, percentages = [], [], [], [], []
+    for position, project in enumerate(projects):
+        for allocation in project.get("resource_allocations", []):
+            owners.append(position)
+            resources.append(allocation.get("resource", "unknown"))
+            starts.append(allocation.get("start_date"))
+            ends.append(allocation.get("end_date"))
+            percentages.append(allocation.get("allocation_percentage"))
+
+    errors: List[List[str]] = [[] for _ in projects]
+    if not owners:
+        return errors
+
+    def to_dates(values: List[Any]) -> pd.Series:
+        try:
+            return parse_dates(pd.Series(values, dtype=object))
+        except (ValueError, TypeError):
+            return pd.to_datetime(
+                pd.Series(values, dtype=object), format="mixed", errors="coerce"
+            )
+
+    start_dates = to_dates(starts)
+    end_dates = to_dates(ends)
+    numbers = pd.to_numeric(pd.Series(percentages, dtype=object), errors="coerce")
+    invalid_dates = (start_dates.isna() | end_dates.isna()).to_numpy()
+    reversed_dates = (start_dates > end_dates).to_numpy()
+    invalid_numbers = numbers.isna().to_numpy()
+    out_of_range = ((numbers < 10) | (numbers > 100)).to_numpy()
+
+    for i in (
+        invalid_dates | reversed_dates | invalid_numbers | out_of_range
+    ).nonzero()[0]:
+        resource = resources[i]
+        if invalid_dates[i]:
+            errors[owners[i]].append(f"Invalid dates for {resource}")
+        elif reversed_dates[i]:
+            errors[owners[i]].append(
+                f"Start date must be before end date for {resource}"
+            )
+        if invalid_numbers[i]:
+            errors[owners[i]].append(f"Invalid allocation percentage for {resource}")
+        elif out_of_range[i]:
+            errors[owners[i]].append(
+                f"Allocation percentage must be between 10% and 100% for {resource}"
+            )
+
+    # Sorted by start within each project and resource, an allocation
+    # overlaps an earlier one if it starts on or before their latest end
+    dated = pd.DataFrame(
+        {
+            "Owner": owners,
+            "Resource": resources,
+            "Start": start_dates.to_numpy(),
+            "End": end_dates.to_numpy(),
+        }
+    )[~(invalid_dates | reversed_dates)]
+    dated = dated.sort_values(["Owner", "Resource", "Start"], kind="stable")
+    groups = [dated["Owner"], dated["Resource"]]
+    latest_end = dated["End"].groupby(groups).cummax().groupby(groups).shift()
+    overlapping = dated[(dated["Start"] <= latest_end).to_numpy()]
+    for owner, resource, start in zip(
+        overlapping["Owner"], overlapping["Resource"], overlapping["Start"]
+    ):
+        errors[owner].append(
+            f"Overlapping allocations for {resource} starting "
+            f"{start.strftime('%Y-%m-%d')}"
+        )
+    return errors
+
+
+def validate_import_batch(
+    resource_type: str,
+    records: List[Dict[str, Any]],
+    data: Dict[str, List[Dict[str, Any]]],
+    index: Dict[str, Any],
+) -> List[str]:
+    """
+    Validate the relationships of a batch of imported records.
+
+    Every check reads the prebuilt entity index, so a batch is validated in
+    one pass over its records. Projects are checked for overlapping resource
+    assignments and for allocation dates, percentages and overlaps. The
+    errors are only reported: the importers still import the records.
+
+    Args:
+        resource_type: One of "people", "teams", "departments" or "projects"
+        records: Records of the batch
+        data: Data the records are checked against
+        index: Entity index of data
+
+    Returns:
+        List of error messages
+    """
+    errors = []
+    if resource_type == "people":
+        for record in records:
+            is_valid, error_msg = validate_person_associations(record, data, index)
+            if not is_valid:
+                errors.append(f"Person '{record.get('name', 'Unknown')}': {error_msg}")
+    elif resource_type == "teams":
+        for record in records:
+            is_valid, error_msg = validate_team_associations(record, data, index)
+            if not is_valid:
+                errors.append(f"Team '{record.get('name', 'Unknown')}': {error_msg}")
+    elif resource_type == "projects":
+        allocation_errors = find_allocation_range_errors(records)
+        for record, range_errors in zip(records, allocation_errors):
+            name = record.get("name", "Unknown")
+            _, conflicts = validate_project_resource_assignments(record, data, index)
+            errors.extend(
+                f"Project '{name}': {message}" for message in conflicts + range_errors
+            )
+    return errors
+
+
+def find_multi_team_members(teams: List[Dict[str, Any]]) -> List[str]:
+    """
+    Find people listed as members of more than one team.
+
+    Args:
+        teams: List of team dictionaries
+
+    Returns:
+        List of error messages
+    """
+    team_memberships = {}
+    for team in teams:
+        for member in team.get("members", []):
+            if member not in team_memberships:
+                team_memberships[member] = []
+            team_memberships[member].append(team.get("name", "Unknown"))
+
+    return [
+        f"Person '{person}' belongs to multiple teams: {', '.join(teams)}. Must belong to only one team."
+        for person, teams in team_memberships.items()
+        if len(teams) > 1
+    ]
+
+
+@instrumented()
 def validate_imported_data(
     data: Dict[str, List[Dict[str, Any]]],
 ) -> Tuple[bool, Dict[str, List[str]]]:
     """
     Validate imported data against all relationship rules.
 
+    The entity index is built once; people, teams and projects are then each
+    checked in one pass (see validate_import_batch).
+
     Args:
         data: Dictionary containing people, teams, departments, and projects
 
@@ -522,44 +659,18 @@ def validate_imported_data(
         "projects": [],
     }
 
-    # Validate people
-    for person in data.get("people", []):
-        is_valid, error_msg = validate_person_associations(person, data)
-        if not is_valid:
-            validation_errors["people"].append(
-                f"Person '{person.get('name', 'Unknown')}': {error_msg}"
-            )
+    # Index the data once for all checks
+    index = build_entity_index(data)
 
-    # Validate teams
-    for team in data.get("teams", []):
-        is_valid, error_msg = validate_team_associations(team, data)
-        if not is_valid:
-            validation_errors["teams"].append(
-                f"Team '{team.get('name', 'Unknown')}': {error_msg}"
+    for resource_type in ["people", "teams", "projects"]:
+        validation_errors[resource_type].extend(
+            validate_import_batch(
+                resource_type, data.get(resource_type, []), data, index
             )
-
-    # Validate projects
-    for project in data.get("projects", []):
-        is_valid, conflicts = validate_project_resource_assignments(project, data)
-        if not is_valid:
-            for conflict in conflicts:
-                validation_errors["projects"].append(
-                    f"Project '{project.get('name', 'Unknown')}': {conflict}"
-                )
+        )
 
     # Check for people in multiple teams
-    team_memberships = {}
-    for team in data.get("teams", []):
-        for member in team.get("members", []):
-            if member not in team_memberships:
-                team_memberships[member] = []
-            team_memberships[member].append(team.get("name", "Unknown"))
-
-    for person, teams in team_memberships.items():
-        if len(teams) > 1:
-            validation_errors["people"].append(
-                f"Person '{person}' belongs to multiple teams: {', '.join(teams)}. Must belong to only one team."
-            )
+    validation_errors["people"].extend(find_multi_team_members(data.get("teams", [])))
 
     # Overall validation result
     is_valid = all(len(errors) == 0 for errors in validation_errors.values())
@@ -607,5 +718,18 @@ def suggest_relationship_fixes(
                 fixes["projects"].append(
                     f"Choose either department assignment or individual person assignments, not both. {error}"
                 )
+            elif "Allocation percentage must be between" in error:
+                fixes["projects"].append(
+                    f"Set the allocation percentage between 10% and 100%. {error}"
+                )
+            elif "Start date must be before end date" in error:
+                fixes["projects"].append(
+                    f"Swap or correct the allocation dates. {error}"
+                )
+            elif "Overlapping allocations for" in error:
+                fixes["projects"].append(
+                    "Merge the overlapping allocations into one or shift their "
+                    f"dates so they follow each other. {error}"
+                )
 
     return fixes
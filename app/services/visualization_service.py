@@ -4,8 +4,17 @@ Visualization service for the resource management application.
 This module provides data transformation and preparation for visualizations.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from app.services.allocation_service import (
+    calculate_allocation_totals,
+    build_allocation_matrix,
+    slice_allocation_matrix,
+)
+from app.services.calendar_service import build_work_calendar
+from app.services.cost_service import calculate_project_costs
+from app.utils.index_utils import get_entity_index
 
 
 def prepare_gantt_data(
@@ -22,6 +31,8 @@ def prepare_gantt_data(
         DataFrame with Gantt chart data
     """
     gantt_data = []
+    # Resource types are looked up once per row, the index is built once
+    index = get_entity_index(resources)
 
     for project in projects:
         # Get project details
@@ -35,7 +46,7 @@ def prepare_gantt_data(
         # If no specific allocations, use assigned resources with 100% allocation
         if not resource_allocations and "assigned_resources" in project:
             for resource_name in project["assigned_resources"]:
-                resource_type, dept = _determine_resource_type(resource_name, resources)
+                resource_type, dept = _determine_resource_type(resource_name, index)
 
                 gantt_data.append(
                     {
@@ -52,7 +63,7 @@ def prepare_gantt_data(
             # Process specific allocations
             for allocation in resource_allocations:
                 resource_name = allocation["resource"]
-                resource_type, dept = _determine_resource_type(resource_name, resources)
+                resource_type, dept = _determine_resource_type(resource_name, index)
                 alloc_start = pd.to_datetime(allocation["start_date"])
                 alloc_end = pd.to_datetime(allocation["end_date"])
                 alloc_percentage = allocation["allocation_percentage"]
@@ -110,48 +121,34 @@ def prepare_utilization_data(
     # Get the min and max dates for the entire period
     min_date = gantt_data["Start"].min()
     max_date = gantt_data["End"].max()
-    total_days = (max_date - min_date).days + 1
 
-    # Calculate utilization per resource
-    resources = gantt_data["Resource"].unique()
-    utilization_data = []
-
-    for resource in resources:
-        resource_data = gantt_data[gantt_data["Resource"] == resource]
-        resource_type = resource_data["Type"].iloc[0]
-        department = resource_data["Department"].iloc[0]
-
-        # Calculate allocation per day
-        daily_allocation = {}
-        for _, row in resource_data.iterrows():
-            dates = pd.date_range(start=row["Start"], end=row["End"])
-            allocation = row["Allocation %"] / 100
-
-            for date in dates:
-                daily_allocation[date] = daily_allocation.get(date, 0) + allocation
-
-        # Calculate metrics
-        allocated_days = sum(min(alloc, 1) for alloc in daily_allocation.values())
-        over_allocated_days = sum(
-            max(alloc - 1, 0) for alloc in daily_allocation.values()
-        )
-        utilization_pct = allocated_days / total_days * 100
-
-        utilization_data.append(
-            {
-                "Resource": resource,
-                "Type": resource_type,
-                "Department": department,
-                "Utilization %": utilization_pct,
-                "Overallocation %": over_allocated_days / total_days * 100,
-            }
-        )
-
-    return pd.DataFrame(utilization_data)
+    # Calculate utilization per resource over its working days
+    first_rows = gantt_data.drop_duplicates(subset="Resource")
+    calendar = build_work_calendar(
+        first_rows["Resource"].to_numpy(), min_date, max_date, resources
+    )
+    totals = calculate_allocation_totals(gantt_data, calendar)
+    working_days = calendar["cumulative_working_days"][
+        calendar["resource_patterns"], -1
+    ]
+    divisor = np.where(working_days > 0, working_days, np.inf)
+
+    return pd.DataFrame(
+        {
+            "Resource": first_rows["Resource"].to_numpy(),
+            "Type": first_rows["Type"].to_numpy(),
+            "Department": first_rows["Department"].to_numpy(),
+            "Utilization %": totals["Allocated Days"].to_numpy() / divisor * 100,
+            "Overallocation %": totals["Overallocated Days"].to_numpy() / divisor * 100,
+        }
+    )
 
 
 def prepare_capacity_data(
-    gantt_data: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp
+    gantt_data: pd.DataFrame,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    allocation_matrix: Optional[Dict[str, Any]] = None,
 ) -> pd.DataFrame:
     """
     Prepare data for capacity visualization.
@@ -160,6 +157,7 @@ def prepare_capacity_data(
         gantt_data: DataFrame with Gantt chart data
         start_date: Start date for the capacity calculation
         end_date: End date for the capacity calculation
+        allocation_matrix: Optional precomputed allocation matrix for gantt_data
 
     Returns:
         DataFrame with capacity data
@@ -177,45 +175,35 @@ def prepare_capacity_data(
             ]
         )
 
-    # Create a date range
-    all_dates = pd.date_range(start=start_date, end=end_date)
-
-    # Create capacity data
+    # Read the requested window from the allocation matrix
+    if allocation_matrix is None:
+        allocation_matrix = build_allocation_matrix(gantt_data)
     resources = gantt_data["Resource"].unique()
-    capacity_data = []
-
-    for resource in resources:
-        resource_rows = gantt_data[gantt_data["Resource"] == resource]
-        resource_type = resource_rows["Type"].iloc[0]
-        department = resource_rows["Department"].iloc[0]
-
-        # For each date, calculate allocation
-        for date in all_dates:
-            # Get allocations for this resource on this date
-            allocations = resource_rows[
-                (resource_rows["Start"] <= date) & (resource_rows["End"] >= date)
-            ]
-
-            # Calculate total allocation
-            total_allocation = allocations["Allocation %"].sum() / 100
-
-            # Calculate availability and overallocation
-            available = max(0, 1 - total_allocation)
-            overallocated = max(0, total_allocation - 1)
-
-            capacity_data.append(
-                {
-                    "Resource": resource,
-                    "Type": resource_type,
-                    "Department": department,
-                    "Date": date,
-                    "Allocation": total_allocation,
-                    "Available": available,
-                    "Overallocated": overallocated,
-                }
-            )
-
-    return pd.DataFrame(capacity_data)
+    window = slice_allocation_matrix(
+        allocation_matrix, list(resources), start_date, end_date
+    )
+    all_dates = window["dates"]
+    total_allocation = window["matrix"].ravel() / 100
+
+    # Type and department come from the first row of each resource
+    first_rows = gantt_data.drop_duplicates(subset="Resource").set_index("Resource")
+
+    # Rows are ordered by resource, then by date
+    return pd.DataFrame(
+        {
+            "Resource": np.repeat(resources, len(all_dates)),
+            "Type": np.repeat(
+                first_rows.loc[resources, "Type"].to_numpy(), len(all_dates)
+            ),
+            "Department": np.repeat(
+                first_rows.loc[resources, "Department"].to_numpy(), len(all_dates)
+            ),
+            "Date": np.tile(all_dates, len(resources)),
+            "Allocation": total_allocation,
+            "Available": np.maximum(0, 1 - total_allocation),
+            "Overallocated": np.maximum(0, total_allocation - 1),
+        }
+    )
 
 
 def prepare_budget_data(
@@ -236,24 +224,24 @@ def prepare_budget_data(
     """
     budget_data = []
 
-    for project in projects:
-        if "allocated_budget" in project:
-            # Calculate actual cost based on resources
-            actual_cost = calculate_project_cost(project, people, teams)
-
-            budget_data.append(
-                {
-                    "Project": project["name"],
-                    "Allocated Budget": project["allocated_budget"],
-                    "Estimated Cost": actual_cost,
-                    "Variance": project["allocated_budget"] - actual_cost,
-                    "Variance %": (project["allocated_budget"] - actual_cost)
-                    / project["allocated_budget"]
-                    * 100
-                    if project["allocated_budget"] > 0
-                    else 0,
-                }
-            )
+    # Calculate the actual cost of all budgeted projects in one batch
+    budgeted = [project for project in projects if "allocated_budget" in project]
+    actual_costs = calculate_project_costs(budgeted, people, teams).to_numpy()
+
+    for project, actual_cost in zip(budgeted, actual_costs):
+        budget_data.append(
+            {
+                "Project": project["name"],
+                "Allocated Budget": project["allocated_budget"],
+                "Estimated Cost": actual_cost,
+                "Variance": project["allocated_budget"] - actual_cost,
+                "Variance %": (project["allocated_budget"] - actual_cost)
+                / project["allocated_budget"]
+                * 100
+                if project["allocated_budget"] > 0
+                else 0,
+            }
+        )
 
     if not budget_data:
         return pd.DataFrame(
@@ -270,108 +258,28 @@ def prepare_budget_data(
 
 
 def _determine_resource_type(
-    resource: str, data: Dict[str, List[Dict[str, Any]]]
+    resource: str, index: Dict[str, Any]
 ) -> tuple:
     """
     Determine the type and department of a resource.
 
     Args:
         resource: Resource name
-        data: Dictionary containing people, teams, and departments data
+        index: Entity index of the people, teams and departments (see
+            get_entity_index)
 
     Returns:
         Tuple of (resource_type, department)
     """
-    # Check if it's a person
-    for person in data.get("people", []):
-        if person["name"] == resource:
-            return "Person", person.get("department", "Unknown")
-
-    # Check if it's a team
-    for team in data.get("teams", []):
-        if team["name"] == resource:
-            return "Team", team.get("department", "Unknown")
+    resource_type = index["resource_types"].get(resource)
 
-    # Check if it's a department
-    for department in data.get("departments", []):
-        if department["name"] == resource:
-            return "Department", department["name"]
-
-    return "Unknown", "Unknown"
+    if resource_type == "Person":
+        return "Person", index["people"][resource].get("department", "Unknown")
 
+    if resource_type == "Team":
+        return "Team", index["teams"][resource].get("department", "Unknown")
 
-def calculate_project_cost(
-    project: Dict[str, Any], people: List[Dict[str, Any]], teams: List[Dict[str, Any]]
-) -> float:
-    """
-    Calculate the cost of a project based on assigned resources.
+    if resource_type == "Department":
+        return "Department", resource
 
-    Args:
-        project: Project dictionary
-        people: List of people dictionaries
-        teams: List of team dictionaries
-
-    Returns:
-        Total project cost
-    """
-    # Get resource allocations
-    resource_allocations = project.get("resource_allocations", [])
-
-    # If no specific allocations, use default allocation
-    if not resource_allocations:
-        start_date = pd.to_datetime(project["start_date"])
-        end_date = pd.to_datetime(project["end_date"])
-        duration_days = (end_date - start_date).days + 1
-        assigned_resources = project.get("assigned_resources", [])
-
-        total_cost = 0
-        for resource_name in assigned_resources:
-            # Check if it's a person
-            person = next((p for p in people if p["name"] == resource_name), None)
-            if person:
-                total_cost += person.get("daily_cost", 0) * duration_days
-                continue
-
-            # Check if it's a team
-            team = next((t for t in teams if t["name"] == resource_name), None)
-            if team:
-                # Sum the daily costs of all team members
-                team_cost = sum(
-                    next(
-                        (p.get("daily_cost", 0) for p in people if p["name"] == member),
-                        0,
-                    )
-                    for member in team.get("members", [])
-                )
-                total_cost += team_cost * duration_days
-
-        return total_cost
-
-    # Process specific allocations
-    total_cost = 0
-    for allocation in resource_allocations:
-        resource_name = allocation["resource"]
-        alloc_start = pd.to_datetime(allocation["start_date"])
-        alloc_end = pd.to_datetime(allocation["end_date"])
-        duration = (alloc_end - alloc_start).days + 1
-        allocation_pct = allocation["allocation_percentage"] / 100
-
-        # Check if it's a person
-        person = next((p for p in people if p["name"] == resource_name), None)
-        if person:
-            resource_cost = person.get("daily_cost", 0) * duration * allocation_pct
-            total_cost += resource_cost
-            continue
-
-        # Check if it's a team
-        team = next((t for t in teams if t["name"] == resource_name), None)
-        if team:
-            # Sum the daily costs of all team members
-            team_cost = sum(
-                next((p.get("daily_cost", 0) for p in people if p["name"] == member), 0)
-                for member in team.get("members", [])
-            )
-            resource_cost = team_cost * duration * allocation_pct
-            total_cost += resource_cost
-
-    return total_cost
+    return "Unknown", "Unknown"
@@ -9,22 +9,29 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.services.config_service import (
     load_utilization_thresholds,
     load_date_range_settings,
-    load_display_preferences,
+    get_chart_height,
     get_department_color,
 )
 from app.utils.ui_components import display_action_bar
+from app.utils.instrumentation_utils import instrumented
 from app.services.data_service import (
-    sort_projects_by_priority_and_date,
-    create_gantt_data,
-    apply_filters,
+    get_cached_gantt_data,
+    get_cached_filtered_data,
+    get_cached_allocation_matrix,
+    get_cached_resource_utilization,
+    get_cached_capacity_data,
     calculate_resource_utilization,
     calculate_capacity_data,
     find_resource_conflicts,
 )
+from app.services.allocation_service import (
+    build_allocation_matrix,
+    slice_allocation_matrix,
+)
 
 
 def create_resource_analytics_filters(page_key: str) -> Dict[str, Any]:
@@ -147,14 +154,27 @@ def create_resource_analytics_filters(page_key: str) -> Dict[str, Any]:
             )
 
         # Third row: Additional metrics filters
-        utilization_threshold = st.slider(
-            "Minimum Utilization %",
-            min_value=0,
-            max_value=100,
-            value=0,
-            step=5,
-            key=f"utilization_{page_key}",
-        )
+        col7, col8 = st.columns(2)
+
+        with col7:
+            utilization_threshold = st.slider(
+                "Minimum Utilization %",
+                min_value=0,
+                max_value=100,
+                value=0,
+                step=5,
+                key=f"utilization_{page_key}",
+            )
+
+        with col8:
+            group_allocations = st.selectbox(
+                "Team/Department Allocations",
+                options=["Groups", "Members", "Groups and members"],
+                index=0,
+                key=f"group_allocations_{page_key}",
+                help="Show team and department allocations as single resources, "
+                "distributed to their members, or both",
+            )
 
         # Assemble filters into a dictionary
         filters = {
@@ -164,6 +184,7 @@ def create_resource_analytics_filters(page_key: str) -> Dict[str, Any]:
             "dept_filter": dept_filter,
             "project_filter": project_filter,
             "utilization_threshold": utilization_threshold,
+            "group_allocations": group_allocations,
         }
 
         return filters
@@ -192,10 +213,7 @@ def display_visualize_data_tab():
     filters = create_resource_analytics_filters("workload")
 
     # Sort projects by priority and end date
-    sorted_projects = sort_projects_by_priority_and_date(
-        st.session_state.data["projects"]
-    )
-    gantt_data = create_gantt_data(sorted_projects, st.session_state.data)
+    gantt_data = get_cached_gantt_data(sort_by_priority=True)
 
     # Ensure the DataFrame has the required columns
     if gantt_data.empty or "Resource" not in gantt_data.columns:
@@ -205,7 +223,10 @@ def display_visualize_data_tab():
         return
 
     # Apply filters to data
-    filtered_data = apply_filters(gantt_data, filters)
+    filtered_data = get_cached_filtered_data(filters, sort_by_priority=True)
+
+    # Build the daily allocation matrix once for all sections
+    allocation_matrix = get_cached_allocation_matrix(filters, sort_by_priority=True)
 
     # Extract date range from filters
     start_date = filters["date_range"][0] if len(filters["date_range"]) > 0 else None
@@ -224,9 +245,10 @@ def display_visualize_data_tab():
     display_resource_matrix_view(filtered_data, start_date, end_date)
 
     # Display resource conflicts section with severity indicators
-    display_resource_conflicts_enhanced(filtered_data)
+    display_resource_conflicts_enhanced(filtered_data, allocation_matrix)
 
 
+@instrumented()
 def display_workload_summary_metrics(filtered_data: pd.DataFrame) -> None:
     """
     Display summary metrics for workload distribution.
@@ -265,6 +287,7 @@ def display_workload_summary_metrics(filtered_data: pd.DataFrame) -> None:
         st.metric("Underutilized", underutilized_count, delta_color="inverse")
 
 
+@instrumented()
 def display_workload_distribution_chart(filtered_data: pd.DataFrame) -> None:
     """
     Display workload distribution across resources.
@@ -276,8 +299,7 @@ def display_workload_distribution_chart(filtered_data: pd.DataFrame) -> None:
         return
 
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     st.subheader("Workload Distribution")
 
@@ -325,6 +347,7 @@ def display_workload_distribution_chart(filtered_data: pd.DataFrame) -> None:
     st.plotly_chart(fig, use_container_width=True)
 
 
+@instrumented()
 def display_project_workload_breakdown(filtered_data: pd.DataFrame) -> None:
     """
     Display project workload breakdown.
@@ -336,8 +359,7 @@ def display_project_workload_breakdown(filtered_data: pd.DataFrame) -> None:
         return
 
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     col1, col2 = st.columns(2)
 
@@ -393,19 +415,24 @@ def display_project_workload_breakdown(filtered_data: pd.DataFrame) -> None:
         st.plotly_chart(fig2, use_container_width=True)
 
 
-def display_resource_conflicts_enhanced(filtered_data: pd.DataFrame) -> None:
+@instrumented()
+def display_resource_conflicts_enhanced(
+    filtered_data: pd.DataFrame, allocation_matrix: Optional[Dict[str, Any]] = None
+) -> None:
     """
     Display enhanced resource conflicts visualization with severity indicators.
 
     Args:
         filtered_data: Filtered DataFrame of resource allocation data
+        allocation_matrix: Optional precomputed allocation matrix for filtered_data
     """
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     st.subheader("Resource Conflicts")
-    conflicts = find_resource_conflicts(filtered_data)
+    conflicts = find_resource_conflicts(
+        filtered_data, allocation_matrix=allocation_matrix, merge_intervals=True
+    )
 
     if conflicts.empty:
         st.success("No resource conflicts detected in the selected date range.")
@@ -415,7 +442,12 @@ def display_resource_conflicts_enhanced(filtered_data: pd.DataFrame) -> None:
     resources = conflicts["Resource"].unique()
 
     # Create a summary bar chart of conflicts
-    conflict_summary = conflicts.groupby("Resource")["Allocation"].max().reset_index()
+    conflict_summary = (
+        conflicts.groupby("Resource")["Peak Allocation"]
+        .max()
+        .reset_index()
+        .rename(columns={"Peak Allocation": "Allocation"})
+    )
     conflict_summary = conflict_summary.sort_values("Allocation", ascending=False)
 
     # Define a function to categorize the severity
@@ -446,8 +478,10 @@ def display_resource_conflicts_enhanced(filtered_data: pd.DataFrame) -> None:
 
     # For each resource with conflicts, show the detailed conflicts
     for resource in resources:
-        resource_conflicts = conflicts[conflicts["Resource"] == resource]
-        max_allocation = resource_conflicts["Allocation"].max()
+        resource_conflicts = conflicts[conflicts["Resource"] == resource].reset_index(
+            drop=True
+        )
+        max_allocation = resource_conflicts["Peak Allocation"].max()
         severity = get_severity(max_allocation)
 
         # Use colored icons based on severity
@@ -459,18 +493,16 @@ def display_resource_conflicts_enhanced(filtered_data: pd.DataFrame) -> None:
             icon = "🟡"
 
         with st.expander(
-            f"{icon} {resource} ({len(resource_conflicts)} overallocations, peak: {max_allocation:.0f}%)"
+            f"{icon} {resource} ({resource_conflicts['Days'].sum()} overallocated days, peak: {max_allocation:.0f}%)"
         ):
-            dates = resource_conflicts["Date"].dt.strftime("%Y-%m-%d").tolist()
-            allocations = resource_conflicts["Allocation"].tolist()
-            projects = resource_conflicts["Projects"].tolist()
-
-            # Create a simple table with the conflicts
+            # Create a simple table with one row per conflict period
             conflict_data = pd.DataFrame(
                 {
-                    "Date": dates,
-                    "Allocation %": allocations,
-                    "Conflicting Projects": projects,
+                    "From": resource_conflicts["Start"].dt.strftime("%Y-%m-%d"),
+                    "To": resource_conflicts["End"].dt.strftime("%Y-%m-%d"),
+                    "Days": resource_conflicts["Days"],
+                    "Peak Allocation %": resource_conflicts["Peak Allocation"],
+                    "Conflicting Projects": resource_conflicts["Projects"],
                 }
             )
 
@@ -499,13 +531,8 @@ def display_resource_utilization_tab():
     # Get filters using the standardized filter component
     filters = create_resource_analytics_filters("performance")
 
-    # Create the Gantt data
-    gantt_data = create_gantt_data(
-        st.session_state.data["projects"], st.session_state.data
-    )
-
-    # Apply filters
-    filtered_data = apply_filters(gantt_data, filters)
+    # Apply filters to the Gantt data
+    filtered_data = get_cached_filtered_data(filters)
 
     # Extract date range
     start_date = filters["date_range"][0]
@@ -515,11 +542,21 @@ def display_resource_utilization_tab():
     if filtered_data.empty:
         st.warning("No data matches your filter criteria. Try adjusting the filters.")
     else:
-        display_performance_metrics_dashboard(filtered_data, start_date, end_date)
+        display_performance_metrics_dashboard(
+            filtered_data,
+            start_date,
+            end_date,
+            # Copied: performance score columns are added to it
+            get_cached_resource_utilization(filters).copy(),
+        )
 
 
+@instrumented()
 def display_performance_metrics_dashboard(
-    filtered_data: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp
+    filtered_data: pd.DataFrame,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    utilization_df: Optional[pd.DataFrame] = None,
 ) -> None:
     """
     Display comprehensive performance metrics dashboard with visualizations focused on resource efficiency.
@@ -528,13 +565,14 @@ def display_performance_metrics_dashboard(
         filtered_data: Filtered DataFrame of resource allocation data
         start_date: Start date for the visualization
         end_date: End date for the visualization
+        utilization_df: Optional precomputed utilization metrics for filtered_data
     """
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     # Calculate utilization metrics
-    utilization_df = calculate_resource_utilization(filtered_data)
+    if utilization_df is None:
+        utilization_df = calculate_resource_utilization(filtered_data)
 
     if utilization_df.empty:
         st.info("No utilization data available with current filters.")
@@ -1271,12 +1309,7 @@ def display_capacity_planning_tab():
     filters = create_resource_analytics_filters("availability")
 
     # Create and filter data
-    gantt_data = create_gantt_data(
-        st.session_state.data["projects"], st.session_state.data
-    )
-
-    # Apply filters
-    filtered_data = apply_filters(gantt_data, filters)
+    filtered_data = get_cached_filtered_data(filters)
 
     # Extract date range
     start_date = filters["date_range"][0]
@@ -1286,11 +1319,22 @@ def display_capacity_planning_tab():
     if filtered_data.empty:
         st.warning("No data matches your filter criteria. Try adjusting the filters.")
     else:
-        display_capacity_planning_dashboard(filtered_data, start_date, end_date)
+        display_capacity_planning_dashboard(
+            filtered_data,
+            start_date,
+            end_date,
+            get_cached_allocation_matrix(filters),
+            get_cached_capacity_data(filters),
+        )
 
 
+@instrumented()
 def display_capacity_planning_dashboard(
-    filtered_data: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp
+    filtered_data: pd.DataFrame,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    allocation_matrix: Optional[Dict[str, Any]] = None,
+    capacity_data: Optional[pd.DataFrame] = None,
 ) -> None:
     """
     Display the capacity planning dashboard with forecast charts.
@@ -1299,15 +1343,19 @@ def display_capacity_planning_dashboard(
         filtered_data: Filtered DataFrame of resource allocation data
         start_date: Start date for the visualization
         end_date: End date for the visualization
+        allocation_matrix: Optional precomputed allocation matrix for filtered_data
+        capacity_data: Optional precomputed daily capacity data for filtered_data
     """
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     st.subheader("Capacity Planning Dashboard")
 
     # Generate capacity data
-    capacity_data = calculate_capacity_data(filtered_data, start_date, end_date)
+    if capacity_data is None:
+        capacity_data = calculate_capacity_data(
+            filtered_data, start_date, end_date, allocation_matrix
+        )
 
     if capacity_data.empty:
         st.info("No capacity data available with current filters.")
@@ -1325,7 +1373,11 @@ def display_capacity_planning_dashboard(
     # Create a heatmap of resource allocations over time
     # First, pivot the data to have resources as rows and dates as columns
     pivot_data = capacity_data.pivot_table(
-        index="Resource", columns="Date", values="Allocation", aggfunc="sum"
+        index="Resource",
+        columns="Date",
+        values="Allocation",
+        aggfunc="sum",
+        observed=True,
     )
 
     # Convert allocation to availability (100% - allocation)
@@ -1382,6 +1434,7 @@ def display_capacity_planning_dashboard(
     display_capacity_forecast(capacity_data, start_date, end_date, chart_height)
 
 
+@instrumented()
 def display_availability_summary_metrics(capacity_data: pd.DataFrame) -> None:
     """
     Display summary metrics for resource availability.
@@ -1392,6 +1445,12 @@ def display_availability_summary_metrics(capacity_data: pd.DataFrame) -> None:
     if capacity_data.empty:
         return
 
+    # Days off are neither available nor allocated
+    if "Working Day" in capacity_data.columns:
+        working_data = capacity_data[capacity_data["Working Day"]]
+        if not working_data.empty:
+            capacity_data = working_data
+
     # Calculate availability metrics
     # 1. Average availability across all resources
     avg_allocation = capacity_data["Allocation"].mean()
@@ -1411,7 +1470,9 @@ def display_availability_summary_metrics(capacity_data: pd.DataFrame) -> None:
         best_date_availability = 0
 
     # 3. Count resources with high availability (>50%)
-    high_avail_resources = capacity_data.groupby("Resource")["Allocation"].mean()
+    high_avail_resources = capacity_data.groupby("Resource", observed=True)[
+        "Allocation"
+    ].mean()
     high_avail_count = sum(
         high_avail_resources < 50
     )  # Less than 50% allocated means >50% available
@@ -1474,6 +1535,7 @@ def display_availability_summary_metrics(capacity_data: pd.DataFrame) -> None:
         )
 
 
+@instrumented()
 def display_availability_timeline(
     capacity_data: pd.DataFrame, chart_height: int = 600
 ) -> None:
@@ -1641,6 +1703,7 @@ def display_availability_timeline(
         )
 
 
+@instrumented()
 def display_availability_by_group(
     capacity_data: pd.DataFrame, chart_height: int = 600
 ) -> None:
@@ -1658,7 +1721,10 @@ def display_availability_by_group(
 
     # Calculate average allocation by department
     dept_allocation = (
-        capacity_data.groupby("Department")["Allocation"].mean().reset_index()
+        capacity_data.groupby("Department", observed=True)["Allocation"]
+        .mean()
+        .reset_index()
+        .astype({"Department": str})
     )
     dept_allocation["Availability"] = 100 - dept_allocation["Allocation"]
     dept_allocation = dept_allocation.sort_values("Availability", ascending=False)
@@ -1741,17 +1807,19 @@ def display_availability_by_group(
         # Check if "Team" column exists in the data
         if "Team" in capacity_data.columns:
             # Filter for resources that have team assignments
-            # We'll use fillna with an empty string to avoid dropping rows
-            team_data = capacity_data.copy()
-            team_data["Team"] = team_data["Team"].fillna("")
-            team_data = team_data[team_data["Team"] != ""]
+            team_data = capacity_data[
+                capacity_data["Team"].notna() & (capacity_data["Team"] != "")
+            ]
 
             if not team_data.empty and team_data["Team"].nunique() > 0:
                 # Calculate team availability by grouping
                 team_allocation = (
-                    team_data.groupby(["Department", "Team"])["Allocation"]
+                    team_data.groupby(["Department", "Team"], observed=True)[
+                        "Allocation"
+                    ]
                     .mean()
                     .reset_index()
+                    .astype({"Department": str, "Team": str})
                 )
                 team_allocation["Availability"] = 100 - team_allocation["Allocation"]
                 team_allocation = team_allocation.sort_values(
@@ -1815,7 +1883,10 @@ def display_availability_by_group(
         else:
             if "Type" in capacity_data.columns:
                 type_allocation = (
-                    capacity_data.groupby("Type")["Allocation"].mean().reset_index()
+                    capacity_data.groupby("Type", observed=True)["Allocation"]
+                    .mean()
+                    .reset_index()
+                    .astype({"Type": str})
                 )
                 type_allocation["Availability"] = 100 - type_allocation["Allocation"]
                 type_allocation = type_allocation.sort_values(
@@ -1881,6 +1952,7 @@ def display_availability_by_group(
                 st.info("No team or resource type data available for display.")
 
 
+@instrumented()
 def display_capacity_forecast(
     capacity_data: pd.DataFrame,
     start_date: pd.Timestamp,
@@ -2052,12 +2124,7 @@ def display_resource_calendar_tab():
     filters = create_resource_analytics_filters("calendar")
 
     # Create and filter data
-    gantt_data = create_gantt_data(
-        st.session_state.data["projects"], st.session_state.data
-    )
-
-    # Apply filters
-    filtered_data = apply_filters(gantt_data, filters)
+    filtered_data = get_cached_filtered_data(filters)
 
     # Extract date range
     start_date = filters["date_range"][0]
@@ -2067,11 +2134,17 @@ def display_resource_calendar_tab():
     if filtered_data.empty:
         st.warning("No data matches your filter criteria. Try adjusting the filters.")
     else:
-        display_enhanced_resource_calendar(filtered_data, start_date, end_date)
+        display_enhanced_resource_calendar(
+            filtered_data, start_date, end_date, get_cached_allocation_matrix(filters)
+        )
 
 
+@instrumented()
 def display_enhanced_resource_calendar(
-    filtered_data: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp
+    filtered_data: pd.DataFrame,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    allocation_matrix: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
     Display an enhanced calendar view of resource allocations with summary metrics and visualizations.
@@ -2080,25 +2153,32 @@ def display_enhanced_resource_calendar(
         filtered_data: Filtered DataFrame of resource allocation data
         start_date: Start date for the visualization
         end_date: End date for the visualization
+        allocation_matrix: Optional precomputed allocation matrix for filtered_data
     """
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     if filtered_data.empty:
         st.info("No data available for the calendar view with current filters.")
         return
 
+    if allocation_matrix is None:
+        allocation_matrix = build_allocation_matrix(filtered_data)
+
     # Get unique resources and create a multiselect or selectbox depending on number of resources
     resources = filtered_data["Resource"].unique()
 
     # Display calendar summary metrics
     st.subheader("Calendar Summary Metrics")
-    display_calendar_summary_metrics(filtered_data, start_date, end_date)
+    display_calendar_summary_metrics(
+        filtered_data, start_date, end_date, allocation_matrix
+    )
 
     # Display allocation pattern analysis
     st.subheader("Allocation Pattern Analysis")
-    display_allocation_patterns(filtered_data, start_date, end_date, chart_height)
+    display_allocation_patterns(
+        filtered_data, start_date, end_date, chart_height, allocation_matrix
+    )
 
     # Display time-based metrics visualization
     st.subheader("Weekly Allocation Patterns")
@@ -2163,8 +2243,12 @@ def display_enhanced_resource_calendar(
     )
 
 
+@instrumented()
 def display_calendar_summary_metrics(
-    filtered_data: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp
+    filtered_data: pd.DataFrame,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    allocation_matrix: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
     Display calendar-specific summary metrics.
@@ -2173,46 +2257,36 @@ def display_calendar_summary_metrics(
         filtered_data: Filtered DataFrame of resource allocation data
         start_date: Start date for the visualization
         end_date: End date for the visualization
+        allocation_matrix: Optional precomputed allocation matrix for filtered_data
     """
     if filtered_data.empty:
         return
 
-    # Calculate the total duration in the selected range
-    date_range = pd.date_range(start=start_date, end=end_date)
+    # Read the selected range from the allocation matrix
+    if allocation_matrix is None:
+        allocation_matrix = build_allocation_matrix(filtered_data)
+    window = slice_allocation_matrix(
+        allocation_matrix, start_date=start_date, end_date=end_date
+    )
+    date_range = window["dates"]
     total_days = len(date_range)
 
-    # Create a daily allocation table
-    daily_allocation = {}
-    max_daily_allocation = 0
-    busiest_date = None
-
-    for date in date_range:
-        # Filter assignments for this date
-        date_assignments = filtered_data[
-            (filtered_data["Start"] <= date) & (filtered_data["End"] >= date)
-        ]
-
-        # Count resources allocated on this date
-        resources_allocated = date_assignments["Resource"].nunique()
-        daily_allocation[date] = resources_allocated
-
-        # Track busiest date
-        if resources_allocated > max_daily_allocation:
-            max_daily_allocation = resources_allocated
-            busiest_date = date
+    # Count resources allocated on each date
+    daily_allocation = (window["matrix"] > 0).sum(axis=0)
+    max_daily_allocation = int(daily_allocation.max()) if total_days > 0 else 0
+    busiest_date = (
+        date_range[int(daily_allocation.argmax())] if max_daily_allocation > 0 else None
+    )
 
     # Calculate metrics
-    total_allocated_days = sum(daily_allocation.values())
+    total_allocated_days = int(daily_allocation.sum())
     avg_daily_resources = total_allocated_days / total_days if total_days > 0 else 0
     allocation_coverage = (
-        len([v for v in daily_allocation.values() if v > 0]) / total_days * 100
-        if total_days > 0
-        else 0
+        (daily_allocation > 0).sum() / total_days * 100 if total_days > 0 else 0
     )
 
     # Calculate weekend allocations percentage
-    weekend_dates = [d for d in date_range if d.weekday() >= 5]
-    weekend_allocation_count = sum(daily_allocation.get(d, 0) for d in weekend_dates)
+    weekend_allocation_count = int(daily_allocation[date_range.weekday >= 5].sum())
     weekend_allocation_pct = (
         weekend_allocation_count / total_allocated_days * 100
         if total_allocated_days > 0
@@ -2253,11 +2327,13 @@ def display_calendar_summary_metrics(
         )
 
 
+@instrumented()
 def display_allocation_patterns(
     filtered_data: pd.DataFrame,
     start_date: pd.Timestamp,
     end_date: pd.Timestamp,
     chart_height: int = 600,
+    allocation_matrix: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
     Display calendar-based allocation patterns visualization.
@@ -2267,15 +2343,22 @@ def display_allocation_patterns(
         start_date: Start date for the visualization
         end_date: End date for the visualization
         chart_height: Height of the chart in pixels
+        allocation_matrix: Optional precomputed allocation matrix for filtered_data
     """
     if filtered_data.empty:
         return
 
-    # Create a date range for analysis
-    date_range = pd.date_range(start=start_date, end=end_date)
+    # Read the selected range from the resource and project allocation matrices
+    if allocation_matrix is None:
+        allocation_matrix = build_allocation_matrix(filtered_data)
+    resource_window = slice_allocation_matrix(
+        allocation_matrix, start_date=start_date, end_date=end_date
+    )
+    project_window = build_allocation_matrix(
+        filtered_data, start_date, end_date, key="Project"
+    )
+    date_range = resource_window["dates"]
 
-    # Create a list to store daily allocation counts
-    allocation_by_day = []
     weekday_names = [
         "Monday",
         "Tuesday",
@@ -2287,27 +2370,18 @@ def display_allocation_patterns(
     ]
 
     # Calculate allocations by day of week
-    for date in date_range:
-        # Filter assignments for this date
-        date_assignments = filtered_data[
-            (filtered_data["Start"] <= date) & (filtered_data["End"] >= date)
-        ]
-
-        allocation_by_day.append(
-            {
-                "Date": date,
-                "WeekDay": weekday_names[date.weekday()],
-                "WeekNumber": date.isocalendar()[1],  # ISO week number
-                "MonthDay": date.day,
-                "Month": date.strftime("%B"),
-                "ResourceCount": date_assignments["Resource"].nunique(),
-                "ProjectCount": date_assignments["Project"].nunique(),
-                "TotalAllocation": date_assignments["Allocation %"].sum(),
-            }
-        )
-
-    # Convert to DataFrame
-    pattern_df = pd.DataFrame(allocation_by_day)
+    pattern_df = pd.DataFrame(
+        {
+            "Date": date_range,
+            "WeekDay": np.array(weekday_names)[date_range.weekday],
+            "WeekNumber": date_range.isocalendar().week.to_numpy(),  # ISO week number
+            "MonthDay": date_range.day,
+            "Month": date_range.strftime("%B"),
+            "ResourceCount": (resource_window["matrix"] > 0).sum(axis=0),
+            "ProjectCount": (project_window["matrix"] > 0).sum(axis=0),
+            "TotalAllocation": resource_window["matrix"].sum(axis=0, dtype=np.float64),
+        }
+    )
 
     if pattern_df.empty:
         st.info("No allocation data available for pattern analysis.")
@@ -2430,6 +2504,7 @@ def display_allocation_patterns(
         )
 
 
+@instrumented()
 def display_weekly_allocation_patterns(
     filtered_data: pd.DataFrame, chart_height: int = 600
 ) -> None:
@@ -2719,6 +2794,7 @@ def display_weekly_allocation_patterns(
             st.info("Not enough data to calculate resource stability.")
 
 
+@instrumented()
 def display_enhanced_calendar_view(
     filtered_data: pd.DataFrame,
     selected_resources: List[str],
@@ -3294,6 +3370,7 @@ def display_resource_calendar(
     display_enhanced_resource_calendar(filtered_data, start_date, end_date)
 
 
+@instrumented()
 def display_resource_matrix_view(
     filtered_data: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp
 ) -> None:
@@ -3306,8 +3383,7 @@ def display_resource_matrix_view(
         end_date: End date for the visualization
     """
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     st.subheader("Resource Matrix View")
 
@@ -8,15 +8,17 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 from app.utils.ui_components import display_action_bar
+from app.utils.instrumentation_utils import instrumented
 from app.services.config_service import (
     load_currency_settings,
     load_utilization_thresholds,
     load_department_colors,
 )
 from app.services.data_service import (
-    create_gantt_data,
-    calculate_resource_utilization,
-    calculate_project_cost,
+    get_cached_gantt_data,
+    get_cached_resource_utilization,
+    get_cached_project_costs,
+    get_cached_project_cost_series,
 )
 
 
@@ -56,6 +58,7 @@ def display_home_tab():
         _display_budget_overview()
 
 
+@instrumented()
 def _display_project_insights():
     """Display project insights in a dedicated expander."""
     # Calculate project insights
@@ -74,6 +77,7 @@ def _display_project_insights():
     if st.session_state.data["projects"]:
         # Calculate metrics
         today = datetime.now()
+        project_costs = get_cached_project_costs()
         for project in st.session_state.data["projects"]:
             # Count high priority
             if project.get("priority") == 1:
@@ -95,11 +99,7 @@ def _display_project_insights():
 
             # Budget metrics
             if "allocated_budget" in project:
-                actual_cost = calculate_project_cost(
-                    project,
-                    st.session_state.data["people"],
-                    st.session_state.data["teams"],
-                )
+                actual_cost = project_costs[project["name"]]
                 if actual_cost > project["allocated_budget"]:
                     over_budget_count += 1
 
@@ -170,6 +170,7 @@ def _display_project_insights():
             )
 
 
+@instrumented()
 def _display_resource_insights():
     """Display resource insights in a dedicated expander."""
     # Calculate resource insights
@@ -182,23 +183,19 @@ def _display_resource_insights():
 
     # Calculate utilization metrics if data exists
     if st.session_state.data["projects"] and st.session_state.data["people"]:
-        gantt_data = create_gantt_data(
-            st.session_state.data["projects"], st.session_state.data
-        )
-        if not gantt_data.empty:
-            utilization_df = calculate_resource_utilization(gantt_data)
-            if not utilization_df.empty:
-                thresholds = load_utilization_thresholds()
-                under_threshold = thresholds.get("under", 50)
-                over_threshold = thresholds.get("over", 100)
-
-                over_utilized_count = len(
-                    utilization_df[utilization_df["Utilization %"] > over_threshold]
-                )
-                under_utilized_count = len(
-                    utilization_df[utilization_df["Utilization %"] < under_threshold]
-                )
-                avg_utilization = utilization_df["Utilization %"].mean()
+        utilization_df = get_cached_resource_utilization()
+        if not utilization_df.empty:
+            thresholds = load_utilization_thresholds()
+            under_threshold = thresholds.get("under", 50)
+            over_threshold = thresholds.get("over", 100)
+
+            over_utilized_count = len(
+                utilization_df[utilization_df["Utilization %"] > over_threshold]
+            )
+            under_utilized_count = len(
+                utilization_df[utilization_df["Utilization %"] < under_threshold]
+            )
+            avg_utilization = utilization_df["Utilization %"].mean()
 
     # Display resource insights in collapsible card
     with st.expander("👥 Resource Insights", expanded=True):
@@ -234,6 +231,7 @@ def _display_resource_insights():
                 st.metric("Avg Utilization", "N/A")
 
 
+@instrumented()
 def _display_project_timeline():
     """Display project timeline visualization."""
     # Create project dataframe for timeline with status
@@ -358,6 +356,7 @@ def _display_project_timeline():
             st.metric("Completed Projects", completed_count)
 
 
+@instrumented()
 def _display_department_allocation():
     """Display department allocation pie chart."""
     if not st.session_state.data["people"]:
@@ -472,6 +471,7 @@ def _display_department_allocation():
         )
 
 
+@instrumented()
 def _display_utilization_summary():
     """Display utilization summary chart."""
     if not st.session_state.data["projects"] or not st.session_state.data["people"]:
@@ -479,16 +479,14 @@ def _display_utilization_summary():
         return
 
     # Create Gantt data for utilization calculation
-    gantt_data = create_gantt_data(
-        st.session_state.data["projects"], st.session_state.data
-    )
+    gantt_data = get_cached_gantt_data()
 
     if gantt_data.empty:
         st.info("No allocation data available.")
         return
 
-    # Calculate utilization
-    utilization_df = calculate_resource_utilization(gantt_data)
+    # Calculate utilization (copied: the Type column is filled in below)
+    utilization_df = get_cached_resource_utilization().copy()
 
     if utilization_df.empty:
         st.info("No utilization data available.")
@@ -662,6 +660,7 @@ def _display_utilization_summary():
         )
 
 
+@instrumented()
 def _display_budget_overview():
     """Display budget overview chart."""
     if not st.session_state.data["projects"]:
@@ -685,11 +684,10 @@ def _display_budget_overview():
 
     # Create budget data
     budget_data = []
+    project_costs = get_cached_project_costs()
     for project in st.session_state.data["projects"]:
         if "allocated_budget" in project:
-            actual_cost = calculate_project_cost(
-                project, st.session_state.data["people"], st.session_state.data["teams"]
-            )
+            actual_cost = project_costs[project["name"]]
 
             # Calculate variance and status
             variance = project["allocated_budget"] - actual_cost
@@ -889,3 +887,57 @@ def _display_budget_overview():
             use_container_width=True,
             hide_index=True,
         )
+
+    _display_budget_burn(budget_df, currency, y_tickprefix, y_ticksuffix)
+
+
+def _display_budget_burn(
+    budget_df: pd.DataFrame, currency: str, y_tickprefix: str, y_ticksuffix: str
+):
+    """Display the cumulative cost of a project against its budget."""
+    with st.expander("Budget Burn"):
+        project_name = st.selectbox(
+            "Project",
+            options=sorted(budget_df["Project"]),
+            key="budget_burn_project",
+        )
+        cost_series = get_cached_project_cost_series()
+        project_series = cost_series[cost_series["Project"] == project_name]
+        if project_series.empty:
+            st.info("No allocations to show for this project.")
+            return
+
+        budget = budget_df.loc[
+            budget_df["Project"] == project_name, "Allocated Budget"
+        ].iloc[0]
+
+        fig = px.line(
+            project_series,
+            x="Date",
+            y="Cumulative Cost",
+            title=f"Cumulative Cost of {project_name}",
+        )
+        fig.add_hline(
+            y=budget,
+            line_dash="dash",
+            line_color="#F44336",
+            annotation_text="Allocated Budget",
+        )
+        fig.update_layout(
+            yaxis_title=f"Amount ({currency})",
+            yaxis=dict(
+                tickprefix=y_tickprefix,
+                ticksuffix=y_ticksuffix,
+                separatethousands=True,
+            ),
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        over_budget = project_series[project_series["Cumulative Cost"] > budget]
+        if not over_budget.empty:
+            st.caption(
+                f"The budget is exceeded on "
+                f"{over_budget['Date'].iloc[0].strftime('%Y-%m-%d')}."
+            )
@@ -5,13 +5,58 @@ This module provides the UI components for importing and exporting data.
 """
 
 import streamlit as st
-import pandas as pd
-import io
+import tempfile
 from datetime import datetime
 from typing import Dict, Any, List
 from app.utils.ui_components import display_action_bar
-from app.services.data_service import load_json, save_json
 from app.services.config_service import regenerate_department_colors
+from app.services.data_service import iter_allocation_export
+from app.services.export_service import (
+    EXPORT_FORMATS,
+    write_export,
+    write_frame_export,
+)
+from app.services.import_service import (
+    TABLE_IMPORT_FIELDS,
+    TABLE_REQUIRED_FIELDS,
+    get_excel_sheet_names,
+    preview_table,
+    scan_json_import,
+    stream_json_import,
+    stream_table_import,
+)
+from app.services.store_service import ensure_private_data, replace_session_data
+from app.utils.cache_utils import bump_data_revision
+
+# Export formats by option label
+EXPORT_FORMAT_OPTIONS = {
+    "JSON (.json)": "json",
+    "JSON Lines (.jsonl)": "jsonl",
+    "Excel (.xlsx)": "excel",
+    "CSV (.csv)": "csv",
+}
+
+# Computed allocation tables by option label
+ALLOCATION_EXPORT_OPTIONS = {
+    "Daily capacity (one row per resource and day)": "capacity",
+    "Resource utilization (one row per resource)": "utilization",
+    "Conflict periods (one row per overallocated interval)": "conflicts",
+}
+
+# Export formats of the computed allocation tables by option label
+TABLE_EXPORT_FORMAT_OPTIONS = {
+    "Parquet (.parquet)": "parquet",
+    "CSV (.csv)": "csv",
+}
+
+# Resource types that can be imported from Excel/CSV sheets
+TABLE_IMPORT_TYPES = {
+    "People": "people",
+    "Projects": "projects",
+    "Teams": "teams",
+    "Departments": "departments",
+    "Resource Allocations": "allocations",
+}
 
 
 def display_import_export_data_tab():
@@ -31,6 +76,8 @@ def display_import_export_data_tab():
 
     with tabs[1]:
         display_export_section()
+        st.markdown("---")
+        display_allocation_export_section()
 
 
 def display_import_section():
@@ -81,35 +128,34 @@ def display_import_section():
     # Function to actually perform the import
     def perform_import():
         try:
-            if st.session_state.import_mode == "Replace all existing data":
-                if st.session_state.import_format == "JSON (.json)":
-                    st.session_state.data = st.session_state.import_data
-                else:
-                    # Handle mapped data for Excel/CSV
-                    if (
-                        st.session_state.import_resource_type.lower()
-                        in st.session_state.data
-                    ):
-                        st.session_state.data[
-                            st.session_state.import_resource_type.lower()
-                        ] = st.session_state.import_data
+            replace = st.session_state.import_mode == "Replace all existing data"
+            # Names of the changed records by resource type, None if unknown
+            changes = None
+            details = ""
+            if st.session_state.import_format == "JSON (.json)":
+                # JSON uploads are streamed from the file in batches
+                result = _import_json_file(uploaded_file, replace)
+            else:
+                # Excel/CSV rows are parsed and upserted by name in chunks
+                result = _import_table_file(uploaded_file, replace)
+            if not replace:
+                changes = {
+                    resource_type: names + result["updated"][resource_type]
+                    for resource_type, names in result["added"].items()
+                }
+            details = _describe_import(result)
+
+            if replace and st.session_state.import_format == "JSON (.json)":
                 st.session_state.import_message = "✅ Data replaced successfully! Your application is now using the imported data."
-                st.session_state.import_message_type = "success"
+            elif replace:
+                st.session_state.import_message = f"✅ {st.session_state.import_resource_type} replaced successfully with the imported rows."
             else:
-                # Merge data
-                if st.session_state.import_format == "JSON (.json)":
-                    _merge_imported_data(st.session_state.import_data)
-                else:
-                    # Handle mapped data for Excel/CSV
-                    existing = st.session_state.data.get(
-                        st.session_state.import_resource_type.lower(), []
-                    )
-                    # Simple merge strategy - could be enhanced
-                    st.session_state.data[
-                        st.session_state.import_resource_type.lower()
-                    ] = existing + st.session_state.import_data
-                st.session_state.import_message = "✅ Data merged successfully! New entries have been added to your existing data."
-                st.session_state.import_message_type = "success"
+                st.session_state.import_message = "✅ Data merged successfully! New entries have been added and matching entries updated."
+            st.session_state.import_message += details
+            st.session_state.import_message_type = "success"
+
+            # Derived frames of the previous data are no longer valid
+            bump_data_revision(changes)
 
             # Set success flag and show message
             st.session_state.import_success = True
@@ -163,18 +209,19 @@ def display_import_section():
         try:
             # Process based on file format
             if file_format == "JSON (.json)":
-                imported_data = load_json(uploaded_file)
-            elif file_format == "Excel (.xlsx)":
-                # Show sheet selection for Excel files
-                xls = pd.ExcelFile(uploaded_file)
-                sheet_name = st.selectbox("Select sheet", options=xls.sheet_names)
-                df = pd.read_excel(uploaded_file, sheet_name=sheet_name)
-                imported_data = df.to_dict(orient="records")
-                st.dataframe(df.head(), use_container_width=True)
-            else:  # CSV
-                df = pd.read_csv(uploaded_file)
-                imported_data = df.to_dict(orient="records")
-                st.dataframe(df.head(), use_container_width=True)
+                # Only counts and relationship fields are kept until import
+                imported_data = _scan_json_file(uploaded_file)
+            else:
+                # Only the first rows are read until import
+                sheet_name = None
+                if file_format == "Excel (.xlsx)":
+                    # Show sheet selection for Excel files
+                    sheet_name = st.selectbox(
+                        "Select sheet", options=get_excel_sheet_names(uploaded_file)
+                    )
+                table_format = "excel" if file_format == "Excel (.xlsx)" else "csv"
+                df = preview_table(uploaded_file, table_format, sheet_name)
+                st.dataframe(df, use_container_width=True)
 
             # For non-JSON formats, we need to map to our data structure
             resource_type = None
@@ -182,43 +229,58 @@ def display_import_section():
                 with st.expander(
                     "Data Mapping (Required for Excel/CSV)", expanded=True
                 ):
-                    st.info("Map your columns to the required data fields.")
+                    st.info(
+                        "Map your columns to the data fields (* = required). "
+                        "Rows are matched to existing entries by name."
+                    )
                     resource_type = st.selectbox(
                         "What type of data is this?",
-                        options=["People", "Projects", "Teams", "Departments"],
+                        options=list(TABLE_IMPORT_TYPES),
                     )
-
-                    # Show mapping UI based on selected resource type
-                    if resource_type == "People":
-                        imported_data = {"people": imported_data}
+                    import_type = TABLE_IMPORT_TYPES[resource_type]
+                    mapping = _display_column_mapping(import_type, list(df.columns))
+                    imported_data = {
+                        "import_type": import_type,
+                        "file_format": table_format,
+                        "sheet_name": sheet_name,
+                        "mapping": mapping,
+                    }
 
             # Validate data structure
             valid_data = False
             if file_format == "JSON (.json)":
-                valid_data = _validate_imported_data(imported_data)
+                valid_data = imported_data["valid"]
                 if valid_data:
                     # Preview summary
+                    counts = imported_data["counts"]
                     with st.expander("Data Preview", expanded=True):
                         col1, col2, col3, col4 = st.columns(4)
                         with col1:
-                            st.metric("People", len(imported_data.get("people", [])))
+                            st.metric("People", counts["people"])
                         with col2:
-                            st.metric("Teams", len(imported_data.get("teams", [])))
+                            st.metric("Teams", counts["teams"])
                         with col3:
-                            st.metric(
-                                "Departments", len(imported_data.get("departments", []))
-                            )
+                            st.metric("Departments", counts["departments"])
                         with col4:
-                            st.metric(
-                                "Projects", len(imported_data.get("projects", []))
+                            st.metric("Projects", counts["projects"])
+                        skipped = sum(imported_data["skipped"].values())
+                        if skipped:
+                            st.warning(
+                                f"{skipped} records without a name will be skipped."
                             )
                 else:
                     st.error(
                         "The JSON file doesn't have the required structure (people, teams, departments, projects)."
                     )
             else:
-                # For Excel/CSV we assume valid after mapping
-                valid_data = True
+                missing = [
+                    field
+                    for field in TABLE_REQUIRED_FIELDS[import_type]
+                    if field not in mapping
+                ]
+                valid_data = not missing
+                if missing:
+                    st.error(f"Map a column to: {', '.join(missing)}.")
 
             # Import options
             if valid_data and not st.session_state.import_initiated:
@@ -228,13 +290,16 @@ def display_import_section():
                     options=["Replace all existing data", "Merge with existing data"],
                     captions=[
                         "Overwrites all current data",
-                        "Adds new entries while preserving existing ones",
+                        "Adds new entries and updates entries with the same name",
                     ],
                     index=1,
                 )
 
                 # Store the necessary data in session state for later use
-                st.session_state.import_data = imported_data
+                # (JSON records are read from the upload again on import)
+                st.session_state.import_data = (
+                    None if file_format == "JSON (.json)" else imported_data
+                )
                 st.session_state.import_mode = import_mode
                 st.session_state.import_resource_type = resource_type
                 st.session_state.import_format = file_format
@@ -261,12 +326,26 @@ def display_import_section():
                     f"You are about to **{st.session_state.import_mode.lower()}**. This action cannot be undone."
                 )
 
-                if st.session_state.import_mode == "Replace all existing data":
+                if st.session_state.import_format != "JSON (.json)":
+                    if st.session_state.import_mode == "Replace all existing data":
+                        st.info(
+                            f"All existing {st.session_state.import_resource_type.lower()} "
+                            "will be replaced with the imported rows."
+                        )
+                    else:
+                        st.info(
+                            "New entries will be added and entries with the same "
+                            "name will be updated with the mapped columns."
+                        )
+                elif st.session_state.import_mode == "Replace all existing data":
                     st.info(
                         "All existing data will be replaced with the imported data."
                     )
                 else:
-                    st.info("New entries will be added to your existing data.")
+                    st.info(
+                        "New entries will be added to your existing data and "
+                        "entries with the same name will be updated."
+                    )
 
                 col1, col2 = st.columns([1, 1])
                 with col1:
@@ -306,9 +385,10 @@ def display_export_section():
     # File format selection
     file_format = st.radio(
         "Select export format",
-        options=["JSON (.json)", "Excel (.xlsx)", "CSV (.csv)"],
+        options=list(EXPORT_FORMAT_OPTIONS),
         horizontal=True,
     )
+    export_format = EXPORT_FORMAT_OPTIONS[file_format]
 
     # Export data selection
     st.markdown("#### What data would you like to export?")
@@ -320,18 +400,16 @@ def display_export_section():
         "Departments Only",
     ]
     export_type = st.selectbox("Data Selection", options=export_options)
+    if export_type == "All Data":
+        resource_types = ["people", "teams", "departments", "projects"]
+    else:
+        resource_types = [export_type.lower().replace(" only", "")]
 
     # File naming
     col1, col2 = st.columns([3, 1])
     with col1:
         # Determine default extension based on format
-        extension = (
-            ".json"
-            if file_format == "JSON (.json)"
-            else ".xlsx"
-            if file_format == "Excel (.xlsx)"
-            else ".csv"
-        )
+        extension = EXPORT_FORMATS[export_format]["extension"]
         filename_base = f"resource_data_{export_type.lower().replace(' ', '_').replace('_only', '')}"
         filename = st.text_input("Filename", value=f"{filename_base}{extension}")
 
@@ -349,150 +427,228 @@ def display_export_section():
     if st.button("Export Data", type="primary", use_container_width=True):
         with st.spinner("Preparing export..."):
             try:
-                # Prepare data for export based on selection
-                if export_type == "All Data":
-                    export_data = st.session_state.data
-                elif export_type == "People Only":
-                    export_data = {"people": st.session_state.data.get("people", [])}
-                elif export_type == "Projects Only":
-                    export_data = {
-                        "projects": st.session_state.data.get("projects", [])
-                    }
-                elif export_type == "Teams Only":
-                    export_data = {"teams": st.session_state.data.get("teams", [])}
-                elif export_type == "Departments Only":
-                    export_data = {
-                        "departments": st.session_state.data.get("departments", [])
-                    }
+                # Records are streamed into a temporary file in batches (raw
+                # file objects are what the download button accepts)
+                with tempfile.TemporaryFile(buffering=0) as export_file:
+                    written_format = write_export(
+                        st.session_state.data,
+                        resource_types,
+                        export_format,
+                        export_file,
+                    )
+                    export_file.seek(0)
+                    if written_format == "zip":
+                        # One file per resource type
+                        filename = filename.replace(extension, ".zip")
 
-                # Handle different file formats
-                if file_format == "JSON (.json)":
-                    # Generate download link for JSON
-                    download_link = save_json(export_data, filename)
                     st.success("✅ Export ready for download!")
-                    st.markdown(download_link, unsafe_allow_html=True)
-                else:
-                    # Convert to DataFrame for Excel/CSV
-                    if export_type == "All Data":
-                        # Create a separate dataframe for each data type
-                        dfs = {}
-                        for key, data in export_data.items():
-                            if data:  # Only create dataframe if data exists
-                                dfs[key] = pd.DataFrame(data)
-
-                        if file_format == "Excel (.xlsx)":
-                            # Create Excel with multiple sheets
-                            buffer = io.BytesIO()
-                            with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                                for sheet_name, df in dfs.items():
-                                    df.to_excel(
-                                        writer,
-                                        sheet_name=sheet_name.capitalize(),
-                                        index=False,
-                                    )
-                            buffer.seek(0)
-
-                            st.success("✅ Export ready for download!")
-                            st.download_button(
-                                label="Download Excel File",
-                                data=buffer,
-                                file_name=filename,
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            )
-                        else:  # CSV - we'll create a zip file with multiple CSVs
-                            import zipfile
-
-                            buffer = io.BytesIO()
-                            with zipfile.ZipFile(buffer, "w") as zf:
-                                for name, df in dfs.items():
-                                    csv_buffer = io.StringIO()
-                                    df.to_csv(csv_buffer, index=False)
-                                    zf.writestr(f"{name}.csv", csv_buffer.getvalue())
-                            buffer.seek(0)
-
-                            zip_filename = filename.replace(".csv", ".zip")
-                            st.success("✅ Export ready for download!")
-                            st.download_button(
-                                label="Download ZIP File",
-                                data=buffer,
-                                file_name=zip_filename,
-                                mime="application/zip",
-                            )
-                    else:
-                        # Single dataframe for the selected data type
-                        data_key = export_type.lower().replace(" only", "")
-                        df = pd.DataFrame(export_data.get(data_key, []))
-
-                        if file_format == "Excel (.xlsx)":
-                            buffer = io.BytesIO()
-                            with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                                df.to_excel(writer, index=False)
-                            buffer.seek(0)
-
-                            st.success("✅ Export ready for download!")
-                            st.download_button(
-                                label="Download Excel File",
-                                data=buffer,
-                                file_name=filename,
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            )
-                        else:  # CSV
-                            csv = df.to_csv(index=False)
-
-                            st.success("✅ Export ready for download!")
-                            st.download_button(
-                                label="Download CSV File",
-                                data=csv,
-                                file_name=filename,
-                                mime="text/csv",
-                            )
+                    st.download_button(
+                        label=f"Download {written_format.upper()} File",
+                        data=export_file,
+                        file_name=filename,
+                        mime=EXPORT_FORMATS[written_format]["mime"],
+                    )
             except Exception as e:
                 st.error(f"Error during export: {str(e)}")
 
 
-def _validate_imported_data(data: Dict[str, Any]) -> bool:
+def display_allocation_export_section():
+    """Display the export of tables computed from the allocations."""
+    st.markdown("### Export Allocation Tables")
+    st.info(
+        "Export the daily capacity, utilization and conflict tables used by the "
+        "dashboards, flattened for BI tools and spreadsheets."
+    )
+
+    table_label = st.selectbox(
+        "Table", options=list(ALLOCATION_EXPORT_OPTIONS), key="allocation_export"
+    )
+    format_label = st.radio(
+        "Select table format",
+        options=list(TABLE_EXPORT_FORMAT_OPTIONS),
+        horizontal=True,
+        key="allocation_export_format",
+    )
+    export_name = ALLOCATION_EXPORT_OPTIONS[table_label]
+    export_format = TABLE_EXPORT_FORMAT_OPTIONS[format_label]
+    extension = EXPORT_FORMATS[export_format]["extension"]
+    filename = f"resource_{export_name}_{datetime.now().strftime('%Y%m%d')}{extension}"
+
+    if st.button(
+        "Export Table", use_container_width=True, key="export_allocation_table"
+    ):
+        with st.spinner("Calculating table..."):
+            try:
+                # The table is calculated and written in chunks
+                with tempfile.TemporaryFile(buffering=0) as export_file:
+                    rows = write_frame_export(
+                        iter_allocation_export(export_name),
+                        export_format,
+                        export_file,
+                    )
+                    export_file.seek(0)
+                    if not rows:
+                        st.info("There are no allocations to export.")
+                        return
+
+                    st.success(f"✅ Export of {rows} rows ready for download!")
+                    st.download_button(
+                        label=f"Download {format_label.split(' ')[0]} File",
+                        data=export_file,
+                        file_name=filename,
+                        mime=EXPORT_FORMATS[export_format]["mime"],
+                    )
+            except Exception as e:
+                st.error(f"Error during export: {str(e)}")
+
+
+def _scan_json_file(uploaded_file) -> Dict[str, Any]:
     """
-    Validate that imported data has the required structure.
+    Scan a JSON upload once per file, showing the progress.
 
     Args:
-        data: The imported data to validate
+        uploaded_file: Uploaded JSON file
 
     Returns:
-        True if the data is valid, False otherwise
+        Scan summary (see import_service.scan_json_import)
     """
-    # Check if the required keys exist
-    required_keys = ["people", "teams", "departments", "projects"]
-    if not all(key in data for key in required_keys):
-        return False
+    cached = st.session_state.get("json_import_scan")
+    if cached is not None and cached[0] == uploaded_file.file_id:
+        return cached[1]
 
-    # Check if the values are lists
-    if not all(isinstance(data[key], list) for key in required_keys):
-        return False
+    progress = st.progress(0.0, text="Scanning file...")
+    summary = scan_json_import(
+        uploaded_file, lambda fraction, label: progress.progress(fraction, text=label)
+    )
+    progress.empty()
+    st.session_state.json_import_scan = (uploaded_file.file_id, summary)
+    return summary
 
-    # Additional validation could be added here
 
-    return True
+def _import_json_file(uploaded_file, replace: bool) -> Dict[str, Any]:
+    """
+    Import a JSON upload in batches into the session data, showing the progress.
 
+    Args:
+        uploaded_file: Uploaded JSON file
+        replace: Whether to replace all existing data instead of merging
 
-def _merge_imported_data(imported_data: Dict[str, List[Dict[str, Any]]]):
+    Returns:
+        Import result (see import_service.stream_json_import)
     """
-    Merge imported data with existing data.
+    if not replace:
+        # Records are merged into the session data in place
+        ensure_private_data()
+    progress = st.progress(0.0, text="Importing records...")
+    result = stream_json_import(
+        uploaded_file,
+        st.session_state.data,
+        _scan_json_file(uploaded_file),
+        replace=replace,
+        on_progress=lambda fraction, label: progress.progress(fraction, text=label),
+    )
+    progress.empty()
+
+    if replace:
+        replace_session_data(result["data"])
+    else:
+        department_names = [d["name"] for d in st.session_state.data["departments"]]
+        regenerate_department_colors(department_names)
+    st.session_state.pop("json_import_scan", None)
+    return result
+
+
+def _display_column_mapping(import_type: str, columns: List[str]) -> Dict[str, str]:
+    """
+    Display a column selection per data field of an Excel/CSV import.
+
+    Columns whose name matches a field (ignoring case, spaces and
+    underscores) are selected by default.
 
     Args:
-        imported_data: The imported data to merge
+        import_type: Key of import_service.TABLE_IMPORT_FIELDS
+        columns: Column names of the uploaded sheet
+
+    Returns:
+        Field name -> column name of the mapped fields
     """
-    # For each resource type, merge based on unique names
-    for resource_type in ["people", "teams", "departments", "projects"]:
-        existing_items = st.session_state.data.get(resource_type, [])
-        existing_names = {item["name"] for item in existing_items}
+    normalized = {
+        str(column).lower().replace(" ", "").replace("_", ""): column
+        for column in columns
+    }
+    options = ["(not mapped)"] + columns
+    required = TABLE_REQUIRED_FIELDS[import_type]
+
+    mapping = {}
+    fields = list(TABLE_IMPORT_FIELDS[import_type])
+    field_columns = st.columns(2)
+    for i, field in enumerate(fields):
+        default = normalized.get(field.replace("_", ""))
+        label = field.replace("_", " ").capitalize()
+        with field_columns[i % 2]:
+            column = st.selectbox(
+                f"{label} *" if field in required else label,
+                options=options,
+                index=options.index(default) if default is not None else 0,
+                key=f"import_mapping_{import_type}_{field}",
+            )
+        if column != "(not mapped)":
+            mapping[field] = column
+    return mapping
 
-        # Add new items from imported data
-        for item in imported_data.get(resource_type, []):
-            if item["name"] not in existing_names:
-                existing_items.append(item)
-                existing_names.add(item["name"])
 
-    # Update department colors
+def _import_table_file(uploaded_file, replace: bool) -> Dict[str, Any]:
+    """
+    Import an Excel/CSV upload in chunks into the session data, showing the progress.
+
+    Args:
+        uploaded_file: Uploaded Excel or CSV file
+        replace: Whether to replace the existing entries of the mapped type
 
-    department_names = [d["name"] for d in st.session_state.data["departments"]]
-    regenerate_department_colors(department_names)
+    Returns:
+        Import result (see import_service.stream_table_import)
+    """
+    settings = st.session_state.import_data
+    # Rows are upserted into the session data in place
+    ensure_private_data()
+    progress = st.progress(0.0, text="Importing rows...")
+    result = stream_table_import(
+        uploaded_file,
+        settings["file_format"],
+        settings["import_type"],
+        settings["mapping"],
+        st.session_state.data,
+        replace=replace,
+        sheet_name=settings["sheet_name"],
+        on_progress=lambda fraction, label: progress.progress(fraction, text=label),
+    )
+    progress.empty()
+
+    if settings["import_type"] == "departments":
+        department_names = [d["name"] for d in st.session_state.data["departments"]]
+        regenerate_department_colors(department_names)
+    return result
+
+
+def _describe_import(result: Dict[str, Any]) -> str:
+    """Summarize the added, updated, skipped and invalid records of an import."""
+    added = sum(len(names) for names in result["added"].values())
+    updated = sum(len(names) for names in result["updated"].values())
+    unchanged = sum(result["unchanged"].values())
+    skipped = sum(result["skipped"].values())
+    details = f" {added} records imported"
+    if updated:
+        details += f", {updated} records updated"
+    if unchanged:
+        details += f", {unchanged} records unchanged"
+    if skipped:
+        details += f", {skipped} records skipped"
+    if result["error_count"]:
+        messages = [
+            message for errors in result["errors"].values() for message in errors
+        ]
+        details += (
+            f". {result['error_count']} validation issues found, e.g.: "
+            + "; ".join(messages[:3])
+        )
+    return details + "."
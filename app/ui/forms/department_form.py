@@ -115,9 +115,9 @@ def display_department_form(
     if department_data and "teams" in department_data:
         existing_teams = [t for t in department_data["teams"] if t in available_teams]
         if len(existing_teams) != len(department_data.get("teams", [])):
-            # Some teams were removed, update the department data
+            # Some teams were removed, update (a copy of) the department data
             if department_data:
-                department_data["teams"] = existing_teams
+                department_data = {**department_data, "teams": existing_teams}
 
     # Initialize the teams state if not already done
     teams_key = f"{stable_key}_teams"
@@ -159,9 +159,9 @@ def display_department_form(
             m for m in department_data["members"] if m in available_people
         ]
         if len(existing_members) != len(department_data.get("members", [])):
-            # Some members were removed, update the department data
+            # Some members were removed, update (a copy of) the department data
             if department_data:
-                department_data["members"] = existing_members
+                department_data = {**department_data, "members": existing_members}
 
     members = st.multiselect(
         "Direct Members",
@@ -79,9 +79,9 @@ def display_team_form(
     if team_data and "members" in team_data:
         existing_members = [m for m in team_data["members"] if m in available_people]
         if len(existing_members) != len(team_data.get("members", [])):
-            # Some members were removed, update the team data
+            # Some members were removed, update (a copy of) the team data
             if team_data:
-                team_data["members"] = existing_members
+                team_data = {**team_data, "members": existing_members}
 
     # Initialize the members state if not already done
     members_key = f"{stable_key}_members"
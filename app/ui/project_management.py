@@ -9,8 +9,10 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from app.utils.ui_components import display_action_bar, paginate_dataframe
-from app.services.config_service import load_display_preferences, load_currency_settings
+from app.services.config_service import get_page_size, load_currency_settings
 from app.services.data_service import parse_resources
+from app.services.store_service import ensure_private_data
+from app.utils.cache_utils import bump_data_revision
 
 
 def display_manage_projects_tab():
@@ -443,8 +445,7 @@ def _filter_projects_dataframe(projects_df: pd.DataFrame) -> pd.DataFrame:
         projects_df = projects_df.sort_values(by=sort_by, ascending=sort_ascending)
 
     # Apply pagination with configured page size
-    display_prefs = load_display_preferences()
-    page_size = display_prefs.get("page_size", 10)
+    page_size = get_page_size()
     projects_df = paginate_dataframe(projects_df, "projects", items_per_page=page_size)
 
     return projects_df
@@ -654,7 +655,9 @@ def add_project_form():
                 new_project["resource_allocations"] = resource_allocations
 
             # Add to session state
+            ensure_private_data()
             st.session_state.data["projects"].append(new_project)
+            bump_data_revision({"projects": [project_name]})
 
             # Clear the dataframe cache to force a refresh of the table
             if "projects_df_cache" in st.session_state:
@@ -926,7 +929,9 @@ def edit_project_form():
                         updated_project["resource_allocations"] = resource_allocations
 
                     # Update in session state
+                    ensure_private_data()
                     st.session_state.data["projects"][project_index] = updated_project
+                    bump_data_revision({"projects": [selected_project, project_name]})
 
                     # Clear the cached dataframe if it exists to force a refresh
                     if "projects_df_cache" in st.session_state:
@@ -990,7 +995,9 @@ def delete_project_form():
             )
 
             if project_index is not None:
+                ensure_private_data()
                 del st.session_state.data["projects"][project_index]
+                bump_data_revision({"projects": [selected_project]})
 
                 # Display a more prominent success message
                 st.success(f"✅ Project '{selected_project}' deleted successfully!")
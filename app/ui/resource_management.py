@@ -12,6 +12,7 @@ from app.utils.ui_components import display_action_bar, paginate_dataframe
 from app.services.config_service import (
     load_currency_settings,
     load_display_preferences,
+    get_page_size,
     load_daily_cost_settings,
     remove_department_color,
 )
@@ -28,6 +29,8 @@ from app.ui.forms.team_form import display_team_form as team_crud_form
 from app.ui.forms.department_form import display_department_form as department_crud_form
 from app.utils.formatting import format_circular_dependency_message
 from app.services.data_service import check_circular_dependencies, parse_resources
+from app.services.store_service import ensure_private_data
+from app.utils.cache_utils import bump_data_revision
 from app.ui.visualizations import display_sunburst_organization
 
 
@@ -67,8 +70,7 @@ def display_people_tab():
         people_df = _create_people_dataframe()
         people_df = _filter_people_dataframe(people_df)
 
-        display_prefs = load_display_preferences()
-        page_size = display_prefs.get("page_size", 10)
+        page_size = get_page_size()
         people_df = paginate_dataframe(people_df, "people", items_per_page=page_size)
 
         # Enable horizontal scrolling for the dataframe
@@ -146,8 +148,7 @@ def display_teams_tab():
         teams_df = _create_teams_dataframe()
         teams_df = _filter_teams_dataframe(teams_df)
 
-        display_prefs = load_display_preferences()
-        page_size = display_prefs.get("page_size", 10)
+        page_size = get_page_size()
         teams_df = paginate_dataframe(teams_df, "teams", items_per_page=page_size)
 
         # Enable horizontal scrolling for the dataframe
@@ -228,8 +229,7 @@ def display_departments_tab():
         departments_df = _create_departments_dataframe()
         departments_df = _filter_departments_dataframe(departments_df)
 
-        display_prefs = load_display_preferences()
-        page_size = display_prefs.get("page_size", 10)
+        page_size = get_page_size()
         departments_df = paginate_dataframe(
             departments_df, "departments", items_per_page=page_size
         )
@@ -618,6 +618,7 @@ def _update_person(person, old_name=None):
     if old_name is None:
         old_name = person["name"]
 
+    ensure_private_data()
     if old_name and old_name != person["name"]:
         update_resource_references(old_name, person["name"], "person")
     update_resource(st.session_state.data["people"], old_name, person)
@@ -654,6 +655,7 @@ def _add_person(person):
         )
         return False
 
+    ensure_private_data()
     if add_resource(st.session_state.data["people"], person):
         # Clear all caches that might include person data
         if "people_df_cache" in st.session_state:
@@ -680,6 +682,7 @@ def _add_person(person):
 
 
 def _delete_person(name):
+    ensure_private_data()
     delete_resource(st.session_state.data["people"], name, "person")
 
     # Clear all caches that might include person data
@@ -699,6 +702,7 @@ def _delete_person(name):
 
 
 def _add_team(team):
+    ensure_private_data()
     if add_resource(st.session_state.data["teams"], team):
         # Clear all caches that might include team data
         if "teams_df_cache" in st.session_state:
@@ -714,6 +718,7 @@ def _add_team(team):
 
 
 def _update_team(team, old_name=None):
+    ensure_private_data()
     # Find the team to update
     team_name = old_name if old_name else team["name"]
     team_index = next(
@@ -743,12 +748,16 @@ def _update_team(team, old_name=None):
     if old_name and old_name != team["name"]:
         update_resource_references(old_name, team["name"], "team")
 
+    # People whose team or department changes, for the change journal
+    touched_people = []
+
     # Handle department changes
     if team.get("department") != existing_team.get("department"):
         # Update people's department if needed
         for person in st.session_state.data["people"]:
             if person.get("team") == team_name:
                 person["department"] = team["department"]
+                touched_people.append(person["name"])
 
     # Update team in the data
     st.session_state.data["teams"][team_index] = team
@@ -768,6 +777,7 @@ def _update_team(team, old_name=None):
             person["team"] = team["name"]
             if team.get("department"):
                 person["department"] = team["department"]
+            touched_people.append(member_name)
 
     # 2. For removed members, clear their team association
     removed_members = [
@@ -780,6 +790,9 @@ def _update_team(team, old_name=None):
         )
         if person and person.get("team") == team_name:
             person["team"] = None
+            touched_people.append(member_name)
+
+    bump_data_revision({"teams": [team_name, team["name"]], "people": touched_people})
 
     # After updating the team, clear all relevant caches
     if "teams_df_cache" in st.session_state:
@@ -796,6 +809,7 @@ def _update_team(team, old_name=None):
 
 
 def _delete_team(name):
+    ensure_private_data()
     delete_resource(st.session_state.data["teams"], name, "team")
 
     # Clear all caches that might include team data
@@ -808,6 +822,7 @@ def _delete_team(name):
 
 
 def _add_department(department):
+    ensure_private_data()
     if add_resource(st.session_state.data["departments"], department):
         # Clear all caches that might include department data
         if "departments_df_cache" in st.session_state:
@@ -823,6 +838,7 @@ def _add_department(department):
 
 
 def _update_department(department, old_name=None):
+    ensure_private_data()
     # Find the department to update
     dept_name = old_name if old_name else department["name"]
     dept_index = next(
@@ -855,6 +871,9 @@ def _update_department(department, old_name=None):
     # Update department in the data
     st.session_state.data["departments"][dept_index] = department
 
+    # Teams whose department changes, for the change journal
+    touched_teams = []
+
     # Update team associations when department changes
     for team_name in department.get("teams", []):
         team = next(
@@ -862,6 +881,7 @@ def _update_department(department, old_name=None):
         )
         if team:
             team["department"] = department["name"]
+            touched_teams.append(team_name)
 
     # For removed teams, clear their department association if it still points to this department
     if existing_dept:
@@ -877,6 +897,11 @@ def _update_department(department, old_name=None):
             )
             if team and team.get("department") == dept_name:
                 team["department"] = None
+                touched_teams.append(team_name)
+
+    bump_data_revision(
+        {"departments": [dept_name, department["name"]], "teams": touched_teams}
+    )
 
     # After updating the department, clear all relevant caches
     if "departments_df_cache" in st.session_state:
@@ -895,6 +920,7 @@ def _update_department(department, old_name=None):
 def _delete_department(name):
     # Remove color from settings first, then delete the resource
     remove_department_color(name)
+    ensure_private_data()
     delete_resource(st.session_state.data["departments"], name, "department")
 
     # Clear all caches that might include department data
@@ -23,7 +23,14 @@ from app.services.config_service import (
     save_department_colors,
     load_heatmap_colorscale,
     save_heatmap_colorscale,
+    load_instrumentation_settings,
+    save_instrumentation_settings,
+    load_backup_settings,
+    save_backup_settings,
+    load_journal_settings,
+    save_journal_settings,
 )
+from app.services.journal_service import compact_journal, read_journal
 
 
 def display_settings_tab():
@@ -272,6 +279,125 @@ def display_display_preferences():
             st.success("Resource view preferences saved!")
             st.rerun()
 
+    # Performance instrumentation
+    with st.expander("Performance Instrumentation", expanded=False):
+        instrumentation = load_instrumentation_settings()
+        enabled = st.checkbox(
+            "Show render timings in the sidebar",
+            value=instrumentation["enabled"],
+            help="Time each tab, its main sections and the core service calls",
+        )
+        log_to_file = st.checkbox(
+            "Append timings to a log file",
+            value=instrumentation["log_to_file"],
+            disabled=not enabled,
+        )
+        log_file = st.text_input(
+            "Log File",
+            value=instrumentation["log_file"],
+            disabled=not (enabled and log_to_file),
+            help="JSON Lines file that receives one record per page render",
+        )
+
+        st.write("")
+        if st.button("Save Instrumentation Settings", use_container_width=True):
+            save_instrumentation_settings(
+                {"enabled": enabled, "log_to_file": log_to_file, "log_file": log_file}
+            )
+            st.success("Instrumentation settings saved!")
+            st.rerun()
+
+    # Rolling backups of the data and settings files
+    with st.expander("Backups", expanded=False):
+        backups = load_backup_settings()
+        backups_enabled = st.checkbox(
+            "Keep compressed backups of the data and settings files",
+            value=backups["enabled"],
+            help="Backups are stored in the backups folder and restored "
+            "automatically if a file is found corrupt",
+        )
+        keep = st.number_input(
+            "Backups to Keep",
+            min_value=1,
+            max_value=100,
+            value=int(backups["keep"]),
+            disabled=not backups_enabled,
+        )
+        min_interval = st.number_input(
+            "Minimum Minutes Between Backups",
+            min_value=0,
+            max_value=1440,
+            value=int(backups["min_interval_minutes"]),
+            disabled=not backups_enabled,
+            help="0 backs up the previous file on every save",
+        )
+
+        st.write("")
+        if st.button("Save Backup Settings", use_container_width=True):
+            save_backup_settings(
+                {
+                    "enabled": backups_enabled,
+                    "keep": int(keep),
+                    "min_interval_minutes": int(min_interval),
+                }
+            )
+            st.success("Backup settings saved!")
+            st.rerun()
+
+    # Append-only change journal
+    with st.expander("Change Journal", expanded=False):
+        journal = load_journal_settings()
+        journal_enabled = st.checkbox(
+            "Record edits in the change journal",
+            value=journal["enabled"],
+            help="Each edit is appended to resource_data.journal.jsonl and "
+            "replayed on startup, instead of rewriting the whole data store",
+        )
+        compact_after = st.number_input(
+            "Compact After (records)",
+            min_value=10,
+            max_value=100000,
+            value=int(journal["compact_after"]),
+            step=10,
+            disabled=not journal_enabled,
+            help="Fold the journal into the data store in the background once "
+            "it holds this many records",
+        )
+
+        records = read_journal()
+        st.caption(f"{len(records)} records awaiting compaction.")
+        if records:
+            st.dataframe(
+                [
+                    {
+                        "Time": record["timestamp"],
+                        "Session": record.get("session"),
+                        "Type": record["entity"],
+                        "Change": record["op"],
+                        "Name": record["name"],
+                    }
+                    for record in records[-20:][::-1]
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+
+        st.write("")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Save Journal Settings", use_container_width=True):
+                save_journal_settings(
+                    {"enabled": journal_enabled, "compact_after": int(compact_after)}
+                )
+                st.success("Journal settings saved!")
+                st.rerun()
+        with col2:
+            if st.button("Compact Now", use_container_width=True, disabled=not records):
+                if compact_journal():
+                    st.success("Journal compacted into the data store.")
+                else:
+                    st.info("A compaction is already running.")
+
 
 def display_cost_settings():
     """Display cost-related settings."""
@@ -12,7 +12,7 @@ from app.services.visualization_service import (
     prepare_gantt_data,
     prepare_utilization_data,
 )
-from app.services.config_service import load_display_preferences, get_department_color
+from app.services.config_service import get_chart_height, get_department_color
 
 
 def display_gantt_chart(
@@ -26,8 +26,7 @@ def display_gantt_chart(
         resources: Dictionary of resource lists (people, teams, departments)
     """
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     gantt_data = prepare_gantt_data(projects, resources)
 
@@ -60,8 +59,7 @@ def display_utilization_chart(
         resources: Dictionary of resource lists (people, teams, departments)
     """
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     utilization_data = prepare_utilization_data(projects, resources)
 
@@ -90,8 +88,7 @@ def display_sunburst_organization(data: Dict[str, List[Dict[str, Any]]]) -> None
         data: Dictionary containing people, teams, and departments data
     """
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     # Create a flattened DataFrame for the visualization
     rows = []
@@ -192,8 +189,7 @@ def display_department_distribution(
         department_colors: Dictionary mapping department names to colors
     """
     # Get chart height from display preferences
-    display_prefs = load_display_preferences()
-    chart_height = display_prefs.get("chart_height", 600)
+    chart_height = get_chart_height()
 
     if not departments:
         st.info("No department data available for visualization.")
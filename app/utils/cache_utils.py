@@ -0,0 +1,233 @@
+"""
+Cache utility functions for the resource management application.
+
+This module provides a data revision counter, the queue of changes awaiting
+the change journal and bounded memoization caches for frames derived from
+the session data: one per session, and one shared by all sessions viewing
+the same version of the shared data.
+"""
+
+import threading
+import streamlit as st
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+from app.utils.instrumentation_utils import increment_counter
+
+MAX_CACHE_ENTRIES = 16
+MAX_SHARED_CACHE_ENTRIES = 64
+# Number of data revisions whose changed record names are kept
+MAX_REVISION_LOG = 64
+
+# Derived values of shared data versions, reused by every session viewing
+# the same version
+_shared_cache: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+_shared_cache_lock = threading.Lock()
+
+
+def get_data_revision() -> int:
+    """
+    Get the revision number of the session data.
+
+    Returns:
+        Current data revision (starts at 0)
+    """
+    if "data_revision" not in st.session_state:
+        st.session_state.data_revision = 0
+    return st.session_state.data_revision
+
+
+def set_shared_data_version(version: Optional[int]) -> None:
+    """
+    Record which version of the shared data the session is viewing.
+
+    Args:
+        version: Shared data version, or None if the session has its own copy
+    """
+    st.session_state.shared_data_version = version
+
+
+def get_shared_data_version() -> Optional[int]:
+    """
+    Get the version of the shared data the session is viewing.
+
+    Returns:
+        Shared data version, or None if the session has its own copy
+    """
+    return st.session_state.get("shared_data_version")
+
+
+def get_data_cache_token() -> Tuple[str, int]:
+    """
+    Identify the session data for caching derived values.
+
+    Sessions viewing the same shared version get the same token, so values
+    derived from it can be shared between them.
+
+    Returns:
+        ("shared", version) or ("session", data revision)
+    """
+    version = get_shared_data_version()
+    if version is not None:
+        return ("shared", version)
+    return ("session", get_data_revision())
+
+
+def bump_data_revision(changes: Optional[Dict[str, Iterable[str]]] = None) -> int:
+    """
+    Mark the session data as changed so derived frames are recomputed.
+
+    The changed records are queued for the change journal. Callers that know
+    which records they touched pass them, otherwise all records are compared
+    with the last persisted state when the journal is written.
+
+    Args:
+        changes: Names of the added, updated or deleted records by resource
+            type (e.g. {"projects": ["Apollo"]}), or None if unknown
+
+    Returns:
+        New data revision
+    """
+    st.session_state.data_revision = get_data_revision() + 1
+    pending = get_pending_changes()
+    if changes is None:
+        pending["unknown"] = True
+    else:
+        for resource_type, names in changes.items():
+            pending["records"].setdefault(resource_type, set()).update(names)
+
+    log = st.session_state.get("revision_log", [])
+    names_by_type = (
+        None
+        if changes is None
+        else {resource_type: set(names) for resource_type, names in changes.items()}
+    )
+    log.append((st.session_state.data_revision, names_by_type))
+    st.session_state.revision_log = log[-MAX_REVISION_LOG:]
+    # Entries of older revisions can never be hit again
+    _get_cache().clear()
+    return st.session_state.data_revision
+
+
+def get_changes_since_revision(revision: int) -> Optional[Dict[str, Set[str]]]:
+    """
+    Get the names of the records changed after a data revision.
+
+    Args:
+        revision: Data revision of the session
+
+    Returns:
+        Changed names by resource type, or None if some of the changes were
+        not itemized or are no longer logged
+    """
+    if revision == get_data_revision():
+        return {}
+    log = st.session_state.get("revision_log", [])
+    if not log or log[0][0] > revision + 1:
+        return None
+    changes: Dict[str, Set[str]] = {}
+    for logged_revision, names_by_type in log:
+        if logged_revision <= revision:
+            continue
+        if names_by_type is None:
+            return None
+        for resource_type, names in names_by_type.items():
+            changes.setdefault(resource_type, set()).update(names)
+    return changes
+
+
+def get_pending_changes() -> Dict[str, Any]:
+    """
+    Get the changes of the session data not yet written to the change journal.
+
+    Returns:
+        Dictionary with "records" (resource type -> set of changed names) and
+        "unknown" (True if some changes were not itemized)
+    """
+    if "pending_changes" not in st.session_state:
+        st.session_state.pending_changes = {"records": {}, "unknown": False}
+    return st.session_state.pending_changes
+
+
+def pop_pending_changes() -> Dict[str, Any]:
+    """
+    Take the pending changes of the session data, leaving none behind.
+
+    Returns:
+        The pending changes (see get_pending_changes)
+    """
+    pending = get_pending_changes()
+    st.session_state.pending_changes = {"records": {}, "unknown": False}
+    return pending
+
+
+def make_cache_key(value: Any) -> Hashable:
+    """
+    Convert a filter value (dicts, lists, dates, ...) into a hashable key.
+
+    Args:
+        value: Value to convert
+
+    Returns:
+        Hashable representation of the value
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), make_cache_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(make_cache_key(v) for v in value)
+    if isinstance(value, Hashable):
+        return value
+    return repr(value)
+
+
+def _get_cache() -> "OrderedDict[Tuple[Hashable, ...], Any]":
+    """Get the derived data cache from the session state."""
+    if "derived_data_cache" not in st.session_state:
+        st.session_state.derived_data_cache = OrderedDict()
+    return st.session_state.derived_data_cache
+
+
+def memoize_derived(name: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+    """
+    Return a value derived from the session data, computing it at most once
+    per data revision.
+
+    Values derived from shared data are cached once per shared version for
+    all sessions (up to MAX_SHARED_CACHE_ENTRIES), others per session (up to
+    MAX_CACHE_ENTRIES), evicting the least recently used entries first.
+    The cached object itself is returned and must be treated as read-only:
+    callers that modify it (e.g. add a DataFrame column) copy it first.
+
+    Args:
+        name: Name of the derived value (e.g. "gantt")
+        key: Hashable key of the inputs besides the session data
+        compute: Function computing the value on a cache miss
+
+    Returns:
+        The cached or freshly computed value
+    """
+    token = get_data_cache_token()
+    if token[0] == "shared":
+        cache, lock = _shared_cache, _shared_cache_lock
+        max_entries = MAX_SHARED_CACHE_ENTRIES
+    else:
+        cache, lock = _get_cache(), nullcontext()
+        max_entries = MAX_CACHE_ENTRIES
+    cache_key = (name, token, key)
+
+    with lock:
+        hit = cache_key in cache
+        if hit:
+            cache.move_to_end(cache_key)
+            value = cache[cache_key]
+    if hit:
+        increment_counter("derived_cache_hits")
+    else:
+        # Computed outside the lock: nested derived values use it too
+        value = compute()
+        increment_counter("derived_cache_misses")
+        with lock:
+            cache[cache_key] = value
+            while len(cache) > max_entries:
+                cache.popitem(last=False)
+    return value
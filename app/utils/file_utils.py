@@ -0,0 +1,174 @@
+"""
+File utility functions for the resource management application.
+
+This module provides crash-safe JSON writes (temporary file, fsync, atomic
+replace), rolling gzip-compressed backups and loading with recovery from the
+newest readable backup.
+"""
+
+import os
+import glob
+import gzip
+import json
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, List, Optional
+import streamlit as st
+
+BACKUP_DIR = "backups"
+
+
+def _fsync_directory(directory: str) -> None:
+    """Flush a directory entry to disk where the platform supports it."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(filename: str, content: bytes) -> None:
+    """
+    Write a file atomically.
+
+    The content goes to a temporary file in the same directory, is flushed to
+    disk and then replaces the target in one step, so readers and crashes see
+    either the old or the new file, never a truncated one.
+
+    Args:
+        filename: Path of the file to write
+        content: Bytes to write
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(filename)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(filename):
+            shutil.copymode(filename, temp_name)
+        os.replace(temp_name, filename)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+    _fsync_directory(directory)
+
+
+def atomic_write_json(filename: str, data: Any, indent: Optional[int] = 4) -> None:
+    """
+    Serialize data to a JSON file atomically.
+
+    Args:
+        filename: Path of the JSON file
+        data: JSON-serializable data
+        indent: Indentation of the JSON output
+    """
+    atomic_write_bytes(filename, json.dumps(data, indent=indent).encode("utf-8"))
+
+
+def get_backup_dir(filename: str) -> str:
+    """Get the backup directory of a file (next to the file)."""
+    return os.path.join(os.path.dirname(os.path.abspath(filename)), BACKUP_DIR)
+
+
+def list_backups(filename: str) -> List[str]:
+    """
+    List the backups of a file.
+
+    Args:
+        filename: Path of the backed up file
+
+    Returns:
+        Backup paths, newest first
+    """
+    pattern = os.path.join(
+        get_backup_dir(filename), f"{glob.escape(os.path.basename(filename))}.*.gz"
+    )
+    return sorted(glob.glob(pattern), reverse=True)
+
+
+def create_backup(
+    filename: str, keep: int = 5, min_interval_minutes: float = 0
+) -> Optional[str]:
+    """
+    Store a compressed copy of a file and prune the oldest backups.
+
+    Args:
+        filename: Path of the file to back up
+        keep: Number of backups to keep
+        min_interval_minutes: Skip the backup if the newest one is younger
+
+    Returns:
+        Path of the new backup, or None if no backup was made
+    """
+    if keep <= 0 or not os.path.exists(filename):
+        return None
+
+    backups = list_backups(filename)
+    if backups and min_interval_minutes > 0:
+        age_minutes = (time.time() - os.path.getmtime(backups[0])) / 60
+        if age_minutes < min_interval_minutes:
+            return None
+
+    os.makedirs(get_backup_dir(filename), exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    backup = os.path.join(
+        get_backup_dir(filename), f"{os.path.basename(filename)}.{stamp}.gz"
+    )
+    with open(filename, "rb") as file:
+        # Fast compression keeps the backup short next to the write itself
+        atomic_write_bytes(backup, gzip.compress(file.read(), compresslevel=1))
+
+    for old_backup in list_backups(filename)[keep:]:
+        os.remove(old_backup)
+    return backup
+
+
+def load_json_with_recovery(filename: str) -> Any:
+    """
+    Load a JSON file, restoring the newest readable backup if it is corrupt.
+
+    The corrupt file is kept next to the original with a ".corrupt-<time>"
+    suffix before the backup replaces it.
+
+    Args:
+        filename: Path of the JSON file
+
+    Returns:
+        The parsed JSON data
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is corrupt and no backup can be read
+    """
+    try:
+        with open(filename, "r") as file:
+            return json.load(file)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        error = e
+
+    for backup in list_backups(filename):
+        try:
+            with open(backup, "rb") as file:
+                content = gzip.decompress(file.read())
+            data = json.loads(content)
+        except (OSError, EOFError, json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        shutil.copyfile(filename, f"{filename}.corrupt-{stamp}")
+        atomic_write_bytes(filename, content)
+        st.warning(
+            f"{filename} was corrupt and has been restored from "
+            f"{os.path.basename(backup)}."
+        )
+        return data
+
+    raise ValueError(f"{filename} is corrupt and no readable backup exists: {error}")
@@ -0,0 +1,147 @@
+"""
+Entity index utility functions for the resource management application.
+
+This module provides a name index over people, teams, departments and projects
+so lookups and membership checks do not have to scan the resource lists.
+"""
+
+import streamlit as st
+from typing import Dict, List, Any, Hashable, Optional, Tuple
+from app.utils.cache_utils import (
+    get_data_revision,
+    get_shared_data_version,
+    memoize_derived,
+)
+
+RESOURCE_KEYS = ["people", "teams", "departments", "projects"]
+
+
+def build_entity_index(data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Build a name index over the resources of a data dictionary.
+
+    When several records share a name, the first one wins, matching the
+    behaviour of a linear scan.
+
+    Args:
+        data: Dictionary containing people, teams, departments and projects
+
+    Returns:
+        Dictionary with name -> record maps ("people", "teams", "departments",
+        "projects"), name -> type ("resource_types": "Person", "Team" or
+        "Department") and membership maps ("person_team", "person_department",
+        "team_department", "team_members", "team_people", "department_teams",
+        "department_people", "group_members")
+    """
+    index: Dict[str, Any] = {key: {} for key in RESOURCE_KEYS}
+    for key in RESOURCE_KEYS:
+        records = index[key]
+        for record in data.get(key, []):
+            records.setdefault(record.get("name"), record)
+
+    # A person shadows a team or department of the same name
+    resource_types: Dict[str, str] = {}
+    for key, resource_type in [
+        ("departments", "Department"),
+        ("teams", "Team"),
+        ("people", "Person"),
+    ]:
+        for name in index[key]:
+            resource_types[name] = resource_type
+    index["resource_types"] = resource_types
+
+    person_team: Dict[str, Optional[str]] = {}
+    person_department: Dict[str, Optional[str]] = {}
+    team_people: Dict[str, List[str]] = {}
+    department_people: Dict[str, List[str]] = {}
+    for name, person in index["people"].items():
+        person_team[name] = person.get("team")
+        person_department[name] = person.get("department")
+        if person.get("team"):
+            team_people.setdefault(person["team"], []).append(name)
+        if person.get("department"):
+            department_people.setdefault(person["department"], []).append(name)
+
+    team_department: Dict[str, Optional[str]] = {}
+    team_members: Dict[str, List[str]] = {}
+    department_teams: Dict[str, List[str]] = {}
+    for team in data.get("teams", []):
+        name = team.get("name")
+        team_department.setdefault(name, team.get("department"))
+        team_members.setdefault(name, team.get("members", []))
+        if team.get("department"):
+            department_teams.setdefault(team["department"], []).append(name)
+
+    # People a team or department allocation applies to: the team's listed
+    # members and people assigned to it, or everyone in the department
+    group_members: Dict[str, List[str]] = {}
+    for name in index["teams"]:
+        group_members[name] = [
+            member
+            for member in dict.fromkeys(
+                team_members.get(name, []) + team_people.get(name, [])
+            )
+            if member in index["people"]
+        ]
+    for name in index["departments"]:
+        group_members[name] = department_people.get(name, [])
+
+    index["person_team"] = person_team
+    index["person_department"] = person_department
+    index["team_people"] = team_people
+    index["department_people"] = department_people
+    index["team_department"] = team_department
+    index["team_members"] = team_members
+    index["department_teams"] = department_teams
+    index["group_members"] = group_members
+    return index
+
+
+def _index_signature(data: Dict[str, List[Dict[str, Any]]]) -> Tuple[Hashable, ...]:
+    """Identify the resource lists of a data dictionary and their lengths."""
+    return tuple((id(data.get(key)), len(data.get(key, []))) for key in RESOURCE_KEYS)
+
+
+def _uses_session_lists(
+    data: Dict[str, List[Dict[str, Any]]], session_data: Dict[str, Any]
+) -> bool:
+    """Check whether every resource list of data is the session's own list."""
+    keys = [key for key in RESOURCE_KEYS if key in data]
+    return bool(keys) and all(data[key] is session_data.get(key) for key in keys)
+
+
+def get_entity_index(
+    data: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+) -> Dict[str, Any]:
+    """
+    Get the entity index of a data dictionary.
+
+    The index of the session data is kept in the session state and rebuilt
+    only when the data revision or the resource lists change; sessions
+    viewing the same version of the shared data share one index. A dictionary
+    made of the session's own lists (e.g. {"people": people, "teams": teams})
+    shares that index; any other data is indexed on every call.
+
+    Args:
+        data: Dictionary of resource lists (defaults to the session data)
+
+    Returns:
+        Entity index (see build_entity_index); it must not be modified
+    """
+    session_data = st.session_state.get("data")
+    if data is None:
+        data = session_data
+    if session_data is None or not _uses_session_lists(data or {}, session_data):
+        return build_entity_index(data or {})
+
+    if get_shared_data_version() is not None:
+        return memoize_derived(
+            "entity_index", None, lambda: build_entity_index(session_data)
+        )
+
+    key = (get_data_revision(), id(session_data), _index_signature(session_data))
+    cached = st.session_state.get("entity_index")
+    if cached is None or cached[0] != key:
+        cached = (key, build_entity_index(session_data))
+        st.session_state.entity_index = cached
+    return cached[1]
@@ -0,0 +1,188 @@
+"""
+Instrumentation utility functions for the resource management application.
+
+This module provides opt-in timers and counters for a single script run, so
+slow tabs, sections and service calls can be found without a profiler.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import pandas as pd
+
+# Streamlit runs each session's script in its own thread
+_state = threading.local()
+
+
+def _get_run() -> Optional[Dict[str, Any]]:
+    """Get the instrumentation run of the current thread, if one is active."""
+    return getattr(_state, "run", None)
+
+
+def start_run(label: str) -> None:
+    """
+    Start recording timings and counters for the current script run.
+
+    Args:
+        label: Name of the run (e.g. the active tab)
+    """
+    _state.run = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "label": label,
+        "started": time.perf_counter(),
+        "sections": {},
+        "counters": {},
+        "stack": [],
+    }
+
+
+def finish_run() -> Optional[Dict[str, Any]]:
+    """
+    Stop recording and return the results of the current run.
+
+    Returns:
+        Dictionary with timestamp, label, total_ms, sections (a list of
+        path, calls, total_ms, max_ms and rows, slowest first) and counters,
+        or None if no run was active
+    """
+    run = _get_run()
+    _state.run = None
+    if run is None:
+        return None
+
+    sections = [
+        {"path": path, **stats}
+        for path, stats in sorted(
+            run["sections"].items(), key=lambda item: -item[1]["total_ms"]
+        )
+    ]
+    return {
+        "timestamp": run["timestamp"],
+        "label": run["label"],
+        "total_ms": (time.perf_counter() - run["started"]) * 1000,
+        "sections": sections,
+        "counters": run["counters"],
+    }
+
+
+def increment_counter(name: str, amount: int = 1) -> None:
+    """
+    Increase a counter of the current run; does nothing when no run is active.
+
+    Args:
+        name: Counter name (e.g. "settings_file_reads")
+        amount: Amount to add
+    """
+    run = _get_run()
+    if run is not None:
+        run["counters"][name] = run["counters"].get(name, 0) + amount
+
+
+@contextmanager
+def timed_section(name: str) -> Iterator[None]:
+    """
+    Time a block of code as a section of the current run.
+
+    Sections nest, so a section is recorded under the path of the sections
+    enclosing it (e.g. "Dashboard / _display_utilization_summary").
+
+    Args:
+        name: Section name
+    """
+    run = _get_run()
+    if run is None:
+        yield
+        return
+
+    run["stack"].append(name)
+    path = " / ".join(run["stack"])
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        run["stack"].pop()
+        stats = run["sections"].setdefault(
+            path, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+        )
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+
+def instrumented(name: Optional[str] = None) -> Callable:
+    """
+    Decorate a function so each call is timed as a section of the current run.
+
+    Rows of returned DataFrames are added to the section and to the
+    "dataframe_rows" counter.
+
+    Args:
+        name: Section name (defaults to the function name)
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        section = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            run = _get_run()
+            if run is None:
+                return func(*args, **kwargs)
+
+            with timed_section(section):
+                result = func(*args, **kwargs)
+            if isinstance(result, pd.DataFrame):
+                path = " / ".join(run["stack"] + [section])
+                run["sections"][path]["rows"] += len(result)
+                increment_counter("dataframe_rows", len(result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def append_run_to_log(run: Dict[str, Any], log_file: str) -> None:
+    """
+    Append the results of a run to a JSON Lines log file.
+
+    Args:
+        run: Results returned by finish_run
+        log_file: Path of the log file
+    """
+    directory = os.path.dirname(log_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(log_file, "a") as file:
+        file.write(json.dumps(run) + "\n")
+
+
+def summarize_sections(run: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Format the sections of a run for display.
+
+    Args:
+        run: Results returned by finish_run
+
+    Returns:
+        List of rows with rounded timings, slowest first
+    """
+    return [
+        {
+            "Section": section["path"],
+            "Calls": section["calls"],
+            "Total (ms)": round(section["total_ms"], 1),
+            "Max (ms)": round(section["max_ms"], 1),
+            "Rows": section["rows"],
+        }
+        for section in run["sections"]
+    ]
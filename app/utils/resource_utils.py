@@ -6,6 +6,23 @@ This module provides utility functions for resource CRUD operations.
 
 import streamlit as st
 from typing import List, Dict, Any, Optional
+from app.utils.cache_utils import bump_data_revision
+from app.utils.index_utils import RESOURCE_KEYS, get_entity_index
+
+
+def _session_resource_key(resources: List[Dict[str, Any]]) -> Optional[str]:
+    """Get the resource type of a list of the session data, if it is one."""
+    session_data = st.session_state.get("data") or {}
+    for key in RESOURCE_KEYS:
+        if resources is session_data.get(key):
+            return key
+    return None
+
+
+def _bump_for(resources: List[Dict[str, Any]], names: List[str]) -> None:
+    """Bump the data revision, itemizing the changed records when possible."""
+    key = _session_resource_key(resources)
+    bump_data_revision({key: names} if key else None)
 
 
 def find_resource_by_name(
@@ -21,6 +38,11 @@ def find_resource_by_name(
     Returns:
         Resource dictionary or None if not found
     """
+    # Lists of the session data are looked up through the entity index
+    key = _session_resource_key(resources)
+    if key:
+        return get_entity_index()[key].get(name)
+
     for resource in resources:
         if resource.get("name") == name:
             return resource
@@ -43,6 +65,7 @@ def add_resource(resource_list: List[Dict[str, Any]], resource: Dict[str, Any])
         return False
 
     resource_list.append(resource)
+    _bump_for(resource_list, [resource.get("name")])
     return True
 
 
@@ -65,6 +88,7 @@ def update_resource(
     for i, resource in enumerate(resource_list):
         if resource.get("name") == resource_name:
             resource_list[i] = updated_resource
+            _bump_for(resource_list, [resource_name, updated_resource.get("name")])
             return True
     return False
 
@@ -85,33 +109,48 @@ def delete_resource(
     """
     for i, resource in enumerate(resource_list):
         if resource.get("name") == resource_name:
+            # Records whose references are updated, for the change journal
+            touched: Dict[str, List[str]] = {
+                "teams": [],
+                "departments": [],
+                "projects": [],
+            }
+
             # Before deleting, handle references to this resource
             if resource_type == "person":
                 # Remove this person from all teams
                 for team in st.session_state.data["teams"]:
                     if resource_name in team.get("members", []):
                         team["members"].remove(resource_name)
+                        touched["teams"].append(team["name"])
 
                 # Remove this person from all departments
                 for dept in st.session_state.data["departments"]:
                     if resource_name in dept.get("members", []):
                         dept["members"].remove(resource_name)
+                        touched["departments"].append(dept["name"])
 
                 # Remove from all projects
                 for project in st.session_state.data["projects"]:
                     if resource_name in project.get("assigned_resources", []):
                         project["assigned_resources"].remove(resource_name)
+                        touched["projects"].append(project["name"])
 
                     # Also remove from resource allocations
                     if "resource_allocations" in project:
+                        allocations = project["resource_allocations"]
                         project["resource_allocations"] = [
                             alloc
-                            for alloc in project["resource_allocations"]
+                            for alloc in allocations
                             if alloc.get("resource") != resource_name
                         ]
+                        if len(project["resource_allocations"]) != len(allocations):
+                            touched["projects"].append(project["name"])
 
             # Now delete the resource
             del resource_list[i]
+            key = _session_resource_key(resource_list)
+            bump_data_revision({**touched, key: [resource_name]} if key else None)
             st.success(
                 f"{resource_type.title()} '{resource_name}' deleted successfully."
             )
@@ -135,12 +174,16 @@ def update_resource_references(
     if resource_name == new_name:
         return
 
+    # Records whose references are updated, for the change journal
+    touched: Dict[str, List[str]] = {"teams": [], "departments": [], "projects": []}
+
     # Update references in teams
     if resource_type == "person":
         for team in st.session_state.data["teams"]:
             if resource_name in team.get("members", []):
                 team["members"].remove(resource_name)
                 team["members"].append(new_name)
+                touched["teams"].append(team["name"])
 
     # Update references in departments
     if resource_type in ["person", "team"]:
@@ -148,9 +191,11 @@ def update_resource_references(
             if resource_type == "person" and resource_name in dept.get("members", []):
                 dept["members"].remove(resource_name)
                 dept["members"].append(new_name)
+                touched["departments"].append(dept["name"])
             elif resource_type == "team" and resource_name in dept.get("teams", []):
                 dept["teams"].remove(resource_name)
                 dept["teams"].append(new_name)
+                touched["departments"].append(dept["name"])
 
     # Update references in projects
     for project in st.session_state.data["projects"]:
@@ -158,11 +203,15 @@ def update_resource_references(
         if resource_name in project.get("assigned_resources", []):
             project["assigned_resources"].remove(resource_name)
             project["assigned_resources"].append(new_name)
+            touched["projects"].append(project["name"])
 
         # Update resource allocations
         for allocation in project.get("resource_allocations", []):
             if allocation.get("resource") == resource_name:
                 allocation["resource"] = new_name
+                touched["projects"].append(project["name"])
+
+    bump_data_revision(touched)
 
 
 def calculate_team_cost(team: Dict[str, Any], people: List[Dict[str, Any]]) -> float:
@@ -179,14 +228,14 @@ def calculate_team_cost(team: Dict[str, Any], people: List[Dict[str, Any]]) -> f
     if not team or "members" not in team:
         return 0.0
 
+    people_by_name = get_entity_index({"people": people})["people"]
     total_cost = 0.0
 
     # Sum the daily costs of all team members
     for member_name in team["members"]:
-        for person in people:
-            if person["name"] == member_name:
-                total_cost += person.get("daily_cost", 0.0)
-                break
+        person = people_by_name.get(member_name)
+        if person:
+            total_cost += person.get("daily_cost", 0.0)
 
     return total_cost
 
@@ -210,21 +259,19 @@ def calculate_department_cost(
     if not department:
         return 0.0
 
+    index = get_entity_index({"people": people, "teams": teams})
     total_cost = 0.0
 
     # Sum costs of direct members
     for member_name in department.get("members", []):
-        for person in people:
-            if person["name"] == member_name:
-                total_cost += person.get("daily_cost", 0.0)
-                break
+        person = index["people"].get(member_name)
+        if person:
+            total_cost += person.get("daily_cost", 0.0)
 
     # Sum costs of teams in the department
     for team_name in department.get("teams", []):
-        for team in teams:
-            if team["name"] == team_name:
-                team_cost = calculate_team_cost(team, people)
-                total_cost += team_cost
-                break
+        team = index["teams"].get(team_name)
+        if team:
+            total_cost += calculate_team_cost(team, people)
 
     return total_cost
@@ -0,0 +1,149 @@
+"""
+Streaming utility functions for the resource management application.
+
+This module provides an incremental reader for JSON documents whose top
+level is an object of arrays, such as resource data exports. Array items are
+decoded one at a time from fixed-size chunks, so neither the whole text nor
+the whole parsed document has to be held in memory.
+"""
+
+import codecs
+import json
+from typing import Any, BinaryIO, Callable, Iterator, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class _JsonChunkReader:
+    """Text buffer over a binary file that is refilled in chunks on demand."""
+
+    def __init__(self, file: BinaryIO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.decoder_json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping the consumed part."""
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        if not chunk:
+            self.eof = True
+        text = self.decoder.decode(chunk, final=self.eof)
+        self.buffer = self.buffer[self.pos :] + text
+        self.pos = 0
+        return bool(text) or not self.eof
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos] if self.pos < len(self.buffer) else ""
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                f"Expected '{char}' but found '{found or 'end of file'}' in JSON "
+                f"near byte {self.bytes_read - len(self.buffer) + self.pos}"
+            )
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder_json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            # with more digits, a fraction or an exponent
+            if (
+                end == len(self.buffer)
+                or (
+                    isinstance(value, (int, float))
+                    and not self.buffer[end:].lstrip(_NUMBER_CHARS)
+                )
+            ) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_arrays(
+    file: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_progress: Optional[Callable[[int], None]] = None,
+    on_key: Optional[Callable[[str, bool], None]] = None,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Iterate over the items of the top-level arrays of a JSON object.
+
+    Top-level values that are not arrays are skipped.
+
+    Args:
+        file: Binary file positioned at the start of the JSON document
+        chunk_size: Number of bytes read at a time
+        on_progress: Optional function called with the number of bytes read
+            after each item
+        on_key: Optional function called with each top-level key and whether
+            its value is an array
+
+    Yields:
+        (key, item) tuples in document order
+
+    Raises:
+        ValueError: If the document is not a JSON object or is malformed
+    """
+    reader = _JsonChunkReader(file, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError("Expected an object key in JSON")
+        reader.expect(":")
+        is_array = reader.peek() == "["
+        if on_key is not None:
+            on_key(key, is_array)
+
+        if is_array:
+            reader.pos += 1
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield key, reader.value()
+                    if on_progress is not None:
+                        on_progress(reader.bytes_read)
+                    if reader.peek() == ",":
+                        reader.pos += 1
+                        continue
+                    reader.expect("]")
+                    break
+        else:
+            reader.value()
+
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
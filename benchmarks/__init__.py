@@ -0,0 +1,3 @@
+"""
+Benchmark package for the resource management application.
+"""
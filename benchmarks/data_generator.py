@@ -0,0 +1,189 @@
+"""
+Synthetic organisation generator for the resource management benchmarks.
+
+This module provides functions that generate people, teams, departments and
+projects of a configurable size in the same format as resource_data.json.
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Any, Set
+
+from faker import Faker
+
+WORK_DAYS = ["MO", "TU", "WE", "TH", "FR"]
+ALLOCATION_PERCENTAGES = list(range(10, 101, 5))
+
+
+def _unique_name(make: Callable[[], str], used: Set[str]) -> str:
+    """Create a name that is not in used, adding a number on collisions."""
+    name = make()
+    if name in used:
+        name = f"{name} {len(used)}"
+    used.add(name)
+    return name
+
+
+def generate_organisation(
+    num_people: int = 200,
+    num_teams: int = 20,
+    num_departments: int = 5,
+    num_projects: int = 50,
+    allocations_per_project: int = 5,
+    horizon_days: int = 365,
+    start_date: date = date(2025, 1, 1),
+    seed: int = 42,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate a synthetic organisation in the resource_data.json format.
+
+    People are spread evenly over departments; teams belong to a department
+    and take at least two of its people. Projects run inside the horizon and
+    allocate people, teams and occasionally whole departments, each person at
+    most once per project so the generated data passes validation.
+
+    Args:
+        num_people: Number of people
+        num_teams: Number of teams
+        num_departments: Number of departments
+        num_projects: Number of projects
+        allocations_per_project: Resource allocations per project
+        horizon_days: Number of days over which projects are spread
+        start_date: First day of the horizon
+        seed: Random seed, so the same arguments give the same organisation
+
+    Returns:
+        Dictionary with people, teams, departments and projects lists
+    """
+    fake = Faker()
+    Faker.seed(seed)
+    rng = random.Random(seed)
+    used_names: Set[str] = set()
+
+    departments = [
+        {
+            "name": _unique_name(
+                lambda: f"{fake.word().title()} Department", used_names
+            ),
+            "teams": [],
+            "members": [],
+        }
+        for _ in range(max(num_departments, 1))
+    ]
+
+    people = []
+    for i in range(num_people):
+        department = departments[i % len(departments)]
+        daily_work_hours = rng.choice([6, 7, 8])
+        people.append(
+            {
+                "name": _unique_name(
+                    lambda: f"{fake.first_name()} {fake.last_name()}", used_names
+                ),
+                "role": fake.job(),
+                "department": department["name"],
+                "team": None,
+                "daily_cost": float(rng.randrange(200, 1000, 10)),
+                "work_days": WORK_DAYS,
+                "daily_work_hours": daily_work_hours,
+                "capacity_hours_per_week": daily_work_hours * len(WORK_DAYS),
+                "capacity_hours_per_month": round(
+                    daily_work_hours * len(WORK_DAYS) * 4.33, 1
+                ),
+            }
+        )
+
+    # Teams take unassigned people of their own department
+    unassigned = {
+        department["name"]: [p for p in people if p["department"] == department["name"]]
+        for department in departments
+    }
+    teams = []
+    for i in range(num_teams):
+        department = departments[i % len(departments)]
+        candidates = unassigned[department["name"]]
+        if len(candidates) < 2:
+            continue
+        size = min(len(candidates), rng.randint(2, 8))
+        members = [candidates.pop() for _ in range(size)]
+        team = {
+            "name": _unique_name(lambda: f"{fake.word().title()} Team", used_names),
+            "department": department["name"],
+            "members": [member["name"] for member in members],
+        }
+        for member in members:
+            member["team"] = team["name"]
+        department["teams"].append(team["name"])
+        teams.append(team)
+
+    for department in departments:
+        department["members"] = [p["name"] for p in unassigned[department["name"]]]
+
+    # Projects allocate mostly people, some teams and rarely departments
+    resource_pool = (
+        [(p["name"], "person") for p in people] * 8
+        + [(t["name"], "team") for t in teams] * 2
+        + [(d["name"], "department") for d in departments]
+    )
+    covered_people = {p["name"]: {p["name"]} for p in people}
+    for team in teams:
+        covered_people[team["name"]] = {team["name"], *team["members"]}
+    for department in departments:
+        covered_people[department["name"]] = {
+            department["name"],
+            *(p["name"] for p in people if p["department"] == department["name"]),
+        }
+    projects = []
+    for priority in range(1, num_projects + 1):
+        length = rng.randint(min(30, horizon_days), max(horizon_days // 2, 1))
+        offset = rng.randint(0, max(horizon_days - length, 0))
+        project_start = start_date + timedelta(days=offset)
+        project_end = project_start + timedelta(days=length - 1)
+
+        allocations = []
+        allocated_people: Set[str] = set()
+        for _ in range(len(resource_pool)):
+            if len(allocations) == allocations_per_project:
+                break
+            resource, resource_type = rng.choice(resource_pool)
+            # Each person is allocated once: directly, through one team or
+            # through their department
+            if not covered_people[resource].isdisjoint(allocated_people):
+                continue
+            allocated_people.update(covered_people[resource])
+
+            alloc_start = project_start + timedelta(days=rng.randint(0, length // 2))
+            alloc_end = alloc_start + timedelta(
+                days=rng.randint(0, (project_end - alloc_start).days)
+            )
+            allocations.append(
+                {
+                    "resource": resource,
+                    "resource_type": resource_type,
+                    "allocation_percentage": rng.choice(ALLOCATION_PERCENTAGES),
+                    "start_date": alloc_start.isoformat(),
+                    "end_date": alloc_end.isoformat(),
+                }
+            )
+
+        projects.append(
+            {
+                "name": _unique_name(lambda: fake.catch_phrase().title(), used_names),
+                "description": fake.sentence(),
+                "start_date": project_start.isoformat(),
+                "end_date": project_end.isoformat(),
+                "priority": priority,
+                "allocated_budget": float(rng.randrange(50_000, 2_000_000, 1_000)),
+                "assigned_resources": list(
+                    dict.fromkeys(a["resource"] for a in allocations)
+                ),
+                "resource_allocations": allocations,
+            }
+        )
+
+    return {
+        "people": people,
+        "teams": teams,
+        "departments": departments,
+        "projects": projects,
+    }
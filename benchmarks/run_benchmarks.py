@@ -0,0 +1,246 @@
+"""
+Benchmark runner for the resource management application.
+
+This module provides a command line harness that times the core data
+functions headlessly on a synthetic organisation and appends the results to
+a JSON Lines file, one record per run.
+
+Usage:
+    python -m benchmarks.run_benchmarks --people 1000 --projects 200
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Any
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit import logger as streamlit_logger
+
+from benchmarks.data_generator import generate_organisation
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results.jsonl")
+
+
+def _time_function(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    Time a function over several runs.
+
+    Args:
+        func: Function to call without arguments
+        repeat: Number of timed runs
+
+    Returns:
+        Dictionary with min, median and mean seconds and the repeat count
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "repeat": repeat,
+    }
+
+
+def _git_revision() -> str:
+    """Get the current git revision, or an empty string outside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_benchmarks(
+    parameters: Dict[str, Any], repeat: int = 5
+) -> Dict[str, Dict[str, float]]:
+    """
+    Generate an organisation and time the core data functions on it.
+
+    Args:
+        parameters: Keyword arguments for generate_organisation
+        repeat: Number of timed runs per function
+
+    Returns:
+        Dictionary mapping benchmark names to timing statistics, plus a
+        "dataset" entry describing the generated data
+    """
+    # Imported here so the data service sees the headless session state
+    from app.services.data_service import (
+        create_gantt_data,
+        calculate_resource_utilization,
+        calculate_capacity_data,
+        find_resource_conflicts,
+        check_circular_dependencies,
+    )
+    from app.services.cost_service import calculate_project_costs
+    from app.services.import_service import merge_resource_data
+    from app.services.snapshot_service import (
+        build_snapshot_gantt_data,
+        load_snapshot,
+        read_snapshot_tables,
+        write_snapshot,
+    )
+    from app.services.validation_service import validate_imported_data
+
+    data = generate_organisation(**parameters)
+    st.session_state.data = data
+
+    gantt_data = create_gantt_data(data["projects"], data)
+    start_date = gantt_data["Start"].min()
+    end_date = gantt_data["End"].max()
+    snapshot_dir = tempfile.mkdtemp(prefix="benchmark_snapshot_")
+    write_snapshot(data, snapshot_dir)
+
+    benchmarks: Dict[str, Callable[[], Any]] = {
+        "create_gantt_data": lambda: create_gantt_data(data["projects"], data),
+        "write_snapshot": lambda: write_snapshot(data, snapshot_dir),
+        "load_snapshot": lambda: load_snapshot(snapshot_dir),
+        "snapshot_gantt_data": lambda: build_snapshot_gantt_data(
+            read_snapshot_tables(snapshot_dir)
+        ),
+        "calculate_resource_utilization": lambda: calculate_resource_utilization(
+            gantt_data
+        ),
+        "calculate_capacity_data": lambda: calculate_capacity_data(
+            gantt_data, start_date, end_date
+        ),
+        "find_resource_conflicts": lambda: find_resource_conflicts(gantt_data),
+        "find_resource_conflicts_merged": lambda: find_resource_conflicts(
+            gantt_data, merge_intervals=True
+        ),
+        "calculate_project_costs": lambda: calculate_project_costs(
+            data["projects"], data["people"], data["teams"]
+        ),
+        "calculate_project_cost_series": lambda: calculate_project_costs(
+            data["projects"], data["people"], data["teams"], daily_series=True
+        ),
+        "validate_imported_data": lambda: validate_imported_data(data),
+        # Merges every record into a copy of its own list (all unchanged)
+        "merge_resource_data": lambda: merge_resource_data(
+            {resource_type: list(items) for resource_type, items in data.items()},
+            data,
+        ),
+        "check_circular_dependencies": check_circular_dependencies,
+    }
+
+    results: Dict[str, Any] = {
+        "dataset": {
+            "people": len(data["people"]),
+            "teams": len(data["teams"]),
+            "departments": len(data["departments"]),
+            "projects": len(data["projects"]),
+            "allocations": sum(
+                len(p.get("resource_allocations", [])) for p in data["projects"]
+            ),
+            "gantt_rows": len(gantt_data),
+            "capacity_days": int((end_date - start_date).days) + 1,
+        }
+    }
+    for name, func in benchmarks.items():
+        results[name] = _time_function(func, repeat)
+    shutil.rmtree(snapshot_dir, ignore_errors=True)
+    return results
+
+
+def write_results(
+    results: Dict[str, Any], parameters: Dict[str, Any], output: str, label: str
+) -> Dict[str, Any]:
+    """
+    Append a benchmark run to a JSON Lines results file.
+
+    Args:
+        results: Output of run_benchmarks
+        parameters: Generator parameters of the run
+        output: Path of the results file
+        label: Free-form label of the run (e.g. a release name)
+
+    Returns:
+        The record that was written
+    """
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": label,
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "parameters": {
+            key: value.isoformat() if hasattr(value, "isoformat") else value
+            for key, value in parameters.items()
+        },
+        "dataset": results["dataset"],
+        "timings": {k: v for k, v in results.items() if k != "dataset"},
+    }
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "a") as file:
+        file.write(json.dumps(record) + "\n")
+    return record
+
+
+def _parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Time the core data functions on a synthetic organisation."
+    )
+    parser.add_argument("--people", type=int, default=200)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--departments", type=int, default=5)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--allocations-per-project", type=int, default=5)
+    parser.add_argument("--horizon-days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--label", default="")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmarks from the command line and print a summary."""
+    args = _parse_args(argv)
+
+    # Streamlit warns about the missing script context when run headless
+    streamlit_logger.set_log_level("error")
+    warnings.filterwarnings("ignore")
+
+    parameters = {
+        "num_people": args.people,
+        "num_teams": args.teams,
+        "num_departments": args.departments,
+        "num_projects": args.projects,
+        "allocations_per_project": args.allocations_per_project,
+        "horizon_days": args.horizon_days,
+        "seed": args.seed,
+    }
+    results = run_benchmarks(parameters, repeat=args.repeat)
+    record = write_results(results, parameters, args.output, args.label)
+
+    print(f"Dataset: {record['dataset']}")
+    for name, timing in record["timings"].items():
+        print(f"{name:<34} median {timing['median'] * 1000:10.2f} ms")
+    print(f"Results appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
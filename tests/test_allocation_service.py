@@ -0,0 +1,260 @@
+"""Tests for the allocation matrix engine."""
+
+import numpy as np
+import pandas as pd
+
+from app.services import allocation_service, calendar_service
+from app.utils.index_utils import build_entity_index
+
+
+def _gantt(seed=0, n=60):
+    """Random Gantt rows with one-decimal percentages and some reversed dates."""
+    rng = np.random.default_rng(seed)
+    starts = pd.Timestamp("2025-01-01") + pd.to_timedelta(
+        rng.integers(0, 60, n), unit="D"
+    )
+    ends = starts + pd.to_timedelta(rng.integers(-3, 30, n), unit="D")
+    return pd.DataFrame(
+        {
+            "Project": [f"P{i % 7}" for i in range(n)],
+            "Resource": [f"R{i}" for i in rng.integers(0, 6, n)],
+            "Type": "Person",
+            "Start": starts,
+            "End": ends,
+            "Allocation %": rng.integers(100, 1000, n) / 10,
+        }
+    )
+
+
+def _daily_sums(gantt_data, resource, dates):
+    """Per-day allocation sums as the original day-by-day loop computed them."""
+    rows = gantt_data[gantt_data["Resource"] == resource]
+    return np.array(
+        [
+            rows[(rows["Start"] <= date) & (rows["End"] >= date)]["Allocation %"].sum()
+            for date in dates
+        ]
+    )
+
+
+def _baseline_days(gantt_data, resource, working_days=None):
+    """Allocated and overallocated days as the original per-day loop summed them."""
+    rows = gantt_data[gantt_data["Resource"] == resource]
+    daily_allocation = {}
+    for _, row in rows.iterrows():
+        for date in pd.date_range(start=row["Start"], end=row["End"]):
+            if working_days is None or date in working_days:
+                daily_allocation[date] = (
+                    daily_allocation.get(date, 0) + row["Allocation %"] / 100
+                )
+    return (
+        sum(min(alloc, 1) for alloc in daily_allocation.values()),
+        sum(max(alloc - 1, 0) for alloc in daily_allocation.values()),
+    )
+
+
+def test_sweep_line_matches_daily_loop():
+    gantt_data = _gantt(seed=2)
+    totals = allocation_service.calculate_allocation_totals(gantt_data)
+    assert totals["Resource"].tolist() == list(gantt_data["Resource"].unique())
+
+    for resource, allocated, overallocated in totals.itertuples(index=False):
+        expected = _baseline_days(gantt_data, resource)
+        np.testing.assert_allclose((allocated, overallocated), expected)
+
+
+def test_sweep_line_counts_only_working_days(monkeypatch):
+    monkeypatch.setattr(
+        calendar_service,
+        "load_work_schedule_settings",
+        lambda: {"work_days": ["MO", "TU", "WE", "TH", "FR"], "work_hours": 8.0},
+    )
+    gantt_data = _gantt(seed=3)
+    resources = gantt_data["Resource"].unique()
+    calendar = calendar_service.build_work_calendar(
+        resources, gantt_data["Start"].min(), gantt_data["End"].max(), {}
+    )
+    totals = allocation_service.calculate_allocation_totals(gantt_data, calendar)
+
+    weekdays = set(calendar["dates"][calendar["dates"].dayofweek < 5])
+    for resource, allocated, overallocated in totals.itertuples(index=False):
+        expected = _baseline_days(gantt_data, resource, weekdays)
+        np.testing.assert_allclose((allocated, overallocated), expected)
+
+
+def test_sweep_line_of_empty_and_reversed_inputs():
+    empty = allocation_service.calculate_allocation_totals(_gantt().iloc[:0])
+    assert empty.empty
+    assert empty.columns.tolist() == [
+        "Resource",
+        "Allocated Days",
+        "Overallocated Days",
+    ]
+
+    reversed_only = _gantt().assign(End=lambda df: df["Start"] - pd.Timedelta(days=1))
+    totals = allocation_service.calculate_allocation_totals(reversed_only)
+    assert len(totals) == reversed_only["Resource"].nunique()
+    assert not totals[["Allocated Days", "Overallocated Days"]].to_numpy().any()
+
+
+def test_matrix_matches_daily_sums():
+    gantt_data = _gantt()
+    allocation_matrix = allocation_service.build_allocation_matrix(gantt_data)
+    assert allocation_matrix["matrix"].dtype == np.float64
+
+    for resource in allocation_matrix["index"]:
+        expected = _daily_sums(gantt_data, resource, allocation_matrix["dates"])
+        row = allocation_service.get_allocation_row(allocation_matrix, resource)
+        np.testing.assert_array_equal(row.to_numpy(), np.round(expected, 6))
+
+
+def test_sums_have_no_float_noise():
+    gantt_data = pd.DataFrame(
+        {
+            "Resource": ["Ada", "Ada", "Ada"],
+            "Start": pd.to_datetime(["2025-01-01", "2025-01-01", "2025-01-03"]),
+            "End": pd.to_datetime(["2025-01-05", "2025-01-02", "2025-01-05"]),
+            "Allocation %": [33.3, 108.3, 108.3],
+        }
+    )
+    allocation_matrix = allocation_service.build_allocation_matrix(gantt_data)
+    assert allocation_matrix["matrix"][0].tolist() == [
+        141.6,
+        141.6,
+        141.6,
+        141.6,
+        141.6,
+    ]
+
+
+def test_update_matches_full_build():
+    gantt_data = _gantt(seed=1)
+    allocation_matrix = allocation_service.build_allocation_matrix(gantt_data)
+    removed = gantt_data[gantt_data["Project"] == "P3"]
+    added = removed.assign(
+        Start=removed["Start"] + pd.Timedelta(days=40), **{"Allocation %": 33.3}
+    )
+    updated = allocation_service.update_allocation_matrix(
+        allocation_matrix, removed, added
+    )
+
+    rebuilt_data = pd.concat([gantt_data[gantt_data["Project"] != "P3"], added])
+    rebuilt = allocation_service.build_allocation_matrix(
+        rebuilt_data, updated["dates"][0], updated["dates"][-1]
+    )
+    window = allocation_service.slice_allocation_matrix(updated, list(rebuilt["index"]))
+    np.testing.assert_array_equal(window["matrix"], rebuilt["matrix"])
+
+
+def test_empty_and_reversed_inputs():
+    empty = _gantt().iloc[:0]
+    allocation_matrix = allocation_service.build_allocation_matrix(empty)
+    assert allocation_matrix["matrix"].shape == (0, 0)
+
+    reversed_only = _gantt().assign(End=lambda df: df["Start"] - pd.Timedelta(days=1))
+    allocation_matrix = allocation_service.build_allocation_matrix(
+        reversed_only, pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-10")
+    )
+    assert not allocation_matrix["matrix"].any()
+
+
+GROUP_DATA = {
+    "people": [
+        {"name": "Ada", "department": "Research", "team": "Core"},
+        # Assigned to the team without being listed as a member
+        {"name": "Brian", "department": "Research", "team": "Core"},
+        {"name": "Carol", "department": "Research", "team": None},
+        {"name": "Dan", "department": "Sales", "team": None},
+    ],
+    "teams": [
+        {"name": "Core", "department": "Research", "members": ["Ada", "Nobody"]},
+        {"name": "Empty", "department": "Sales", "members": []},
+    ],
+    "departments": [
+        {"name": "Research", "teams": ["Core"], "members": ["Carol"]},
+        {"name": "Sales", "teams": ["Empty"], "members": ["Dan"]},
+    ],
+    "projects": [],
+}
+
+
+def _group_gantt():
+    rows = [
+        ("Apollo", "Core", "Team", "2025-01-01", "2025-01-10", 50),
+        ("Apollo", "Carol", "Person", "2025-01-03", "2025-01-04", 20),
+        ("Gemini", "Research", "Department", "2025-01-05", "2025-01-06", 10),
+        ("Gemini", "Empty", "Team", "2025-01-01", "2025-01-02", 30),
+        ("Mercury", "Ada", "Person", "2025-01-08", "2025-01-03", 40),
+    ]
+    gantt_data = pd.DataFrame(
+        rows, columns=["Project", "Resource", "Type", "Start", "End", "Allocation %"]
+    )
+    gantt_data["Start"] = pd.to_datetime(gantt_data["Start"])
+    gantt_data["End"] = pd.to_datetime(gantt_data["End"])
+    gantt_data["Department"] = ["Research", "Research", "Research", "Sales", "Research"]
+    gantt_data["Team"] = ["Core", None, None, "Empty", "Core"]
+    return gantt_data
+
+
+def _expanded_rows(gantt_data, data, keep_aggregates):
+    """Member rows as a row-by-row loop over the group records builds them."""
+    people = {person["name"]: person for person in data["people"]}
+    rows = []
+    for row in gantt_data.to_dict("records"):
+        if row["Type"] == "Team":
+            team = next(t for t in data["teams"] if t["name"] == row["Resource"])
+            members = [m for m in team["members"] if m in people] + [
+                name
+                for name, person in people.items()
+                if person["team"] == team["name"] and name not in team["members"]
+            ]
+        elif row["Type"] == "Department":
+            members = [
+                name
+                for name, person in people.items()
+                if person["department"] == row["Resource"]
+            ]
+        else:
+            members = []
+        if not members or keep_aggregates:
+            rows.append(dict(row, **{"Allocated Via": None}))
+        for member in members:
+            rows.append(
+                dict(
+                    row,
+                    Resource=member,
+                    Type="Person",
+                    Department=people[member]["department"],
+                    Team=people[member]["team"],
+                    **{"Allocated Via": row["Resource"]},
+                )
+            )
+    return pd.DataFrame(rows)
+
+
+def test_group_expansion_matches_row_loop():
+    gantt_data = _group_gantt()
+    index = build_entity_index(GROUP_DATA)
+    for keep_aggregates in (False, True):
+        expanded = allocation_service.expand_group_allocations(
+            gantt_data, index, keep_aggregates
+        )
+        expected = _expanded_rows(gantt_data, GROUP_DATA, keep_aggregates)
+        pd.testing.assert_frame_equal(
+            expanded, expected[expanded.columns], check_dtype=False
+        )
+
+    # Per-person load includes the group work, never the reversed row
+    expanded = allocation_service.expand_group_allocations(gantt_data, index)
+    allocation_matrix = allocation_service.build_allocation_matrix(expanded)
+    ada = allocation_service.get_allocation_row(allocation_matrix, "Ada")
+    assert ada.tolist() == [50, 50, 50, 50, 60, 60, 50, 50, 50, 50]
+
+
+def test_group_expansion_of_empty_input():
+    empty = _group_gantt().iloc[:0]
+    expanded = allocation_service.expand_group_allocations(
+        empty, build_entity_index(GROUP_DATA)
+    )
+    assert expanded.empty
+    assert "Allocated Via" in expanded.columns
@@ -0,0 +1,103 @@
+"""Tests for the data revision counter and derived value caches."""
+
+from collections import OrderedDict
+
+import pytest
+import streamlit as st
+
+from app.utils import cache_utils
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(monkeypatch):
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    monkeypatch.setattr(cache_utils, "_shared_cache", OrderedDict())
+    yield
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+
+def _counting(calls):
+    def compute():
+        calls.append(cache_utils.get_data_revision())
+        return {"revision": len(calls)}
+
+    return compute
+
+
+def test_values_are_computed_once_per_revision():
+    calls = []
+    first = cache_utils.memoize_derived("gantt", None, _counting(calls))
+    assert cache_utils.memoize_derived("gantt", None, _counting(calls)) is first
+    assert calls == [0]
+
+    # Other keys and names are cached separately
+    cache_utils.memoize_derived("gantt", True, _counting(calls))
+    cache_utils.memoize_derived("capacity", None, _counting(calls))
+    assert calls == [0, 0, 0]
+
+    cache_utils.bump_data_revision()
+    second = cache_utils.memoize_derived("gantt", None, _counting(calls))
+    assert second is not first
+    assert calls == [0, 0, 0, 1]
+
+
+def test_least_recently_used_entries_are_evicted():
+    calls = []
+    for key in range(cache_utils.MAX_CACHE_ENTRIES):
+        cache_utils.memoize_derived("filtered", key, _counting(calls))
+    # Using the oldest entry keeps it over the second oldest
+    cache_utils.memoize_derived("filtered", 0, _counting(calls))
+    cache_utils.memoize_derived("filtered", "new", _counting(calls))
+    assert len(calls) == cache_utils.MAX_CACHE_ENTRIES + 1
+
+    cache_utils.memoize_derived("filtered", 0, _counting(calls))
+    assert len(calls) == cache_utils.MAX_CACHE_ENTRIES + 1
+    cache_utils.memoize_derived("filtered", 1, _counting(calls))
+    assert len(calls) == cache_utils.MAX_CACHE_ENTRIES + 2
+
+
+def test_shared_versions_are_cached_across_sessions():
+    calls = []
+    cache_utils.set_shared_data_version(3)
+    first = cache_utils.memoize_derived("gantt", None, _counting(calls))
+
+    # Another session viewing the same version
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    cache_utils.set_shared_data_version(3)
+    assert cache_utils.memoize_derived("gantt", None, _counting(calls)) is first
+
+    cache_utils.set_shared_data_version(None)
+    cache_utils.memoize_derived("gantt", None, _counting(calls))
+    assert len(calls) == 2
+
+
+def test_changes_since_revision():
+    assert cache_utils.get_changes_since_revision(0) == {}
+    cache_utils.bump_data_revision({"projects": ["Apollo"]})
+    cache_utils.bump_data_revision({"projects": ["Gemini"], "people": ["Ada"]})
+    assert cache_utils.get_changes_since_revision(0) == {
+        "projects": {"Apollo", "Gemini"},
+        "people": {"Ada"},
+    }
+    assert cache_utils.get_changes_since_revision(1) == {
+        "projects": {"Gemini"},
+        "people": {"Ada"},
+    }
+
+    # Changes that were not itemized are unknown
+    cache_utils.bump_data_revision()
+    assert cache_utils.get_changes_since_revision(1) is None
+    cache_utils.bump_data_revision({"projects": ["Apollo"]})
+    assert cache_utils.get_changes_since_revision(3) == {"projects": {"Apollo"}}
+
+    # So are revisions no longer logged
+    for _ in range(cache_utils.MAX_REVISION_LOG):
+        cache_utils.bump_data_revision({"projects": ["Apollo"]})
+    assert cache_utils.get_changes_since_revision(3) is None
+    revision = cache_utils.get_data_revision()
+    assert cache_utils.get_changes_since_revision(revision - 1) == {
+        "projects": {"Apollo"}
+    }
@@ -0,0 +1,50 @@
+"""Tests for the work calendar service."""
+
+import pandas as pd
+
+from app.services import calendar_service
+
+
+def _data(work_days):
+    person = {"name": "Ada Lovelace", "department": "Research", "daily_work_hours": 8}
+    if work_days is not None:
+        person["work_days"] = work_days
+    return {
+        "people": [person],
+        "teams": [],
+        "departments": [{"name": "Research", "teams": [], "members": []}],
+        "projects": [],
+    }
+
+
+def test_person_without_work_days_uses_default_schedule(monkeypatch):
+    monkeypatch.setattr(
+        calendar_service,
+        "load_work_schedule_settings",
+        lambda: {"work_days": ["MO", "TU", "WE"], "work_hours": 6.0},
+    )
+    # Monday 2025-01-06 to Sunday 2025-01-12
+    start, end = pd.Timestamp("2025-01-06"), pd.Timestamp("2025-01-12")
+
+    for work_days in (None, []):
+        calendar = calendar_service.build_work_calendar(
+            ["Ada Lovelace"], start, end, _data(work_days)
+        )
+        mask = calendar_service.get_working_day_mask(calendar)[0]
+        assert mask.tolist() == [True, True, True, False, False, False, False]
+        assert calendar["daily_hours"].tolist() == [8.0]
+
+
+def test_person_work_days_override_default_schedule(monkeypatch):
+    monkeypatch.setattr(
+        calendar_service,
+        "load_work_schedule_settings",
+        lambda: {"work_days": ["MO", "TU", "WE"], "work_hours": 6.0},
+    )
+    start, end = pd.Timestamp("2025-01-06"), pd.Timestamp("2025-01-12")
+
+    calendar = calendar_service.build_work_calendar(
+        ["Ada Lovelace"], start, end, _data(["FR", "SA"])
+    )
+    mask = calendar_service.get_working_day_mask(calendar)[0]
+    assert mask.tolist() == [False, False, False, False, True, True, False]
@@ -0,0 +1,68 @@
+"""Tests for the settings cache."""
+
+import json
+import os
+
+import pytest
+
+from app.services import config_service
+
+
+@pytest.fixture
+def settings_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        config_service, "_settings_cache", {"signature": None, "settings": None}
+    )
+    reads = []
+    load_json = config_service.load_json_with_recovery
+    monkeypatch.setattr(
+        config_service,
+        "load_json_with_recovery",
+        lambda filename: reads.append(filename) or load_json(filename),
+    )
+    return tmp_path, reads
+
+
+def test_settings_file_is_read_only_when_it_changes(settings_dir):
+    tmp_path, reads = settings_dir
+    settings_file = tmp_path / "settings.json"
+    settings_file.write_text(json.dumps({"currency": "USD"}))
+
+    assert config_service.get_setting("currency") == "USD"
+    assert config_service.load_settings() == {"currency": "USD"}
+    assert len(reads) == 1
+
+    # Edited outside the app, with a new modification time
+    settings_file.write_text(json.dumps({"currency": "GBP"}))
+    stat = settings_file.stat()
+    os.utime(settings_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert config_service.get_setting("currency") == "GBP"
+    assert len(reads) == 2
+
+
+def test_saved_settings_are_cached_without_reading(settings_dir):
+    tmp_path, reads = settings_dir
+    settings = config_service.load_settings()
+    # A missing file is created with the defaults
+    assert settings["storage_backend"] == "json"
+    assert (tmp_path / "settings.json").exists()
+
+    settings["currency"] = "CHF"
+    config_service.save_settings(settings)
+    assert config_service.get_setting("currency") == "CHF"
+    assert json.loads((tmp_path / "settings.json").read_text())["currency"] == "CHF"
+    assert reads == []
+
+
+def test_returned_settings_are_copies(settings_dir):
+    tmp_path, _ = settings_dir
+    (tmp_path / "settings.json").write_text(
+        json.dumps({"work_schedule": {"work_days": ["MO"], "work_hours": 8}})
+    )
+    config_service.load_settings()["work_schedule"]["work_days"].append("TU")
+    config_service.get_setting("work_schedule")["work_hours"] = 4
+    assert config_service.get_setting("work_schedule") == {
+        "work_days": ["MO"],
+        "work_hours": 8,
+    }
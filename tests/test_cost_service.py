@@ -0,0 +1,131 @@
+"""Tests for the batched project cost engine."""
+
+import numpy as np
+import pandas as pd
+
+from app.services import cost_service
+
+PEOPLE = [
+    {"name": "Ada", "daily_cost": 500},
+    {"name": "Brian", "daily_cost": 412.5},
+    {"name": "Carol"},
+]
+TEAMS = [{"name": "Core", "members": ["Ada", "Brian", "Nobody"]}]
+PROJECTS = [
+    {
+        "name": "Apollo",
+        "start_date": "2025-01-01",
+        "end_date": "2025-01-31",
+        "assigned_resources": ["Ada", "Core", "Research", "Ghost"],
+    },
+    {
+        "name": "Gemini",
+        "start_date": "2025-02-01",
+        "end_date": "2025-03-31",
+        "resource_allocations": [
+            {
+                "resource": "Ada",
+                "allocation_percentage": 50,
+                "start_date": "2025-02-01",
+                "end_date": "2025-02-10",
+            },
+            {
+                "resource": "Core",
+                "allocation_percentage": 25,
+                "start_date": "2025-02-05",
+                "end_date": "2025-03-04",
+            },
+            {
+                # Reversed dates
+                "resource": "Brian",
+                "allocation_percentage": 100,
+                "start_date": "2025-03-10",
+                "end_date": "2025-03-08",
+            },
+        ],
+    },
+    {
+        "name": "Mercury",
+        "start_date": "2025-04-01",
+        "end_date": "2025-04-30",
+        "assigned_resources": [],
+    },
+]
+
+
+def _baseline_cost(project, people, teams):
+    """Project cost as the original per-project scan computed it."""
+
+    def daily_cost(name):
+        person = next((p for p in people if p["name"] == name), None)
+        if person:
+            return person.get("daily_cost", 0)
+        team = next((t for t in teams if t["name"] == name), None)
+        if team:
+            return sum(
+                p.get("daily_cost", 0)
+                for p in people
+                if p["name"] in team.get("members", [])
+            )
+        return 0
+
+    allocations = project.get("resource_allocations") or [
+        {
+            "resource": name,
+            "allocation_percentage": 100,
+            "start_date": project["start_date"],
+            "end_date": project["end_date"],
+        }
+        for name in project.get("assigned_resources", [])
+    ]
+    total = 0
+    for allocation in allocations:
+        days = (
+            pd.to_datetime(allocation["end_date"])
+            - pd.to_datetime(allocation["start_date"])
+        ).days + 1
+        total += (
+            daily_cost(allocation["resource"])
+            * days
+            * allocation["allocation_percentage"]
+            / 100
+        )
+    return total
+
+
+def test_costs_match_per_project_scan():
+    costs = cost_service.calculate_project_costs(PROJECTS, PEOPLE, TEAMS)
+    assert list(costs.index) == ["Apollo", "Gemini", "Mercury"]
+    expected = [_baseline_cost(project, PEOPLE, TEAMS) for project in PROJECTS]
+    np.testing.assert_allclose(costs.to_numpy(), expected)
+
+
+def test_costs_of_no_projects():
+    assert cost_service.calculate_project_costs([], PEOPLE, TEAMS).empty
+    costs, daily = cost_service.calculate_project_costs(
+        [], PEOPLE, TEAMS, daily_series=True
+    )
+    assert costs.empty and daily.empty
+
+
+def test_daily_series_adds_up_to_valid_allocations():
+    _, daily = cost_service.calculate_project_costs(
+        PROJECTS, PEOPLE, TEAMS, daily_series=True
+    )
+    assert set(daily["Project"]) == {"Apollo", "Gemini"}
+
+    gemini = daily[daily["Project"] == "Gemini"]
+    assert gemini["Date"].min() == pd.Timestamp("2025-02-01")
+    assert gemini["Date"].max() == pd.Timestamp("2025-03-04")
+    # Per-day sums of the allocations active on each day
+    for date, cost in zip(gemini["Date"], gemini["Daily Cost"]):
+        expected = (500 * 0.5 if date <= pd.Timestamp("2025-02-10") else 0) + (
+            912.5 * 0.25 if date >= pd.Timestamp("2025-02-05") else 0
+        )
+        assert cost == expected
+    np.testing.assert_allclose(
+        gemini["Cumulative Cost"].iloc[-1], gemini["Daily Cost"].sum()
+    )
+
+    apollo = daily[daily["Project"] == "Apollo"]
+    assert apollo["Cumulative Cost"].iloc[0] == apollo["Daily Cost"].iloc[0]
@@ -0,0 +1,80 @@
+"""Tests for the synthetic organisation generator and the benchmark runner."""
+
+import json
+from datetime import date
+
+import streamlit as st
+
+from app.services.validation_service import validate_imported_data
+from benchmarks import run_benchmarks
+from benchmarks.data_generator import generate_organisation
+
+PARAMETERS = {
+    "num_people": 30,
+    "num_teams": 4,
+    "num_departments": 3,
+    "num_projects": 6,
+    "allocations_per_project": 4,
+    "horizon_days": 90,
+    "start_date": date(2025, 1, 1),
+}
+
+
+def test_same_seed_gives_same_organisation():
+    assert generate_organisation(**PARAMETERS) == generate_organisation(**PARAMETERS)
+    assert generate_organisation(**PARAMETERS) != generate_organisation(
+        **PARAMETERS, seed=7
+    )
+
+
+def test_organisation_is_consistent():
+    data = generate_organisation(**PARAMETERS)
+    assert len(data["people"]) == 30
+    assert len(data["teams"]) == 4
+    assert len(data["departments"]) == 3
+    assert len(data["projects"]) == 6
+
+    names = [
+        item["name"]
+        for resource_type in ("people", "teams", "departments", "projects")
+        for item in data[resource_type]
+    ]
+    assert len(names) == len(set(names))
+
+    people = {person["name"]: person for person in data["people"]}
+    for team in data["teams"]:
+        for member in team["members"]:
+            assert people[member]["team"] == team["name"]
+            assert people[member]["department"] == team["department"]
+
+    for project in data["projects"]:
+        assert "2025-01-01" <= project["start_date"] <= project["end_date"]
+        assert project["end_date"] <= "2025-03-31"
+        assert len(project["resource_allocations"]) == 4
+        for allocation in project["resource_allocations"]:
+            assert project["start_date"] <= allocation["start_date"]
+            assert allocation["start_date"] <= allocation["end_date"]
+            assert allocation["end_date"] <= project["end_date"]
+
+    is_valid, errors = validate_imported_data(data)
+    assert is_valid, errors
+
+
+def test_benchmark_run_is_written_as_one_line(tmp_path):
+    parameters = dict(PARAMETERS, num_people=10, num_projects=3)
+    try:
+        results = run_benchmarks.run_benchmarks(parameters, repeat=1)
+    finally:
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+    assert results["dataset"]["projects"] == 3
+    assert results["dataset"]["allocations"] == 12
+    assert results["create_gantt_data"]["repeat"] == 1
+
+    output = tmp_path / "results" / "benchmarks.jsonl"
+    for label in ("before", "after"):
+        run_benchmarks.write_results(results, parameters, str(output), label)
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["label"] for record in records] == ["before", "after"]
+    assert records[0]["parameters"]["start_date"] == "2025-01-01"
+    assert records[0]["timings"].keys() == results.keys() - {"dataset"}
@@ -0,0 +1,435 @@
+"""Tests for loading and deriving resource data."""
+
+import copy
+import json
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+from app.services import calendar_service, data_service
+from app.utils.cache_utils import bump_data_revision
+
+
+def test_demo_data_only_without_data_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    demo = {"people": [{"name": "Ada"}], "teams": [], "departments": [], "projects": []}
+    monkeypatch.setattr(data_service, "load_demo_data", lambda: demo)
+
+    # An existing file with no records is loaded as is
+    empty = {"people": [], "teams": [], "departments": [], "projects": []}
+    (tmp_path / "resource_data.json").write_text(json.dumps(empty))
+    assert data_service.load_data() == empty
+
+    (tmp_path / "resource_data.json").unlink()
+    assert data_service.load_data() == demo
+    assert json.loads((tmp_path / "resource_data.json").read_text()) == demo
+
+
+DATA = {
+    "people": [
+        {"name": "Ada", "department": "Research", "team": "Core"},
+        {"name": "Brian", "department": "Research", "team": None},
+    ],
+    "teams": [{"name": "Core", "department": "Research", "members": ["Ada"]}],
+    "departments": [{"name": "Research", "teams": ["Core"], "members": []}],
+    "projects": [
+        {
+            "name": "Apollo",
+            "start_date": "2025-01-01",
+            "end_date": "2025-01-20",
+            "priority": 1,
+            "assigned_resources": ["Ada", "Brian", "Core", "Research"],
+            "resource_allocations": [
+                {
+                    "resource": "Ada",
+                    "allocation_percentage": 50,
+                    "start_date": "2025-01-03",
+                    "end_date": "2025-01-10",
+                },
+                {
+                    # Reversed dates never count
+                    "resource": "Brian",
+                    "allocation_percentage": 30,
+                    "start_date": "2025-01-12",
+                    "end_date": "2025-01-05",
+                },
+                {
+                    "resource": "Core",
+                    "allocation_percentage": 33.3,
+                    "start_date": "2025-01-01",
+                    "end_date": "2025-01-31",
+                },
+                {
+                    "resource": "Research",
+                    "allocation_percentage": 10,
+                    "start_date": "2025-01-08",
+                    "end_date": "2025-01-09",
+                },
+            ],
+        },
+        {
+            "name": "Gemini",
+            "start_date": "2025-01-05",
+            "end_date": "2025-01-15",
+            "priority": 2,
+            "assigned_resources": ["Ada"],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def session_data():
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    st.session_state.data = copy.deepcopy(DATA)
+    yield st.session_state.data
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+
+def _baseline_capacity(filtered_data, start_date, end_date, people):
+    """Daily capacity rows as the original per-day, per-resource loop built them."""
+    team_lookup = {p["name"]: p["team"] for p in people if p.get("team")}
+    rows = []
+    resources = filtered_data["Resource"].unique()
+    attributes = {}
+    for resource in resources:
+        info = filtered_data[filtered_data["Resource"] == resource].iloc[0]
+        if info["Type"] == "Team":
+            team = resource
+        elif info["Type"] == "Person":
+            team = team_lookup.get(resource)
+            if team is None:
+                team = info["Team"]
+        else:
+            team = info["Team"]
+        attributes[resource] = (info["Department"], team, info["Type"])
+    for date in pd.date_range(start_date, end_date):
+        for resource in resources:
+            assignments = filtered_data[
+                (filtered_data["Resource"] == resource)
+                & (filtered_data["Start"] <= date)
+                & (filtered_data["End"] >= date)
+            ]
+            department, team, resource_type = attributes[resource]
+            rows.append(
+                {
+                    "Date": date,
+                    "Resource": resource,
+                    "Allocation": assignments["Allocation %"].sum(),
+                    "Department": department,
+                    "Team": team,
+                    "Type": resource_type,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def test_capacity_data_matches_baseline(session_data):
+    gantt_data = data_service.create_gantt_data(session_data["projects"], session_data)
+    start, end = pd.Timestamp("2024-12-30"), pd.Timestamp("2025-02-02")
+    capacity = data_service.calculate_capacity_data(gantt_data, start, end)
+    expected = _baseline_capacity(gantt_data, start, end, session_data["people"])
+
+    assert capacity["Team"].tolist() == expected["Team"].tolist()
+    departments = capacity[capacity["Type"] == "Department"]
+    assert all(team is None for team in departments["Team"])
+    pd.testing.assert_frame_equal(
+        capacity[expected.columns].astype({"Resource": object, "Type": object}),
+        expected.astype({"Department": object}),
+        check_dtype=False,
+        check_categorical=False,
+    )
+
+
+def test_capacity_data_of_empty_input(session_data):
+    empty = data_service.create_gantt_data([], session_data)
+    start, end = pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-31")
+    assert data_service.calculate_capacity_data(empty, start, end).empty
+
+
+def test_utilization_matches_baseline(session_data, monkeypatch):
+    # Every day is a working day, as the original loop assumed
+    monkeypatch.setattr(
+        calendar_service,
+        "load_work_schedule_settings",
+        lambda: {
+            "work_days": ["MO", "TU", "WE", "TH", "FR", "SA", "SU"],
+            "work_hours": 8.0,
+        },
+    )
+    gantt_data = data_service.create_gantt_data(session_data["projects"], session_data)
+    utilization = data_service.calculate_resource_utilization(gantt_data)
+
+    total_days = (gantt_data["End"].max() - gantt_data["Start"].min()).days + 1
+    assert utilization["Resource"].tolist() == list(gantt_data["Resource"].unique())
+    assert (utilization["Total Days"] == total_days).all()
+    for row in utilization.to_dict("records"):
+        daily_allocation = {}
+        resource_rows = gantt_data[gantt_data["Resource"] == row["Resource"]]
+        for _, allocation in resource_rows.iterrows():
+            for date in pd.date_range(allocation["Start"], allocation["End"]):
+                daily_allocation[date] = (
+                    daily_allocation.get(date, 0) + allocation["Allocation %"] / 100
+                )
+        allocated_days = sum(min(alloc, 1) for alloc in daily_allocation.values())
+        overallocated_days = sum(
+            max(alloc - 1, 0) for alloc in daily_allocation.values()
+        )
+        assert row["Allocated Days"] == pytest.approx(allocated_days)
+        assert row["Utilization %"] == pytest.approx(allocated_days / total_days * 100)
+        assert row["Overallocation %"] == pytest.approx(
+            overallocated_days / total_days * 100
+        )
+
+
+def test_utilization_of_empty_input(session_data):
+    empty = data_service.create_gantt_data([], session_data)
+    utilization = data_service.calculate_resource_utilization(empty)
+    assert utilization.empty
+    assert "Utilization %" in utilization.columns
+
+
+def _conflict_gantt():
+    """Overlapping allocations of two resources, with a reversed row."""
+    rows = [
+        ("Apollo", "Ada", "2025-01-01", "2025-01-10", 60),
+        ("Gemini", "Ada", "2025-01-05", "2025-01-07", 50),
+        ("Mercury", "Ada", "2025-01-07", "2025-01-12", 45.5),
+        ("Gemini", "Ada", "2025-01-09", "2025-01-02", 100),
+        ("Apollo", "Core", "2025-01-03", "2025-01-04", 100),
+        ("Gemini", "Core", "2025-01-04", "2025-01-06", 10),
+        ("Mercury", "Core", "2025-01-06", "2025-01-06", 95),
+        ("Mercury", "Brian", "2025-01-01", "2025-01-20", 100),
+    ]
+    gantt_data = pd.DataFrame(
+        rows, columns=["Project", "Resource", "Start", "End", "Allocation %"]
+    )
+    gantt_data["Start"] = pd.to_datetime(gantt_data["Start"])
+    gantt_data["End"] = pd.to_datetime(gantt_data["End"])
+    gantt_data["Type"] = gantt_data["Resource"].map(
+        {"Ada": "Person", "Brian": "Person", "Core": "Team"}
+    )
+    gantt_data["Department"] = "Research"
+    return gantt_data
+
+
+def _baseline_conflicts(gantt_data, threshold=1.0):
+    """Daily conflicts as the original per-resource, per-day loop found them."""
+    conflicts = []
+    dates = pd.date_range(gantt_data["Start"].min(), gantt_data["End"].max())
+    for resource in gantt_data["Resource"].unique():
+        resource_data = gantt_data[gantt_data["Resource"] == resource]
+        for date in dates:
+            allocations = resource_data[
+                (resource_data["Start"] <= date) & (resource_data["End"] >= date)
+            ]
+            total_allocation = allocations["Allocation %"].sum() / 100
+            if total_allocation > threshold:
+                conflicts.append(
+                    {
+                        "Resource": resource,
+                        "Type": resource_data["Type"].iloc[0],
+                        "Department": resource_data["Department"].iloc[0],
+                        "Date": date,
+                        "Allocation": total_allocation * 100,
+                        "Projects": ", ".join(allocations["Project"].tolist()),
+                    }
+                )
+    return pd.DataFrame(conflicts)
+
+
+def test_conflicts_match_baseline():
+    gantt_data = _conflict_gantt()
+    for threshold in (1.0, 0.5):
+        conflicts = data_service.find_resource_conflicts(gantt_data, threshold)
+        expected = _baseline_conflicts(gantt_data, threshold)
+        pd.testing.assert_frame_equal(
+            conflicts.reset_index(drop=True), expected, check_dtype=False
+        )
+
+
+def test_merged_conflicts_cover_the_daily_conflicts():
+    gantt_data = _conflict_gantt()
+    periods = data_service.find_resource_conflicts(gantt_data, merge_intervals=True)
+    assert periods[["Resource", "Start", "End", "Days"]].values.tolist() == [
+        ["Ada", pd.Timestamp("2025-01-05"), pd.Timestamp("2025-01-10"), 6],
+        ["Core", pd.Timestamp("2025-01-04"), pd.Timestamp("2025-01-04"), 1],
+        ["Core", pd.Timestamp("2025-01-06"), pd.Timestamp("2025-01-06"), 1],
+    ]
+    assert periods["Peak Allocation"].tolist() == [155.5, 110, 105]
+    assert periods["Projects"].tolist() == [
+        "Apollo, Gemini, Mercury",
+        "Apollo, Gemini",
+        "Gemini, Mercury",
+    ]
+
+    daily = _baseline_conflicts(gantt_data)
+    for period in periods.to_dict("records"):
+        days = daily[
+            (daily["Resource"] == period["Resource"])
+            & (daily["Date"] >= period["Start"])
+            & (daily["Date"] <= period["End"])
+        ]
+        assert len(days) == period["Days"]
+        assert days["Allocation"].max() == pytest.approx(period["Peak Allocation"])
+    assert periods["Days"].sum() == len(daily)
+
+
+def test_conflicts_of_empty_and_reversed_inputs():
+    gantt_data = _conflict_gantt()
+    for merge_intervals in (False, True):
+        empty = data_service.find_resource_conflicts(
+            gantt_data.iloc[:0], merge_intervals=merge_intervals
+        )
+        assert empty.empty
+        reversed_only = data_service.find_resource_conflicts(
+            gantt_data.assign(Start=gantt_data["End"] + pd.Timedelta(days=1)),
+            merge_intervals=merge_intervals,
+        )
+        assert reversed_only.empty
+        assert "Projects" in reversed_only.columns
+
+
+def test_cached_frames_follow_data_revisions(session_data):
+    gantt_data = data_service.get_cached_gantt_data()
+    assert data_service.get_cached_gantt_data() is gantt_data
+
+    session_data["projects"][1]["assigned_resources"] = ["Brian", "Core"]
+    bump_data_revision({"projects": ["Gemini"]})
+    updated = data_service.get_cached_gantt_data()
+    assert updated is not gantt_data
+    pd.testing.assert_frame_equal(
+        updated.reset_index(drop=True),
+        data_service.create_gantt_data(session_data["projects"], session_data),
+        check_dtype=False,
+    )
+
+
+def _as_objects(frame):
+    return frame.reset_index(drop=True).astype(
+        {column: object for column in ["Resource", "Department", "Team", "Type"]}
+    )
+
+
+def test_capacity_windows_concatenate_to_the_whole_range(session_data):
+    gantt_data = data_service.create_gantt_data(session_data["projects"], session_data)
+    start, end = pd.Timestamp("2024-12-30"), pd.Timestamp("2025-02-02")
+    whole = data_service.calculate_capacity_data(gantt_data, start, end)
+    for window_days in (1, 3, 7, 35, 100):
+        windows = list(
+            data_service.iter_capacity_data(
+                gantt_data, start, end, window_days=window_days
+            )
+        )
+        assert len(windows) == -(-35 // window_days)
+        pd.testing.assert_frame_equal(
+            _as_objects(pd.concat(windows)), _as_objects(whole)
+        )
+
+
+def test_allocation_exports_match_the_views(session_data):
+    capacity = pd.concat(data_service.iter_allocation_export("capacity"))
+    gantt_data = data_service.create_gantt_data(session_data["projects"], session_data)
+    # The period of the valid allocations; the reversed one is left out
+    expected = _baseline_capacity(
+        gantt_data,
+        pd.Timestamp("2025-01-01"),
+        pd.Timestamp("2025-01-31"),
+        session_data["people"],
+    )
+    pd.testing.assert_frame_equal(
+        _as_objects(capacity[expected.columns]),
+        expected,
+        check_dtype=False,
+    )
+
+    (utilization,) = data_service.iter_allocation_export("utilization")
+    pd.testing.assert_frame_equal(
+        utilization, data_service.calculate_resource_utilization(gantt_data)
+    )
+    (conflicts,) = data_service.iter_allocation_export("conflicts")
+    pd.testing.assert_frame_equal(
+        conflicts,
+        data_service.find_resource_conflicts(gantt_data, merge_intervals=True),
+    )
+
+
+def test_allocation_exports_of_no_allocations(session_data):
+    session_data["projects"] = []
+    bump_data_revision()
+    for export_name in ("capacity", "utilization", "conflicts"):
+        assert list(data_service.iter_allocation_export(export_name)) == []
+    empty = data_service.create_gantt_data([], session_data)
+    start, end = pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-31")
+    assert list(data_service.iter_capacity_data(empty, start, end)) == []
+
+
+def _assert_same_aggregates(aggregates, expected):
+    pd.testing.assert_frame_equal(
+        aggregates["gantt"].reset_index(drop=True),
+        expected["gantt"].reset_index(drop=True),
+        check_dtype=False,
+    )
+    pd.testing.assert_frame_equal(
+        aggregates["utilization"].reset_index(drop=True),
+        expected["utilization"].reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert aggregates["project_costs"] == expected["project_costs"]
+
+
+def test_aggregates_sign_only_the_changed_projects(session_data, monkeypatch):
+    data_service.get_allocation_aggregates()
+
+    signed = []
+    signature = data_service._content_signature
+    monkeypatch.setattr(
+        data_service,
+        "_content_signature",
+        lambda value: signed.append(value) or signature(value),
+    )
+    session_data["projects"][1]["assigned_resources"] = ["Brian"]
+    session_data["projects"].append(
+        dict(session_data["projects"][1], name="Vostok", assigned_resources=["Ada"])
+    )
+    bump_data_revision({"projects": ["Gemini", "Vostok"]})
+    aggregates = data_service.get_allocation_aggregates()
+    assert [value["name"] for value in signed] == ["Gemini", "Vostok"]
+    _assert_same_aggregates(
+        aggregates, data_service._build_allocation_aggregates(session_data)
+    )
+
+    # Changes that were not itemized compare every record
+    signed.clear()
+    del session_data["projects"][0]
+    bump_data_revision()
+    aggregates = data_service.get_allocation_aggregates()
+    assert len(signed) == len(session_data["projects"]) + 1
+    _assert_same_aggregates(
+        aggregates, data_service._build_allocation_aggregates(session_data)
+    )
+
+
+def test_gantt_data_indexes_resources_once(monkeypatch):
+    calls = []
+    get_entity_index = data_service.get_entity_index
+    monkeypatch.setattr(
+        data_service,
+        "get_entity_index",
+        lambda data=None: calls.append(data) or get_entity_index(data),
+    )
+    # Not the session data, so every lookup would index it again
+    data = copy.deepcopy(DATA)
+    gantt_data = data_service.create_gantt_data(data["projects"], data)
+    assert len(calls) == 1
+    assert gantt_data["Type"].tolist() == [
+        "Person",
+        "Person",
+        "Team",
+        "Department",
+        "Person",
+    ]
+    assert gantt_data["Team"].tolist() == ["Core", None, None, None, "Core"]
@@ -0,0 +1,160 @@
+"""Tests for the streaming export writers."""
+
+import csv
+import io
+import json
+import zipfile
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from openpyxl import load_workbook
+
+from app.services import export_service
+
+DATA = {
+    "people": [
+        {
+            "name": "Ada Lovelace",
+            "department": "Research",
+            "team": "Core",
+            "daily_cost": 500.5,
+            "work_days": ["MO", "TU"],
+            "skills": [],
+        },
+        {
+            "name": 'Brian "B", Jr.',
+            "department": "Research",
+            "team": None,
+            "notes": "line one\nline two",
+        },
+        {"name": "Zoë", "department": "Sales", "availability": [{"from": "2025-01"}]},
+    ],
+    "teams": [{"name": "Core", "department": "Research", "members": ["Ada Lovelace"]}],
+    "departments": [],
+    "projects": [{"name": "Apollo", "priority": 1, "budget": {"total": 10}}],
+}
+RESOURCE_TYPES = ["people", "teams", "departments", "projects"]
+
+
+def _text(parts):
+    return "".join(parts)
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_json_exports_parse_to_the_records(batch_size):
+    text = _text(export_service.iter_json_export(DATA, RESOURCE_TYPES, batch_size))
+    assert json.loads(text) == DATA
+    assert text == _text(export_service.iter_json_export(DATA, RESOURCE_TYPES))
+
+    lines = _text(export_service.iter_jsonl_export(DATA["people"], batch_size))
+    assert [json.loads(line) for line in lines.splitlines()] == DATA["people"]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_csv_export_has_the_columns_of_a_frame_export(batch_size):
+    text = _text(export_service.iter_csv_export(DATA["people"], batch_size))
+    rows = list(csv.reader(io.StringIO(text)))
+    # The same columns, in the same order, as the DataFrame the export used
+    assert rows[0] == list(pd.DataFrame(DATA["people"]).columns)
+    assert len(rows) == len(DATA["people"]) + 1
+
+    ada, brian, zoe = (dict(zip(rows[0], row)) for row in rows[1:])
+    assert ada["work_days"] == "MO;TU"
+    assert ada["skills"] == ""
+    assert ada["daily_cost"] == "500.5"
+    assert brian["name"] == 'Brian "B", Jr.'
+    assert brian["notes"] == "line one\nline two"
+    assert brian["team"] == ""
+    assert json.loads(zoe["availability"]) == [{"from": "2025-01"}]
+
+
+def test_excel_export_has_one_sheet_per_resource_type():
+    file = io.BytesIO()
+    export_service.write_excel_export(DATA, RESOURCE_TYPES, file)
+    workbook = load_workbook(io.BytesIO(file.getvalue()), read_only=True)
+    assert workbook.sheetnames == ["People", "Teams", "Departments", "Projects"]
+
+    rows = list(workbook["People"].iter_rows(values_only=True))
+    assert list(rows[0]) == list(pd.DataFrame(DATA["people"]).columns)
+    assert rows[1][:5] == ("Ada Lovelace", "Research", "Core", 500.5, "MO;TU")
+    assert list(workbook["Departments"].iter_rows(values_only=True)) == [()]
+    assert list(workbook["Projects"].iter_rows(values_only=True))[1] == (
+        "Apollo",
+        1,
+        '{"total": 10}',
+    )
+
+
+def test_table_exports_of_several_types_are_zipped():
+    file = io.BytesIO()
+    assert export_service.write_export(DATA, RESOURCE_TYPES, "csv", file) == "zip"
+    with zipfile.ZipFile(io.BytesIO(file.getvalue())) as archive:
+        assert archive.namelist() == [f"{key}.csv" for key in RESOURCE_TYPES]
+        assert archive.read("people.csv").decode("utf-8") == _text(
+            export_service.iter_csv_export(DATA["people"])
+        )
+        assert archive.read("departments.csv") == b"\r\n"
+
+    file = io.BytesIO()
+    assert export_service.write_export(DATA, ["teams"], "jsonl", file) == "jsonl"
+    assert json.loads(file.getvalue()) == DATA["teams"][0]
+
+
+def test_exports_of_no_records():
+    assert json.loads(_text(export_service.iter_json_export({}, RESOURCE_TYPES))) == {
+        key: [] for key in RESOURCE_TYPES
+    }
+    assert _text(export_service.iter_jsonl_export([])) == ""
+    assert _text(export_service.iter_csv_export([])) == "\r\n"
+
+
+def _capacity_frames():
+    """Daily rows in two frames, as produced window by window."""
+    dates = pd.date_range("2025-01-01", periods=5)
+    frame = pd.DataFrame(
+        {
+            "Date": dates.repeat(2),
+            "Resource": ["Ada", "Core"] * 5,
+            "Allocation": [50.0, 33.3] * 5,
+            "Team": ["Core", None] * 5,
+        }
+    )
+    return [frame.iloc[:6], frame.iloc[6:]]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 100])
+def test_frame_exports_read_back_as_the_whole_table(chunk_size):
+    frames = _capacity_frames()
+    whole = pd.concat(frames, ignore_index=True)
+
+    file = io.BytesIO()
+    rows = export_service.write_frame_export(iter(frames), "parquet", file, chunk_size)
+    assert rows == len(whole)
+    file.seek(0)
+    table = pq.read_table(file)
+    assert str(table.schema.field("Date").type) == "date32[day]"
+    parquet = table.to_pandas()
+    parquet["Date"] = pd.to_datetime(parquet["Date"])
+    pd.testing.assert_frame_equal(parquet, whole, check_dtype=False)
+
+    file = io.BytesIO()
+    export_service.write_frame_export(iter(frames), "csv", file, chunk_size)
+    csv_rows = pd.read_csv(
+        io.BytesIO(file.getvalue()), parse_dates=["Date"], keep_default_na=False
+    )
+    # Missing values are written as empty cells
+    pd.testing.assert_frame_equal(
+        csv_rows, whole.fillna({"Team": ""}), check_dtype=False
+    )
+
+
+def test_frame_export_of_no_frames():
+    file = io.BytesIO()
+    assert export_service.write_frame_export(iter([]), "parquet", file) == 0
+    file.seek(0)
+    assert pq.read_table(file).num_rows == 0
+
+    file = io.BytesIO()
+    assert export_service.write_frame_export(iter([]), "csv", file) == 0
+    assert file.getvalue() == b""
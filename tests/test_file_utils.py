@@ -0,0 +1,76 @@
+"""Tests for atomic writes, rolling backups and recovery."""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from app.utils import file_utils
+
+
+def test_failed_write_keeps_the_old_file(tmp_path, monkeypatch):
+    target = tmp_path / "resource_data.json"
+    file_utils.atomic_write_json(str(target), {"people": ["Ada"]})
+    os.chmod(target, 0o640)
+
+    def fail(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(file_utils.os, "fsync", fail)
+    with pytest.raises(OSError):
+        file_utils.atomic_write_json(str(target), {"people": []})
+    assert json.loads(target.read_text()) == {"people": ["Ada"]}
+    assert os.listdir(tmp_path) == ["resource_data.json"]
+
+    monkeypatch.undo()
+    file_utils.atomic_write_json(str(target), {"people": []}, indent=None)
+    assert target.read_text() == '{"people": []}'
+    assert os.stat(target).st_mode & 0o777 == 0o640
+
+
+def test_backups_are_pruned_and_throttled(tmp_path):
+    target = tmp_path / "settings.json"
+    assert file_utils.create_backup(str(target)) is None
+
+    for version in range(4):
+        target.write_text(json.dumps({"version": version}))
+        assert file_utils.create_backup(str(target), keep=3) is not None
+    backups = file_utils.list_backups(str(target))
+    assert len(backups) == 3
+    with gzip.open(backups[0]) as file:
+        assert json.load(file) == {"version": 3}
+    with gzip.open(backups[-1]) as file:
+        assert json.load(file) == {"version": 1}
+
+    assert file_utils.create_backup(str(target), min_interval_minutes=10) is None
+    assert file_utils.create_backup(str(target), keep=0) is None
+    assert len(file_utils.list_backups(str(target))) == 3
+
+
+def test_corrupt_file_is_restored_from_newest_readable_backup(tmp_path):
+    target = tmp_path / "resource_data.json"
+    target.write_text(json.dumps({"version": 1}))
+    file_utils.create_backup(str(target))
+    target.write_text(json.dumps({"version": 2}))
+    newest = file_utils.create_backup(str(target))
+    # A torn backup is skipped
+    with open(newest, "r+b") as file:
+        file.truncate(10)
+    target.write_text('{"version": 3, "people": [')
+
+    assert file_utils.load_json_with_recovery(str(target)) == {"version": 1}
+    assert json.loads(target.read_text()) == {"version": 1}
+    corrupt = [name for name in os.listdir(tmp_path) if ".corrupt-" in name]
+    assert len(corrupt) == 1
+    assert (tmp_path / corrupt[0]).read_text() == '{"version": 3, "people": ['
+
+
+def test_corrupt_file_without_backup(tmp_path):
+    target = tmp_path / "resource_data.json"
+    with pytest.raises(FileNotFoundError):
+        file_utils.load_json_with_recovery(str(target))
+    target.write_text("")
+    with pytest.raises(ValueError):
+        file_utils.load_json_with_recovery(str(target))
+    assert target.read_text() == ""
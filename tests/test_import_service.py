@@ -0,0 +1,372 @@
+"""Tests for the JSON and table import paths."""
+
+import copy
+import io
+import json
+
+import pandas as pd
+
+from app.services import import_service
+from app.services.export_service import iter_csv_export
+
+
+def _person():
+    return {
+        "name": "Ada Lovelace",
+        "role": "Engineer",
+        "department": "Research",
+        "team": "Core",
+        "daily_cost": 500.0,
+        "work_days": ["MO", "TU", "WE", "TH"],
+        "daily_work_hours": 8.0,
+        "skills": ["Python"],
+        # Rounded by hand, as in an external file
+        "capacity_hours_per_week": 32,
+        "capacity_hours_per_month": 138.6,
+    }
+
+
+def _json_import(data, replace):
+    upload = {
+        "people": [_person()],
+        "teams": [],
+        "departments": [],
+        "projects": [],
+    }
+    file = io.BytesIO(json.dumps(upload).encode("utf-8"))
+    summary = import_service.scan_json_import(file)
+    return import_service.stream_json_import(file, data, summary, replace=replace)
+
+
+def _csv_reimport(data):
+    file = io.BytesIO("".join(iter_csv_export(data["people"])).encode("utf-8"))
+    mapping = {field: field for field in import_service.TABLE_IMPORT_FIELDS["people"]}
+    return import_service.stream_table_import(file, "csv", "people", mapping, data)
+
+
+def test_csv_reimport_of_json_import_is_unchanged():
+    for replace in (False, True):
+        data = {"people": [], "teams": [], "departments": [], "projects": []}
+        data = _json_import(data, replace)["data"]
+        person = data["people"][0]
+        assert person["capacity_hours_per_month"] == 32 * 4.33
+
+        result = _csv_reimport(data)
+        assert result["updated"]["people"] == []
+        assert result["unchanged"]["people"] == 1
+
+
+def test_merge_derives_capacity_of_updated_person():
+    data = {"people": [dict(_person(), work_days=["MO"])]}
+    import_service.merge_resource_data(data, {"people": [_person()]})
+    assert data["people"][0]["capacity_hours_per_week"] == 32
+    assert data["people"][0]["capacity_hours_per_month"] == 32 * 4.33
+
+
+def _allocation_import(data, rows, chunk_size=1):
+    lines = ["project,resource,start_date,end_date,allocation_percentage"] + rows
+    file = io.BytesIO("\n".join(lines).encode("utf-8"))
+    mapping = {
+        field: field for field in import_service.TABLE_IMPORT_FIELDS["allocations"]
+    }
+    return import_service.stream_table_import(
+        file, "csv", "allocations", mapping, data, chunk_size=chunk_size
+    )
+
+
+def test_allocation_reimport_reports_unchanged_projects():
+    allocations = [
+        {
+            "resource": "Ada Lovelace",
+            "allocation_percentage": 50,
+            "start_date": "2025-01-01",
+            "end_date": "2025-01-31",
+        },
+        {
+            "resource": "Ada Lovelace",
+            "allocation_percentage": 20,
+            "start_date": "2025-03-01",
+            "end_date": "2025-03-31",
+        },
+    ]
+    projects = [
+        {
+            "name": name,
+            "assigned_resources": ["Ada Lovelace"],
+            "resource_allocations": [dict(a) for a in allocations],
+        }
+        for name in ["Apollo", "Gemini"]
+    ]
+    data = {"people": [_person()], "teams": [], "departments": [], "projects": projects}
+    originals = list(projects)
+
+    # Rows of each project span chunks, only Gemini's second row differs
+    result = _allocation_import(
+        data,
+        [
+            "Apollo,Ada Lovelace,2025-01-01,2025-01-31,50",
+            "Gemini,Ada Lovelace,2025-01-01,2025-01-31,50",
+            "Apollo,Ada Lovelace,2025-03-01,2025-03-31,20",
+            "Gemini,Ada Lovelace,2025-03-01,2025-03-31,40",
+            "Vostok,Ada Lovelace,2025-03-01,2025-03-31,40",
+        ],
+    )
+    assert result["updated"]["projects"] == ["Gemini"]
+    assert result["unchanged"]["projects"] == 1
+    assert result["skipped"]["projects"] == 1
+    assert data["projects"][0] is originals[0]
+    assert data["projects"][1]["resource_allocations"][1]["allocation_percentage"] == 40
+    assert originals[1]["resource_allocations"][1]["allocation_percentage"] == 20
+
+
+def test_json_import_batches_give_the_same_result():
+    upload = {
+        "people": [dict(_person(), name=f"Person {i}", team=None) for i in range(5)]
+        + [{"role": "No name"}, "text"],
+        "teams": [{"name": "Core", "department": "Research", "members": []}],
+        "departments": [{"name": "Research", "teams": ["Core"], "members": []}],
+        "projects": [],
+    }
+    file = io.BytesIO(json.dumps(upload).encode("utf-8"))
+    summary = import_service.scan_json_import(file)
+    assert summary["counts"]["people"] == 5
+    assert summary["skipped"]["people"] == 2
+
+    existing = [dict(_person(), name="Person 3", team=None, role="Manager")]
+    results = []
+    for batch_size in (1, 2, 1000):
+        data = {
+            "people": list(existing),
+            "teams": [],
+            "departments": [],
+            "projects": [],
+        }
+        results.append(
+            import_service.stream_json_import(
+                file, data, summary, batch_size=batch_size
+            )
+        )
+    for result in results[1:]:
+        assert result == results[0]
+
+    result = results[0]
+    assert [p["name"] for p in result["data"]["people"]] == [
+        "Person 3",
+        "Person 0",
+        "Person 1",
+        "Person 2",
+        "Person 4",
+    ]
+    assert result["updated"]["people"] == ["Person 3"]
+    assert result["skipped"]["people"] == 2
+    assert result["data"]["people"][0]["role"] == "Engineer"
+
+
+def test_json_import_of_empty_upload():
+    upload = {"people": [], "teams": [], "departments": [], "projects": []}
+    file = io.BytesIO(json.dumps(upload).encode("utf-8"))
+    summary = import_service.scan_json_import(file)
+    assert summary["valid"]
+    data = {"people": [_person()], "teams": [], "departments": [], "projects": []}
+    result = import_service.stream_json_import(file, data, summary)
+    assert result["data"]["people"] == [_person()]
+    assert result["error_count"] == 0
+
+    replaced = import_service.stream_json_import(file, data, summary, replace=True)
+    assert replaced["data"] == upload
+
+
+PEOPLE_ROWS = [
+    ["name", "department", "team", "daily_cost", "work_days", "skills"],
+    ["Ada", "Research", "Core", "500", "Monday; Tuesday", "Python; C"],
+    ["Brian", "Research", "", "abc", "MO", ""],
+    ["", "Research", "", "300", "", ""],
+    ["Carol", "Sales", "", "412.5", "XX", ""],
+    ["Dan", "Sales", "", "", "mo|we|FR", "SQL"],
+    ["Ada", "Research", "Core", "550", "", ""],
+]
+
+
+def _csv(rows):
+    return io.BytesIO("\n".join(",".join(row) for row in rows).encode("utf-8"))
+
+
+def _excel(rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append([int(v) if v.isdigit() else v or None for v in row])
+    file = io.BytesIO()
+    workbook.save(file)
+    file.seek(0)
+    return file
+
+
+def test_table_chunks_concatenate_to_the_whole_sheet():
+    expected = pd.read_csv(_csv(PEOPLE_ROWS), dtype=str, keep_default_na=False)
+    for file_format, make in (("csv", _csv), ("excel", _excel)):
+        for chunk_size in (1, 2, 4, 100):
+            chunks = list(
+                import_service.read_table_chunks(
+                    make(PEOPLE_ROWS), file_format, chunk_size=chunk_size
+                )
+            )
+            assert [len(c) for c in chunks][:-1] == [chunk_size] * (len(chunks) - 1)
+            pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+        selected = pd.concat(
+            import_service.read_table_chunks(
+                make(PEOPLE_ROWS), file_format, columns=["name", "team"], chunk_size=2
+            )
+        )
+        pd.testing.assert_frame_equal(selected, expected[["name", "team"]])
+
+
+def test_table_import_is_independent_of_chunk_size():
+    mapping = {field: field for field in PEOPLE_ROWS[0]}
+    results = []
+    for chunk_size in (1, 2, 3, 100):
+        data = {
+            "people": [],
+            "teams": [{"name": "Core", "department": "Research", "members": []}],
+            "departments": [
+                {"name": "Research", "teams": ["Core"], "members": []},
+                {"name": "Sales", "teams": [], "members": []},
+            ],
+            "projects": [],
+        }
+        result = import_service.stream_table_import(
+            _csv(PEOPLE_ROWS), "csv", "people", mapping, data, chunk_size=chunk_size
+        )
+        results.append((result, data))
+    for result, data in results[1:]:
+        assert result == results[0][0]
+        assert data == results[0][1]
+
+    result, data = results[0]
+    assert result["added"]["people"] == ["Ada", "Dan"]
+    assert result["updated"]["people"] == ["Ada"]
+    assert result["skipped"]["people"] == 3
+    assert result["errors"]["people"] == [
+        "Row 3: invalid daily_cost",
+        "Row 4: name is required",
+        "Row 5: invalid work_days",
+    ]
+    ada, dan = data["people"]
+    assert ada["daily_cost"] == 550
+    assert ada["work_days"] == ["MO", "TU"]
+    assert ada["skills"] == ["Python", "C"]
+    assert dan["work_days"] == ["MO", "WE", "FR"]
+    assert "daily_cost" not in dan
+
+
+def test_table_import_of_header_only_file():
+    data = {"people": [], "teams": [], "departments": [], "projects": []}
+    mapping = {field: field for field in PEOPLE_ROWS[0]}
+    result = import_service.stream_table_import(
+        _csv(PEOPLE_ROWS[:1]), "csv", "people", mapping, data
+    )
+    assert result["added"]["people"] == []
+    assert result["error_count"] == 0
+    assert data["people"] == []
+
+
+def test_allocation_rows_with_reversed_dates_are_skipped():
+    project = {"name": "Apollo", "assigned_resources": [], "resource_allocations": []}
+    data = {
+        "people": [_person()],
+        "teams": [],
+        "departments": [],
+        "projects": [project],
+    }
+    result = _allocation_import(
+        data,
+        [
+            "Apollo,Ada Lovelace,2025-02-01,2025-01-01,50",
+            "Apollo,Ada Lovelace,2025-01-01,2025-01-31,5",
+            "Apollo,Ada Lovelace,01/02/2025,2025-02-28,50",
+        ],
+        chunk_size=2,
+    )
+    assert result["skipped"]["projects"] == 2
+    assert result["errors"]["projects"] == [
+        "Row 2: end_date is before start_date",
+        "Row 3: allocation_percentage must be between 10 and 100",
+    ]
+    assert result["updated"]["projects"] == ["Apollo"]
+    assert data["projects"][0]["resource_allocations"] == [
+        {
+            "resource": "Ada Lovelace",
+            "start_date": "2025-01-02",
+            "end_date": "2025-02-28",
+            "allocation_percentage": 50.0,
+        }
+    ]
+
+
+def _baseline_merge(data, imported_data):
+    """New records appended by name, as the original add-only merge did."""
+    for resource_type in ["people", "teams", "departments", "projects"]:
+        existing_items = data.get(resource_type, [])
+        existing_names = {item["name"] for item in existing_items}
+        for item in imported_data.get(resource_type, []):
+            if item["name"] not in existing_names:
+                existing_items.append(item)
+                existing_names.add(item["name"])
+    return data
+
+
+def test_merge_adds_what_the_add_only_merge_added():
+    teams = [
+        {"name": "Core", "department": "Research", "members": ["Ada"]},
+        {"name": "Ops", "department": "Research", "members": []},
+    ]
+    data = {
+        "people": [],
+        "teams": teams,
+        "departments": [{"name": "Research", "teams": ["Core"], "members": []}],
+        "projects": [{"name": "Apollo", "priority": 1}],
+    }
+    imported = {
+        "teams": [
+            dict(teams[1]),
+            {"name": "Core", "department": "Research", "members": ["Ada", "Brian"]},
+            {"name": "Infra", "department": "Research", "members": []},
+            {"name": "Infra", "department": "Sales"},
+        ],
+        "departments": [],
+        "projects": [{"name": "Gemini", "priority": 2}, {"priority": 3}],
+    }
+    # The add-only merge failed on records without a name, which are now ignored
+    named = {
+        resource_type: [record for record in records if "name" in record]
+        for resource_type, records in imported.items()
+    }
+    expected = _baseline_merge(copy.deepcopy(data), copy.deepcopy(named))
+    expected["teams"][0] = imported["teams"][1]
+    expected["teams"][2]["department"] = "Sales"
+
+    core, ops = teams
+    summary = import_service.merge_resource_data(data, copy.deepcopy(imported))
+    assert data == expected
+    assert summary["teams"] == {
+        "inserted": ["Infra"],
+        "updated": ["Core", "Infra"],
+        "unchanged": ["Ops"],
+    }
+    assert summary["projects"]["inserted"] == ["Gemini"]
+    assert summary["people"] == {"inserted": [], "updated": [], "unchanged": []}
+    # Updated records are new dictionaries, the shared originals are unchanged
+    assert core["members"] == ["Ada"]
+    assert data["teams"][1] is ops
+
+
+def test_merge_of_empty_import():
+    data = {"people": [_person()], "teams": [], "departments": [], "projects": []}
+    summary = import_service.merge_resource_data(data, {})
+    assert data["people"] == [_person()]
+    assert all(
+        summary[resource_type] == {"inserted": [], "updated": [], "unchanged": []}
+        for resource_type in summary
+    )
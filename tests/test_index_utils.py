@@ -0,0 +1,85 @@
+"""Tests for the entity name index."""
+
+import copy
+
+import pytest
+import streamlit as st
+
+from app.services import data_service
+from app.utils.cache_utils import bump_data_revision
+from app.utils.index_utils import build_entity_index, get_entity_index
+
+DATA = {
+    "people": [
+        {"name": "Ada", "department": "Research", "team": "Core"},
+        {"name": "Ada", "department": "Sales", "team": None},
+        # A person shadows the team of the same name
+        {"name": "Ops", "department": "Sales"},
+        {"name": "Brian"},
+    ],
+    "teams": [
+        {"name": "Core", "department": "Research", "members": ["Ada"]},
+        {"name": "Ops", "department": "Research", "members": []},
+        {"name": "Infra"},
+    ],
+    "departments": [
+        {"name": "Research", "teams": ["Core"], "members": []},
+        {"name": "Core", "teams": [], "members": []},
+    ],
+    "projects": [{"name": "Apollo"}],
+}
+
+
+def _baseline_resource_type(resource, data):
+    """Type, department and team as the original scans of the lists found them."""
+    for person in data["people"]:
+        if person["name"] == resource:
+            return (
+                "Person",
+                person.get("department", "Unknown"),
+                person.get("team", None),
+            )
+    for team in data["teams"]:
+        if team["name"] == resource:
+            return "Team", team.get("department", "Unknown"), None
+    for department in data["departments"]:
+        if department["name"] == resource:
+            return "Department", department["name"], None
+    return "Unknown", "Unknown", None
+
+
+@pytest.fixture
+def session_data():
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    st.session_state.data = copy.deepcopy(DATA)
+    yield st.session_state.data
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+
+def test_lookups_match_list_scans():
+    index = build_entity_index(DATA)
+    for name in ["Ada", "Ops", "Brian", "Core", "Infra", "Research", "Apollo", ""]:
+        assert data_service._determine_resource_type(
+            name, index
+        ) == _baseline_resource_type(name, DATA)
+    assert build_entity_index({})["resource_types"] == {}
+
+
+def test_session_index_is_rebuilt_only_on_changes(session_data):
+    index = get_entity_index()
+    assert get_entity_index() is index
+    # A dictionary of the session's own lists shares its index
+    assert get_entity_index({"people": session_data["people"]}) is index
+    assert get_entity_index(copy.deepcopy(DATA)) is not index
+
+    # Appending changes the list length even without a new revision
+    session_data["people"].append({"name": "Carol", "department": "Sales"})
+    appended = get_entity_index()
+    assert appended is not index
+    assert appended["resource_types"]["Carol"] == "Person"
+
+    session_data["people"][-1]["department"] = "Research"
+    bump_data_revision({"people": ["Carol"]})
+    assert get_entity_index()["person_department"]["Carol"] == "Research"
@@ -0,0 +1,92 @@
+"""Tests for the render timers and counters."""
+
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from app.utils import instrumentation_utils
+
+
+@pytest.fixture(autouse=True)
+def no_active_run():
+    instrumentation_utils.finish_run()
+    yield
+    instrumentation_utils.finish_run()
+
+
+@instrumentation_utils.instrumented()
+def _frame(rows):
+    return pd.DataFrame({"value": range(rows)})
+
+
+@instrumentation_utils.instrumented("outer")
+def _outer():
+    return [_frame(2), _frame(3)]
+
+
+def test_nothing_is_recorded_without_a_run():
+    instrumentation_utils.increment_counter("settings_file_reads")
+    assert len(_frame(4)) == 4
+    assert instrumentation_utils.finish_run() is None
+
+
+def test_sections_nest_and_count_rows():
+    instrumentation_utils.start_run("Dashboard")
+    with instrumentation_utils.timed_section("Dashboard"):
+        _outer()
+        _frame(5)
+    instrumentation_utils.increment_counter("derived_cache_hits", 2)
+    run = instrumentation_utils.finish_run()
+
+    sections = {section["path"]: section for section in run["sections"]}
+    assert set(sections) == {
+        "Dashboard",
+        "Dashboard / outer",
+        "Dashboard / outer / _frame",
+        "Dashboard / _frame",
+    }
+    assert sections["Dashboard / outer / _frame"]["calls"] == 2
+    assert sections["Dashboard / outer / _frame"]["rows"] == 5
+    assert sections["Dashboard / _frame"]["rows"] == 5
+    assert sections["Dashboard / outer"]["rows"] == 0
+    assert run["counters"] == {"dataframe_rows": 10, "derived_cache_hits": 2}
+
+    # Slowest first, and enclosing sections take at least as long as their parts
+    totals = [section["total_ms"] for section in run["sections"]]
+    assert totals == sorted(totals, reverse=True)
+    assert run["sections"][0]["path"] == "Dashboard"
+    assert run["total_ms"] >= sections["Dashboard"]["total_ms"]
+
+    rows = instrumentation_utils.summarize_sections(run)
+    assert rows[0]["Section"] == "Dashboard"
+    assert rows[0]["Calls"] == 1
+
+
+def test_runs_are_kept_per_thread():
+    instrumentation_utils.start_run("Dashboard")
+    other_runs = []
+
+    def other_session():
+        instrumentation_utils.increment_counter("settings_file_reads")
+        other_runs.append(instrumentation_utils.finish_run())
+
+    thread = threading.Thread(target=other_session)
+    thread.start()
+    thread.join()
+    assert other_runs == [None]
+    assert instrumentation_utils.finish_run()["counters"] == {}
+
+
+def test_runs_are_appended_to_the_log(tmp_path):
+    log_file = tmp_path / "logs" / "instrumentation_log.jsonl"
+    for label in ("Dashboard", "Data Tools"):
+        instrumentation_utils.start_run(label)
+        _frame(1)
+        instrumentation_utils.append_run_to_log(
+            instrumentation_utils.finish_run(), str(log_file)
+        )
+    runs = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [run["label"] for run in runs] == ["Dashboard", "Data Tools"]
+    assert runs[1]["sections"][0]["path"] == "_frame"
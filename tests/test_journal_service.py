@@ -0,0 +1,112 @@
+"""Tests for the change journal: replay, torn lines and compaction."""
+
+import copy
+import gzip
+import json
+import os
+
+import pytest
+
+from app.services import config_service, journal_service, storage_service
+from app.utils.file_utils import get_backup_dir
+
+DATA = {
+    "people": [
+        {"name": "Ada", "department": "Research", "team": "Core"},
+        {"name": "Brian", "department": "Research", "team": None},
+        {"name": "Carol", "department": "Sales", "team": None},
+    ],
+    "teams": [{"name": "Core", "department": "Research", "members": ["Ada"]}],
+    "departments": [
+        {"name": "Research", "teams": ["Core"], "members": ["Brian"]},
+        {"name": "Sales", "teams": [], "members": ["Carol"]},
+    ],
+    "projects": [],
+}
+
+
+def _edited():
+    """DATA with an update, a delete and two inserts."""
+    edited = copy.deepcopy(DATA)
+    edited["people"][0]["team"] = None
+    del edited["people"][1]
+    edited["people"].insert(0, {"name": "Dan", "department": "Sales", "team": None})
+    edited["projects"].append({"name": "Apollo", "assigned_resources": ["Dan"]})
+    return edited
+
+
+CHANGES = {"people": ["Ada", "Brian", "Dan"], "projects": ["Apollo"]}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        config_service, "_settings_cache", {"signature": None, "settings": None}
+    )
+    return tmp_path
+
+
+def test_replay_reproduces_the_edited_data():
+    records = journal_service.build_change_records(_edited(), CHANGES, 1)
+    assert [(r["op"], r["name"]) for r in records] == [
+        ("delete", "Brian"),
+        ("upsert", "Dan"),
+        ("upsert", "Ada"),
+        ("upsert", "Apollo"),
+    ]
+    assert journal_service.apply_journal(copy.deepcopy(DATA), records) == _edited()
+    # Records already folded into the snapshot replay without effect
+    assert journal_service.apply_journal(_edited(), records) == _edited()
+
+
+def test_torn_last_line_is_dropped_and_truncated(data_dir):
+    journal = str(data_dir / "resource_data.journal.jsonl")
+    records = journal_service.build_change_records(_edited(), CHANGES, 1)
+    journal_service.append_journal(records[:2], journal)
+    with open(journal, "a") as file:
+        file.write(json.dumps(records[2])[:25])
+
+    assert journal_service.read_journal(journal) == json.loads(json.dumps(records[:2]))
+    assert journal_service.journal_length(journal) == 2
+
+    # The next append cuts the torn line off instead of continuing it
+    journal_service.append_journal(records[2:], journal)
+    assert journal_service.read_journal(journal) == json.loads(json.dumps(records))
+    assert journal_service.journal_length(journal) == 4
+
+
+def test_load_replays_the_journal_on_the_stored_data(data_dir):
+    storage_service.get_storage_backend()["save"](DATA)
+    records = journal_service.build_change_records(_edited(), CHANGES, 1)
+    journal_service.append_journal(records)
+    with open(journal_service.JOURNAL_FILE, "a") as file:
+        file.write('{"entity": "people", "op": "delete", "na')
+
+    assert journal_service.load_with_journal() == _edited()
+    # The stored data itself is unchanged
+    assert storage_service.get_storage_backend()["load"]() == DATA
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_compaction_folds_and_archives_the_journal(data_dir, backend):
+    (data_dir / "settings.json").write_text(json.dumps({"storage_backend": backend}))
+    storage_service.get_storage_backend()["save"](DATA)
+    assert not journal_service.compact_journal()
+
+    records = journal_service.build_change_records(_edited(), CHANGES, 1)
+    journal_service.append_journal(records)
+    assert journal_service.compact_journal()
+
+    assert storage_service.get_storage_backend()["load"]() == _edited()
+    assert journal_service.read_journal() == []
+    assert journal_service.journal_length() == 0
+    assert journal_service.load_with_journal() == _edited()
+
+    archive = os.path.join(
+        get_backup_dir(journal_service.JOURNAL_FILE),
+        "resource_data.journal.jsonl.archive.gz",
+    )
+    with gzip.open(archive, "rt") as file:
+        archived = [json.loads(line) for line in file]
+    assert archived == json.loads(json.dumps(records))
@@ -0,0 +1,149 @@
+"""Tests for the Arrow snapshot backend and its Gantt fast path."""
+
+import copy
+import json
+
+import pandas as pd
+
+from app.services import data_service, journal_service, snapshot_service
+
+DATA = {
+    "people": [
+        {
+            "name": "Ada",
+            "department": "Research",
+            "team": "Core",
+            "daily_cost": 500,
+            "skills": ["python"],
+            "work_days": ["MO", "TU"],
+        },
+        {
+            "name": "Brian",
+            "department": "Research",
+            "team": None,
+            "daily_cost": 412.5,
+            "skills": [],
+            "notes": {"rating": 3},
+            "employee_id": 2**70,
+        },
+    ],
+    "teams": [{"name": "Core", "department": "Research", "members": ["Ada", "Brian"]}],
+    "departments": [{"name": "Research", "teams": ["Core"], "members": []}],
+    "projects": [
+        {
+            "name": "Apollo",
+            "start_date": "2025-01-01",
+            "end_date": "2025-03-31",
+            "priority": 1,
+            "assigned_resources": ["Ada", "Core"],
+            "resource_allocations": [
+                {
+                    "resource": "Ada",
+                    "allocation_percentage": 50,
+                    "start_date": "2025-01-01",
+                    "end_date": "2025-02-15",
+                },
+                {
+                    "resource": "Core",
+                    "allocation_percentage": 25.5,
+                    "start_date": "2025-02-01",
+                    "end_date": "2025-03-31",
+                },
+            ],
+        },
+        {
+            "name": "Gemini",
+            "start_date": "2025-02-01",
+            "end_date": "2025-01-15",
+            "priority": 2,
+            "assigned_resources": ["Brian", "Research"],
+        },
+        {
+            "name": "Mercury",
+            "start_date": "2025-03-01",
+            "end_date": "2025-04-30",
+            "priority": 3,
+            "assigned_resources": [],
+            "resource_allocations": [],
+        },
+    ],
+}
+
+
+def _canonical(data):
+    return json.dumps(data, sort_keys=True)
+
+
+def test_round_trip_keeps_types_and_missing_fields(tmp_path):
+    snapshot_service.write_snapshot(DATA, str(tmp_path))
+    loaded = snapshot_service.load_snapshot(str(tmp_path))
+    # The canonical JSON tells 500 from 500.0 and None from a missing field
+    assert _canonical(loaded) == _canonical(DATA)
+
+    tables = snapshot_service.read_snapshot_tables(str(tmp_path))
+    assert "record" not in tables["people"].column_names
+    assert str(tables["people"].column("record.skills").type) == "list<item: string>"
+
+
+def test_round_trip_of_empty_data(tmp_path):
+    empty = {"people": [], "teams": [], "departments": [], "projects": []}
+    snapshot_service.write_snapshot(empty, str(tmp_path))
+    assert snapshot_service.load_snapshot(str(tmp_path)) == empty
+    tables = snapshot_service.read_snapshot_tables(str(tmp_path))
+    assert snapshot_service.build_snapshot_gantt_data(tables).empty
+
+
+def test_snapshot_gantt_matches_records(tmp_path):
+    snapshot_service.write_snapshot(DATA, str(tmp_path))
+    tables = snapshot_service.read_snapshot_tables(str(tmp_path))
+    expected = data_service.create_gantt_data(DATA["projects"], DATA)
+    pd.testing.assert_frame_equal(
+        snapshot_service.build_snapshot_gantt_data(tables)[expected.columns],
+        expected,
+        check_dtype=False,
+    )
+
+
+def test_fast_path_applies_journaled_projects(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "settings.json").write_text(json.dumps({"storage_backend": "arrow"}))
+    snapshot_service.write_snapshot(DATA, snapshot_service.SNAPSHOT_DIR)
+
+    edited = copy.deepcopy(DATA)
+    edited["projects"][0]["resource_allocations"][0]["allocation_percentage"] = 80
+    del edited["projects"][1]
+    edited["projects"].insert(0, {**DATA["projects"][1], "name": "Vostok"})
+    records = journal_service.build_change_records(
+        edited, {"projects": ["Apollo", "Gemini", "Vostok"]}, 1
+    )
+    journal_service.append_journal(records, journal_service.JOURNAL_FILE)
+
+    data, origin = journal_service.load_with_journal_origin()
+    assert data == edited
+    assert origin["journal"] == len(records)
+    assert origin["changes"] == {"projects": {"Apollo", "Gemini", "Vostok"}}
+
+    built = []
+    monkeypatch.setattr(
+        data_service,
+        "build_snapshot_gantt_data",
+        lambda tables: built.append(tables)
+        or snapshot_service.build_snapshot_gantt_data(tables),
+    )
+    aggregates = data_service._build_allocation_aggregates(data, origin)
+    assert built
+    expected = data_service._build_allocation_aggregates(data)
+    pd.testing.assert_frame_equal(
+        aggregates["gantt"][expected["gantt"].columns],
+        expected["gantt"],
+        check_dtype=False,
+    )
+    assert aggregates["project_costs"] == expected["project_costs"]
+
+
+def test_origin_is_none_without_snapshot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "resource_data.json").write_text(json.dumps(DATA))
+    data, origin = journal_service.load_with_journal_origin()
+    assert data == DATA
+    assert origin is None
@@ -0,0 +1,83 @@
+"""Tests for the SQLite storage backend."""
+
+from app.services import storage_service
+
+
+def _person(name, team="Core"):
+    return {"name": name, "department": "Research", "team": team}
+
+
+def _data(people):
+    return {"people": people, "teams": [], "departments": [], "projects": []}
+
+
+def _names(data):
+    return [person["name"] for person in data["people"]]
+
+
+def test_saved_order_round_trips(tmp_path):
+    filename = str(tmp_path / "resources.db")
+    people = [_person("Ada"), _person("Brian"), _person("Carol")]
+    storage_service.save_sqlite_storage(_data(people), filename)
+
+    # Reorder, insert in the middle, edit and delete
+    people = [_person("Carol"), _person("Dana"), _person("Ada", team="Ops")]
+    storage_service.save_sqlite_storage(_data(people), filename)
+    assert _names(storage_service.load_sqlite_storage(filename)) == [
+        "Carol",
+        "Dana",
+        "Ada",
+    ]
+
+    # Without the row cache the stored positions are read back first
+    storage_service._row_cache.clear()
+    people = [_person("Ada", team="Ops"), _person("Eve"), _person("Carol")]
+    result = storage_service.save_sqlite_storage(_data(people), filename)
+    loaded = storage_service.load_sqlite_storage(filename)
+    assert _names(loaded) == ["Ada", "Eve", "Carol"]
+    assert loaded["people"] == people
+    assert result == {"upserted": 1, "moved": 2, "deleted": 1}
+
+
+def test_upsert_records_writes_position(tmp_path):
+    filename = str(tmp_path / "resources.db")
+    people = [_person("Ada"), _person("Brian")]
+    storage_service.save_sqlite_storage(_data(people), filename)
+
+    storage_service.upsert_sqlite_records(
+        "people", [_person("Brian"), _person("Ada")], [0, 1], filename
+    )
+    assert _names(storage_service.load_sqlite_storage(filename)) == ["Brian", "Ada"]
+
+
+def test_save_changes_writes_only_named_records(tmp_path):
+    filename = str(tmp_path / "resources.db")
+    people = [_person("Ada"), _person("Brian"), _person("Carol")]
+    storage_service.save_sqlite_storage(_data(people), filename)
+
+    # An unlisted edit is not written
+    people = [_person("Ada", team="Ops"), _person("Dana"), _person("Carol", "Lab")]
+    result = storage_service.save_sqlite_storage(
+        _data(people), filename, changes={"people": ["Dana", "Brian", "Carol"]}
+    )
+    assert result == {"upserted": 2, "moved": 0, "deleted": 1}
+    loaded = storage_service.load_sqlite_storage(filename)
+    assert loaded["people"] == [_person("Ada"), _person("Dana"), _person("Carol", "Lab")]
+
+    # Insert and delete shift the other rows
+    people = [_person("Eve"), _person("Ada"), _person("Carol", "Lab")]
+    result = storage_service.save_sqlite_storage(
+        _data(people), filename, changes={"people": ["Eve", "Dana"]}
+    )
+    assert result == {"upserted": 1, "moved": 1, "deleted": 1}
+    assert storage_service.load_sqlite_storage(filename)["people"] == people
+
+    # The row cache matches the database, so a full save finds nothing to do
+    result = storage_service.save_sqlite_storage(_data(people), filename)
+    assert result == {"upserted": 0, "moved": 0, "deleted": 0}
+
+
+def test_json_is_the_default_backend(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    backend = storage_service.get_storage_backend()
+    assert backend["file"] == storage_service.JSON_DATA_FILE
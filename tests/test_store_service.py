@@ -0,0 +1,174 @@
+"""Tests for the shared data store and the session side of it."""
+
+import copy
+
+import pytest
+import streamlit as st
+
+from app.services import store_service
+from app.services.journal_service import build_change_records
+from app.utils.cache_utils import bump_data_revision
+
+DATA = {
+    "people": [
+        {"name": "Ada", "department": "Research"},
+        {"name": "Brian", "department": "Research"},
+        {"name": "Carol", "department": "Research"},
+    ],
+    "teams": [],
+    "departments": [{"name": "Research", "teams": [], "members": []}],
+    "projects": [],
+}
+
+
+def _load():
+    return copy.deepcopy(DATA), None
+
+
+@pytest.fixture(autouse=True)
+def fresh_store(monkeypatch):
+    monkeypatch.setattr(
+        store_service, "load_journal_settings", lambda: {"enabled": False}
+    )
+    monkeypatch.setitem(store_service._store, "data", None)
+    monkeypatch.setitem(store_service._store, "log", [])
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    store_service.attach_session_data(_load)
+
+
+def _edit(name, department):
+    """Edit a person of the session data as the resource forms do."""
+    store_service.ensure_private_data()
+    person = next(p for p in st.session_state.data["people"] if p["name"] == name)
+    person["department"] = department
+    bump_data_revision({"people": [name]})
+
+
+def _commit_elsewhere(name, department):
+    """Commit an edit of a person made in another session."""
+    data = copy.deepcopy(store_service._store["data"])
+    next(p for p in data["people"] if p["name"] == name)["department"] = department
+    records = build_change_records(data, {"people": [name]}, 0)
+    store_service.commit_records(records, store_service._store["fingerprints"])
+
+
+def test_session_copies_on_first_edit_and_reattaches_after_commit():
+    shared = store_service._store["data"]
+    assert st.session_state.data is shared
+
+    _edit("Ada", "Sales")
+    assert st.session_state.data is not shared
+    assert shared["people"][0]["department"] == "Research"
+
+    result = store_service.commit_session_changes()
+    assert len(result["applied"]) == 1
+    assert st.session_state.store_state["shared"]
+    assert st.session_state.data is store_service._store["data"]
+    assert st.session_state.data["people"][0]["department"] == "Sales"
+
+
+def test_truncated_log_keeps_conflicting_edits(monkeypatch):
+    _edit("Ada", "Sales")
+    _commit_elsewhere("Ada", "Marketing")
+    result = store_service.commit_session_changes()
+    assert len(result["conflicts"]) == 1
+
+    # More versions are committed than the log keeps
+    monkeypatch.setattr(store_service, "MAX_LOG_VERSIONS", 1)
+    _commit_elsewhere("Brian", "Sales")
+    _commit_elsewhere("Carol", "Sales")
+    assert (
+        store_service.get_changes_since(st.session_state.store_state["version"]) is None
+    )
+
+    store_service.sync_session_data(_load)
+    people = {p["name"]: p["department"] for p in st.session_state.data["people"]}
+    assert people == {"Ada": "Sales", "Brian": "Sales", "Carol": "Sales"}
+    assert [c["name"] for c in st.session_state.data_conflicts] == ["Ada"]
+    assert not st.session_state.store_state["shared"]
+    assert store_service._store["data"]["people"][0]["department"] == "Marketing"
+
+
+def test_origin_only_describes_unchanged_shared_data(monkeypatch):
+    origin = {"snapshot": ("snapshots", 3), "journal": 0, "changes": {}}
+    monkeypatch.setitem(store_service._store, "data", None)
+    store_service.attach_session_data(lambda: (copy.deepcopy(DATA), origin))
+    assert store_service.get_session_data_origin() == origin
+
+    _edit("Ada", "Sales")
+    assert store_service.get_session_data_origin() is None
+
+    store_service.commit_session_changes()
+    assert st.session_state.store_state["shared"]
+    assert store_service.get_session_data_origin() is None
+
+
+def _records(name, department):
+    """Change records setting the department of a person in a copy of the store."""
+    data = copy.deepcopy(store_service._store["data"])
+    next(p for p in data["people"] if p["name"] == name)["department"] = department
+    return build_change_records(data, {"people": [name]}, 0)
+
+
+def test_commits_compare_and_swap_per_record():
+    seen = store_service._store["fingerprints"]
+    before = store_service._store["data"]
+    first = store_service.commit_records(_records("Ada", "Sales"), seen)
+    assert len(first["applied"]) == 1
+    # The version a session may still read is left as it was
+    assert before["people"][0]["department"] == "Research"
+
+    # Another record seen at the same version still applies
+    second = store_service.commit_records(_records("Brian", "Sales"), seen)
+    assert len(second["applied"]) == 1
+    assert second["version"] == first["version"] + 1
+
+    # The same record changed in between conflicts, unless identical
+    assert store_service.commit_records(_records("Ada", "Sales"), seen) == dict(
+        second, applied=[], conflicts=[]
+    )
+    conflict = store_service.commit_records(_records("Ada", "Marketing"), seen)
+    assert [r["name"] for r in conflict["conflicts"]] == ["Ada"]
+    assert conflict["version"] == second["version"]
+
+    forced = store_service.commit_records(
+        _records("Ada", "Marketing"), seen, force=True
+    )
+    assert len(forced["applied"]) == 1
+    people = {p["name"]: p["department"] for p in forced["data"]["people"]}
+    assert people == {"Ada": "Marketing", "Brian": "Sales", "Carol": "Research"}
+    start = first["version"] - 1
+    assert [
+        len(store_service.get_changes_since(version))
+        for version in range(start, forced["version"] + 1)
+    ] == [3, 2, 1, 0]
+
+
+@pytest.mark.parametrize("keep_mine", [True, False])
+def test_resolved_conflicts_reattach_shared_data(keep_mine):
+    _edit("Ada", "Sales")
+    _commit_elsewhere("Ada", "Marketing")
+    store_service.commit_session_changes()
+    assert [c["name"] for c in st.session_state.data_conflicts] == ["Ada"]
+
+    store_service.resolve_data_conflicts(keep_mine)
+    assert st.session_state.store_state["shared"]
+    assert st.session_state.data is store_service._store["data"]
+    expected = "Sales" if keep_mine else "Marketing"
+    assert st.session_state.data["people"][0]["department"] == expected
+
+
+def test_sync_applies_changes_of_other_sessions():
+    _commit_elsewhere("Brian", "Sales")
+    store_service.sync_session_data(_load)
+    assert st.session_state.data is store_service._store["data"]
+
+    # A private copy keeps its own edits and takes the others
+    _edit("Ada", "Sales")
+    _commit_elsewhere("Carol", "Sales")
+    store_service.sync_session_data(_load)
+    assert st.session_state.data is not store_service._store["data"]
+    people = {p["name"]: p["department"] for p in st.session_state.data["people"]}
+    assert people == {"Ada": "Sales", "Brian": "Sales", "Carol": "Sales"}
+    assert store_service._store["data"]["people"][0]["department"] == "Research"
@@ -0,0 +1,85 @@
+"""Tests for the incremental JSON array reader."""
+
+import io
+import json
+
+import pytest
+
+from app.utils.stream_utils import iter_json_arrays
+
+DOCUMENT = {
+    "people": [
+        {"name": "Ada Lovelace", "daily_cost": 512.25, "skills": ["Python", "C"]},
+        {"name": "Zoë “Z” Ünal", "notes": "tab\tquote\" slash\\ ☃"},
+        {"name": "Brian", "daily_cost": -1234567890123, "team": None, "ok": True},
+    ],
+    "version": 2,
+    "settings": {"nested": [1, 2, {"deep": []}]},
+    "teams": [],
+    "departments": [[], {}, "text", 1e-7, 12345, False],
+    "projects": [{"name": "Apollo", "resource_allocations": [{"x": 1.5}]}],
+}
+
+
+def _items(text, chunk_size, **kwargs):
+    file = io.BytesIO(text.encode("utf-8"))
+    return list(iter_json_arrays(file, chunk_size=chunk_size, **kwargs))
+
+
+def _expected(document):
+    return [
+        (key, item)
+        for key, value in document.items()
+        if isinstance(value, list)
+        for item in value
+    ]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_every_chunk_boundary_gives_the_parsed_items(indent):
+    text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False)
+    expected = _expected(json.loads(text))
+    # Boundaries fall inside keys, strings, multi-byte characters and numbers
+    for chunk_size in list(range(1, 40)) + [len(text.encode("utf-8"))]:
+        assert _items(text, chunk_size) == expected, chunk_size
+
+
+def test_keys_progress_and_byte_order_mark():
+    text = "﻿" + json.dumps(DOCUMENT)
+    keys = []
+    progress = []
+    items = _items(
+        text,
+        7,
+        on_key=lambda key, is_array: keys.append((key, is_array)),
+        on_progress=progress.append,
+    )
+    assert items == _expected(DOCUMENT)
+    assert keys == [(key, isinstance(v, list)) for key, v in DOCUMENT.items()]
+    assert len(progress) == len(items)
+    assert progress == sorted(progress)
+    assert progress[-1] <= len(text.encode("utf-8"))
+
+
+@pytest.mark.parametrize("text", ["{}", " { } ", '{"people": []}'])
+def test_empty_documents(text):
+    assert _items(text, 1) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "[]",
+        '{"people": [{"name": "Ada"}',
+        '{"people": [{"name": "Ada"},]}',
+        '{"people": [{"name": "Ada"}] "teams": []}',
+        '{"people": [{"name": "Ada"}]',
+        '{people: []}',
+        '{"people": [1 2]}',
+    ],
+)
+def test_malformed_documents_raise_value_error(text):
+    for chunk_size in (1, 3, 1024):
+        with pytest.raises(ValueError):
+            _items(text, chunk_size)
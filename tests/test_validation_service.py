@@ -0,0 +1,68 @@
+"""Tests for the batched import validation."""
+
+from app.services import validation_service
+
+
+def _allocation(resource, start, end, percentage=50):
+    return {
+        "resource": resource,
+        "start_date": start,
+        "end_date": end,
+        "allocation_percentage": percentage,
+    }
+
+
+def test_range_errors_match_per_project_checks():
+    projects = [
+        {
+            "resource_allocations": [
+                _allocation("Ada", "2025-01-01", "2025-01-31"),
+                _allocation("Brian", "2025-03-10", "2025-03-08", 5),
+                _allocation("Core", "not a date", "2025-01-31", 120),
+                {
+                    "resource": "Ada",
+                    "start_date": "2025-02-01",
+                    "end_date": "2025-02-28",
+                },
+            ]
+        },
+        {"resource_allocations": []},
+        {},
+    ]
+    errors = validation_service.find_allocation_range_errors(projects)
+    for project, project_errors in zip(projects, errors):
+        allocations = project.get("resource_allocations", [])
+        _, expected = validation_service.validate_project_resources([], allocations)
+        assert sorted(project_errors) == sorted(expected)
+    assert validation_service.find_allocation_range_errors([]) == []
+
+
+def test_overlapping_allocations_of_a_resource():
+    projects = [
+        {
+            "resource_allocations": [
+                _allocation("Ada", "2025-01-10", "2025-01-20"),
+                _allocation("Ada", "2025-01-01", "2025-01-31"),
+                # Starts the day after the latest end
+                _allocation("Ada", "2025-02-01", "2025-02-05"),
+                _allocation("Brian", "2025-01-01", "2025-01-05"),
+                _allocation("Brian", "2025-01-05", "2025-01-09"),
+                # Reversed dates are reported once, not as overlaps
+                _allocation("Brian", "2025-01-08", "2025-01-02"),
+            ]
+        },
+        {"resource_allocations": [_allocation("Ada", "2025-01-10", "2025-01-20")]},
+    ]
+    errors = validation_service.find_allocation_range_errors(projects)
+    assert errors == [
+        [
+            "Start date must be before end date for Brian",
+            "Overlapping allocations for Ada starting 2025-01-10",
+            "Overlapping allocations for Brian starting 2025-01-05",
+        ],
+        [],
+    ]
+
+    fixes = validation_service.suggest_relationship_fixes({"projects": errors[0]})
+    assert len(fixes["projects"]) == 3
+    assert fixes["projects"][1].startswith("Merge the overlapping allocations")